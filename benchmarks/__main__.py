@@ -0,0 +1,65 @@
+import argparse
+from benchmarks.harness import (get_cases, run_benchmarks, save_results, load_results, diff_results,
+                                available_backends)
+
+# Command line interface of the benchmark suite. Run from the root of the repository:
+#   python -m benchmarks list --group layers
+#   python -m benchmarks run --group layers preprocessors --filter "*molecule*" --output results.json
+#   python -m benchmarks diff results_old.json results.json --threshold 0.1
+parser = argparse.ArgumentParser(description='Run and compare benchmarks of kgcnn.')
+subparsers = parser.add_subparsers(dest="command", required=True)
+for command in ["list", "run"]:
+    subparser = subparsers.add_parser(command, help="%s benchmark cases." % command.capitalize())
+    subparser.add_argument("--group", required=False, help="Groups of benchmarks.", default=None, nargs="+",
+                           choices=["imports", "layers", "loaders", "preprocessors", "scripts"])
+    subparser.add_argument("--filter", required=False, help="Shell-style patterns of benchmark IDs.", default=None,
+                           nargs="+")
+    if command == "run":
+        subparser.add_argument("--backends", required=False, help="Keras backends to run.", default=None,
+                               nargs="+", choices=available_backends)
+        subparser.add_argument("--repeats", required=False, help="Number of timed calls.", default=10, type=int)
+        subparser.add_argument("--warmup", required=False, help="Number of calls before timing.", default=1,
+                               type=int)
+        subparser.add_argument("--output", required=False, help="File path of JSON results.",
+                               default="benchmark_results.json")
+diff_parser = subparsers.add_parser("diff", help="Compare two result files.")
+diff_parser.add_argument("base", help="File path of JSON results of the reference.")
+diff_parser.add_argument("new", help="File path of JSON results to compare.")
+diff_parser.add_argument("--threshold", required=False, help="Relative change to report.", default=0.1, type=float)
+diff_parser.add_argument("--all", required=False, help="Show all metrics.", default=False, action="store_true")
+diff_parser.add_argument("--fail_on_regression", required=False, help="Exit with error code for regressions.",
+                         default=False, action="store_true")
+
+
+def main(args: dict) -> int:
+    if args["command"] == "list":
+        for case in get_cases(groups=args["group"], patterns=args["filter"]):
+            print("%s (backends: %s)" % (case.id, ", ".join(case.backends) if case.backends is not None else "any"))
+        return 0
+
+    if args["command"] == "run":
+        cases = get_cases(groups=args["group"], patterns=args["filter"])
+        print("Running %s benchmark cases." % len(cases))
+        results = run_benchmarks(cases, backends=args["backends"], repeats=args["repeats"], warmup=args["warmup"])
+        save_results(results, args["output"])
+        print("Saved results to '%s'." % args["output"])
+        return 0
+
+    base, new = load_results(args["base"]), load_results(args["new"])
+    print("Base: commit %s from %s" % (base["metadata"]["commit"], base["metadata"]["date_time"]))
+    print("New: commit %s from %s" % (new["metadata"]["commit"], new["metadata"]["date_time"]))
+    changes = diff_results(base, new, threshold=args["threshold"])
+    for x in changes:
+        if not args["all"] and x["status"] not in ["regression", "improvement"]:
+            continue
+        print("%-12s %s @%s %s: %.4g -> %.4g (%+.1f%%)" % (
+            x["status"] if x["status"] is not None else "-", x["id"], x["backend"], x["metric"], x["base"], x["new"],
+            100 * x["change"]))
+    regressions = [x for x in changes if x["status"] == "regression"]
+    print("%s regressions and %s improvements of %s compared metrics." % (
+        len(regressions), len([x for x in changes if x["status"] == "improvement"]), len(changes)))
+    return 1 if regressions and args["fail_on_regression"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(vars(parser.parse_args())))
@@ -0,0 +1,116 @@
+import argparse
+import time
+import multiprocessing
+import numpy as np
+
+# Benchmark of DimeNetPP and MXMNet with angle indices precomputed for each graph in python against computing them
+# within the model by `EdgeAngleIndices` . Reported are the preprocessing time, the memory of the stored angle indices
+# and the time per training epoch. Graphs are random molecules the size of QM9 with a spanning tree and a ring closure
+# as bonds and random coordinates. Every configuration is run in a separate process.
+parser = argparse.ArgumentParser(description='Benchmark precomputed against in-model angle indices.')
+parser.add_argument("--model", required=False, help="Model to benchmark.", default="DimeNetPP",
+                    choices=["DimeNetPP", "MXMNet"])
+parser.add_argument("--num_graphs", required=False, help="Number of graphs in dataset.", default=512, type=int)
+parser.add_argument("--batch_size", required=False, help="Batch size.", default=32, type=int)
+parser.add_argument("--epochs", required=False, help="Number of timed epochs.", default=2, type=int)
+
+
+def make_synthetic_dataset(num_graphs: int, seed: int = 42):
+    """Make random molecule-like graphs with coordinates, a spanning tree and a ring closure as bonds."""
+    from kgcnn.data.base import MemoryGraphList
+    rng = np.random.default_rng(seed)
+    graphs = []
+    for _ in range(num_graphs):
+        num_nodes = int(rng.integers(5, 30))
+        bonds = [(i, int(rng.integers(0, i))) for i in range(1, num_nodes)] + [(num_nodes - 1, 0)]
+        bonds = np.array(sorted(set(bonds + [(j, i) for i, j in bonds])), dtype="int64")
+        graphs.append({"node_number": rng.integers(1, 10, size=num_nodes),
+                       "node_coordinates": rng.uniform(0.0, 1.5 * np.cbrt(num_nodes), size=(num_nodes, 3)),
+                       "edge_indices": bonds, "graph_labels": rng.normal(size=(1,))})
+    return MemoryGraphList(graphs)
+
+
+def model_config(model_name: str, make_angle_indices: bool):
+    """Inputs, preprocessing and small model arguments for each model."""
+    inputs = [{"shape": (None,), "name": "node_number", "dtype": "int64"},
+              {"shape": (None, 3), "name": "node_coordinates", "dtype": "float32"}]
+    if model_name == "DimeNetPP":
+        inputs += [{"shape": (None, 2), "name": "range_indices", "dtype": "int64"}]
+        methods = [{"method": "set_range", "max_distance": 4.0, "max_neighbours": 1000},
+                   {"method": "count_nodes_and_edges", "count_nodes": "node_number", "total_edges": "total_ranges",
+                    "count_edges": "range_indices"}]
+        totals = [{"shape": (), "name": "total_nodes", "dtype": "int64"},
+                  {"shape": (), "name": "total_ranges", "dtype": "int64"}]
+        angle_methods = [{"method": "set_angle"}]
+        angles = ["angle_indices"]
+        kwargs = {"emb_size": 32, "out_emb_size": 64, "int_emb_size": 16, "basis_emb_size": 8, "num_blocks": 2,
+                  "output_mlp": {"use_bias": True, "units": 1, "activation": "linear"}}
+    else:
+        inputs += [{"shape": (None, 1), "name": "edge_weights", "dtype": "float32"},
+                   {"shape": (None, 2), "name": "edge_indices", "dtype": "int64"},
+                   {"shape": (None, 2), "name": "range_indices", "dtype": "int64"}]
+        methods = [{"method": "set_edge_weights_uniform"},
+                   {"method": "set_range", "max_distance": 4.0, "max_neighbours": 1000},
+                   {"method": "count_nodes_and_edges", "count_nodes": "node_number"},
+                   {"method": "count_nodes_and_edges", "count_nodes": "node_number", "total_edges": "total_ranges",
+                    "count_edges": "range_indices"}]
+        totals = [{"shape": (), "name": "total_nodes", "dtype": "int64"},
+                  {"shape": (), "name": "total_edges", "dtype": "int64"},
+                  {"shape": (), "name": "total_ranges", "dtype": "int64"}]
+        angle_methods = [
+            {"method": "set_angle", "range_indices": "edge_indices", "edge_pairing": "jk",
+             "angle_indices": "angle_indices_1", "angle_indices_nodes": "angle_indices_nodes_1",
+             "angle_attributes": "angle_attributes_1"},
+            {"method": "set_angle", "range_indices": "edge_indices", "edge_pairing": "ik", "allow_self_edges": True,
+             "angle_indices": "angle_indices_2", "angle_indices_nodes": "angle_indices_nodes_2",
+             "angle_attributes": "angle_attributes_2"}]
+        angles = ["angle_indices_1", "angle_indices_2"]
+        kwargs = {"depth": 2, "output_mlp": {"use_bias": True, "units": 1, "activation": "linear"}}
+    if not make_angle_indices:
+        methods += angle_methods + [
+            {"method": "count_nodes_and_edges", "count_nodes": "node_number", "total_edges": "total_%s" % x,
+             "count_edges": x} for x in angles]
+        inputs += [{"shape": (None, 2), "name": x, "dtype": "int64"} for x in angles]
+        totals += [{"shape": (), "name": "total_%s" % x, "dtype": "int64"} for x in angles]
+    return inputs + totals, methods, angles, kwargs
+
+
+def run_config(model_name: str, make_angle_indices: bool, num_graphs: int, batch_size: int, epochs: int, queue):
+    import importlib
+    make_model = getattr(importlib.import_module("kgcnn.literature.%s" % model_name), "make_model")
+    dataset = make_synthetic_dataset(num_graphs)
+    inputs, methods, angles, kwargs = model_config(model_name, make_angle_indices)
+    start = time.perf_counter()
+    for method in methods:
+        dataset.map_list(**method)
+    x = dataset.tensor(inputs)
+    preprocessing_time = time.perf_counter() - start
+    angle_memory = 0.0 if make_angle_indices else sum(
+        [float(np.sum([g[a].nbytes for g in dataset])) for a in angles]) / 1024.0 ** 2
+    y = np.array([g["graph_labels"] for g in dataset])
+
+    model = make_model(inputs=inputs, make_angle_indices=make_angle_indices, **kwargs)
+    model.compile(loss="mean_absolute_error", optimizer="adam")
+    model.fit(x, y, batch_size=batch_size, epochs=1, verbose=0)  # Warm-up and compile.
+    start = time.perf_counter()
+    model.fit(x, y, batch_size=batch_size, epochs=epochs, verbose=0)
+    epoch_time = (time.perf_counter() - start) / epochs
+    queue.put({"preprocessing_time": preprocessing_time, "angle_memory_mb": angle_memory, "epoch_time": epoch_time})
+
+
+if __name__ == "__main__":
+    args = vars(parser.parse_args())
+    print("Input of argparse:", args)
+    context = multiprocessing.get_context("spawn")
+    for name, make_angle_indices in [("precomputed", False), ("in_model", True)]:
+        queue = context.Queue()
+        process = context.Process(target=run_config, args=(
+            args["model"], make_angle_indices, args["num_graphs"], args["batch_size"], args["epochs"], queue))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            print("%s: failed with exit code %s" % (name, process.exitcode))
+            continue
+        results = queue.get()
+        print("%s: preprocessing %.3f s, stored angle indices %.2f MB, epoch time %.3f s" % (
+            name, results["preprocessing_time"], results["angle_memory_mb"], results["epoch_time"]))
@@ -0,0 +1,143 @@
+import numpy as np
+
+# Synthetic graphs for benchmarks. Only the size and structure of the graphs matter for timing, so that properties
+# are random. All graphs have 'node_number', 'node_attributes', 'node_coordinates', 'edge_indices' sorted by the
+# receiving node with both directions of each edge, 'edge_attributes' and 'graph_labels' .
+# Imports of `kgcnn` are within functions, so that the keras backend can be chosen before in a benchmark process.
+
+
+def _make_graph(rng, edges: np.ndarray, num_nodes: int, coordinates: np.ndarray, num_features: int) -> dict:
+    edges = np.unique(np.concatenate([edges, edges[:, ::-1]], axis=0), axis=0).astype("int64")
+    return {"node_number": rng.integers(1, 10, size=num_nodes),
+            "node_attributes": rng.normal(size=(num_nodes, num_features)).astype("float32"),
+            "node_coordinates": coordinates,
+            "edge_indices": edges,
+            "edge_attributes": rng.normal(size=(len(edges), num_features)).astype("float32"),
+            "graph_labels": rng.normal(size=(1,)).astype("float32")}
+
+
+def make_molecule_graphs(num_graphs: int = 256, min_nodes: int = 5, max_nodes: int = 40, num_features: int = 32,
+                         seed: int = 42):
+    r"""Make molecule-like graphs with a random spanning tree plus a ring closure as bonds.
+
+    Args:
+        num_graphs (int): Number of graphs. Default is 256.
+        min_nodes (int): Minimum number of nodes per graph. Default is 5.
+        max_nodes (int): Maximum number of nodes per graph. Default is 40.
+        num_features (int): Number of node and edge features. Default is 32.
+        seed (int): Random seed. Default is 42.
+
+    Returns:
+        MemoryGraphList: List of graphs.
+    """
+    rng = np.random.default_rng(seed)
+    graphs = []
+    for _ in range(num_graphs):
+        num_nodes = int(rng.integers(min_nodes, max_nodes + 1))
+        bonds = [(i, int(rng.integers(0, i))) for i in range(1, num_nodes)] + [(num_nodes - 1, 0)]
+        coordinates = rng.uniform(0.0, 1.5 * np.cbrt(num_nodes), size=(num_nodes, 3))
+        graphs.append(_make_graph(rng, np.array(bonds), num_nodes, coordinates, num_features))
+    from kgcnn.data.base import MemoryGraphList
+    return MemoryGraphList(graphs)
+
+
+def make_crystal_graphs(num_graphs: int = 32, num_nodes: int = 16, num_neighbours: int = 12, density: float = 0.08,
+                        num_features: int = 32, seed: int = 42):
+    r"""Make crystal-like graphs of a cubic unit cell with random positions and the given density of nodes.
+
+    The graphs have a 'graph_lattice' for periodic preprocessors. Edges connect each node with its nearest neighbours
+    within the unit cell.
+
+    Args:
+        num_graphs (int): Number of graphs. Default is 32.
+        num_nodes (int): Number of nodes in the unit cell. Default is 16.
+        num_neighbours (int): Number of nearest neighbours per node. Default is 12.
+        density (float): Nodes per volume. Default is 0.08.
+        num_features (int): Number of node and edge features. Default is 32.
+        seed (int): Random seed. Default is 42.
+
+    Returns:
+        MemoryGraphList: List of graphs.
+    """
+    rng = np.random.default_rng(seed)
+    num_neighbours = min(num_neighbours, num_nodes - 1)
+    graphs = []
+    for _ in range(num_graphs):
+        length = np.cbrt(num_nodes / density)
+        coordinates = rng.uniform(0.0, length, size=(num_nodes, 3))
+        distance = np.linalg.norm(coordinates[:, None, :] - coordinates[None, :, :], axis=-1)
+        neighbours = np.argsort(distance, axis=-1)[:, 1:num_neighbours + 1]
+        edges = np.stack([np.repeat(np.arange(num_nodes), num_neighbours), neighbours.flatten()], axis=-1)
+        graph = _make_graph(rng, edges, num_nodes, coordinates, num_features)
+        graph["graph_lattice"] = np.eye(3) * length
+        graphs.append(graph)
+    from kgcnn.data.base import MemoryGraphList
+    return MemoryGraphList(graphs)
+
+
+def make_power_law_graphs(num_graphs: int = 1, num_nodes: int = 20000, mean_degree: int = 10, exponent: float = 2.5,
+                          num_features: int = 32, seed: int = 42):
+    r"""Make graphs with a power-law degree distribution like citation or social networks.
+
+    Edges are drawn with probability proportional to the product of expected degrees of both nodes, which are
+    sampled from a Pareto distribution with the given exponent.
+
+    Args:
+        num_graphs (int): Number of graphs. Default is 1.
+        num_nodes (int): Number of nodes per graph. Default is 20000.
+        mean_degree (int): Average number of neighbours. Default is 10.
+        exponent (float): Exponent of the degree distribution. Default is 2.5.
+        num_features (int): Number of node and edge features. Default is 32.
+        seed (int): Random seed. Default is 42.
+
+    Returns:
+        MemoryGraphList: List of graphs.
+    """
+    rng = np.random.default_rng(seed)
+    graphs = []
+    for _ in range(num_graphs):
+        weights = rng.pareto(exponent - 1.0, size=num_nodes) + 1.0
+        probability = weights / np.sum(weights)
+        num_edges = num_nodes * mean_degree // 2
+        edges = np.stack([rng.choice(num_nodes, size=num_edges, p=probability),
+                          rng.choice(num_nodes, size=num_edges, p=probability)], axis=-1)
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        coordinates = rng.uniform(0.0, 1.0, size=(num_nodes, 3))
+        graphs.append(_make_graph(rng, edges, num_nodes, coordinates, num_features))
+    from kgcnn.data.base import MemoryGraphList
+    return MemoryGraphList(graphs)
+
+
+graph_generators = {
+    "molecule": make_molecule_graphs,
+    "crystal": make_crystal_graphs,
+    "power_law": make_power_law_graphs,
+}
+
+
+def make_graphs(kind: str, **kwargs):
+    """Make synthetic graphs of type 'molecule', 'crystal' or 'power_law' with generator kwargs."""
+    if kind not in graph_generators:
+        raise ValueError("Unknown graph type '%s' for benchmarks, choose from %s." % (kind, list(graph_generators)))
+    return graph_generators[kind](**kwargs)
+
+
+def to_disjoint(graphs) -> dict:
+    r"""Concatenate graphs into one disjoint graph with edge indices of shape `(2, M)` and batch IDs.
+
+    Args:
+        graphs (MemoryGraphList): List of graphs.
+
+    Returns:
+        dict: Nodes, edges, edge indices, batch ID of nodes and edges and the number of nodes and edges per graph.
+    """
+    count_nodes = np.array([len(g["node_attributes"]) for g in graphs], dtype="int64")
+    count_edges = np.array([len(g["edge_indices"]) for g in graphs], dtype="int64")
+    offsets = np.repeat(np.cumsum(count_nodes) - count_nodes, count_edges)
+    edge_indices = np.concatenate([g["edge_indices"] for g in graphs], axis=0) + offsets[:, None]
+    return {"nodes": np.concatenate([g["node_attributes"] for g in graphs], axis=0),
+            "edges": np.concatenate([g["edge_attributes"] for g in graphs], axis=0),
+            "edge_indices": np.transpose(edge_indices),
+            "batch_id_node": np.repeat(np.arange(len(graphs), dtype="int64"), count_nodes),
+            "batch_id_edge": np.repeat(np.arange(len(graphs), dtype="int64"), count_edges),
+            "count_nodes": count_nodes, "count_edges": count_edges}
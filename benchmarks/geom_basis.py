@@ -0,0 +1,82 @@
+import argparse
+import resource
+import time
+import multiprocessing
+import numpy as np
+
+# Benchmark of the geometric front end of Schnet, DimeNetPP and PAiNN with and without the fused distance basis layer.
+# Every configuration is run in a separate process to measure its peak memory (resident set size) independently.
+parser = argparse.ArgumentParser(description='Benchmark fused distance basis expansion against chained layers.')
+parser.add_argument("--model", required=False, help="Model to benchmark.", default="Schnet",
+                    choices=["Schnet", "DimeNetPP", "PAiNN"])
+parser.add_argument("--num_graphs", required=False, help="Number of graphs per batch.", default=16, type=int)
+parser.add_argument("--num_nodes", required=False, help="Number of nodes per graph.", default=64, type=int)
+parser.add_argument("--num_neighbours", required=False, help="Number of neighbours per node.", default=50, type=int)
+parser.add_argument("--steps", required=False, help="Number of timed training steps.", default=10, type=int)
+
+
+def make_inputs(num_graphs: int, num_nodes: int, num_neighbours: int, with_angles: bool = False, seed: int = 42):
+    """Make padded random graphs with a fixed number of neighbours per node."""
+    rng = np.random.default_rng(seed)
+    num_neighbours = min(num_neighbours, num_nodes - 1)
+    node_number = rng.integers(1, 10, size=(num_graphs, num_nodes))
+    coordinates = rng.uniform(0.0, 5.0, size=(num_graphs, num_nodes, 3)).astype("float32")
+    receive = np.repeat(np.arange(num_nodes), num_neighbours)
+    send = (receive + np.tile(np.arange(1, num_neighbours + 1), num_nodes)) % num_nodes
+    edges = np.broadcast_to(np.stack([receive, send], axis=-1), (num_graphs, len(receive), 2))
+    inputs = [node_number, coordinates, np.array(edges)]
+    if with_angles:
+        # Pairs of consecutive edges that share the receiving node, which is sufficient for benchmarking.
+        first = np.arange(len(receive))
+        second = (first // num_neighbours) * num_neighbours + (first + 1) % num_neighbours
+        angles = np.broadcast_to(np.stack([first, second], axis=-1), (num_graphs, len(first), 2))
+        inputs += [np.array(angles)]
+    inputs += [np.full(num_graphs, num_nodes), np.full(num_graphs, len(receive))]
+    if with_angles:
+        inputs += [np.full(num_graphs, len(receive))]
+    return inputs
+
+
+def run_config(model_name: str, fused_basis_args, num_graphs: int, num_nodes: int, num_neighbours: int,
+               steps: int, queue):
+    import keras as ks
+    import importlib
+    make_model = getattr(importlib.import_module("kgcnn.literature.%s" % model_name), "make_model")
+    model_kwargs = {"fused_basis_args": fused_basis_args}
+    if model_name == "PAiNN":
+        model_kwargs.update({"conv_args": {"units": 128, "cutoff": 5.0, "conv_pool": "scatter_sum"}})
+    if model_name == "DimeNetPP":
+        model_kwargs.update({"output_mlp": {"use_bias": [True, False], "units": [64, 1],
+                                            "activation": ["swish", "linear"]}})
+    model = make_model(**model_kwargs)
+    model.compile(loss="mean_absolute_error", optimizer="adam")
+    x = make_inputs(num_graphs, num_nodes, num_neighbours, with_angles=(model_name == "DimeNetPP"))
+    y = np.zeros((num_graphs, 1))
+    model.train_on_batch(x, y)  # Warm-up and compile.
+    start = time.perf_counter()
+    for _ in range(steps):
+        model.train_on_batch(x, y)
+    step_time = (time.perf_counter() - start) / steps
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    queue.put({"step_time": step_time, "peak_memory_mb": peak_memory})
+
+
+if __name__ == "__main__":
+    args = vars(parser.parse_args())
+    print("Input of argparse:", args)
+    configs = {"chained": None, "fused": {}, "fused_recompute": {"recompute_grad": True}}
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for name, fused_args in configs.items():
+        queue = context.Queue()
+        process = context.Process(target=run_config, args=(
+            args["model"], fused_args, args["num_graphs"], args["num_nodes"], args["num_neighbours"],
+            args["steps"], queue))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            print("%s: failed with exit code %s" % (name, process.exitcode))
+            continue
+        results[name] = queue.get()
+        print("%s: step time %.4f s, peak memory %.1f MB" % (
+            name, results[name]["step_time"], results[name]["peak_memory_mb"]))
@@ -0,0 +1,284 @@
+import os
+import sys
+import json
+import time
+import fnmatch
+import platform
+import itertools
+import subprocess
+import importlib
+import queue as queue_module
+import multiprocessing
+import numpy as np
+from datetime import datetime
+from typing import Callable, Union
+
+# Registry and runner of benchmark cases. A case is a function registered with `register_benchmark` in one of the
+# `suite_modules` . Its parameters are given as lists, which are expanded to all combinations like parametrized tests.
+# A timed case returns a function without arguments, which runs the benchmarked operation until its result is
+# available, e.g. by converting the output to numpy. Other cases, like the comparison scripts in this folder, return
+# a dictionary of their own metrics. Each case and backend is run in a separate process, since the keras backend is
+# fixed at import time, and so that peak memory is measured independently.
+
+suite_modules = ["benchmarks.suite_imports", "benchmarks.suite_layers", "benchmarks.suite_loaders",
+                 "benchmarks.suite_preprocessors", "benchmarks.suite_scripts"]
+
+available_backends = ["tensorflow", "jax", "torch"]
+
+_registry = {}
+
+
+class BenchmarkCase:
+    r"""Single benchmark with fixed parameters."""
+
+    def __init__(self, group: str, name: str, function: Callable, params: dict, backends: Union[list, None],
+                 timed: bool):
+        self.group = group
+        self.name = name
+        self.function = function
+        self.params = params
+        self.backends = backends
+        self.timed = timed
+
+    @property
+    def id(self) -> str:
+        label = ",".join(["%s=%s" % (key, value) for key, value in self.params.items()])
+        return "%s.%s[%s]" % (self.group, self.name, label) if label else "%s.%s" % (self.group, self.name)
+
+
+def register_benchmark(group: str, params: dict = None, backends: Union[list, None] = available_backends,
+                       timed: bool = True, name: str = None):
+    r"""Decorator to register a benchmark function for all combinations of parameters.
+
+    Args:
+        group (str): Group of the benchmark, e.g. 'layers' .
+        params (dict): Lists of values for each keyword argument of the function. Default is None.
+        backends (list): Keras backends to run the benchmark with. None if the benchmark does not depend on the
+            backend. Default is all backends.
+        timed (bool): Whether the function returns a function to time or a dictionary of metrics. Default is True.
+        name (str): Name of the benchmark. Default is the name of the function.
+
+    Returns:
+        Callable: Decorator.
+    """
+    params = params if params is not None else {}
+
+    def decorator(function):
+        keys = list(params.keys())
+        for values in itertools.product(*[params[key] for key in keys]):
+            case = BenchmarkCase(group, name if name is not None else function.__name__, function,
+                                 dict(zip(keys, values)), backends, timed)
+            _registry[case.id] = case
+        return function
+
+    return decorator
+
+
+def get_cases(groups: list = None, patterns: list = None) -> list:
+    r"""Get registered benchmark cases of all suites.
+
+    Args:
+        groups (list): Groups to select. Default is None, which selects all groups.
+        patterns (list): Shell-style patterns of which one must match the ID of a case. Default is None.
+
+    Returns:
+        list: List of :obj:`BenchmarkCase` .
+    """
+    for module in suite_modules:
+        importlib.import_module(module)
+    cases = list(_registry.values())
+    if groups:
+        cases = [x for x in cases if x.group in groups]
+    if patterns:
+        cases = [x for x in cases if any([fnmatch.fnmatch(x.id, p) for p in patterns])]
+    return cases
+
+
+def peak_memory_mb() -> float:
+    r"""Peak resident set size of the current process in MB."""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024.0 ** 2 if sys.platform == "darwin" else peak / 1024.0
+
+
+def time_function(function: Callable, repeats: int = 10, warmup: int = 1) -> dict:
+    r"""Time repeated calls of a function after warm-up calls, e.g. for compilation.
+
+    Args:
+        function (Callable): Function without arguments.
+        repeats (int): Number of timed calls. Default is 10.
+        warmup (int): Number of calls before timing. Default is 1.
+
+    Returns:
+        dict: Statistics of the time per call in seconds.
+    """
+    for _ in range(warmup):
+        function()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {"median_time": float(np.median(times)), "min_time": float(np.min(times)),
+            "mean_time": float(np.mean(times)), "std_time": float(np.std(times)), "repeats": repeats}
+
+
+def _run_case_in_process(case_id: str, backend: str, repeats: int, warmup: int, queue):
+    if backend is not None:
+        os.environ["KERAS_BACKEND"] = backend
+    try:
+        case = [x for x in get_cases() if x.id == case_id][0]
+        base_memory = peak_memory_mb()
+        if case.timed:
+            metrics = time_function(case.function(**case.params), repeats=repeats, warmup=warmup)
+        else:
+            metrics = dict(case.function(**case.params))
+        metrics["peak_memory_mb"] = peak_memory_mb()
+        metrics["memory_increase_mb"] = metrics["peak_memory_mb"] - base_memory
+        queue.put({"metrics": metrics, "error": None})
+    except Exception as error:
+        queue.put({"metrics": {}, "error": "%s: %s" % (type(error).__name__, error)})
+
+
+def run_case(case: BenchmarkCase, backend: str = None, repeats: int = 10, warmup: int = 1) -> dict:
+    r"""Run a benchmark case in a new process.
+
+    Args:
+        case (BenchmarkCase): Case to run.
+        backend (str): Keras backend. Default is None.
+        repeats (int): Number of timed calls for timed cases. Default is 10.
+        warmup (int): Number of calls before timing. Default is 1.
+
+    Returns:
+        dict: Result with ID, parameters, backend, metrics and error message if the case failed.
+    """
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_run_case_in_process, args=(case.id, backend, repeats, warmup, queue))
+    process.start()
+    # Read the result before joining, since the process does not end before its queue has been read.
+    result = None
+    while result is None and process.is_alive():
+        try:
+            result = queue.get(timeout=1.0)
+        except queue_module.Empty:
+            continue
+    if result is None:
+        try:
+            result = queue.get(timeout=1.0)
+        except queue_module.Empty:
+            result = {"metrics": {}, "error": None}
+    process.join()
+    if process.exitcode != 0 and result["error"] is None:
+        result["error"] = "Process failed with exit code %s." % process.exitcode
+    return {"id": case.id, "group": case.group, "name": case.name, "params": case.params,
+            "backend": backend if backend is not None else "any", **result}
+
+
+def run_benchmarks(cases: list, backends: list = None, repeats: int = 10, warmup: int = 1,
+                   verbose: int = 1) -> dict:
+    r"""Run benchmark cases for each of their supported backends.
+
+    Args:
+        cases (list): List of :obj:`BenchmarkCase` .
+        backends (list): Backends to run. Default is None, which runs all backends supported by a case.
+        repeats (int): Number of timed calls for timed cases. Default is 10.
+        warmup (int): Number of calls before timing. Default is 1.
+        verbose (int): Print each result. Default is 1.
+
+    Returns:
+        dict: Metadata and list of results.
+    """
+    results = []
+    for case in cases:
+        case_backends = [None] if case.backends is None else [
+            x for x in case.backends if backends is None or x in backends]
+        for backend in case_backends:
+            result = run_case(case, backend=backend, repeats=repeats, warmup=warmup)
+            results.append(result)
+            if verbose > 0:
+                print(format_result(result))
+    return {"metadata": get_metadata(), "results": results}
+
+
+def format_result(result: dict) -> str:
+    """Make a line of text for the result of a case."""
+    if result["error"] is not None:
+        return "%s @%s: failed with %s" % (result["id"], result["backend"], result["error"])
+    metrics = ", ".join(["%s %.4g" % (key, value) for key, value in result["metrics"].items()
+                         if isinstance(value, (int, float)) and key != "repeats"])
+    return "%s @%s: %s" % (result["id"], result["backend"], metrics)
+
+
+def get_metadata() -> dict:
+    """Information on commit, versions and machine to compare results."""
+    repository = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=repository, capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    from kgcnn import __kgcnn_version__
+    return {"commit": commit, "date_time": datetime.today().strftime('%Y-%m-%d %H:%M:%S'),
+            "kgcnn_version": __kgcnn_version__, "python_version": platform.python_version(),
+            "numpy_version": np.__version__, "platform": platform.platform(), "processor": platform.processor(),
+            "cpu_count": os.cpu_count()}
+
+
+def save_results(results: dict, file_path: str):
+    """Save results of :obj:`run_benchmarks` as JSON file."""
+    with open(file_path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(file_path: str) -> dict:
+    """Load results of :obj:`run_benchmarks` from JSON file."""
+    with open(file_path, "r") as f:
+        return json.load(f)
+
+
+def is_higher_better(metric: str) -> Union[bool, None]:
+    """Whether higher values of a metric are better. None for metrics that are not a measure of performance."""
+    if metric.startswith("std_"):
+        return None
+    if metric.endswith("_per_second") or metric.endswith("accuracy"):
+        return True
+    if metric.endswith("_time") or metric.endswith("_mb") or metric.endswith("deviation"):
+        return False
+    return None
+
+
+def diff_results(base: dict, new: dict, threshold: float = 0.1) -> list:
+    r"""Compare metrics of two results for cases with the same ID and backend.
+
+    Args:
+        base (dict): Results of the reference, e.g. of an earlier commit.
+        new (dict): Results to compare.
+        threshold (float): Relative change of a metric, which is reported as regression or improvement.
+            Default is 0.1.
+
+    Returns:
+        list: Dictionaries with ID, backend, metric, both values, relative change and 'regression', 'improvement',
+            'unchanged' or None as status for metrics without a direction.
+    """
+    base_results = {(x["id"], x["backend"]): x for x in base["results"] if x["error"] is None}
+    out = []
+    for result in new["results"]:
+        key = (result["id"], result["backend"])
+        if result["error"] is not None or key not in base_results:
+            continue
+        for metric, value in result["metrics"].items():
+            base_value = base_results[key]["metrics"].get(metric)
+            if not isinstance(value, (int, float)) or not isinstance(base_value, (int, float)) or metric == "repeats":
+                continue
+            change = (value - base_value) / abs(base_value) if base_value != 0 else 0.0
+            higher_better = is_higher_better(metric)
+            if higher_better is None:
+                status = None
+            elif abs(change) <= threshold:
+                status = "unchanged"
+            else:
+                status = "improvement" if (change > 0) == higher_better else "regression"
+            out.append({"id": result["id"], "backend": result["backend"], "metric": metric, "base": base_value,
+                        "new": value, "change": change, "status": status})
+    return out
@@ -0,0 +1,83 @@
+import os
+import argparse
+import time
+import multiprocessing
+import numpy as np
+
+# Benchmark of the LSTM aggregation of GraphSAGE with padding to the maximum degree against degree buckets.
+# Degrees are drawn to resemble either a Cora-like citation graph with a few hub nodes or a batch of PROTEINS-like
+# graphs with a narrow degree distribution. Every backend is run in a separate process.
+parser = argparse.ArgumentParser(description='Benchmark padded against degree-bucketed LSTM aggregation.')
+parser.add_argument("--backends", required=False, help="Keras backends to benchmark.", nargs="+",
+                    default=["tensorflow", "torch"])
+parser.add_argument("--degrees", required=False, help="Degree distribution.", default="Cora",
+                    choices=["Cora", "PROTEINS"])
+parser.add_argument("--degree_buckets", required=False, help="Upper bounds of degree buckets.", nargs="+",
+                    default=[2, 4, 8, 16, 32], type=int)
+parser.add_argument("--units", required=False, help="Units of LSTM and edge features.", default=64, type=int)
+parser.add_argument("--steps", required=False, help="Number of timed calls.", default=5, type=int)
+
+
+def make_degrees(name: str, seed: int = 42):
+    """Draw in-degrees of nodes similar to Cora or a batch of 32 PROTEINS graphs."""
+    rng = np.random.default_rng(seed)
+    if name == "Cora":
+        degrees = np.minimum(np.floor(rng.pareto(1.8, size=2708) * 2.0) + 1, 168).astype("int64")
+        degrees[rng.integers(0, 2708, size=5)] = 168
+    else:
+        degrees = np.clip(rng.poisson(2.7, size=32 * 39) + 1, 1, 25).astype("int64")
+    return degrees
+
+
+def run_backend(backend: str, degrees: np.ndarray, degree_buckets: list, units: int, steps: int, queue):
+    os.environ["KERAS_BACKEND"] = backend
+    from keras import ops
+    from kgcnn.layers.aggr import AggregateLocalEdgesLSTM
+    rng = np.random.default_rng(42)
+    num_nodes, max_degree = len(degrees), int(np.max(degrees))
+    receive = np.repeat(np.arange(num_nodes), degrees)
+    edge_index = ops.convert_to_tensor(np.stack([receive, rng.integers(0, num_nodes, size=len(receive))]),
+                                       dtype="int64")
+    nodes = ops.convert_to_tensor(rng.normal(size=(num_nodes, units)), dtype="float32")
+    edges = ops.convert_to_tensor(rng.normal(size=(len(receive), units)), dtype="float32")
+    results = {}
+    for name, buckets in [("padded", None), ("bucketed", degree_buckets)]:
+        layer = AggregateLocalEdgesLSTM(units=units, max_edges_per_node=max_degree, degree_buckets=buckets)
+        ops.convert_to_numpy(layer([nodes, edges, edge_index]))  # Warm-up.
+        start = time.perf_counter()
+        for _ in range(steps):
+            out = layer([nodes, edges, edge_index])
+        ops.convert_to_numpy(out)
+        results[name] = (time.perf_counter() - start) / steps
+    queue.put(results)
+
+
+def count_recurrent_steps(degrees: np.ndarray, degree_buckets: list):
+    """Number of LSTM cell evaluations including padding for padded and bucketed aggregation."""
+    max_degree = int(np.max(degrees))
+    bucketed, lower = 0, 0
+    for upper in [x for x in degree_buckets if x < max_degree] + [max_degree]:
+        bucketed += int(np.sum(np.logical_and(degrees > lower, degrees <= upper))) * upper
+        lower = upper
+    return len(degrees) * max_degree, bucketed
+
+
+if __name__ == "__main__":
+    args = vars(parser.parse_args())
+    print("Input of argparse:", args)
+    degrees = make_degrees(args["degrees"])
+    padded_steps, bucketed_steps = count_recurrent_steps(degrees, args["degree_buckets"])
+    print("Nodes %s, edges %s, max degree %s" % (len(degrees), int(np.sum(degrees)), int(np.max(degrees))))
+    print("Recurrent steps: padded %s, bucketed %s" % (padded_steps, bucketed_steps))
+    context = multiprocessing.get_context("spawn")
+    for backend in args["backends"]:
+        queue = context.Queue()
+        process = context.Process(target=run_backend, args=(
+            backend, degrees, args["degree_buckets"], args["units"], args["steps"], queue))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            print("%s: failed with exit code %s" % (backend, process.exitcode))
+            continue
+        results = queue.get()
+        print("%s: padded %.4f s, bucketed %.4f s" % (backend, results["padded"], results["bucketed"]))
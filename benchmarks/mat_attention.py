@@ -0,0 +1,80 @@
+import argparse
+import resource
+import time
+import multiprocessing
+import numpy as np
+
+# Benchmark of MAT with full and blocked attention heads on padded batches the size of QM9 (up to 29 atoms) or
+# ESOL (up to 55 atoms with hydrogen) molecules. Molecules are random, since only their size matters for timing.
+# Every configuration is run in a separate process to measure its peak memory (resident set size) independently.
+parser = argparse.ArgumentParser(description='Benchmark blocked attention of MAT against full attention.')
+parser.add_argument("--dataset", required=False, help="Size of padded molecules.", default="QM9",
+                    choices=["QM9", "ESOL"])
+parser.add_argument("--batch_size", required=False, help="Number of molecules per batch.", default=64, type=int)
+parser.add_argument("--block_size", required=False, help="Number of query nodes per block.", default=8, type=int)
+parser.add_argument("--depth", required=False, help="Number of attention layers.", default=2, type=int)
+parser.add_argument("--heads", required=False, help="Number of attention heads.", default=4, type=int)
+parser.add_argument("--units", required=False, help="Units of attention heads.", default=32, type=int)
+parser.add_argument("--steps", required=False, help="Number of timed training steps.", default=10, type=int)
+
+max_atoms = {"QM9": 29, "ESOL": 55}
+
+
+def make_inputs(num_graphs: int, num_nodes: int, seed: int = 42):
+    """Make padded random molecules with node mask and adjacency from a distance cutoff."""
+    rng = np.random.default_rng(seed)
+    num_atoms = rng.integers(num_nodes // 2, num_nodes + 1, size=num_graphs)
+    node_mask = np.arange(num_nodes)[None, :] < num_atoms[:, None]
+    node_number = rng.integers(1, 10, size=(num_graphs, num_nodes)) * node_mask
+    coordinates = rng.uniform(0.0, 6.0, size=(num_graphs, num_nodes, 3)).astype("float32") * node_mask[..., None]
+    adjacency_mask = node_mask[:, :, None] & node_mask[:, None, :]
+    distance = np.linalg.norm(coordinates[:, :, None, :] - coordinates[:, None, :, :], axis=-1)
+    adjacency = ((distance < 1.6) & adjacency_mask).astype("float32")[..., None]
+    return [node_number, coordinates, adjacency, node_mask, adjacency_mask]
+
+
+def run_config(block_size, recompute: bool, batch_size: int, num_nodes: int, depth: int, heads: int, units: int,
+               steps: int, queue):
+    from kgcnn.literature.MAT import make_model
+    model = make_model(
+        inputs=[{"shape": (num_nodes,), "name": "node_number", "dtype": "int64"},
+                {"shape": (num_nodes, 3), "name": "node_coordinates", "dtype": "float32"},
+                {"shape": (num_nodes, num_nodes, 1), "name": "adjacency_matrix", "dtype": "float32"},
+                {"shape": (num_nodes,), "name": "node_mask", "dtype": "bool"},
+                {"shape": (num_nodes, num_nodes), "name": "adjacency_mask", "dtype": "bool"}],
+        input_edge_embedding=None, depth=depth, heads=heads,
+        attention_kwargs={"units": units, "lambda_attention": 0.3, "lambda_distance": 0.3, "lambda_adjacency": None,
+                          "dropout": None, "add_identity": False, "block_size": block_size,
+                          "recompute_grad": recompute})
+    model.compile(loss="mean_absolute_error", optimizer="adam")
+    x = make_inputs(batch_size, num_nodes)
+    y = np.zeros((batch_size, 1))
+    model.train_on_batch(x, y)  # Warm-up and compile.
+    start = time.perf_counter()
+    for _ in range(steps):
+        model.train_on_batch(x, y)
+    step_time = (time.perf_counter() - start) / steps
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    queue.put({"step_time": step_time, "peak_memory_mb": peak_memory})
+
+
+if __name__ == "__main__":
+    args = vars(parser.parse_args())
+    print("Input of argparse:", args)
+    configs = {"full": (None, False), "blocked": (args["block_size"], False),
+               "blocked_recompute": (args["block_size"], True)}
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for name, (block_size, recompute) in configs.items():
+        queue = context.Queue()
+        process = context.Process(target=run_config, args=(
+            block_size, recompute, args["batch_size"], max_atoms[args["dataset"]], args["depth"], args["heads"],
+            args["units"], args["steps"], queue))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            print("%s: failed with exit code %s" % (name, process.exitcode))
+            continue
+        results[name] = queue.get()
+        print("%s: step time %.4f s, peak memory %.1f MB" % (
+            name, results[name]["step_time"], results[name]["peak_memory_mb"]))
@@ -0,0 +1,93 @@
+import argparse
+import resource
+import time
+import multiprocessing
+import numpy as np
+
+# Benchmark of GCN, GIN and Schnet with and without fused message passing, i.e. gather, multiplication with edge
+# weights and aggregation in one operation. GCN is run on a single graph with the size of Cora, GIN and Schnet on
+# batches of graphs with the size of QM9 molecules. Graphs are random, since only their size matters for timing.
+# Every configuration is run in a separate process to measure its peak memory (resident set size) independently.
+parser = argparse.ArgumentParser(description='Benchmark fused message passing against gather and aggregate.')
+parser.add_argument("--model", required=False, help="Model to benchmark.", default="GCN",
+                    choices=["GCN", "GIN", "Schnet"])
+parser.add_argument("--batch_size", required=False, help="Number of QM9-like graphs per batch.", default=32, type=int)
+parser.add_argument("--steps", required=False, help="Number of timed training steps.", default=10, type=int)
+
+
+def make_cora_inputs(num_nodes: int = 2708, num_edges: int = 10556, num_features: int = 1433, seed: int = 42):
+    """Make a random graph with node features and normalized edge weights the size of Cora with self-loops."""
+    rng = np.random.default_rng(seed)
+    edges = np.concatenate([rng.integers(0, num_nodes, size=(num_edges, 2)),
+                            np.repeat(np.arange(num_nodes)[:, None], 2, axis=-1)], axis=0)
+    edges = edges[np.argsort(edges[:, 0], kind="stable")]
+    node_attributes = (rng.uniform(size=(1, num_nodes, num_features)) < 0.01).astype("float32")
+    edge_weights = rng.uniform(0.0, 0.5, size=(1, len(edges), 1)).astype("float32")
+    return [node_attributes, edge_weights, edges[None, ...], np.array([num_nodes]), np.array([len(edges)])]
+
+
+def make_qm9_inputs(num_graphs: int, num_nodes: int = 18, seed: int = 42):
+    """Make padded random, fully connected graphs the size of QM9 molecules."""
+    rng = np.random.default_rng(seed)
+    node_number = rng.integers(1, 10, size=(num_graphs, num_nodes))
+    coordinates = rng.uniform(0.0, 3.0, size=(num_graphs, num_nodes, 3)).astype("float32")
+    receive, send = np.nonzero(1 - np.eye(num_nodes))
+    edges = np.broadcast_to(np.stack([receive, send], axis=-1), (num_graphs, len(receive), 2))
+    return [node_number, coordinates, np.array(edges), np.full(num_graphs, num_nodes),
+            np.full(num_graphs, len(receive))]
+
+
+def run_config(model_name: str, fused: bool, batch_size: int, steps: int, queue):
+    import importlib
+    make_model = getattr(importlib.import_module("kgcnn.literature.%s" % model_name), "make_model")
+    if model_name == "GCN":
+        x = make_cora_inputs()
+        model = make_model(
+            inputs=[{"shape": (None, x[0].shape[-1]), "name": "node_attributes", "dtype": "float32"},
+                    {"shape": (None, 1), "name": "edge_weights", "dtype": "float32"},
+                    {"shape": (None, 2), "name": "edge_indices", "dtype": "int64"},
+                    {"shape": (), "name": "total_nodes", "dtype": "int64"},
+                    {"shape": (), "name": "total_edges", "dtype": "int64"}],
+            gcn_args={"units": 140, "use_bias": True, "activation": "relu", "fused_message_passing": fused},
+            cast_disjoint_kwargs={"static_batched_node_output_shape": (x[0].shape[1], 7)},
+            output_embedding="node", output_mlp={"use_bias": [True, False], "units": [70, 7],
+                                                 "activation": ["relu", "softmax"]})
+        y = np.zeros((x[0].shape[1], 7))
+    elif model_name == "GIN":
+        x = make_qm9_inputs(batch_size)
+        x = [x[0]] + x[2:]
+        model = make_model(gin_args={"fused_message_passing": fused}, output_mlp={"units": 1, "activation": "linear"})
+        y = np.zeros((batch_size, 1))
+    else:
+        x = make_qm9_inputs(batch_size)
+        model = make_model(interaction_args={
+            "units": 128, "use_bias": True, "cfconv_pool": "scatter_sum", "fused_message_passing": fused,
+            "activation": {"class_name": "function", "config": "kgcnn>shifted_softplus"}})
+        y = np.zeros((batch_size, 1))
+    model.compile(loss="mean_absolute_error", optimizer="adam")
+    model.train_on_batch(x, y)  # Warm-up and compile.
+    start = time.perf_counter()
+    for _ in range(steps):
+        model.train_on_batch(x, y)
+    step_time = (time.perf_counter() - start) / steps
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    queue.put({"step_time": step_time, "peak_memory_mb": peak_memory})
+
+
+if __name__ == "__main__":
+    args = vars(parser.parse_args())
+    print("Input of argparse:", args)
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for name, fused in [("gather_aggregate", False), ("fused", True)]:
+        queue = context.Queue()
+        process = context.Process(target=run_config, args=(
+            args["model"], fused, args["batch_size"], args["steps"], queue))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            print("%s: failed with exit code %s" % (name, process.exitcode))
+            continue
+        results[name] = queue.get()
+        print("%s: step time %.4f s, peak memory %.1f MB" % (
+            name, results[name]["step_time"], results[name]["peak_memory_mb"]))
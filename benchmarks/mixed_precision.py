@@ -0,0 +1,91 @@
+import argparse
+import time
+import multiprocessing
+import numpy as np
+
+# Benchmark of Schnet, GIN and DMPNN trained with `float32` against a `mixed_bfloat16` policy. Graphs are random,
+# fully connected and of the size of QM9 molecules. Reported are training throughput in graphs per second and the
+# relative deviation of the predictions of the mixed precision model with the same weights from `float32` .
+# Every configuration is run in a separate process.
+parser = argparse.ArgumentParser(description='Benchmark float32 against mixed precision training.')
+parser.add_argument("--model", required=False, help="Model to benchmark.", default="Schnet",
+                    choices=["Schnet", "GIN", "DMPNN"])
+parser.add_argument("--policy", required=False, help="Mixed precision policy.", default="mixed_bfloat16",
+                    choices=["mixed_bfloat16", "mixed_float16"])
+parser.add_argument("--batch_size", required=False, help="Number of QM9-like graphs per batch.", default=32, type=int)
+parser.add_argument("--steps", required=False, help="Number of timed training steps.", default=10, type=int)
+
+
+def make_qm9_inputs(num_graphs: int, num_nodes: int = 18, seed: int = 42):
+    """Make padded random, fully connected graphs the size of QM9 molecules."""
+    rng = np.random.default_rng(seed)
+    node_number = rng.integers(1, 10, size=(num_graphs, num_nodes))
+    coordinates = rng.uniform(0.0, 3.0, size=(num_graphs, num_nodes, 3)).astype("float32")
+    receive, send = np.nonzero(1 - np.eye(num_nodes))
+    edges = np.array(np.broadcast_to(np.stack([receive, send], axis=-1), (num_graphs, len(receive), 2)))
+    return [node_number, coordinates, edges, np.full(num_graphs, num_nodes), np.full(num_graphs, len(receive))]
+
+
+def build_model(model_name: str):
+    import importlib
+    import keras as ks
+    ks.utils.set_random_seed(42)
+    make_model = getattr(importlib.import_module("kgcnn.literature.%s" % model_name), "make_model")
+    if model_name == "Schnet":
+        return make_model()
+    if model_name == "GIN":
+        return make_model(output_mlp={"units": 1, "activation": "linear"})
+    return make_model(inputs=[{"shape": (None,), "name": "node_number", "dtype": "int64"},
+                              {"shape": (None,), "name": "edge_number", "dtype": "int64"},
+                              {"shape": (None, 2), "name": "edge_indices", "dtype": "int64"},
+                              {"shape": (), "name": "total_nodes", "dtype": "int64"},
+                              {"shape": (), "name": "total_edges", "dtype": "int64"}],
+                      make_reverse_edges=True, input_edge_embedding={"input_dim": 5, "output_dim": 64},
+                      output_mlp={"use_bias": True, "units": 1, "activation": "linear"})
+
+
+def model_inputs(model_name: str, batch_size: int):
+    x = make_qm9_inputs(batch_size)
+    if model_name == "GIN":
+        return [x[0]] + x[2:]
+    if model_name == "DMPNN":
+        return [x[0], np.ones(x[2].shape[:2], dtype="int64")] + x[2:]
+    return x
+
+
+def run_config(model_name: str, policy: str, batch_size: int, steps: int, queue):
+    import keras as ks
+    x = model_inputs(model_name, batch_size)
+    y = np.zeros((batch_size, 1))
+    reference = build_model(model_name)
+    expected = ks.ops.convert_to_numpy(reference(x))
+    ks.mixed_precision.set_global_policy(policy)
+    model = build_model(model_name)
+    model.set_weights(reference.get_weights())
+    predicted = ks.ops.convert_to_numpy(ks.ops.cast(model(x), "float32"))
+    deviation = float(np.linalg.norm(predicted - expected) / np.linalg.norm(expected))
+    model.compile(loss="mean_absolute_error", optimizer="adam")
+    model.train_on_batch(x, y)  # Warm-up and compile.
+    start = time.perf_counter()
+    for _ in range(steps):
+        model.train_on_batch(x, y)
+    step_time = (time.perf_counter() - start) / steps
+    queue.put({"graphs_per_second": batch_size / step_time, "deviation": deviation})
+
+
+if __name__ == "__main__":
+    args = vars(parser.parse_args())
+    print("Input of argparse:", args)
+    context = multiprocessing.get_context("spawn")
+    for policy in ["float32", args["policy"]]:
+        queue = context.Queue()
+        process = context.Process(target=run_config, args=(
+            args["model"], policy, args["batch_size"], args["steps"], queue))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            print("%s: failed with exit code %s" % (policy, process.exitcode))
+            continue
+        results = queue.get()
+        print("%s: %.1f graphs/s, relative deviation from float32 %.2e" % (
+            policy, results["graphs_per_second"], results["deviation"]))
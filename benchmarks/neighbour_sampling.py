@@ -0,0 +1,89 @@
+import argparse
+import resource
+import time
+import multiprocessing
+import numpy as np
+
+# Benchmark of node classification with mini-batches of sampled k-hop subgraphs against full-batch training on the
+# complete graph. Models are taken from the Cora hyperparameter, the graph is random with the given size and degree.
+# Reported are the time per training epoch over all training nodes and the peak memory (resident set size).
+# Every configuration is run in a separate process to measure its peak memory independently.
+parser = argparse.ArgumentParser(description='Benchmark neighbour sampling against full-batch node classification.')
+parser.add_argument("--model", required=False, help="Model to benchmark.", default="GCN",
+                    choices=["GCN", "GraphSAGE", "GAT"])
+parser.add_argument("--hyper", required=False, help="Hyperparameter of the model.",
+                    default="training/hyper/hyper_cora_lu.py")
+parser.add_argument("--num_nodes", required=False, help="Number of nodes of the graph.", default=50000, type=int)
+parser.add_argument("--degree", required=False, help="Average number of neighbours.", default=10, type=int)
+parser.add_argument("--num_features", required=False, help="Number of node features.", default=256, type=int)
+parser.add_argument("--fan_outs", required=False, help="Number of sampled neighbours per hop.", default=[10, 5, 5],
+                    nargs="+", type=int)
+parser.add_argument("--batch_size", required=False, help="Number of seed nodes per batch.", default=512, type=int)
+parser.add_argument("--train_fraction", required=False, help="Fraction of training nodes.", default=0.1, type=float)
+parser.add_argument("--epochs", required=False, help="Number of timed epochs.", default=2, type=int)
+
+
+def make_graph(num_nodes: int, degree: int, num_features: int, num_classes: int, seed: int = 42):
+    """Make a random undirected graph with self-loops and symmetric normalized edge weights."""
+    from kgcnn.graph.methods import rescale_edge_weights_degree_sym
+    rng = np.random.default_rng(seed)
+    edges = rng.integers(0, num_nodes, size=(num_nodes * degree // 2, 2))
+    edges = np.concatenate([edges, edges[:, ::-1], np.repeat(np.arange(num_nodes)[:, None], 2, axis=1)])
+    edges = np.unique(edges, axis=0)
+    return {"node_attributes": rng.normal(size=(num_nodes, num_features)).astype("float32"),
+            "edge_indices": edges,
+            "edge_weights": rescale_edge_weights_degree_sym(edges, np.ones((len(edges), 1), dtype="float32")),
+            "node_labels": np.eye(num_classes, dtype="float32")[rng.integers(0, num_classes, size=num_nodes)],
+            "total_nodes": np.array(num_nodes), "total_edges": np.array(len(edges))}
+
+
+def run_config(args: dict, sampling: bool, queue):
+    from kgcnn.training.hyper import HyperParameter
+    from kgcnn.models.serial import deserialize as deserialize_model
+    from kgcnn.io.loader import tf_dataset_neighbour_sampler_generator
+    hyper = HyperParameter(args["hyper"], hyper_category=args["model"])
+    inputs = hyper["model"]["config"]["inputs"]
+    inputs[0]["shape"] = [None, args["num_features"]]
+    num_classes = hyper["model"]["config"]["output_mlp"]["units"][-1]
+    hyper = hyper.copy({"model.config.inputs": inputs,
+                        "model.config.cast_disjoint_kwargs.static_batched_node_output_shape": None})
+    graph = make_graph(args["num_nodes"], args["degree"], args["num_features"], num_classes)
+    num_train = int(args["num_nodes"] * args["train_fraction"])
+    train_index = np.random.default_rng(1).permutation(args["num_nodes"])[:num_train]
+
+    model = deserialize_model(hyper["model"])
+    model.compile(loss="categorical_crossentropy", optimizer="adam", weighted_metrics=[])
+    if sampling:
+        x = tf_dataset_neighbour_sampler_generator(
+            graph, inputs, seed_nodes=train_index, fan_outs=args["fan_outs"], labels=graph["node_labels"],
+            batch_size=args["batch_size"])
+        fit_kwargs = {}
+    else:
+        train_mask = np.zeros((1, args["num_nodes"]), dtype="float32")
+        train_mask[0, train_index] = 1
+        x = [np.expand_dims(graph[i["name"]], axis=0) for i in inputs]
+        fit_kwargs = {"y": np.expand_dims(graph["node_labels"], axis=0), "sample_weight": train_mask,
+                      "batch_size": 1}
+    model.fit(x, epochs=1, verbose=0, **fit_kwargs)  # Warm-up and compile.
+    start = time.perf_counter()
+    model.fit(x, epochs=args["epochs"], verbose=0, **fit_kwargs)
+    epoch_time = (time.perf_counter() - start) / args["epochs"]
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    queue.put({"epoch_time": epoch_time, "peak_memory_mb": peak_memory})
+
+
+if __name__ == "__main__":
+    args = vars(parser.parse_args())
+    print("Input of argparse:", args)
+    context = multiprocessing.get_context("spawn")
+    for name, sampling in [("full_batch", False), ("neighbour_sampling", True)]:
+        queue = context.Queue()
+        process = context.Process(target=run_config, args=(args, sampling, queue))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            print("%s: failed with exit code %s" % (name, process.exitcode))
+            continue
+        results = queue.get()
+        print("%s: epoch time %.3f s, peak memory %.1f MB" % (
+            name, results["epoch_time"], results["peak_memory_mb"]))
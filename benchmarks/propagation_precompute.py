@@ -0,0 +1,108 @@
+import argparse
+import time
+import multiprocessing
+import numpy as np
+
+# Benchmark of SGC with node attributes propagated once before training against GCN, which propagates in every
+# training step. Reported are the preprocessing time, the time per training epoch and the test accuracy of a random
+# split. Models are taken from the Cora hyperparameter. If the dataset can not be downloaded, a random graph with the
+# size of Cora is used, with homophilous edges and bag-of-words attributes that depend on the class.
+# Every configuration is run in a separate process.
+parser = argparse.ArgumentParser(description='Benchmark precomputed propagation of SGC against GCN.')
+parser.add_argument("--hyper", required=False, help="Hyperparameter of the models.",
+                    default="training/hyper/hyper_cora_lu.py")
+parser.add_argument("--dataset", required=False, help="Dataset to benchmark.", default="CoraLu",
+                    choices=["CoraLu", "Cora", "synthetic"])
+parser.add_argument("--num_edges", required=False, help="Number of edges of the synthetic graph.", default=5278,
+                    type=int)
+parser.add_argument("--hops", required=False, help="Propagation steps for SGC.", default=[2], nargs="+", type=int)
+parser.add_argument("--alpha", required=False, help="Teleport probability of APPNP.", default=None, type=float)
+parser.add_argument("--epochs", required=False, help="Number of training epochs.", default=200, type=int)
+parser.add_argument("--test_fraction", required=False, help="Fraction of test nodes.", default=0.2, type=float)
+
+
+def make_synthetic_dataset(num_nodes: int = 2708, num_classes: int = 7, num_words: int = 1433,
+                           num_edges: int = 5278, homophily: float = 0.8, seed: int = 42):
+    """Make a random graph where most edges connect nodes of the same class and words are partly class specific."""
+    from kgcnn.data.base import MemoryGraphList
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, num_classes, size=num_nodes)
+    class_words = rng.permutation(num_words)[:num_classes * 20].reshape((num_classes, 20))
+    node_attributes = np.zeros((num_nodes, num_words), dtype="float32")
+    for i in range(num_nodes):
+        words = np.concatenate([rng.choice(class_words[labels[i]], size=3), rng.integers(0, num_words, size=15)])
+        node_attributes[i, words] = 1.0
+    edges = []
+    members = [np.nonzero(labels == c)[0] for c in range(num_classes)]
+    for i in rng.integers(0, num_nodes, size=num_edges):
+        j = rng.choice(members[labels[i]]) if rng.random() < homophily else rng.integers(0, num_nodes)
+        edges.append([i, j])
+    return MemoryGraphList([{"node_attributes": node_attributes, "edge_indices": np.array(edges, dtype="int64"),
+                             "node_labels": np.eye(num_classes, dtype="float32")[labels]}])
+
+
+def load_dataset(name: str, num_edges: int):
+    if name == "synthetic":
+        return make_synthetic_dataset(num_edges=num_edges)
+    import importlib
+    return getattr(importlib.import_module("kgcnn.data.datasets.%sDataset" % name), "%sDataset" % name)()
+
+
+def run_config(args: dict, category: str, queue):
+    from kgcnn.training.hyper import HyperParameter
+    from kgcnn.models.serial import deserialize as deserialize_model
+    hyper = HyperParameter(args["hyper"], hyper_category=category)
+    dataset = load_dataset(args["dataset"], args["num_edges"])
+    start = time.perf_counter()
+    for method in ["make_undirected_edges", "add_edge_self_loops", "normalize_edge_weights_sym"]:
+        dataset.map_list(method=method)
+    if category == "SGC":
+        dataset.map_list(method="propagate_node_attributes", hops=args["hops"], alpha=args["alpha"],
+                         node_attributes_propagated="node_attributes")
+    dataset.map_list(method="count_nodes_and_edges")
+    preprocessing_time = time.perf_counter() - start
+
+    graph = dataset[0]
+    num_nodes, num_classes = graph["node_labels"].shape
+    inputs = hyper["model"]["config"]["inputs"]
+    inputs[0]["shape"] = [None, graph[inputs[0]["name"]].shape[-1]]
+    hyper = hyper.copy({"model.config.inputs": inputs,
+                        "model.config.cast_disjoint_kwargs.static_batched_node_output_shape": None,
+                        "model.config.output_mlp.units.%s" % (
+                                len(hyper["model"]["config"]["output_mlp"]["units"]) - 1): num_classes})
+    x = [np.expand_dims(graph[i["name"]], axis=0) for i in inputs]
+    y = np.expand_dims(graph["node_labels"], axis=0)
+    test_index = np.random.default_rng(1).permutation(num_nodes)[:int(num_nodes * args["test_fraction"])]
+    train_mask = np.ones((1, num_nodes), dtype="float32")
+    train_mask[0, test_index] = 0
+
+    model = deserialize_model(hyper["model"])
+    model.compile(**hyper.compile())
+    model.fit(x, y, sample_weight=train_mask, batch_size=1, epochs=1, verbose=0)  # Warm-up and compile.
+    start = time.perf_counter()
+    model.fit(x, y, sample_weight=train_mask, batch_size=1, epochs=args["epochs"] - 1, verbose=0)
+    epoch_time = (time.perf_counter() - start) / max(args["epochs"] - 1, 1)
+    predicted = np.argmax(model.predict(x, verbose=0)[0][test_index], axis=-1)
+    accuracy = float(np.mean(predicted == np.argmax(graph["node_labels"][test_index], axis=-1)))
+    queue.put({"preprocessing_time": preprocessing_time, "epoch_time": epoch_time, "accuracy": accuracy})
+
+
+if __name__ == "__main__":
+    args = vars(parser.parse_args())
+    print("Input of argparse:", args)
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for category in ["GCN", "SGC"]:
+        queue = context.Queue()
+        process = context.Process(target=run_config, args=(args, category, queue))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            print("%s: failed with exit code %s" % (category, process.exitcode))
+            continue
+        results[category] = queue.get()
+        print("%s: preprocessing %.3f s, epoch time %.4f s, test accuracy %.4f" % (
+            category, results[category]["preprocessing_time"], results[category]["epoch_time"],
+            results[category]["accuracy"]))
+    if len(results) == 2:
+        print("Speedup of SGC per epoch: %.2f" % (results["GCN"]["epoch_time"] / results["SGC"]["epoch_time"]))
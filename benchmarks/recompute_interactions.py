@@ -0,0 +1,94 @@
+import os
+import argparse
+import resource
+import time
+import multiprocessing
+import numpy as np
+
+# Benchmark of DimeNetPP, PAiNN and Megnet with and without recomputing the activations of interaction blocks in the
+# backward pass. Graphs are random point clouds with the density of a crystal and all neighbours within a cutoff as
+# edges, so that the number of edges per graph is large. DimeNetPP computes angle indices within the model.
+# Every configuration is run in a separate process to measure its peak memory (resident set size) independently.
+# The memory used by training is the increase of the peak memory over the memory after building the model. A fixed
+# threshold for `mmap` is set, so that the heap of `malloc` does not keep freed activations as resident memory.
+parser = argparse.ArgumentParser(description='Benchmark recomputation of interaction blocks.')
+parser.add_argument("--model", required=False, help="Model to benchmark.", default="PAiNN",
+                    choices=["DimeNetPP", "PAiNN", "Megnet"])
+parser.add_argument("--batch_size", required=False, help="Number of graphs per batch.", default=8, type=int)
+parser.add_argument("--num_nodes", required=False, help="Number of nodes per graph.", default=64, type=int)
+parser.add_argument("--cutoff", required=False, help="Distance cutoff for edges.", default=5.0, type=float)
+parser.add_argument("--depth", required=False, help="Number of interaction blocks.", default=3, type=int)
+parser.add_argument("--steps", required=False, help="Number of timed training steps.", default=5, type=int)
+
+
+def make_inputs(num_graphs: int, num_nodes: int, cutoff: float, seed: int = 42):
+    """Make padded random point clouds with a density of 0.08 nodes per cubic unit and edges within cutoff."""
+    rng = np.random.default_rng(seed)
+    box = np.cbrt(num_nodes / 0.08)
+    coordinates = rng.uniform(0.0, box, size=(num_graphs, num_nodes, 3)).astype("float32")
+    edges = []
+    for x in coordinates:
+        d = np.linalg.norm(x[:, None, :] - x[None, :, :], axis=-1)
+        edges.append(np.stack(np.nonzero(np.logical_and(d < cutoff, d > 0.0)), axis=-1))
+    total_edges = np.array([len(e) for e in edges])
+    edge_indices = np.zeros((num_graphs, np.max(total_edges), 2), dtype="int64")
+    for i, e in enumerate(edges):
+        edge_indices[i, :len(e)] = e
+    node_number = rng.integers(1, 20, size=(num_graphs, num_nodes))
+    return node_number, coordinates, edge_indices, np.full(num_graphs, num_nodes), total_edges
+
+
+def run_config(model_name: str, recompute: bool, batch_size: int, num_nodes: int, cutoff: float, depth: int,
+               steps: int, queue):
+    import importlib
+    make_model = getattr(importlib.import_module("kgcnn.literature.%s" % model_name), "make_model")
+    node_number, coordinates, edge_indices, total_nodes, total_edges = make_inputs(batch_size, num_nodes, cutoff)
+    if model_name == "DimeNetPP":
+        x = [node_number, coordinates, edge_indices, total_nodes, total_edges]
+        model = make_model(inputs=[{"shape": (None,), "name": "node_number", "dtype": "int64"},
+                                   {"shape": (None, 3), "name": "node_coordinates", "dtype": "float32"},
+                                   {"shape": (None, 2), "name": "edge_indices", "dtype": "int64"},
+                                   {"shape": (), "name": "total_nodes", "dtype": "int64"},
+                                   {"shape": (), "name": "total_edges", "dtype": "int64"}],
+                           make_angle_indices=True, recompute_interactions=recompute, cutoff=cutoff, num_blocks=depth,
+                           output_mlp={"use_bias": True, "units": 1, "activation": "linear"})
+    elif model_name == "PAiNN":
+        x = [node_number, coordinates, edge_indices, total_nodes, total_edges]
+        model = make_model(recompute_interactions=recompute, depth=depth,
+                           bessel_basis={"num_radial": 20, "cutoff": cutoff})
+    else:
+        x = [node_number, coordinates, edge_indices, np.zeros((batch_size, 1)), total_nodes, total_edges]
+        model = make_model(recompute_interactions=recompute, nblocks=depth,
+                           gauss_args={"bins": 25, "distance": cutoff})
+    y = np.zeros((batch_size, 1))
+    base_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    model.compile(loss="mean_absolute_error", optimizer="adam")
+    model.train_on_batch(x, y)  # Warm-up and compile.
+    start = time.perf_counter()
+    for _ in range(steps):
+        model.train_on_batch(x, y)
+    step_time = (time.perf_counter() - start) / steps
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    queue.put({"step_time": step_time, "peak_memory_mb": peak_memory, "training_memory_mb": peak_memory - base_memory,
+               "num_edges": int(np.sum(total_edges))})
+
+
+if __name__ == "__main__":
+    args = vars(parser.parse_args())
+    print("Input of argparse:", args)
+    os.environ.setdefault("MALLOC_MMAP_THRESHOLD_", "65536")
+    context = multiprocessing.get_context("spawn")
+    for name, recompute in [("store", False), ("recompute", True)]:
+        queue = context.Queue()
+        process = context.Process(target=run_config, args=(
+            args["model"], recompute, args["batch_size"], args["num_nodes"], args["cutoff"], args["depth"],
+            args["steps"], queue))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            print("%s: failed with exit code %s" % (name, process.exitcode))
+            continue
+        results = queue.get()
+        print("%s: edges %s, step time %.4f s, peak memory %.1f MB, of which training %.1f MB" % (
+            name, results["num_edges"], results["step_time"], results["peak_memory_mb"],
+            results["training_memory_mb"]))
@@ -0,0 +1,90 @@
+import argparse
+import time
+import multiprocessing
+import numpy as np
+
+# Benchmark of DMPNN, CMPNN and DGIN with reverse edge indices precomputed for each graph in python against computing
+# them within the model by `EdgeIndicesReverse` . Reported are the preprocessing time and the time per training epoch.
+# The synthetic dataset has the size and bond structure of ESOL, if the datasets can not be downloaded.
+# Every configuration is run in a separate process.
+parser = argparse.ArgumentParser(description='Benchmark precomputed against in-model reverse edge indices.')
+parser.add_argument("--model", required=False, help="Model to benchmark.", default="DMPNN",
+                    choices=["DMPNN", "CMPNN", "DGIN"])
+parser.add_argument("--dataset", required=False, help="Dataset to benchmark.", default="ESOL",
+                    choices=["ESOL", "Lipop", "synthetic"])
+parser.add_argument("--batch_size", required=False, help="Batch size.", default=32, type=int)
+parser.add_argument("--epochs", required=False, help="Number of timed epochs.", default=2, type=int)
+
+
+def make_synthetic_dataset(num_graphs: int = 1128, seed: int = 42):
+    """Make random molecule-like graphs with a spanning tree and a ring closure each and bonds in both directions."""
+    from kgcnn.data.base import MemoryGraphList
+    rng = np.random.default_rng(seed)
+    graphs = []
+    for _ in range(num_graphs):
+        num_nodes = int(rng.integers(5, 40))
+        bonds = [(i, int(rng.integers(0, i))) for i in range(1, num_nodes)] + [(num_nodes - 1, 0)]
+        bonds = np.array(sorted(set(bonds + [(j, i) for i, j in bonds])), dtype="int64")
+        graphs.append({"node_number": rng.integers(1, 10, size=num_nodes),
+                       "edge_number": rng.integers(1, 4, size=len(bonds)),
+                       "edge_indices": bonds, "graph_labels": rng.normal(size=(1,))})
+    return MemoryGraphList(graphs)
+
+
+def load_dataset(name: str):
+    if name == "synthetic":
+        return make_synthetic_dataset()
+    import importlib
+    dataset = getattr(importlib.import_module("kgcnn.data.datasets.%sDataset" % name), "%sDataset" % name)()
+    dataset.set_attributes()
+    return dataset
+
+
+def run_config(model_name: str, dataset_name: str, make_reverse_edges: bool, batch_size: int, epochs: int, queue):
+    import importlib
+    make_model = getattr(importlib.import_module("kgcnn.literature.%s" % model_name), "make_model")
+    dataset = load_dataset(dataset_name)
+    inputs = [{"shape": (None,), "name": "node_number", "dtype": "int64"},
+              {"shape": (None,), "name": "edge_number", "dtype": "int64"},
+              {"shape": (None, 2), "name": "edge_indices", "dtype": "int64"},
+              {"shape": (), "name": "total_nodes", "dtype": "int64"},
+              {"shape": (), "name": "total_edges", "dtype": "int64"}]
+    start = time.perf_counter()
+    dataset.map_list(method="count_nodes_and_edges", count_nodes="node_number")
+    if not make_reverse_edges:
+        dataset.map_list(method="set_edge_indices_reverse")
+        dataset.map_list(method="count_nodes_and_edges", total_edges="total_reverse", count_nodes="node_number",
+                         count_edges="edge_indices_reverse")
+        inputs = inputs[:3] + [{"shape": (None, 1), "name": "edge_indices_reverse", "dtype": "int64"}] + \
+            inputs[3:] + [{"shape": (), "name": "total_reverse", "dtype": "int64"}]
+    x = dataset.tensor(inputs)
+    preprocessing_time = time.perf_counter() - start
+    y = np.array([np.reshape(g["graph_labels"], (-1,))[:1] for g in dataset])
+
+    model = make_model(inputs=inputs, make_reverse_edges=make_reverse_edges,
+                       input_edge_embedding={"input_dim": 25, "output_dim": 64},
+                       output_mlp={"use_bias": True, "units": 1, "activation": "linear"})
+    model.compile(loss="mean_absolute_error", optimizer="adam")
+    model.fit(x, y, batch_size=batch_size, epochs=1, verbose=0)  # Warm-up and compile.
+    start = time.perf_counter()
+    model.fit(x, y, batch_size=batch_size, epochs=epochs, verbose=0)
+    epoch_time = (time.perf_counter() - start) / epochs
+    queue.put({"preprocessing_time": preprocessing_time, "epoch_time": epoch_time})
+
+
+if __name__ == "__main__":
+    args = vars(parser.parse_args())
+    print("Input of argparse:", args)
+    context = multiprocessing.get_context("spawn")
+    for name, make_reverse_edges in [("precomputed", False), ("in_model", True)]:
+        queue = context.Queue()
+        process = context.Process(target=run_config, args=(
+            args["model"], args["dataset"], make_reverse_edges, args["batch_size"], args["epochs"], queue))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            print("%s: failed with exit code %s" % (name, process.exitcode))
+            continue
+        results = queue.get()
+        print("%s: preprocessing %.3f s, epoch time %.3f s" % (
+            name, results["preprocessing_time"], results["epoch_time"]))
@@ -0,0 +1,55 @@
+import os
+import argparse
+import time
+import multiprocessing
+import numpy as np
+
+# Microbenchmark of scatter reductions with unsorted (default) and sorted indices, i.e. segment operations.
+# Every backend is run in a separate process, since the keras backend is fixed at import time.
+parser = argparse.ArgumentParser(description='Benchmark scatter against segment reductions for each backend.')
+parser.add_argument("--backends", required=False, help="Keras backends to benchmark.", nargs="+",
+                    default=["tensorflow", "jax", "torch"])
+parser.add_argument("--num_nodes", required=False, help="Number of nodes to aggregate into.", default=20000, type=int)
+parser.add_argument("--num_neighbours", required=False, help="Number of edges per node.", default=30, type=int)
+parser.add_argument("--units", required=False, help="Feature dimension of edges.", default=128, type=int)
+parser.add_argument("--steps", required=False, help="Number of timed calls.", default=20, type=int)
+
+
+def run_backend(backend: str, num_nodes: int, num_neighbours: int, units: int, steps: int, queue):
+    os.environ["KERAS_BACKEND"] = backend
+    from keras import ops
+    from kgcnn.ops.scatter import scatter_reduce_sum, scatter_reduce_mean, scatter_reduce_max
+    rng = np.random.default_rng(42)
+    indices = ops.convert_to_tensor(np.repeat(np.arange(num_nodes), num_neighbours), dtype="int64")
+    values = ops.convert_to_tensor(rng.normal(size=(num_nodes * num_neighbours, units)), dtype="float32")
+    shape = (num_nodes, units)
+    results = {}
+    for name, fn in [("sum", scatter_reduce_sum), ("mean", scatter_reduce_mean), ("max", scatter_reduce_max)]:
+        for sorted_indices in [False, True]:
+            ops.convert_to_numpy(fn(indices, values, shape, sorted_indices=sorted_indices))  # Warm-up.
+            start = time.perf_counter()
+            for _ in range(steps):
+                out = fn(indices, values, shape, sorted_indices=sorted_indices)
+            ops.convert_to_numpy(out)
+            results["%s_%s" % (name, "sorted" if sorted_indices else "scatter")] = (
+                time.perf_counter() - start) / steps
+    queue.put(results)
+
+
+if __name__ == "__main__":
+    args = vars(parser.parse_args())
+    print("Input of argparse:", args)
+    context = multiprocessing.get_context("spawn")
+    for backend in args["backends"]:
+        queue = context.Queue()
+        process = context.Process(target=run_backend, args=(
+            backend, args["num_nodes"], args["num_neighbours"], args["units"], args["steps"], queue))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            print("%s: failed with exit code %s" % (backend, process.exitcode))
+            continue
+        results = queue.get()
+        for method in ["sum", "mean", "max"]:
+            print("%s %s: scatter %.5f s, sorted %.5f s" % (
+                backend, method, results["%s_scatter" % method], results["%s_sorted" % method]))
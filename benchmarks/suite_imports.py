@@ -0,0 +1,62 @@
+import os
+import sys
+import json
+import subprocess
+import numpy as np
+from benchmarks.harness import register_benchmark
+
+# Time to import modules of kgcnn in a new interpreter, which is the startup time of command line tools and worker
+# processes. Heavy optional dependencies like tensorflow or pymatgen must only be imported by functions that use them.
+# A case fails, if the median time exceeds its budget in seconds or if the module imports one of the listed packages.
+# Modules of layers import keras and its backend, which takes most of the time, but must not import tensorflow for
+# another backend.
+heavy_packages = ["tensorflow", "torch", "jax", "keras", "pymatgen", "rdkit", "sklearn"]
+
+import_budgets = {
+    "kgcnn.data.utils": {"budget": 1.0, "not_imported": ["tensorflow", "torch", "jax", "keras"]},
+    "kgcnn.data.base": {"budget": 1.0, "not_imported": ["tensorflow", "torch", "jax", "keras", "sklearn"]},
+    "kgcnn.io.file": {"budget": 1.0, "not_imported": ["tensorflow", "torch", "jax", "keras"]},
+    "kgcnn.io.loader": {"budget": 1.0, "not_imported": ["tensorflow", "torch", "jax", "keras"]},
+    "kgcnn.graph.methods": {"budget": 1.0, "not_imported": ["tensorflow", "torch", "jax", "keras", "pymatgen"]},
+    "kgcnn.graph.preprocessor": {"budget": 1.0, "not_imported": ["tensorflow", "torch", "jax", "keras", "pymatgen"]},
+}
+
+_import_code = """import sys, time, json
+start = time.perf_counter()
+import %s
+print(json.dumps({"time": time.perf_counter() - start, "loaded": [x for x in %s if x in sys.modules]}))
+"""
+
+
+def _time_import(module: str, repeats: int) -> dict:
+    times, loaded = [], []
+    for _ in range(repeats):
+        process = subprocess.run([sys.executable, "-c", _import_code % (module, heavy_packages)],
+                                 capture_output=True, text=True, check=True, env=dict(os.environ))
+        out = json.loads(process.stdout.strip().split("\n")[-1])
+        times.append(out["time"])
+        loaded = out["loaded"]
+    return {"median_time": float(np.median(times)), "min_time": float(np.min(times)), "loaded_packages": loaded}
+
+
+def _check_budget(module: str, metrics: dict, budget: float, not_imported: list):
+    loaded = [x for x in metrics["loaded_packages"] if x in not_imported]
+    if loaded:
+        raise AssertionError("Import of '%s' loads %s." % (module, loaded))
+    if budget is not None and metrics["median_time"] > budget:
+        raise AssertionError("Import of '%s' takes %.2f s, which exceeds the budget of %.2f s." % (
+            module, metrics["median_time"], budget))
+    return metrics
+
+
+@register_benchmark("imports", params={"module": list(import_budgets.keys())}, backends=None, timed=False)
+def import_module(module: str, repeats: int = 5):
+    metrics = _time_import(module, repeats)
+    return _check_budget(module, metrics, **import_budgets[module])
+
+
+@register_benchmark("imports", params={"module": ["kgcnn.layers.gather", "kgcnn.layers.aggr"]}, timed=False)
+def import_keras_module(module: str, repeats: int = 5):
+    metrics = _time_import(module, repeats)
+    backend = os.environ["KERAS_BACKEND"]
+    return _check_budget(module, metrics, None, ["tensorflow"] if backend != "tensorflow" else [])
@@ -0,0 +1,59 @@
+import numpy as np
+from benchmarks.harness import register_benchmark
+from benchmarks.generators import make_graphs, to_disjoint
+
+# Forward pass of the core gather, aggregation and casting layers on disjoint batches of synthetic graphs. Layers are
+# called eagerly, so that the time is the time of the operations of the backend without compilation.
+graph_sizes = {
+    "molecule": {"num_graphs": 256},
+    "crystal": {"num_graphs": 64, "num_nodes": 32},
+    "power_law": {"num_graphs": 1, "num_nodes": 20000},
+}
+
+
+def _disjoint_tensors(graph: str, units: int):
+    from keras import ops
+    data = to_disjoint(make_graphs(graph, num_features=units, **graph_sizes[graph]))
+    return {key: ops.convert_to_tensor(value) for key, value in data.items()}
+
+
+@register_benchmark("layers", params={"graph": ["molecule", "crystal", "power_law"], "units": [64],
+                                      "pooling_method": ["scatter_sum", "scatter_mean"]})
+def aggregate_local_edges(graph: str, units: int, pooling_method: str):
+    from keras import ops
+    from kgcnn.layers.aggr import AggregateLocalEdges
+    x = _disjoint_tensors(graph, units)
+    layer = AggregateLocalEdges(pooling_method=pooling_method)
+
+    def run():
+        ops.convert_to_numpy(layer([x["nodes"], x["edges"], x["edge_indices"]]))
+    return run
+
+
+@register_benchmark("layers", params={"graph": ["molecule", "crystal", "power_law"], "units": [64]})
+def gather_nodes(graph: str, units: int):
+    from keras import ops
+    from kgcnn.layers.gather import GatherNodes
+    x = _disjoint_tensors(graph, units)
+    layer = GatherNodes()
+
+    def run():
+        ops.convert_to_numpy(layer([x["nodes"], x["edge_indices"]]))
+    return run
+
+
+@register_benchmark("layers", params={"graph": ["molecule", "crystal"], "units": [64],
+                                      "padded_disjoint": [False, True]})
+def cast_batched_indices_to_disjoint(graph: str, units: int, padded_disjoint: bool):
+    from keras import ops
+    from kgcnn.layers.casting import CastBatchedIndicesToDisjoint
+    graphs = make_graphs(graph, num_features=units, **graph_sizes[graph])
+    x = graphs.tensor([{"name": "node_attributes", "shape": (None, units), "dtype": "float32"},
+                       {"name": "edge_indices", "shape": (None, 2), "dtype": "int64"}])
+    x += [np.array([len(g["node_attributes"]) for g in graphs]), np.array([len(g["edge_indices"]) for g in graphs])]
+    x = [ops.convert_to_tensor(value) for value in x]
+    layer = CastBatchedIndicesToDisjoint(padded_disjoint=padded_disjoint)
+
+    def run():
+        ops.convert_to_numpy(layer(x)[1])
+    return run
@@ -0,0 +1,51 @@
+from benchmarks.harness import register_benchmark
+from benchmarks.generators import make_graphs
+
+# One epoch of the data loaders over synthetic graphs. Loaders use `tensorflow` or numpy independent of the backend.
+graph_sizes = {
+    "molecule": {"num_graphs": 2048},
+    "crystal": {"num_graphs": 512, "num_nodes": 32},
+}
+
+
+def _inputs(units: int):
+    return [{"shape": (None, units), "name": "node_attributes", "dtype": "float32"},
+            {"shape": (None, units), "name": "edge_attributes", "dtype": "float32"},
+            {"shape": (None, 2), "name": "edge_indices", "dtype": "int64"},
+            {"shape": (), "name": "total_nodes", "dtype": "int64"},
+            {"shape": (), "name": "total_edges", "dtype": "int64"}]
+
+
+@register_benchmark("loaders", params={"graph": ["molecule", "crystal"], "units": [32], "batch_size": [32]},
+                    backends=None)
+def tf_dataset_disjoint_generator(graph: str, units: int, batch_size: int):
+    from kgcnn.io.loader import tf_dataset_disjoint_generator
+    graphs = make_graphs(graph, num_features=units, **graph_sizes[graph])
+    inputs = [{"shape": (units,), "name": "node_attributes", "dtype": "float32"},
+              {"shape": (units,), "name": "edge_attributes", "dtype": "float32"},
+              {"shape": (None,), "name": "edge_indices", "dtype": "int64"},
+              {"shape": (), "name": "batch_id_node", "dtype": "int64"},
+              {"shape": (), "name": "batch_id_edge", "dtype": "int64"},
+              {"shape": (), "name": "node_id", "dtype": "int64"},
+              {"shape": (), "name": "edge_id", "dtype": "int64"},
+              {"shape": (), "name": "count_nodes", "dtype": "int64"},
+              {"shape": (), "name": "count_edges", "dtype": "int64"}]
+    loader = tf_dataset_disjoint_generator(
+        graphs, inputs=inputs, batch_size=batch_size, assignment_to_id=[0, 1, 1],
+        assignment_of_indices=[None, None, 0], pos_batch_id=[3, 4], pos_subgraph_id=[5, 6], pos_count=[7, 8])
+
+    def run():
+        for _ in loader:
+            pass
+    return run
+
+
+@register_benchmark("loaders", params={"graph": ["molecule", "crystal"], "units": [32]}, backends=None)
+def tensor_padded(graph: str, units: int):
+    graphs = make_graphs(graph, num_features=units, **graph_sizes[graph])
+    graphs.map_list(method="count_nodes_and_edges")
+    inputs = _inputs(units)
+
+    def run():
+        graphs.tensor(inputs)
+    return run
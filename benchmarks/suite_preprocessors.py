@@ -0,0 +1,46 @@
+from benchmarks.harness import register_benchmark
+from benchmarks.generators import make_graphs
+
+# Graph preprocessors applied with `map_list` to all graphs of a synthetic dataset. Preprocessors use numpy and do not
+# depend on the backend. Each call recomputes and overwrites the properties of the previous call.
+graph_sizes = {
+    "molecule": {"num_graphs": 512},
+    "crystal": {"num_graphs": 64, "num_nodes": 32},
+    "power_law": {"num_graphs": 1, "num_nodes": 20000},
+}
+
+
+def _map_method(graph: str, method: str, setup_methods: list = None, **kwargs):
+    graphs = make_graphs(graph, **graph_sizes[graph])
+    for x in setup_methods if setup_methods is not None else []:
+        graphs.map_list(**x)
+
+    def run():
+        graphs.map_list(method=method, **kwargs)
+    return run
+
+
+@register_benchmark("preprocessors", params={"graph": ["molecule", "crystal"], "max_distance": [4.0]}, backends=None)
+def set_range(graph: str, max_distance: float):
+    return _map_method(graph, "set_range", max_distance=max_distance, max_neighbours=1000)
+
+
+@register_benchmark("preprocessors", params={"graph": ["molecule", "crystal"]}, backends=None)
+def set_angle(graph: str):
+    return _map_method(graph, "set_angle", range_indices="edge_indices")
+
+
+@register_benchmark("preprocessors", params={"graph": ["crystal"], "max_distance": [5.0],
+                                             "max_neighbours": [None, 32]}, backends=None)
+def set_range_periodic(graph: str, max_distance: float, max_neighbours: int):
+    return _map_method(graph, "set_range_periodic", max_distance=max_distance, max_neighbours=max_neighbours)
+
+
+@register_benchmark("preprocessors", params={"graph": ["molecule"]}, backends=None)
+def set_edge_indices_reverse(graph: str):
+    return _map_method(graph, "set_edge_indices_reverse")
+
+
+@register_benchmark("preprocessors", params={"graph": ["molecule", "power_law"]}, backends=None)
+def normalize_edge_weights_sym(graph: str):
+    return _map_method(graph, "normalize_edge_weights_sym", setup_methods=[{"method": "set_edge_weights_uniform"}])
@@ -0,0 +1,98 @@
+import os
+import queue
+from benchmarks.harness import register_benchmark
+
+# Comparisons of the benchmark scripts in this folder with small sizes, so that they can be tracked across commits.
+# Each case calls the function of the script that runs one configuration and returns the metrics of the script.
+# Timings of scripts that compare keras backends get the suffix '_time' . Model scripts run with `tensorflow` , like
+# the scripts with their default settings. For the full sizes, run the scripts directly.
+hyper_cora = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "training", "hyper",
+                          "hyper_cora_lu.py")
+
+
+def _run(function, *args, **kwargs) -> dict:
+    results = queue.Queue()
+    function(*args, queue=results, **kwargs)
+    return results.get()
+
+
+@register_benchmark("scripts", params={"model": ["Schnet"], "variant": ["chained", "fused"]},
+                    backends=["tensorflow"], timed=False)
+def geom_basis(model: str, variant: str):
+    from benchmarks.geom_basis import run_config
+    return _run(run_config, model, None if variant == "chained" else {}, num_graphs=4, num_nodes=32,
+                num_neighbours=16, steps=3)
+
+
+@register_benchmark("scripts", backends=["tensorflow", "jax", "torch"], timed=False)
+def scatter():
+    from benchmarks.scatter import run_backend
+    results = _run(run_backend, os.environ["KERAS_BACKEND"], num_nodes=5000, num_neighbours=20, units=64, steps=5)
+    return {"%s_time" % key: value for key, value in results.items()}
+
+
+@register_benchmark("scripts", params={"model": ["GCN", "Schnet"], "fused": [False, True]},
+                    backends=["tensorflow"], timed=False)
+def message_passing(model: str, fused: bool):
+    from benchmarks.message_passing import run_config
+    return _run(run_config, model, fused, batch_size=16, steps=3)
+
+
+@register_benchmark("scripts", params={"variant": ["full", "blocked"]}, backends=["tensorflow"], timed=False)
+def mat_attention(variant: str):
+    from benchmarks.mat_attention import run_config, max_atoms
+    return _run(run_config, 8 if variant == "blocked" else None, False, batch_size=16, num_nodes=max_atoms["QM9"],
+                depth=2, heads=4, units=32, steps=3)
+
+
+@register_benchmark("scripts", params={"degrees": ["PROTEINS"]}, backends=["tensorflow", "torch"], timed=False)
+def lstm_aggregation(degrees: str):
+    from benchmarks.lstm_aggregation import run_backend, make_degrees
+    results = _run(run_backend, os.environ["KERAS_BACKEND"], make_degrees(degrees), [2, 4, 8, 16, 32], units=32,
+                   steps=2)
+    return {"%s_time" % key: value for key, value in results.items()}
+
+
+@register_benchmark("scripts", params={"model": ["DMPNN"], "make_reverse_edges": [False, True]},
+                    backends=["tensorflow"], timed=False)
+def reverse_edges(model: str, make_reverse_edges: bool):
+    from benchmarks.reverse_edges import run_config
+    return _run(run_config, model, "synthetic", make_reverse_edges, batch_size=32, epochs=1)
+
+
+@register_benchmark("scripts", params={"model": ["DimeNetPP"], "make_angle_indices": [False, True]},
+                    backends=["tensorflow"], timed=False)
+def angle_indices(model: str, make_angle_indices: bool):
+    from benchmarks.angle_indices import run_config
+    return _run(run_config, model, make_angle_indices, num_graphs=64, batch_size=32, epochs=1)
+
+
+@register_benchmark("scripts", params={"model": ["Schnet"], "policy": ["float32", "mixed_bfloat16"]},
+                    backends=["tensorflow"], timed=False)
+def mixed_precision(model: str, policy: str):
+    from benchmarks.mixed_precision import run_config
+    return _run(run_config, model, policy, batch_size=16, steps=3)
+
+
+@register_benchmark("scripts", params={"model": ["PAiNN"], "recompute": [False, True]},
+                    backends=["tensorflow"], timed=False)
+def recompute_interactions(model: str, recompute: bool):
+    from benchmarks.recompute_interactions import run_config
+    return _run(run_config, model, recompute, batch_size=2, num_nodes=32, cutoff=5.0, depth=2, steps=2)
+
+
+@register_benchmark("scripts", params={"model": ["GCN"], "sampling": [False, True]}, backends=["tensorflow"],
+                    timed=False)
+def neighbour_sampling(model: str, sampling: bool):
+    from benchmarks.neighbour_sampling import run_config
+    args = {"model": model, "hyper": hyper_cora, "num_nodes": 5000, "degree": 10, "num_features": 64,
+            "fan_outs": [10, 5, 5], "batch_size": 512, "train_fraction": 0.1, "epochs": 1}
+    return _run(run_config, args, sampling)
+
+
+@register_benchmark("scripts", params={"category": ["GCN", "SGC"]}, backends=["tensorflow"], timed=False)
+def propagation_precompute(category: str):
+    from benchmarks.propagation_precompute import run_config
+    args = {"hyper": hyper_cora, "dataset": "synthetic", "num_edges": 5278, "hops": [1, 2], "alpha": None,
+            "epochs": 20, "test_fraction": 0.2}
+    return _run(run_config, args, category)
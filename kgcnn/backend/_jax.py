@@ -1,4 +1,6 @@
 import numpy as np
+import jax
+import jax.experimental.sparse
 import jax.numpy as jnp
 from kgcnn import __safe_scatter_max_min_to_zero__ as global_safe_scatter_max_min_to_zero
 
@@ -72,6 +74,75 @@ def scatter_reduce_softmax(indices, values, shape, normalize: bool = False):
     return values_exp / values_exp_sum
 
 
+def segment_reduce_sum(indices, values, shape):
+    return jax.ops.segment_sum(values, indices, num_segments=shape[0], indices_are_sorted=True)
+
+
+def segment_reduce_min(indices, values, shape):
+    out = jax.ops.segment_min(values, indices, num_segments=shape[0], indices_are_sorted=True)
+    if global_safe_scatter_max_min_to_zero:
+        counts = jnp.bincount(indices, length=shape[0])
+        out = jnp.where(jnp.reshape(counts > 0, [-1] + [1] * (values.ndim - 1)), out, jnp.zeros_like(out))
+    return out
+
+
+def segment_reduce_max(indices, values, shape):
+    out = jax.ops.segment_max(values, indices, num_segments=shape[0], indices_are_sorted=True)
+    if global_safe_scatter_max_min_to_zero:
+        counts = jnp.bincount(indices, length=shape[0])
+        out = jnp.where(jnp.reshape(counts > 0, [-1] + [1] * (values.ndim - 1)), out, jnp.zeros_like(out))
+    return out
+
+
+def segment_reduce_mean(indices, values, shape):
+    counts = jnp.bincount(indices, length=shape[0]).astype(values.dtype)
+    out = jax.ops.segment_sum(values, indices, num_segments=shape[0], indices_are_sorted=True)
+    inverse_counts = jnp.nan_to_num(jnp.reciprocal(counts), posinf=0.0, neginf=0.0, nan=0.0)
+    return out * jnp.reshape(inverse_counts, [-1] + [1] * (values.ndim - 1))
+
+
+def segment_reduce_softmax(indices, values, shape, normalize: bool = False):
+    if normalize:
+        data_segment_max = jax.ops.segment_max(values, indices, num_segments=shape[0], indices_are_sorted=True)
+        values = values - jnp.take(data_segment_max, indices, axis=0)
+    values_exp = jnp.exp(values)
+    values_exp_sum = jax.ops.segment_sum(values_exp, indices, num_segments=shape[0], indices_are_sorted=True)
+    return values_exp / jnp.take(values_exp_sum, indices, axis=0)
+
+
+def _gather_scatter_reduce_sum(x, indices_gather, indices_scatter, shape, weights=None):
+    if weights is not None and weights.ndim == 1:
+        weights = jnp.expand_dims(weights, axis=-1)
+    use_sparse_matmul = x.ndim == 2 and (weights is None or weights.shape[-1] == 1)
+    if use_sparse_matmul:
+        values = jnp.ones(indices_scatter.shape, dtype=x.dtype) if weights is None else jnp.squeeze(weights, axis=-1)
+        adjacency = jax.experimental.sparse.BCOO(
+            (values, jnp.stack([indices_scatter, indices_gather], axis=-1)), shape=(shape[0], x.shape[0]))
+        return adjacency @ x
+
+    # Vector weights can not be expressed by sparse matrix product. Gathered messages are recomputed for gradient.
+    def message_passing(x_, w_):
+        messages = jnp.take(x_, indices_gather, axis=0)
+        if w_ is not None:
+            messages = messages * w_
+        return jnp.zeros(shape, messages.dtype).at[indices_scatter].add(messages)
+
+    if weights is None:
+        return jax.checkpoint(lambda x_: message_passing(x_, None))(x)
+    return jax.checkpoint(message_passing)(x, weights)
+
+
+def gather_scatter_reduce_sum(x, indices_gather, indices_scatter, shape, weights=None):
+    return _gather_scatter_reduce_sum(x, indices_gather, indices_scatter, shape, weights=weights)
+
+
+def gather_scatter_reduce_mean(x, indices_gather, indices_scatter, shape, weights=None):
+    out = _gather_scatter_reduce_sum(x, indices_gather, indices_scatter, shape, weights=weights)
+    counts = jnp.bincount(indices_scatter, length=shape[0]).astype(out.dtype)
+    inverse_counts = jnp.nan_to_num(jnp.reciprocal(counts), posinf=0.0, neginf=0.0, nan=0.0)
+    return out * jnp.reshape(inverse_counts, [-1] + [1] * (out.ndim - 1))
+
+
 def repeat_static_length(x, repeats, axis=None, total_repeat_length: int = None):
     return jnp.repeat(x, repeats=repeats, axis=axis, total_repeat_length=total_repeat_length)
 
@@ -86,3 +157,10 @@ def norm(x, ord='fro', axis=None, keepdims=False):
 
 def cross(x1, x2):
     return jnp.cross(x1, x2, axis=-1)
+
+def searchsorted(sorted_sequence, values, side="left"):
+    return jnp.searchsorted(sorted_sequence, values, side=side).astype("int64")
+
+
+def recompute_grad(f):
+    return jax.checkpoint(f)
@@ -1,2 +1,6 @@
 def decompose_ragged_tensor(x):
-    raise NotImplementedError("Operation not supported by this backend '%s'." % __name__)
\ No newline at end of file
+    raise NotImplementedError("Operation not supported by this backend '%s'." % __name__)
+
+
+def recompute_grad(f):
+    return f
@@ -48,6 +48,83 @@ def scatter_reduce_softmax(indices, values, shape, normalize: bool = False):
     return values_exp / values_exp_sum
 
 
+# Tensorflow has no sorted segment reduction that runs both with and without XLA, which keras uses by default to
+# compile the train step. Kernels of `tf.math.segment_sum` etc. are not registered for XLA and `SegmentSumV2` etc.
+# only have XLA kernels. The segment reductions therefore use the unsorted segment operations, which do not require
+# sorted indices and give identical results, but take the 1D indices directly instead of expanding them for
+# `tf.scatter_nd` .
+
+
+def segment_reduce_sum(indices, values, shape):
+    return tf.math.unsorted_segment_sum(values, indices, num_segments=shape[0])
+
+
+def segment_reduce_min(indices, values, shape):
+    out = tf.math.unsorted_segment_min(values, indices, num_segments=shape[0])
+    if global_safe_scatter_max_min_to_zero:
+        counts = tf.math.bincount(tf.cast(indices, dtype="int32"), minlength=shape[0], maxlength=shape[0])
+        out = tf.where(tf.reshape(counts > 0, [-1] + [1] * (len(values.shape) - 1)), out, tf.zeros_like(out))
+    return out
+
+
+def segment_reduce_max(indices, values, shape):
+    out = tf.math.unsorted_segment_max(values, indices, num_segments=shape[0])
+    if global_safe_scatter_max_min_to_zero:
+        counts = tf.math.bincount(tf.cast(indices, dtype="int32"), minlength=shape[0], maxlength=shape[0])
+        out = tf.where(tf.reshape(counts > 0, [-1] + [1] * (len(values.shape) - 1)), out, tf.zeros_like(out))
+    return out
+
+
+def segment_reduce_mean(indices, values, shape):
+    counts = tf.math.bincount(tf.cast(indices, dtype="int32"), minlength=shape[0], maxlength=shape[0],
+                              dtype=values.dtype)
+    out = tf.math.unsorted_segment_sum(values, indices, num_segments=shape[0])
+    return tf.math.divide_no_nan(out, tf.reshape(counts, [-1] + [1] * (len(values.shape) - 1)))
+
+
+def segment_reduce_softmax(indices, values, shape, normalize: bool = False):
+    if normalize:
+        data_segment_max = tf.math.unsorted_segment_max(values, indices, num_segments=shape[0])
+        values = values - tf.gather(data_segment_max, indices, axis=0)
+    values_exp = tf.math.exp(values)
+    values_exp_sum = tf.math.unsorted_segment_sum(values_exp, indices, num_segments=shape[0])
+    return values_exp / tf.gather(values_exp_sum, indices, axis=0)
+
+
+def _gather_scatter_reduce_sum(x, indices_gather, indices_scatter, shape, weights=None):
+    if weights is not None and len(weights.shape) == 1:
+        weights = tf.expand_dims(weights, axis=-1)
+    use_sparse_matmul = len(x.shape) == 2 and (weights is None or weights.shape[-1] == 1)
+    if use_sparse_matmul:
+        values = tf.ones_like(indices_scatter, dtype=x.dtype) if weights is None else tf.squeeze(weights, axis=-1)
+        adjacency = tf.sparse.SparseTensor(
+            indices=tf.stack([tf.cast(indices_scatter, "int64"), tf.cast(indices_gather, "int64")], axis=-1),
+            values=values, dense_shape=tf.stack([tf.cast(shape[0], "int64"), tf.shape(x, out_type="int64")[0]]))
+        return tf.sparse.sparse_dense_matmul(adjacency, x)
+
+    # Vector weights can not be expressed by sparse matrix product. Gathered messages are recomputed for gradient.
+    def message_passing(x_, w_):
+        messages = tf.gather(x_, indices_gather, axis=0)
+        if w_ is not None:
+            messages = messages * w_
+        return tf.scatter_nd(tf.expand_dims(indices_scatter, axis=1), messages, tf.cast(shape, dtype="int64"))
+
+    if weights is None:
+        return recompute_grad(lambda x_: message_passing(x_, None))(x)
+    return recompute_grad(message_passing)(x, weights)
+
+
+def gather_scatter_reduce_sum(x, indices_gather, indices_scatter, shape, weights=None):
+    return _gather_scatter_reduce_sum(x, indices_gather, indices_scatter, shape, weights=weights)
+
+
+def gather_scatter_reduce_mean(x, indices_gather, indices_scatter, shape, weights=None):
+    out = _gather_scatter_reduce_sum(x, indices_gather, indices_scatter, shape, weights=weights)
+    counts = tf.math.bincount(tf.cast(indices_scatter, dtype="int32"), minlength=shape[0], maxlength=shape[0],
+                              dtype=out.dtype)
+    return tf.math.divide_no_nan(out, tf.reshape(counts, [-1] + [1] * (len(out.shape) - 1)))
+
+
 def repeat_static_length(x, repeats, axis=None, total_repeat_length: int = None):
     return tf.repeat(x, repeats=repeats, axis=axis)
 
@@ -70,13 +147,35 @@ def cross(x1, x2):
     return tf.linalg.cross(x1, x2)
 
 
-
-
-
-
-
-
-
-
-
-
+def searchsorted(sorted_sequence, values, side="left"):
+    return tf.searchsorted(sorted_sequence, values, side=side, out_type="int64")
+
+
+def recompute_grad(f):
+    # Similar to `tf.recompute_grad` but densify gradients from gather operations, which are returned as
+    # `IndexedSlices` and not accepted by custom gradient.
+    @tf.custom_gradient
+    def recompute_f(*args):
+        result = f(*args)
+
+        def grad_f(*result_grads, variables=None):
+            variables = list(variables) if variables is not None else []
+            # Make the recomputation depend on the incoming gradients. Otherwise, in graph mode it can be scheduled
+            # in the forward pass or merged with the forward operations by grappler, which keeps all activations.
+            with tf.control_dependencies(result_grads):
+                recompute_args = [tf.identity(x) for x in args]
+            with tf.GradientTape() as tape:
+                tape.watch(recompute_args)
+                tape.watch(variables)
+                recomputed = f(*recompute_args)
+            grads = tape.gradient(recomputed, recompute_args + variables, output_gradients=list(result_grads))
+            grads = [tf.convert_to_tensor(g) if isinstance(g, tf.IndexedSlices) else g for g in grads]
+            # Return all gradients only after the complete backward pass. Otherwise, in graph mode the optimizer can
+            # update a variable with its gradient before the recomputation has read it for the other gradients.
+            with tf.control_dependencies([g for g in grads if g is not None]):
+                grads = [tf.identity(g) if g is not None else None for g in grads]
+            return grads[:len(args)], grads[len(args):]
+
+        return result, grad_f
+
+    return recompute_f
@@ -1,4 +1,5 @@
 import torch
+import torch.utils.checkpoint
 
 
 def scatter_reduce_sum(indices, values, shape):
@@ -54,6 +55,77 @@ def scatter_reduce_softmax(indices, values, shape, normalize: bool = False):
     return values_exp / values_exp_sum
 
 
+def segment_reduce_sum(indices, values, shape):
+    lengths = torch.bincount(indices, minlength=shape[0])
+    return torch.segment_reduce(values, "sum", lengths=lengths, axis=0, unsafe=True, initial=0)
+
+
+def segment_reduce_min(indices, values, shape):
+    lengths = torch.bincount(indices, minlength=shape[0])
+    out = torch.segment_reduce(values, "min", lengths=lengths, axis=0, unsafe=True)
+    has_scattered = torch.reshape(lengths > 0, [-1] + [1] * (values.dim() - 1))
+    return torch.where(has_scattered, out, torch.zeros_like(out))
+
+
+def segment_reduce_max(indices, values, shape):
+    lengths = torch.bincount(indices, minlength=shape[0])
+    out = torch.segment_reduce(values, "max", lengths=lengths, axis=0, unsafe=True)
+    has_scattered = torch.reshape(lengths > 0, [-1] + [1] * (values.dim() - 1))
+    return torch.where(has_scattered, out, torch.zeros_like(out))
+
+
+def segment_reduce_mean(indices, values, shape):
+    lengths = torch.bincount(indices, minlength=shape[0])
+    out = torch.segment_reduce(values, "sum", lengths=lengths, axis=0, unsafe=True, initial=0)
+    counts = torch.reshape(torch.clamp(lengths, min=1), [-1] + [1] * (values.dim() - 1)).to(values.dtype)
+    return out / counts
+
+
+def segment_reduce_softmax(indices, values, shape, normalize: bool = False):
+    lengths = torch.bincount(indices, minlength=shape[0])
+    if normalize:
+        data_segment_max = torch.segment_reduce(values, "max", lengths=lengths, axis=0, unsafe=True)
+        values = values - torch.index_select(data_segment_max, dim=0, index=indices)
+    values_exp = torch.exp(values)
+    values_exp_sum = torch.segment_reduce(values_exp, "sum", lengths=lengths, axis=0, unsafe=True, initial=0)
+    return values_exp / torch.index_select(values_exp_sum, dim=0, index=indices)
+
+
+def _gather_scatter_reduce_sum(x, indices_gather, indices_scatter, shape, weights=None):
+    if weights is not None and weights.dim() == 1:
+        weights = torch.unsqueeze(weights, dim=-1)
+    use_sparse_matmul = x.dim() == 2 and (weights is None or weights.shape[-1] == 1)
+    if use_sparse_matmul:
+        values = torch.ones(indices_scatter.shape, dtype=x.dtype, device=x.device) if weights is None else (
+            torch.squeeze(weights, dim=-1))
+        adjacency = torch.sparse_coo_tensor(
+            torch.stack([indices_scatter, indices_gather], dim=0), values, size=(shape[0], x.shape[0]),
+            check_invariants=False)
+        return torch.sparse.mm(adjacency, x)
+
+    # Vector weights can not be expressed by sparse matrix product. Gathered messages are recomputed for gradient.
+    def message_passing(x_, *w_):
+        messages = torch.index_select(x_, dim=0, index=indices_gather)
+        if len(w_) > 0:
+            messages = messages * w_[0]
+        return scatter_reduce_sum(indices_scatter, messages, shape)
+
+    if weights is None:
+        return recompute_grad(message_passing)(x)
+    return recompute_grad(message_passing)(x, weights)
+
+
+def gather_scatter_reduce_sum(x, indices_gather, indices_scatter, shape, weights=None):
+    return _gather_scatter_reduce_sum(x, indices_gather, indices_scatter, shape, weights=weights)
+
+
+def gather_scatter_reduce_mean(x, indices_gather, indices_scatter, shape, weights=None):
+    out = _gather_scatter_reduce_sum(x, indices_gather, indices_scatter, shape, weights=weights)
+    lengths = torch.bincount(indices_scatter, minlength=shape[0])
+    counts = torch.reshape(torch.clamp(lengths, min=1), [-1] + [1] * (out.dim() - 1)).to(out.dtype)
+    return out / counts
+
+
 def repeat_static_length(x, repeats, axis=None, total_repeat_length: int = None):
     # from keras_core.backend.torch.numpy import repeat
     return torch.repeat_interleave(x, repeats, dim=axis)
@@ -69,3 +141,12 @@ def norm(x, ord='fro', axis=None, keepdims=False):
 
 def cross(x1, x2):
     return torch.cross(x1, x2, dim=-1)
+
+def searchsorted(sorted_sequence, values, side="left"):
+    return torch.searchsorted(sorted_sequence.contiguous(), values.contiguous(), side=side)
+
+
+def recompute_grad(f):
+    def recompute_f(*args):
+        return torch.utils.checkpoint.checkpoint(f, *args, use_reentrant=False)
+    return recompute_f
@@ -2,8 +2,7 @@ import logging
 import numpy as np
 import pandas as pd
 import os
-from sklearn.model_selection import KFold
-from kgcnn.io.loader import tf_dataset_disjoint_generator
+import weakref
 # import typing as t
 from typing import Union, List, Callable, Dict, Optional
 # from collections.abc import MutableSequence
@@ -18,6 +17,13 @@ module_logger = logging.getLogger(__name__)
 module_logger.setLevel(logging.INFO)
 
 
+def _gather_rows(values: np.ndarray, row_splits: np.ndarray, index: np.ndarray):
+    # Values of the rows `index` of concatenated arrays with `row_splits` and the length of each row.
+    lengths = row_splits[index + 1] - row_splits[index]
+    offsets = np.repeat(row_splits[index] - (np.cumsum(lengths) - lengths), lengths)
+    return values[np.arange(len(offsets), dtype="int64") + offsets], lengths
+
+
 class MemoryGraphList(list):
     r"""Class to store a list of graph dictionaries in memory.
 
@@ -116,15 +122,30 @@ class MemoryGraphList(list):
         if isinstance(item, int):
             return super(MemoryGraphList, self).__getitem__(item)
         if isinstance(item, slice):
-            return MemoryGraphList(super(MemoryGraphList, self).__getitem__(item))
-        if isinstance(item, (list, tuple)):
-            return MemoryGraphList([super(MemoryGraphList, self).__getitem__(int(i)) for i in item])
-        if isinstance(item, np.ndarray):
-            return MemoryGraphList([super(MemoryGraphList, self).__getitem__(int(i)) for i in item])
+            return self._subset(np.arange(len(self), dtype="int64")[item])
+        if isinstance(item, (list, tuple, np.ndarray)):
+            return self._subset(np.arange(len(self), dtype="int64")[np.array([int(i) for i in item], dtype="int64")])
         if isinstance(item, (np.uint8, np.int32, np.int64)):
             return super(MemoryGraphList, self).__getitem__(int(item))
         raise TypeError("Unsupported type '%s' for `MemoryGraphList` items." % type(item))
 
+    def _subset(self, index: np.ndarray):
+        subset = MemoryGraphList([super(MemoryGraphList, self).__getitem__(int(i)) for i in index])
+        # Index subsets like splits of cross-validation make tensors from cached arrays of the list they are taken from.
+        root, root_index = self._tensor_root()
+        subset._tensor_parent = (root, root_index[index])
+        return subset
+
+    def _tensor_root(self):
+        # List with cached arrays and indices of the graphs of this list in it, if the graphs are still the same.
+        parent = self.__dict__.get("_tensor_parent")
+        if parent is not None:
+            root, index = parent
+            if len(index) == len(self) and (len(index) == 0 or int(np.amax(index)) < len(root)) and all(
+                    list.__getitem__(root, int(i)) is x for i, x in zip(index, self)):
+                return root, index
+        return self, np.arange(len(self), dtype="int64")
+
     def __setitem__(self, key, value):
         if not isinstance(value, GraphDict):
             raise TypeError("Require a `GraphDict` as list item.")
@@ -186,29 +207,128 @@ class MemoryGraphList(list):
         raise ValueError("Can not set length. Please use 'empty()' to initialize an empty list.")
 
     def _to_tensor(self, item: dict, make_copy=True):
-        if not make_copy:
-            self.logger.warning("At the moment always a copy is made for tensor().")
         props: list = self.obtain_property(item["name"])
         is_ragged = item["ragged"] if "ragged" in item else False
         dtype = item["dtype"] if "dtype" in item else None
+        key = (item["name"], is_ragged, dtype)
+        if not make_copy:
+            # Properties are compared by identity, so that the cache is invalid if graphs or arrays are replaced.
+            # Only weak references are stored, which do not keep tensors or replaced arrays in memory.
+            cache = self.__dict__.setdefault("_tensor_cache", {})
+            if key in cache and props is not None:
+                props_refs, out_ref = cache[key]
+                out = out_ref()
+                if out is not None and len(props_refs) == len(props) and all(
+                        (x() if x is not None else None) is y for x, y in zip(props_refs, props)):
+                    return out
+            cache.pop(key, None)
+        out = self._tensor_from_flat_values(item["name"], is_ragged, dtype) if not make_copy else None
         # Could add name and shape information if available.
+        if out is None and is_ragged:
+            out = ragged_tensor_from_nested_numpy(props, dtype=dtype)
+        elif out is None:
+            out = pad_np_array_list_batch_dim(props, dtype=dtype)[0]
+        if not make_copy and props is not None:
+            try:
+                self._tensor_cache[key] = (
+                    tuple(weakref.ref(x) if x is not None else None for x in props), weakref.ref(out))
+            except TypeError:
+                # Properties that are not arrays, e.g. python lists, can not be referenced weakly and are not cached.
+                pass
+        return out
+
+    def _flat_values(self, name: str, dtype: str = None):
+        r"""Concatenated arrays of a property of all graphs and their row splits, which are cached until an array of
+        the property is replaced.
+
+        Args:
+            name (str): Name of the property.
+            dtype (str): Data type of the values. Default is None, which is the type of the first array.
+
+        Returns:
+            tuple: Values and row splits, which are None for arrays of rank zero. None, if the arrays of the property
+            can not be concatenated.
+        """
+        props = [x.get(name) for x in self]
+        key = (name, dtype)
+        cache = self.__dict__.setdefault("_flat_cache", {})
+        if key in cache:
+            props_refs, values, row_splits = cache.pop(key)
+            if len(props_refs) == len(props) and all(x() is y for x, y in zip(props_refs, props)):
+                cache[key] = (props_refs, values, row_splits)
+                return values, row_splits
+        if len(props) == 0 or not all([isinstance(x, np.ndarray) for x in props]):
+            return None
+        dtype = dtype if dtype is not None else props[0].dtype
+        try:
+            if all([x.ndim == 0 for x in props]):
+                values, row_splits = np.array(props, dtype=dtype), None
+            elif all([x.ndim > 0 for x in props]) and len(set([x.shape[1:] for x in props])) == 1:
+                values = np.concatenate(props, axis=0, dtype=dtype, casting="unsafe")
+                row_splits = np.concatenate(
+                    [np.zeros(1, dtype="int64"), np.cumsum([len(x) for x in props], dtype="int64")])
+            else:
+                return None
+        except (TypeError, ValueError):
+            return None
+        cache[key] = (tuple(weakref.ref(x) for x in props), values, row_splits)
+        return values, row_splits
+
+    def _tensor_from_flat_values(self, name: str, is_ragged: bool, dtype: str = None):
+        # Tensor of a property from the cached arrays of the list, from which this list has been indexed, or None.
+        root, index = self._tensor_root()
+        flat_values = root._flat_values(name, dtype)
+        if flat_values is None or len(index) == 0:
+            return None
+        values, row_splits = flat_values
+        if row_splits is None:
+            return None if is_ragged else values[index]
+        values, lengths = _gather_rows(values, row_splits, index)
         if is_ragged:
-            return ragged_tensor_from_nested_numpy(props, dtype=dtype)
-        else:
-            return pad_np_array_list_batch_dim(props, dtype=dtype)[0]
+            import tensorflow as tf
+            return tf.RaggedTensor.from_row_lengths(values, lengths)
+        padded = np.zeros([len(index), int(np.amax(lengths))] + list(values.shape[1:]), dtype=values.dtype)
+        row_starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        padded[np.repeat(np.arange(len(index)), lengths), np.arange(len(values)) - row_starts] = values
+        return padded
+
+    def _subset_flat_cache(self, index: np.ndarray):
+        # Keep the cached arrays of the graphs `index` , e.g. after removing graphs from the list.
+        cache = self.__dict__.get("_flat_cache", {})
+        for key, (props_refs, values, row_splits) in list(cache.items()):
+            if row_splits is None:
+                values = values[index]
+            else:
+                values, lengths = _gather_rows(values, row_splits, index)
+                row_splits = np.concatenate([np.zeros(1, dtype="int64"), np.cumsum(lengths)])
+            cache[key] = (tuple(props_refs[i] for i in index), values, row_splits)
+
+    def clear_tensor_cache(self):
+        """Remove all tensors and arrays that have been cached by :obj:`tensor` with `make_copy=False` ."""
+        self.__dict__.pop("_tensor_cache", None)
+        self.__dict__.pop("_flat_cache", None)
 
     def tensor(self, items: Union[list, Dict], make_copy=True):
         r"""Make tensor objects from multiple graph properties in list.
 
         It is recommended to run :obj:`clean` beforehand.
 
+        With `make_copy=False` the arrays of each property of all graphs are concatenated once and cached, as long as
+        the graphs in the list and their property arrays are the same objects. Lists taken from this list by index,
+        e.g. the splits of cross-validation, slice their tensors from these cached arrays instead of concatenating
+        the arrays of their graphs again. Replacing graphs or assigning new arrays invalidates the cache, but changing
+        arrays in place does not. The cached arrays are a copy of the properties, which is removed by
+        :obj:`clear_tensor_cache` . Tensors are also returned again by subsequent calls, as long as they are still
+        referenced elsewhere, and should not be modified.
+
         Args:
             items (list): List of dictionaries that specify graph properties in list via 'name' key.
                 The dict-items match the tensor input for :obj:`tf.keras.layers.Input` layers.
                 Required dict-keys should be 'name' and 'ragged'.
                 Optionally shape information can be included via 'shape' and 'dtype'.
                 E.g.: `[{'name': 'edge_indices', 'ragged': True}, {...}, ...]`.
-            make_copy (bool): Whether to copy the data. Default is True.
+            make_copy (bool): Whether to copy the data on every call instead of using cached tensors.
+                Default is True.
 
         Returns:
             list: List of Tensors.
@@ -257,55 +377,100 @@ class MemoryGraphList(list):
                 method(x, **kwargs)
         return self
 
-    def clean(self, inputs: Union[list, str]):
+    def _property_statistics(self, name: str) -> dict:
+        # Columnar statistics of a single property for all graphs, computed in bulk without per-graph logging.
+        values = [x.get(name) for x in self]
+        shapes = [x.shape if isinstance(x, np.ndarray) else None for x in values]
+        is_array = np.array([x is not None for x in shapes], dtype="bool")
+        is_undefined = np.array([x is None or not hasattr(x, "__getitem__") for x in values], dtype="bool")
+        rank = np.array([len(x) if x is not None else -1 for x in shapes], dtype="int64")
+        length = np.array([x[0] if x else -1 for x in shapes], dtype="int64")
+        dtypes = {x.dtype for x in values if isinstance(x, np.ndarray)}
+        return {"values": values, "shapes": shapes, "is_array": is_array, "is_undefined": is_undefined, "rank": rank,
+                "length": length, "dtypes": dtypes}
+
+    def check_properties(self, inputs: Union[list, str]) -> dict:
+        r"""Check graph properties for all graphs in the list and report invalid graphs.
+
+        A graph is invalid for a property, if the property is not defined, is not a numpy array or is an empty
+        array. Properties that are not assigned to any graph are reported but do not mark graphs as invalid.
+
+        Args:
+            inputs (list): A list of property names or a list of dicts with the name of the property in 'name' key,
+                e.g. the model input config.
+
+        Returns:
+            dict: Report with number of graphs 'num_graphs', sorted indices of all 'invalid_graphs' and for each
+            property in 'properties' a dict with 'assigned', indices of graphs with 'undefined', 'not_array' or
+            'empty' property and the set of 'dtypes' and 'ranks' found for the property.
+        """
+        if isinstance(inputs, (str, dict)):
+            inputs = [inputs]
+        report = {"num_graphs": len(self), "invalid_graphs": np.zeros(0, dtype="int"), "properties": {}}
+        invalid = np.zeros(len(self), dtype="bool")
+        for item in inputs:
+            if item is None:
+                continue
+            # If this is a list of dict, which are the config for ks.layers.Input(), we pick 'name'.
+            item_name = item["name"] if isinstance(item, dict) else item
+            stats = self._property_statistics(item_name)
+            is_not_array = np.logical_and(np.logical_not(stats["is_undefined"]), np.logical_not(stats["is_array"]))
+            is_empty = stats["length"] == 0
+            assigned = not bool(np.all(stats["is_undefined"])) or len(self) == 0
+            report["properties"][item_name] = {
+                "assigned": assigned,
+                "undefined": np.flatnonzero(stats["is_undefined"]),
+                "not_array": np.flatnonzero(is_not_array),
+                "empty": np.flatnonzero(is_empty),
+                "dtypes": sorted({str(x) for x in stats["dtypes"]}),
+                "ranks": sorted({int(x) for x in np.unique(stats["rank"][stats["is_array"]])})
+            }
+            if assigned:
+                invalid = np.logical_or(invalid, np.logical_or(stats["is_undefined"], is_not_array))
+                invalid = np.logical_or(invalid, is_empty)
+        report["invalid_graphs"] = np.flatnonzero(invalid).astype("int")
+        return report
+
+    def clean(self, inputs: Union[list, str], return_report: bool = False):
         r"""Given a list of property names, this method removes all elements from the internal list of
         `GraphDict` items, which do not define at least one of those properties. Meaning, only those graphs remain in
         the list which definitely define all properties specified by :obj:`inputs`.
 
+        Invalid graphs are found with :obj:`check_properties` and removed by rebuilding the list once.
+
         Args:
             inputs (list): A list of strings, where each string is supposed to be a property name, which the graphs
                 in this list may possess. Within :obj:`kgcnn`, this can be simpy the 'input' category in model
                 configuration. In this case, a list of dicts that specify the name of the property with 'name' key.
+            return_report (bool): Whether to return the report of :obj:`check_properties` instead of the indices of
+                removed graphs. Default is False.
 
         Returns:
             invalid_graphs (np.ndarray): A list of graph indices that do not have the required properties and which
-                have been removed.
+                have been removed. In descending order.
         """
-        if isinstance(inputs, str):
-            inputs = [inputs]
-        invalid_graphs = []
-        for item in inputs:
-            # If this is a list of dict, which are the config for ks.layers.Input(), we pick 'name'.
-            if isinstance(item, dict):
-                item_name = item["name"]
-            else:
-                item_name = item
-            props = self.obtain_property(item_name)
-            if props is None:
-                self.logger.warning("Can not clean property '%s' as it was not assigned to any graph." % item)
+        report = self.check_properties(inputs)
+        for name, info in report["properties"].items():
+            if not info["assigned"]:
+                self.logger.warning("Can not clean property '%s' as it was not assigned to any graph." % name)
                 continue
-            for i, x in enumerate(props):
-                # If property is neither list nor np.array
-                if x is None or not hasattr(x, "__getitem__"):
-                    self.logger.info("Property '%s' is not defined for graph '%s'." % (item_name, i))
-                    invalid_graphs.append(i)
-                elif not isinstance(x, np.ndarray):
-                    self.logger.info("Property '%s' is not a numpy array for graph '%s'." % (item_name, i))
-                    invalid_graphs.append(i)
-                elif len(x.shape) > 0:
-                    if len(x) <= 0:
-                        self.logger.info("Property '%s' is an empty list for graph '%s'." % (item_name, i))
-                        invalid_graphs.append(i)
-        invalid_graphs = np.unique(np.array(invalid_graphs, dtype="int"))
-        invalid_graphs = np.flip(invalid_graphs)  # Need descending order for pop()
+            for reason, msg in [("undefined", "is not defined"), ("not_array", "is not a numpy array"),
+                                ("empty", "is an empty list")]:
+                if len(info[reason]) > 0:
+                    self.logger.info("Property '%s' %s for %s graphs." % (name, msg, len(info[reason])))
+        invalid_graphs = report["invalid_graphs"]
         if len(invalid_graphs) > 0:
             self.logger.warning("Found invalid graphs for properties. Removing graphs '%s'." % invalid_graphs)
+            keep = np.ones(len(self), dtype="bool")
+            keep[invalid_graphs] = False
+            # Single rebuild of the list instead of removing graphs one by one.
+            list.__setitem__(self, slice(None), [x for x, k in zip(self, keep) if k])
+            self._subset_flat_cache(np.flatnonzero(keep))
         else:
             self.logger.info("No invalid graphs for assigned properties found.")
-        # Remove from the end via pop().
-        for i in invalid_graphs:
-            self.pop(int(i))
-        return invalid_graphs
+        if return_report:
+            return report
+        return np.flip(invalid_graphs)
 
     def rename_property_on_graphs(self, old_property_name: str, new_property_name: str) -> list:
         """Change the name of a graph property on all graphs in the list.
@@ -340,6 +505,7 @@ class MemoryGraphList(list):
         Returns:
             tf.data.Dataset: Dataset from generator.
         """
+        from kgcnn.io.loader import tf_dataset_disjoint_generator
         return tf_dataset_disjoint_generator(self, inputs=inputs, **kwargs)
 
 
@@ -497,7 +663,8 @@ class MemoryGraphDataset(MemoryGraphList):
         self.warning("Unsupported data extension of '%s' for table file." % file_path)
         return self
 
-    def assert_valid_model_input(self, hyper_input: Union[list, dict], raise_error_on_fail: bool = True):
+    def assert_valid_model_input(self, hyper_input: Union[list, dict], raise_error_on_fail: bool = True,
+                                 make_copy: bool = True):
         r"""Check whether dataset has graph properties (in tensor format) requested by model input.
 
         The list :obj:`hyper_input` that defines model input match interface to hyperparameter.
@@ -515,6 +682,9 @@ class MemoryGraphDataset(MemoryGraphList):
         Args:
             hyper_input (list): List of properties that need to be available to a model for training.
             raise_error_on_fail (bool): Whether to raise an error if assertion failed.
+            make_copy (bool): Whether tensors are copied on every call of :obj:`tensor` . With `make_copy=False` the
+                arrays of the properties are concatenated and cached for :obj:`tensor` while checking them.
+                Default is True.
         """
         dataset = self
 
@@ -550,27 +720,32 @@ class MemoryGraphDataset(MemoryGraphList):
                 continue
             if "name" not in x:
                 message_error("Can not infer name from '%s' for model input." % x)
-            data = [dataset[i].obtain_property(x["name"]) for i in range(len(dataset))]
-            prop_in_data = [y is None for y in data]
-            if all(prop_in_data):
+            stats = dataset._property_statistics(x["name"])
+            prop_in_data = np.array([y is None for y in stats["values"]], dtype="bool")
+            if np.all(prop_in_data):
                 message_error("Property %s is not defined for any graph in list. Please check property." % x["name"])
-            if any(prop_in_data):
+            if np.any(prop_in_data):
                 message_warning("Property %s is not defined for all graphs in list. Please run clean()." % x["name"])
 
-            # we also will check shape here but only with first element.
-            if hasattr(data[0], "shape") and "shape" in x:
-                shape_element = data[0].shape
+            # We check shape of all arrays, but only once for each distinct shape.
+            # Empty arrays are skipped, since they are removed by clean().
+            if np.any(stats["is_array"]) and "shape" in x:
                 shape_input = x["shape"]
-                if len(shape_input) != len(shape_element):
-                    message_error(
-                        "Mismatch in rank for model input {} vs. {}".format(shape_element, shape_input))
-                for i, dim in enumerate(shape_input):
-                    if dim is not None:
-                        if shape_element[i] != dim:
-                            message_error(
-                                "Mismatch in shape for model input {} vs. {}".format(shape_element, shape_input))
+                for shape_element in set([y for y in stats["shapes"] if y is not None]):
+                    if len(shape_element) > 0 and shape_element[0] == 0:
+                        continue
+                    if len(shape_input) != len(shape_element):
+                        message_error(
+                            "Mismatch in rank for model input {} vs. {}".format(shape_element, shape_input))
+                        break
+                    if any([dim is not None and shape_element[i] != dim for i, dim in enumerate(shape_input)]):
+                        message_error(
+                            "Mismatch in shape for model input {} vs. {}".format(shape_element, shape_input))
+                        break
             else:
                 message_error("Can not check shape for '%s'." % x["name"])
+            if not make_copy:
+                dataset._flat_values(x["name"], x["dtype"] if "dtype" in x else None)
         return
 
     def collect_files_in_file_directory(self, file_column_name: str = None, table_file_path: str = None,
@@ -805,6 +980,7 @@ class MemoryGraphDataset(MemoryGraphList):
         Returns:
             None.
         """
+        from sklearn.model_selection import KFold
         kf = KFold(n_splits=n_splits, shuffle=shuffle, random_state=random_state)
         for x in self:
             x.set(train, [])
@@ -4,7 +4,6 @@ import pandas as pd
 from typing import Union, Callable, List, Dict
 from kgcnn.molecule.base import MolGraphInterface
 from kgcnn.data.transform.scaler.molecule import QMGraphLabelScaler
-from sklearn.preprocessing import StandardScaler
 from kgcnn.molecule.serial import deserialize_encoder
 from kgcnn.data.base import MemoryGraphDataset
 from kgcnn.molecule.io import parse_list_to_xyz_str, read_xyz_file, \
@@ -1,7 +1,7 @@
 import numpy as np
 import logging
 from typing import Union, List, Dict, Tuple
-from kgcnn.data.transform.scaler.molecule import _ExtensiveMolecularScalerBase
+from kgcnn.data.transform.scaler.molecule import _ExtensiveMolecularScalerBase, iterate_chunks
 
 logging.basicConfig()  # Module logger
 module_logger = logging.getLogger(__name__)
@@ -101,6 +101,31 @@ class EnergyForceExtensiveLabelScaler(_ExtensiveMolecularScalerBase):
         return super(EnergyForceExtensiveLabelScaler, self)._fit(
             molecular_property=y, sample_weight=sample_weight, atomic_number=atomic_number)
 
+    # noinspection PyPep8Naming
+    def partial_fit(self, y: Tuple[List[np.ndarray], List[np.ndarray]] = None, *,
+                    X: List[np.ndarray] = None,
+                    sample_weight: Union[None, np.ndarray] = None,
+                    force: Union[None, List[np.ndarray]] = None,
+                    atomic_number: Union[None, List[np.ndarray]] = None
+                    ):
+        """Update the fit with a batch of molecules. Successive calls match :obj:`fit()` on all batches.
+        Forces are not required for the fit but can be passed like for :obj:`fit()` .
+
+        Args:
+            y (tuple): Tuple of `(energy, forces)` .
+                Energies must be a single array or list of energies of shape `(n_samples, n_states)` .
+            X (list): Atomic number `atomic_number` are a list of arrays of atomic numbers.
+            sample_weight (list, np.ndarray): Weights for each sample.
+            force (list): List of forces as numpy arrays. Deprecated, since they can be contained in `y` .
+            atomic_number (list): List of arrays of atomic numbers. Deprecated, since they can be contained in `X` .
+
+        Returns:
+            self.
+        """
+        X, y, force, atomic_number = self._verify_input(X, y, force, atomic_number)
+        return super(EnergyForceExtensiveLabelScaler, self)._partial_fit(
+            molecular_property=y, sample_weight=sample_weight, atomic_number=atomic_number)
+
     # noinspection PyPep8Naming
     def fit_transform(self, y: Tuple[List[np.ndarray], List[np.ndarray]] = None, *,
                       X: List[np.ndarray] = None,
@@ -170,8 +195,9 @@ class EnergyForceExtensiveLabelScaler(_ExtensiveMolecularScalerBase):
             else:
                 force = [np.array(f) for f in force]
         else:
+            offset = self._predict(atomic_number)
             for i in range(len(y)):
-                y[i][:] = y[i] - self._predict(atomic_number)[i]
+                y[i][:] = y[i] - offset[i]
                 if self._standardize_scale:
                     y[i][:] = y[i] / self.scale_
                     force[i][:] = force[i] / np.expand_dims(self.scale_, axis=0)
@@ -214,11 +240,12 @@ class EnergyForceExtensiveLabelScaler(_ExtensiveMolecularScalerBase):
                 force = [np.array(f) for f in force]
             y = y + self._predict(atomic_number)
         else:
+            offset = self._predict(atomic_number)
             for i in range(len(y)):
                 if self._standardize_scale:
                     y[i][:] = y[i][:] * self.scale_
                     force[i][:] = force[i] * np.expand_dims(self.scale_, axis=0)
-                y[i][:] = y[i][:] + self._predict(atomic_number)[i]
+                y[i][:] = y[i][:] + offset[i]
         return y, force
 
     # Needed for backward compatibility.
@@ -275,11 +302,14 @@ class EnergyForceExtensiveLabelScaler(_ExtensiveMolecularScalerBase):
 
     # Similar functions that work on dataset plus property names.
     # noinspection PyPep8Naming
-    def fit_dataset(self, dataset: List[Dict[str, np.ndarray]], **fit_params):
+    def fit_dataset(self, dataset: List[Dict[str, np.ndarray]], chunk_size: int = None, **fit_params):
         r"""Fit to dataset with relevant `X` , `y` information.
 
         Args:
-            dataset (list): Dataset of type `List[Dict]` containing energies and forces and atomic numbers.
+            dataset (list): Dataset of type `List[Dict]` containing energies and forces and atomic numbers. With
+                `chunk_size` , this can also be an iterable of graphs, e.g. read from a file.
+            chunk_size (int): Number of graphs to fit at once with :obj:`partial_fit()` . Default is None, which
+                fits all graphs at once.
             fit_params: Fit parameters handed to :obj:`fit()`
 
         Returns:
@@ -287,12 +317,16 @@ class EnergyForceExtensiveLabelScaler(_ExtensiveMolecularScalerBase):
         """
         atoms = self._atomic_number
         energy, force = self._energy, self._force
-        return self.fit(
-            X=[item[atoms] for item in dataset],
-            y=([item[energy] for item in dataset], [item[force] for item in dataset]),
-            sample_weight=[item[self._sample_weight] for item in dataset] if self._sample_weight is not None else None,
-            **fit_params
-        )
+        for i, chunk in enumerate(iterate_chunks(dataset, chunk_size)):
+            fit_method = self.fit if i == 0 else self.partial_fit
+            fit_method(
+                X=[item[atoms] for item in chunk],
+                y=([item[energy] for item in chunk], [item[force] for item in chunk]),
+                sample_weight=[
+                    item[self._sample_weight] for item in chunk] if self._sample_weight is not None else None,
+                **fit_params
+            )
+        return self
 
     # noinspection PyPep8Naming
     def transform_dataset(self, dataset: List[Dict[str, np.ndarray]], copy: bool = True, copy_dataset: bool = False,
@@ -1,5 +1,6 @@
 import matplotlib.pyplot as plt
 import numpy as np
+import scipy.sparse as sp
 import os
 from typing import Union, List, Dict
 from sklearn.linear_model import Ridge
@@ -7,6 +8,31 @@ from kgcnn.data.utils import save_json_file, load_json_file
 from kgcnn.data.transform.scaler.serial import deserialize
 
 
+def iterate_chunks(dataset, chunk_size: int = None):
+    r"""Iterate over lists of consecutive graphs of a dataset.
+
+    Args:
+        dataset (list): Dataset or any iterable of graphs.
+        chunk_size (int): Number of graphs per chunk. Default is None, which gives the full dataset as one chunk.
+
+    Returns:
+        Iterator: Lists of graphs with at most `chunk_size` items.
+    """
+    if chunk_size is None:
+        yield dataset
+        return
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive, but got '%s'." % chunk_size)
+    chunk = []
+    for item in dataset:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if len(chunk) > 0:
+        yield chunk
+
+
 class _ExtensiveMolecularScalerBase:
     """Scaler base class for extensive properties like energy to remove a simple linear behaviour with additive atom
     contributions.
@@ -34,6 +60,26 @@ class _ExtensiveMolecularScalerBase:
         self._molecular_property = None
         self._atomic_number = None
         self._sample_weight = None
+        self._fit_statistics = None
+
+    def _composition(self, atomic_number) -> sp.csr_matrix:
+        r"""Sparse composition matrix with the count of each atomic number per molecule.
+
+        Args:
+            atomic_number (list): List of arrays of atomic numbers. Example [np.array([7,1,1,1]), ...].
+
+        Returns:
+            sp.csr_matrix: Composition matrix of shape `(n_samples, max_atomic_number)` .
+        """
+        atoms = [np.asarray(x).reshape(-1) for x in atomic_number]
+        lengths = np.array([len(x) for x in atoms], dtype="int64")
+        atoms = np.concatenate(atoms, axis=0).astype("int64") if len(atoms) > 0 else np.zeros(0, dtype="int64")
+        graph_id = np.repeat(np.arange(len(lengths), dtype="int64"), lengths)
+        # Duplicate entries of the same atomic number in a molecule are summed up into counts.
+        composition = sp.csr_matrix((np.ones(len(atoms)), (graph_id, atoms)),
+                                    shape=(len(lengths), self.max_atomic_number))
+        composition.sum_duplicates()
+        return composition
 
     def _fit(self, molecular_property, atomic_number, sample_weight=None):
         r"""Fit atomic number to the molecular properties.
@@ -52,27 +98,162 @@ class _ExtensiveMolecularScalerBase:
                     len(atomic_number), len(molecular_property))
             )
 
-        unique_number = [np.unique(x, return_counts=True) for x in atomic_number]
-        all_unique = np.unique(np.concatenate([x[0] for x in unique_number], axis=0))
+        composition = self._composition(atomic_number)
+        # Statistics of this batch are kept, so that the fit can be continued with `_partial_fit()` .
+        self._fit_statistics = None
+        self._update_statistics(molecular_property, composition, sample_weight=sample_weight)
+        # Number of molecules that contain each atomic number.
+        species_count = np.bincount(composition.indices, minlength=self.max_atomic_number)
+        all_unique = np.flatnonzero(species_count)
         self._fit_atom_selection = all_unique
         atom_mask = np.zeros(self.max_atomic_number, dtype="bool")
         atom_mask[all_unique] = True
         self._fit_atom_selection_mask = atom_mask
-        total_number = []
-        for unique_per_mol, num_unique in unique_number:
-            array_atoms = np.zeros(self.max_atomic_number)
-            array_atoms[unique_per_mol] = num_unique
-            positives = array_atoms[atom_mask]
-            total_number.append(positives)
-        total_number = np.array(total_number)
+        total_number = composition[:, all_unique].toarray()
         self.ridge.fit(total_number, molecular_property, sample_weight=sample_weight)
-        diff = molecular_property - self.ridge.predict(total_number)
+        # Newer scikit-learn versions return a flat prediction for a single target of shape `(n_samples, 1)` .
+        diff = molecular_property - np.reshape(self.ridge.predict(total_number), np.shape(molecular_property))
         if self._standardize_scale:
             self.scale_ = np.std(diff, axis=0)
         else:
             self.scale_ = np.ones(diff.shape[1:], dtype="float")
         return self
 
+    def _update_statistics(self, molecular_property, composition: sp.csr_matrix, sample_weight=None):
+        r"""Add sums of the composition and properties of a batch of molecules to the statistics of the fit.
+
+        Sums with and without sample weights are required for the ridge regression and the standard deviation of
+        the residuals, respectively. To avoid cancellation in the sums for properties with a large offset, like total
+        energies, the prediction of a least squares fit of the first batch is subtracted from the properties.
+
+        Args:
+            molecular_property (np.ndarray): Molecular properties of shape `(n_samples, n_properties)` .
+            composition (sp.csr_matrix): Composition matrix of shape `(n_samples, max_atomic_number)` .
+            sample_weight: Sample weights `(n_samples,)` . Default is None.
+        """
+        y = np.array(molecular_property, dtype="float64")
+        y_2d = np.reshape(y, (len(y), -1))
+        statistics = getattr(self, "_fit_statistics", None)
+        if statistics is None:
+            reference_coef, reference_intercept = self._reference_fit(y_2d, composition)
+        else:
+            reference_coef, reference_intercept = statistics["reference_coef"], statistics["reference_intercept"]
+        if statistics is not None and statistics["property_shape"] != y.shape[1:]:
+            raise ValueError("`ExtensiveMolecularScaler` got properties of shape '%s' but fitted '%s'." % (
+                y.shape[1:], statistics["property_shape"]))
+        y_2d = y_2d - composition @ reference_coef - reference_intercept
+        weight = np.ones(len(y)) if sample_weight is None else np.reshape(
+            np.array(sample_weight, dtype="float64"), (-1,))
+        weighted_composition = sp.diags(weight) @ composition
+        batch = {
+            "num_samples": len(y), "sum_x": np.asarray(composition.sum(axis=0)).reshape(-1),
+            "sum_y": np.sum(y_2d, axis=0), "sum_yy": np.sum(np.square(y_2d), axis=0),
+            "xx": (composition.T @ composition).toarray(), "xy": composition.T @ y_2d,
+            "sum_w": np.sum(weight), "sum_wx": np.asarray(weighted_composition.sum(axis=0)).reshape(-1),
+            "sum_wy": np.sum(np.expand_dims(weight, axis=-1) * y_2d, axis=0),
+            "wxx": (weighted_composition.T @ composition).toarray(), "wxy": weighted_composition.T @ y_2d,
+            "species_count": np.bincount(composition.indices, minlength=self.max_atomic_number)
+        }
+        if statistics is None:
+            self._fit_statistics = dict(batch, property_shape=y.shape[1:], reference_coef=reference_coef,
+                                        reference_intercept=reference_intercept)
+            return
+        for key, value in batch.items():
+            statistics[key] = statistics[key] + value
+
+    def _reference_fit(self, y_2d: np.ndarray, composition: sp.csr_matrix):
+        r"""Least squares fit of the properties of a batch of molecules, which is subtracted from the properties of
+        all batches in the statistics of the fit.
+
+        Args:
+            y_2d (np.ndarray): Molecular properties of shape `(n_samples, n_properties)` .
+            composition (sp.csr_matrix): Composition matrix of shape `(n_samples, max_atomic_number)` .
+
+        Returns:
+            tuple: Coefficients of shape `(max_atomic_number, n_properties)` and intercept of shape `(n_properties, )`.
+        """
+        species = np.flatnonzero(np.bincount(composition.indices, minlength=self.max_atomic_number))
+        x = composition[:, species].toarray()
+        if self.ridge.fit_intercept:
+            x = np.concatenate([x, np.ones((len(x), 1))], axis=-1)
+        solution = np.linalg.lstsq(x, y_2d, rcond=None)[0]
+        coef = np.zeros((self.max_atomic_number, y_2d.shape[1]))
+        coef[species] = solution[:len(species)]
+        intercept = solution[-1] if self.ridge.fit_intercept else np.zeros(y_2d.shape[1])
+        return coef, intercept
+
+    def _partial_fit(self, molecular_property, atomic_number, sample_weight=None):
+        r"""Update the fit with a batch of molecules, e.g. for datasets that do not fit into memory.
+
+        Sums of the composition and properties of all batches are accumulated, from which the normal equations of
+        the ridge regression and the standard deviation of the residuals are computed. The result matches
+        :obj:`_fit()` on all samples up to numerical precision. Note that the normal equations are solved directly,
+        which is the 'cholesky' solver of :obj:`Ridge()` . Calling :obj:`_fit()` resets the statistics.
+        Statistics are not saved with the scaler, so that a loaded scaler can not be updated by :obj:`_partial_fit()` .
+
+        Args:
+            molecular_property (np.ndarray): Molecular properties of shape `(n_samples, n_properties)` .
+            atomic_number (list): List of arrays of atomic numbers. Example [np.array([7,1,1,1]), ...].
+            sample_weight: Sample weights `(n_samples,)` . Default is None.
+
+        Returns:
+            self
+        """
+        if len(atomic_number) != len(molecular_property):
+            raise ValueError(
+                "`ExtensiveMolecularScaler` different input shape '{0}' vs. '{1}'.".format(
+                    len(atomic_number), len(molecular_property))
+            )
+        if self._fit_statistics is None and self.scale_ is not None:
+            raise ValueError(
+                "`ExtensiveMolecularScaler` has no statistics of the previous fit, e.g. after `load()` , to continue "
+                "with `partial_fit()` . Fit the scaler again on all samples.")
+        self._update_statistics(molecular_property, self._composition(atomic_number), sample_weight=sample_weight)
+        stats = self._fit_statistics
+        all_unique = np.flatnonzero(stats["species_count"])
+        self._fit_atom_selection = all_unique
+        atom_mask = np.zeros(self.max_atomic_number, dtype="bool")
+        atom_mask[all_unique] = True
+        self._fit_atom_selection_mask = atom_mask
+
+        # Normal equations of the ridge regression with intercept from weighted and centered sums. The sums are of
+        # the properties minus the reference fit, which is added to the coefficients and intercept afterwards.
+        # The penalty of the ridge regression is on the full coefficients, which requires to subtract `alpha` times
+        # the reference coefficients on the right-hand side.
+        reference_coef = stats["reference_coef"][all_unique]
+        xx, xy = stats["wxx"][np.ix_(all_unique, all_unique)], stats["wxy"][all_unique]
+        if self.ridge.fit_intercept:
+            mean_x, mean_y = stats["sum_wx"][all_unique] / stats["sum_w"], stats["sum_wy"] / stats["sum_w"]
+            xx = xx - stats["sum_w"] * np.outer(mean_x, mean_x)
+            xy = xy - stats["sum_w"] * np.outer(mean_x, mean_y)
+        alpha = np.broadcast_to(np.array(self.ridge.alpha, dtype="float64"), xy.shape[1:])
+        xy = xy - alpha * reference_coef
+        coef = np.stack([np.linalg.solve(xx + a * np.eye(len(all_unique)), xy[:, i]) for i, a in enumerate(alpha)],
+                        axis=-1)
+        intercept = mean_y - mean_x @ coef if self.ridge.fit_intercept else np.zeros(coef.shape[1])
+
+        # Standard deviation of the residuals without weights from the sums of all samples.
+        num_samples, sum_x, xx_all = stats["num_samples"], stats["sum_x"][all_unique], stats["xx"][
+            np.ix_(all_unique, all_unique)]
+        sum_prediction = sum_x @ coef + num_samples * intercept
+        sum_residual = stats["sum_y"] - sum_prediction
+        sum_squared_residual = (stats["sum_yy"] - 2 * np.sum(coef * stats["xy"][all_unique], axis=0)
+                                - 2 * intercept * stats["sum_y"] + np.sum(coef * (xx_all @ coef), axis=0)
+                                + 2 * intercept * (sum_x @ coef) + num_samples * np.square(intercept))
+        variance = np.maximum(sum_squared_residual / num_samples - np.square(sum_residual / num_samples), 0.0)
+        coef, intercept = coef + reference_coef, intercept + stats["reference_intercept"]
+
+        # Set attributes of the ridge regression like after `fit()` for one or more targets.
+        is_single = len(stats["property_shape"]) == 0
+        self.ridge.coef_ = coef[:, 0] if is_single else np.transpose(coef)
+        self.ridge.intercept_ = (intercept[0] if is_single else intercept) if self.ridge.fit_intercept else 0.0
+        self.ridge.n_features_in_ = len(all_unique)
+        if self._standardize_scale:
+            self.scale_ = np.reshape(np.sqrt(variance), stats["property_shape"])
+        else:
+            self.scale_ = np.ones(stats["property_shape"], dtype="float")
+        return self
+
     def _predict(self, atomic_number):
         """Predict the offset form atomic numbers. Requires :obj:`fit()` called previously.
 
@@ -84,17 +265,13 @@ class _ExtensiveMolecularScalerBase:
         """
         if self._fit_atom_selection_mask is None:
             raise ValueError("`ExtensiveMolecularScaler` has not been fitted yet. Can not predict.")
-        unique_number = [np.unique(x, return_counts=True) for x in atomic_number]
-        total_number = []
-        for unique_per_mol, num_unique in unique_number:
-            array_atoms = np.zeros(self.max_atomic_number)
-            array_atoms[unique_per_mol] = num_unique
-            positives = array_atoms[self._fit_atom_selection_mask]
-            if np.sum(positives) != np.sum(num_unique):
-                print("`ExtensiveMolecularScaler` got unknown atom species in transform.")
-            total_number.append(positives)
-        total_number = np.array(total_number)
+        composition = self._composition(atomic_number)
+        total_number = composition[:, np.flatnonzero(self._fit_atom_selection_mask)].toarray()
+        if np.sum(total_number) != composition.sum():
+            print("`ExtensiveMolecularScaler` got unknown atom species in transform.")
         offset = self.ridge.predict(total_number)
+        if self.scale_ is not None and np.ndim(self.scale_) == 1 and np.ndim(offset) == 1:
+            offset = np.expand_dims(offset, axis=-1)
         return offset
 
     def _plot_predict(self, molecular_property: np.ndarray, atomic_number: List[np.ndarray]):
@@ -190,7 +367,9 @@ class _ExtensiveMolecularScalerBase:
             config (dict): Config dictionary.
         """
         self._standardize_scale = config["standardize_scale"]
-        config_ridge = {key: value for key, value in config.items() if key not in ["standardize_scale"]}
+        # Config of subclasses also has the names of properties, which are not parameters of the ridge regression.
+        params_ridge = self.ridge.get_params()
+        config_ridge = {key: value for key, value in config.items() if key in params_ridge}
         self.ridge.set_params(**config_ridge)
         return self
 
@@ -210,6 +389,8 @@ class _ExtensiveMolecularScalerBase:
         Args:
             weights (dict): Weight dictionary.
         """
+        # Statistics of a previous fit do not belong to the new weights.
+        self._fit_statistics = None
         for item, value in weights.items():
             if item in self._attributes_list_mol:
                 setattr(self, item, np.array(value))
@@ -265,20 +446,26 @@ class _ExtensiveMolecularScalerBase:
 
     # Similar functions that work on dataset plus property names.
     # noinspection PyPep8Naming
-    def fit_dataset(self, dataset: List[Dict[str, np.ndarray]]):
+    def fit_dataset(self, dataset: List[Dict[str, np.ndarray]], chunk_size: int = None):
         r"""Fit to dataset with relevant `X` , `y` information.
 
         Args:
-            dataset (list): Dataset of type `List[Dict]` with dictionary of numpy arrays.
+            dataset (list): Dataset of type `List[Dict]` with dictionary of numpy arrays. With `chunk_size` , this can
+                also be an iterable of graphs, e.g. read from a file.
+            chunk_size (int): Number of graphs to fit at once with :obj:`_partial_fit()` . Default is None, which
+                fits all graphs at once.
 
         Returns:
             self.
         """
-        return self._fit(
-            molecular_property=np.array([item[self._molecular_property] for item in dataset]),
-            atomic_number=[item[self._atomic_number] for item in dataset],
-            sample_weight=[item[self._sample_weight] for item in dataset] if self._sample_weight is not None else None
-        )
+        for i, chunk in enumerate(iterate_chunks(dataset, chunk_size)):
+            fit_method = self._fit if i == 0 else self._partial_fit
+            fit_method(
+                molecular_property=np.array([item[self._molecular_property] for item in chunk]),
+                atomic_number=[item[self._atomic_number] for item in chunk],
+                sample_weight=[item[self._sample_weight] for item in chunk] if self._sample_weight is not None else None
+            )
+        return self
 
     # noinspection PyPep8Naming
     def transform_dataset(self, dataset: List[Dict[str, np.ndarray]],
@@ -402,6 +589,22 @@ class ExtensiveMolecularScaler(_ExtensiveMolecularScalerBase):
         return super(ExtensiveMolecularScaler, self)._fit(
             molecular_property=X, atomic_number=atomic_number, sample_weight=sample_weight)
 
+    # noinspection PyPep8Naming
+    def partial_fit(self, X, *, y: Union[None, np.ndarray] = None, sample_weight=None, atomic_number=None):
+        r"""Update the fit with a batch of molecules. Successive calls match :obj:`fit()` on all batches.
+
+        Args:
+            X (np.ndarray): Array of atomic properties of shape `(n_samples, n_properties)`.
+            y (np.ndarray): Ignored.
+            atomic_number (list): List of arrays of atomic numbers. Example [np.array([7,1,1,1]), ...].
+            sample_weight: Sample weights `(n_samples,)` . Default is None.
+
+        Returns:
+            self.
+        """
+        return super(ExtensiveMolecularScaler, self)._partial_fit(
+            molecular_property=X, atomic_number=atomic_number, sample_weight=sample_weight)
+
     # noinspection PyPep8Naming
     def transform(self, X, *, y=None, copy=True, atomic_number=None):
         """Transform any atomic number list with matching properties based on previous fit with sequential std-scaling.
@@ -523,6 +726,26 @@ class ExtensiveMolecularLabelScaler(_ExtensiveMolecularScalerBase):
         return super(ExtensiveMolecularLabelScaler, self)._fit(
             molecular_property=y, sample_weight=sample_weight, atomic_number=atomic_number)
 
+    # noinspection PyPep8Naming
+    def partial_fit(self, y: Union[None, list, np.ndarray] = None, *, X=None, sample_weight=None, atomic_number=None):
+        """Update the fit with a batch of labels. Successive calls match :obj:`fit()` on all batches.
+
+        Args:
+            y: Array of atomic labels of shape `(n_samples, n_labels)`.
+            X: List of array of atomic numbers. Example [np.array([7,1,1,1]), ...].
+            atomic_number (list): List of arrays of atomic numbers. Example [np.array([7,1,1,1]), ...].
+                Optional, since they should be contained in `X` . Note that if assigning `atomic_numbers`
+                then `X` is ignored.
+            sample_weight: Sample weights `(n_samples,)` . Default is None.
+
+        Returns:
+            self.
+        """
+        self._assert_has_y(y)
+        atomic_number = atomic_number if atomic_number else X
+        return super(ExtensiveMolecularLabelScaler, self)._partial_fit(
+            molecular_property=y, sample_weight=sample_weight, atomic_number=atomic_number)
+
     # noinspection PyPep8Naming
     def transform(self, y=None, *, X=None, copy=True, atomic_number=None):
         """Transform any atomic number list with matching labels based on previous fit with sequential std-scaling.
@@ -725,6 +948,30 @@ class QMGraphLabelScaler:
 
         return self
 
+    # noinspection PyPep8Naming
+    def partial_fit(self, y: Union[np.ndarray, List[np.ndarray]] = None,
+                    X: Union[np.ndarray, List[np.ndarray], None] = None,
+                    atomic_number: Union[np.ndarray, List[np.ndarray], None] = None,
+                    sample_weight=None):
+        r"""Update the fit of each scaler in list with a batch of QM graph labels or targets.
+        All scalers in list must support `partial_fit` .
+
+        Args:
+            y (np.ndarray): Array of atomic labels of shape `(n_samples, n_labels)`.
+            X (np.ndarray): Ignored.
+            atomic_number (list): List of arrays of atomic numbers. Example [np.array([7,1,1,1]), ...].
+            sample_weight: Sample weights `(n_samples,)` . Default is None.
+
+        Returns:
+            self
+        """
+        labels, atomic_number = self._check_input(atomic_number, X, y)
+
+        for i, x in enumerate(self.scaler_list):
+            x.partial_fit([d[i:i + 1] for d in labels], atomic_number=atomic_number, sample_weight=sample_weight)
+
+        return self
+
     # noinspection PyPep8Naming
     def inverse_transform(self, y: Union[np.ndarray, List[np.ndarray]] = None,
                           X: Union[np.ndarray, List[np.ndarray], None] = None,
@@ -852,24 +1099,29 @@ class QMGraphLabelScaler:
 
     # Similar functions that work on dataset plus property names.
     # noinspection PyPep8Naming
-    def fit_dataset(self, dataset: List[Dict[str, np.ndarray]]):
+    def fit_dataset(self, dataset: List[Dict[str, np.ndarray]], chunk_size: int = None):
         r"""Fit to dataset with relevant `X` , `y` information.
 
         Args:
-            dataset (list): Dataset of type `List[Dict]` with dictionary of numpy arrays.
-
+            dataset (list): Dataset of type `List[Dict]` with dictionary of numpy arrays. With `chunk_size` , this can
+                also be an iterable of graphs, e.g. read from a file.
+            chunk_size (int): Number of graphs to fit at once with :obj:`partial_fit()` . Default is None, which
+                fits all graphs at once.
 
         Returns:
             self.
         """
-        return self.fit(
-            y=[item[self._n_y] for item in dataset],
-            X=[item[self._n_X] for item in dataset] if self._n_X is not None else None,
-            atomic_number=[
-                item[self._n_atomic_number] for item in dataset] if self._n_atomic_number is not None else None,
-            sample_weight=[
-                item[self._n_sample_weight] for item in dataset] if self._n_sample_weight is not None else None
-        )
+        for i, chunk in enumerate(iterate_chunks(dataset, chunk_size)):
+            fit_method = self.fit if i == 0 else self.partial_fit
+            fit_method(
+                y=[item[self._n_y] for item in chunk],
+                X=[item[self._n_X] for item in chunk] if self._n_X is not None else None,
+                atomic_number=[
+                    item[self._n_atomic_number] for item in chunk] if self._n_atomic_number is not None else None,
+                sample_weight=[
+                    item[self._n_sample_weight] for item in chunk] if self._n_sample_weight is not None else None
+            )
+        return self
 
     # noinspection PyPep8Naming
     def transform_dataset(self, dataset: List[Dict[str, np.ndarray]],
@@ -1,6 +1,5 @@
 import pickle
 import logging
-import tensorflow as tf
 import numpy as np
 import yaml
 import json
@@ -153,6 +152,7 @@ def ragged_tensor_from_nested_numpy(numpy_list: list, dtype: str = None, row_spl
     Returns:
         tf.RaggedTensor: Ragged tensor of former nested list of numpy arrays.
     """
+    import tensorflow as tf
     return tf.RaggedTensor.from_row_lengths(
         np.concatenate(numpy_list, axis=0, dtype=dtype), np.array([len(x) for x in numpy_list], dtype=row_splits_dtype))
 
@@ -169,13 +169,12 @@ def pad_np_array_list_batch_dim(values: list, dtype: str = None):
     """
     max_shape = np.amax([x.shape for x in values], axis=0)
     final_shape = np.concatenate([np.array([len(values)], dtype="int64"), np.array(max_shape, dtype="int64")])
-    padded = np.zeros(final_shape, dtype=values[0].dtype)
+    # Allocate with final dtype to avoid a copy of the padded array for casting.
+    padded = np.zeros(final_shape, dtype=dtype if dtype is not None else values[0].dtype)
     mask = np.zeros(final_shape, dtype="bool")
     for i, x in enumerate(values):
         # noinspection PyTypeChecker
         index = [i] + [slice(0, int(j)) for j in x.shape]
         padded[tuple(index)] = x
         mask[tuple(index)] = True
-    if dtype is not None:
-        padded = padded.astype(dtype=dtype)
     return padded, mask
@@ -2,12 +2,14 @@ from ._adj import (
     get_angle_indices, coordinates_to_distancematrix, invert_distance,
     define_adjacency_from_distance, sort_edge_indices, get_angle, add_edges_reverse_indices,
     rescale_edge_weights_degree_sym, add_self_loops_to_edge_indices, compute_reverse_edges_index_map,
-    distance_to_gauss_basis, get_angle_between_edges, convert_scaled_adjacency_to_list
+    distance_to_gauss_basis, get_angle_between_edges, convert_scaled_adjacency_to_list, propagate_node_attributes
 )
 from ._geom import (
     get_principal_moments_of_inertia,
     shift_coordinates_to_unit_cell, distance_for_range_indices, distance_for_range_indices_periodic,
-    coulomb_matrix_to_inverse_distance_proton, coordinates_from_distance_matrix
+    coulomb_matrix_to_inverse_distance_proton, coordinates_from_distance_matrix,
+    make_acsf_radial_parameters, make_acsf_angular_parameters, make_acsf_element_pair_mapping,
+    compute_acsf_radial, compute_acsf_angular
 )
 from ._periodic import (
     range_neighbour_lattice
@@ -19,10 +21,13 @@ __all__ = [
     "define_adjacency_from_distance", "sort_edge_indices", "get_angle", "add_edges_reverse_indices",
     "rescale_edge_weights_degree_sym", "add_self_loops_to_edge_indices", "compute_reverse_edges_index_map",
     "distance_to_gauss_basis", "get_angle_between_edges", "convert_scaled_adjacency_to_list",
+    "propagate_node_attributes",
     # geom
     "get_principal_moments_of_inertia",
     "shift_coordinates_to_unit_cell", "distance_for_range_indices", "distance_for_range_indices_periodic",
     "coulomb_matrix_to_inverse_distance_proton", "coordinates_from_distance_matrix",
+    "make_acsf_radial_parameters", "make_acsf_angular_parameters", "make_acsf_element_pair_mapping",
+    "compute_acsf_radial", "compute_acsf_angular",
     # periodic
     "range_neighbour_lattice"
 ]
@@ -297,6 +297,42 @@ def make_adjacency_from_edge_indices(edge_indices, edge_values=None, shape=None)
     return out_adj
 
 
+def propagate_node_attributes(node_attributes, edge_indices, edge_weights=None, hops: list = None,
+                              alpha: float = None):
+    r"""Propagate node attributes with the (pre-scaled) adjacency matrix :math:`A` given by edge indices and weights
+    for a fixed number of steps :math:`k` , which is :math:`H_k = A^k X` as in
+    `SGC <https://arxiv.org/abs/1902.07153>`__ . With a teleport probability :math:`\alpha` , the propagation is the
+    personalized PageRank iteration :math:`H_k = (1-\alpha) A H_{k-1} + \alpha X` of
+    `APPNP <https://arxiv.org/abs/1810.05997>`__ . The propagated attributes for all steps in `hops` are computed with
+    one sequence of sparse matrix products and concatenated along the last axis.
+
+    Args:
+        node_attributes (np.ndarray): Node attributes :math:`X` of shape `(N, F)` .
+        edge_indices (np.ndarray): Index-list referring to nodes of shape `(M, 2)` .
+        edge_weights (np.ndarray): Edge weights matching indices of shape `(M, 1)` . Default is None, which uses ones.
+        hops (list): Number of propagation steps to return. Zero returns the node attributes. Default is `[2]` .
+        alpha (float): Teleport probability of APPNP. Default is None, which is :math:`A^k X` .
+
+    Returns:
+        np.ndarray: Propagated node attributes of shape `(N, len(hops) * F)` .
+    """
+    hops = [2] if hops is None else list(hops)
+    node_attributes = np.asarray(node_attributes)
+    x = np.reshape(node_attributes, (len(node_attributes), -1)).astype("float64")
+    if edge_weights is not None:
+        edge_weights = np.reshape(edge_weights, (-1,))
+    adj = make_adjacency_from_edge_indices(
+        np.reshape(edge_indices, (-1, 2)), edge_weights, shape=(len(x), len(x))).tocsr()
+    h = x
+    propagated = {0: x}
+    for k in range(1, max(hops) + 1):
+        h = adj.dot(h) if alpha is None else (1.0 - alpha) * adj.dot(h) + alpha * x
+        if k in hops:
+            propagated[k] = h
+    out = np.concatenate([propagated[k] for k in hops], axis=-1)
+    return out.astype(node_attributes.dtype if np.issubdtype(node_attributes.dtype, np.floating) else "float32")
+
+
 def get_angle_indices(idx, check_sorted: bool = True, allow_multi_edges: bool = False,
                       allow_self_edges: bool = False, allow_reverse_edges: bool = False,
                       edge_pairing: str = "jk"):
@@ -276,3 +276,200 @@ def distance_for_range_indices_periodic(coordinates: np.ndarray,
             dist = np.expand_dims(dist, axis=-1)
     return dist
 
+
+
+_acsf_max_atomic_number = 96
+
+
+def _acsf_reverse_mapping(element_mapping: np.ndarray) -> np.ndarray:
+    reverse_mapping = np.full(_acsf_max_atomic_number, np.iinfo("int64").max, dtype="int64")
+    reverse_mapping[np.asarray(element_mapping, dtype="int64")] = np.arange(len(element_mapping))
+    return reverse_mapping
+
+
+def _acsf_cutoff(distance: np.ndarray, cutoff: np.ndarray) -> np.ndarray:
+    return (np.cos(np.clip(distance, -cutoff, cutoff) * np.pi / cutoff) + 1.0) * 0.5
+
+
+def make_acsf_radial_parameters(eta: list, rs: list, rc: float, elements: list, **kwargs) -> dict:
+    r"""Make the parameter table of the radial atom-centered symmetry functions :math:`G_{i}^{2}` from lists of
+    :math:`\eta` and :math:`R_s` with a single cutoff :math:`R_c` , which is shared by all elements.
+
+    Args:
+        eta (list): List of etas.
+        rs (list): List of rs.
+        rc (float): Single Cutoff value.
+        elements (list): List of elements.
+
+    Returns:
+        dict: Kwargs for :obj:`compute_acsf_radial` with `eta_rs_rc` of shape `(N, m, 3)` .
+    """
+    eta_rs_rc = [(et, rs_, rc) for rs_ in rs for et in eta]
+    elements = np.sort(elements)
+    params = np.broadcast_to(eta_rs_rc, (len(elements), len(eta_rs_rc), 3))
+    return {"eta_rs_rc": params, "element_mapping": elements, **kwargs}
+
+
+def make_acsf_angular_parameters(eta: list, zeta: list, lamda: list, rc: float, elements: list, **kwargs) -> dict:
+    r"""Make the parameter table of the angular atom-centered symmetry functions :math:`G_{i}^{4}` from lists of
+    :math:`\eta` , :math:`\zeta` and :math:`\lambda` with a single cutoff :math:`R_c` , which is shared by all
+    unordered element pairs.
+
+    Args:
+        eta (list): List of etas.
+        zeta (list): List of zeta.
+        lamda (list): List of lamda.
+        rc (float): Single Cutoff value.
+        elements (list): List of elements.
+
+    Returns:
+        dict: Kwargs for :obj:`compute_acsf_angular` with `eta_zeta_lambda_rc` of shape `(N(N+1)/2, m, 4)` .
+    """
+    eta_zeta_lambda_rc = [[et, z, la, rc] for et in eta for z in zeta for la in lamda]
+    elements = np.sort(elements)
+    params = np.broadcast_to(
+        eta_zeta_lambda_rc, (int(len(elements) * (len(elements) + 1) / 2), len(eta_zeta_lambda_rc), 4))
+    return {"eta_zeta_lambda_rc": params, "element_mapping": elements, "element_pair_mapping": None, **kwargs}
+
+
+def make_acsf_element_pair_mapping(element_mapping: np.ndarray, keep_pair_order: bool = False) -> np.ndarray:
+    r"""Make all pairs of atomic numbers of the angular symmetry functions in the order of the parameter table.
+
+    Args:
+        element_mapping (np.ndarray): Atomic numbers of elements of shape `(N, )` .
+        keep_pair_order (bool): Whether to keep ordered pairs, which gives `N*N` instead of `N(N+1)/2` pairs.
+
+    Returns:
+        np.ndarray: Pairs of atomic numbers of shape `(M, 2)` .
+    """
+    element_pair_index = np.expand_dims(np.asarray(element_mapping, dtype="int"), axis=-1)
+    num_elements = len(element_pair_index)
+    element_pair_mapping = np.concatenate([
+        np.repeat(np.expand_dims(element_pair_index, axis=0), num_elements, axis=0),
+        np.repeat(np.expand_dims(element_pair_index, axis=1), num_elements, axis=1)
+    ], axis=-1).reshape((-1, 2))
+    if not keep_pair_order:
+        element_pair_mapping = np.sort(element_pair_mapping, axis=-1)
+        element_pair_mapping = element_pair_mapping[
+            np.sort(np.unique(element_pair_mapping, axis=0, return_index=True)[1])]
+    return element_pair_mapping
+
+
+def compute_acsf_radial(node_number: np.ndarray, node_coordinates: np.ndarray, edge_indices: np.ndarray,
+                        eta_rs_rc: np.ndarray, element_mapping: np.ndarray, add_eps: bool = False,
+                        epsilon: float = 1e-7, chunk_size: int = None) -> np.ndarray:
+    r"""Compute the radial atom-centered symmetry functions of
+    `Behler (2011) <https://aip.scitation.org/doi/full/10.1063/1.3553717>`__ for a single graph:
+
+    .. math::
+
+        G_{i}^{2} = \sum_{j \neq i} \; e^{−\eta \, (r_{ij} − \mu)^{2} } \; f_c(r_{ij})
+
+    with :math:`f_c(r_{ij}) = 0.5 [\cos{\frac{\pi r_{ij}}{R_c}} + 1]` , summed separately for each element of
+    :math:`j` . Matches the layer :obj:`ACSFG2` of :obj:`kgcnn.literature.HDNNP2nd` .
+
+    Args:
+        node_number (np.ndarray): Atomic numbers of shape `(N, )` .
+        node_coordinates (np.ndarray): Node coordinates of shape `(N, 3)` .
+        edge_indices (np.ndarray): Edge indices referring to nodes of shape `(M, 2)` .
+        eta_rs_rc (np.ndarray): Parameters of shape `(N, N, m, 3)` or `(N, m, 3)` for the `N` elements.
+        element_mapping (np.ndarray): Atomic numbers of the elements in :obj:`eta_rs_rc` of shape `(N, )` .
+        add_eps (bool): Whether to add :obj:`epsilon` to the squared distance. Default is False.
+        epsilon (float): Epsilon to add to squared distances. Default is 1e-7.
+        chunk_size (int): Number of edges to process at once to bound memory. Default is None.
+
+    Returns:
+        np.ndarray: Atomic representation of shape `(N, N*m)` .
+    """
+    z = np.asarray(node_number, dtype="int64")
+    xyz = np.asarray(node_coordinates, dtype="float64")
+    ij = np.asarray(edge_indices, dtype="int64")
+    eta_rs_rc = np.asarray(eta_rs_rc, dtype="float64")
+    use_target_set = len(eta_rs_rc.shape) == 4
+    num_relations = eta_rs_rc.shape[1] if use_target_set else eta_rs_rc.shape[0]
+    num_params = eta_rs_rc.shape[-2]
+    reverse_mapping = _acsf_reverse_mapping(element_mapping)
+    eps = epsilon if add_eps else 0.0
+    out = np.zeros((len(z) * num_relations, num_params), dtype="float64")
+    chunk_size = len(ij) if not chunk_size else chunk_size
+    for start in range(0, len(ij), max(chunk_size, 1)):
+        i, j = ij[start:start + chunk_size, 0], ij[start:start + chunk_size, 1]
+        zi_map, zj_map = reverse_mapping[z[i]], reverse_mapping[z[j]]
+        params = eta_rs_rc[zi_map, zj_map] if use_target_set else eta_rs_rc[zj_map]
+        rij = np.sqrt(np.sum(np.square(xyz[i] - xyz[j]), axis=-1, keepdims=True) + eps)
+        eta, mu, cutoff = params[..., 0], params[..., 1], params[..., 2]
+        rep = np.exp(-np.square(rij - mu) * eta) * _acsf_cutoff(rij, cutoff)
+        np.add.at(out, i * num_relations + zj_map, rep)
+    return out.reshape((len(z), num_relations * num_params))
+
+
+def compute_acsf_angular(node_number: np.ndarray, node_coordinates: np.ndarray, angle_indices: np.ndarray,
+                         eta_zeta_lambda_rc: np.ndarray, element_mapping: np.ndarray,
+                         element_pair_mapping: np.ndarray = None, keep_pair_order: bool = False,
+                         multiplicity: float = None, add_eps: bool = False, epsilon: float = 1e-7,
+                         chunk_size: int = None) -> np.ndarray:
+    r"""Compute the angular atom-centered symmetry functions of
+    `Behler (2011) <https://aip.scitation.org/doi/full/10.1063/1.3553717>`__ for a single graph:
+
+    .. math::
+
+        G_{i}^{4} = 2^{1-\zeta} \sum_{j,k \neq i} (1 + \lambda \cos \theta_{ijk})^{\zeta} \;
+        e^{-\eta (r_{ij}^2 + r_{ik}^2 + r_{jk}^2)} \; f_c(r_{ij}) \, f_c(r_{ik}) \, f_c(r_{jk})
+
+    summed separately for each element pair of :math:`j, k` . Matches the layer :obj:`ACSFG4` of
+    :obj:`kgcnn.literature.HDNNP2nd` .
+
+    Args:
+        node_number (np.ndarray): Atomic numbers of shape `(N, )` .
+        node_coordinates (np.ndarray): Node coordinates of shape `(N, 3)` .
+        angle_indices (np.ndarray): Angle indices referring to nodes of shape `(K, 3)` .
+        eta_zeta_lambda_rc (np.ndarray): Parameters of shape `(N, M, m, 4)` or `(M, m, 4)` for `M` element pairs.
+        element_mapping (np.ndarray): Atomic numbers of the elements of shape `(N, )` .
+        element_pair_mapping (np.ndarray): Atomic number pairs of shape `(M, 2)` . Default is None, which uses
+            :obj:`make_acsf_element_pair_mapping` .
+        keep_pair_order (bool): Whether parameters are given for ordered element pairs. Default is False.
+        multiplicity (float): Angle term is divided by multiplicity, if not None. Default is None.
+        add_eps (bool): Whether to add :obj:`epsilon` to the squared distance. Default is False.
+        epsilon (float): Epsilon to add to squared distances. Default is 1e-7.
+        chunk_size (int): Number of angles to process at once, which bounds the memory of the angular term for
+            large systems. Default is None.
+
+    Returns:
+        np.ndarray: Atomic representation of shape `(N, M*m)` .
+    """
+    z = np.asarray(node_number, dtype="int64")
+    xyz = np.asarray(node_coordinates, dtype="float64")
+    ijk = np.asarray(angle_indices, dtype="int64")
+    eta_zeta_lambda_rc = np.asarray(eta_zeta_lambda_rc, dtype="float64")
+    use_target_set = len(eta_zeta_lambda_rc.shape) == 4
+    num_relations = eta_zeta_lambda_rc.shape[1] if use_target_set else eta_zeta_lambda_rc.shape[0]
+    num_params = eta_zeta_lambda_rc.shape[-2]
+    if element_pair_mapping is None:
+        element_pair_mapping = make_acsf_element_pair_mapping(element_mapping, keep_pair_order=keep_pair_order)
+    reverse_mapping = _acsf_reverse_mapping(element_mapping)
+    reverse_pair_mapping = np.full((_acsf_max_atomic_number, _acsf_max_atomic_number), np.iinfo("int64").max,
+                                   dtype="int64")
+    for n, (zj, zk) in enumerate(np.asarray(element_pair_mapping, dtype="int64")):
+        reverse_pair_mapping[zj, zk] = n
+        if not keep_pair_order:
+            reverse_pair_mapping[zk, zj] = n
+    eps = epsilon if add_eps else 0.0
+    out = np.zeros((len(z) * num_relations, num_params), dtype="float64")
+    chunk_size = len(ijk) if not chunk_size else chunk_size
+    for start in range(0, len(ijk), max(chunk_size, 1)):
+        i, j, k = [ijk[start:start + chunk_size, n] for n in range(3)]
+        zi_map = reverse_mapping[z[i]]
+        zjk_map = reverse_pair_mapping[z[j], z[k]]
+        params = eta_zeta_lambda_rc[zi_map, zjk_map] if use_target_set else eta_zeta_lambda_rc[zjk_map]
+        eta, zeta, lamda, cutoff = [params[..., n] for n in range(4)]
+        vij, vik, vjk = xyz[i] - xyz[j], xyz[i] - xyz[k], xyz[j] - xyz[k]
+        rij, rik, rjk = [np.sqrt(np.sum(np.square(v), axis=-1, keepdims=True) + eps) for v in [vij, vik, vjk]]
+        rep = np.ones_like(eta)
+        for r in [rij, rik, rjk]:
+            rep = rep * _acsf_cutoff(r, cutoff) * np.exp(-np.square(r) * eta)
+        cos_theta = np.sum(vij * vik, axis=-1, keepdims=True) / rij / rik
+        cos_term = np.power(2.0, 1.0 - zeta) * np.power(cos_theta * lamda + 1.0, zeta)
+        if multiplicity is not None:
+            cos_term = cos_term / multiplicity
+        np.add.at(out, i * num_relations + zjk_map, rep * cos_term)
+    return out.reshape((len(z), num_relations * num_params))
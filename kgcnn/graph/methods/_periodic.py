@@ -1,6 +1,5 @@
 import numpy as np
 from typing import Union
-from pymatgen.optimization.neighbors import find_points_in_spheres
 
 
 def range_neighbour_lattice(coordinates: np.ndarray, lattice: np.ndarray,
@@ -82,6 +81,8 @@ def range_neighbour_lattice(coordinates: np.ndarray, lattice: np.ndarray,
         else:
             radius = max(max_distance, estimated_nn_radius)
 
+    # Imported here, so that pymatgen is only required for periodic graphs.
+    from pymatgen.optimization.neighbors import find_points_in_spheres
     _max_iter_nn_test = 100
     _iter_required = 0
     index1, index2, offset_vectors, distances = None, None, None, None
@@ -209,6 +209,46 @@ class NormalizeEdgeWeightsSymmetric(GraphPreProcessorBase):
         return edge_weights
 
 
+class PropagateNodeAttributes(GraphPreProcessorBase):
+    r"""Propagate :obj:`node_attributes` with the adjacency matrix of :obj:`edge_indices` and :obj:`edge_weights`
+    for a fixed number of steps, i.e. :math:`A^k X` for each :math:`k` in `hops` , which are concatenated.
+    With fixed, normalized edge weights this precomputes the message passing of
+    `SGC <https://arxiv.org/abs/1902.07153>`__ or, with teleport probability `alpha` ,
+    `APPNP <https://arxiv.org/abs/1810.05997>`__ once, so that a model only needs a node-wise MLP.
+    See :obj:`kgcnn.graph.methods.propagate_node_attributes` .
+
+    Args:
+        node_attributes (str): Name of node attributes to propagate. Default is "node_attributes".
+        edge_indices (str): Name of indices in dictionary. Default is "edge_indices".
+        edge_weights (str): Name of edge weights in dictionary. Default is "edge_weights".
+        node_attributes_propagated (str): Name of propagated attributes to set in dictionary.
+            Default is "node_attributes_propagated".
+        hops (list): Number of propagation steps to compute. Default is `[2]` .
+        alpha (float): Teleport probability of APPNP. Default is None.
+    """
+
+    def __init__(self, *, node_attributes: str = "node_attributes", edge_indices: str = "edge_indices",
+                 edge_weights: str = "edge_weights", node_attributes_propagated: str = "node_attributes_propagated",
+                 hops: list = None, alpha: float = None, name="propagate_node_attributes", **kwargs):
+        super().__init__(name=name, **kwargs)
+        hops = [2] if hops is None else list(hops)
+        self._to_obtain.update({"node_attributes": node_attributes, "edge_indices": edge_indices,
+                                "edge_weights": edge_weights})
+        self._to_assign = node_attributes_propagated
+        self._call_kwargs = {"hops": hops, "alpha": alpha}
+        self._silent = ["edge_weights"]
+        self._config_kwargs.update({"node_attributes": node_attributes, "edge_indices": edge_indices,
+                                    "edge_weights": edge_weights,
+                                    "node_attributes_propagated": node_attributes_propagated,
+                                    **self._call_kwargs})
+
+    def call(self, *, node_attributes: np.ndarray, edge_indices: np.ndarray, edge_weights: np.ndarray,
+             hops: list, alpha: float):
+        if node_attributes is None or edge_indices is None:
+            return None
+        return propagate_node_attributes(node_attributes, edge_indices, edge_weights, hops=hops, alpha=alpha)
+
+
 class SetRangeFromEdges(GraphPreProcessorBase):
     r"""Assigns range indices and attributes (distance) from the definition of edge indices. These operations
     require the attributes :obj:`node_coordinates` and :obj:`edge_indices` to be set. That also means that
@@ -532,6 +572,75 @@ class PrincipalMomentsOfInertia(GraphPreProcessorBase):
             masses=node_mass, coordinates=node_coordinates, shift_center_of_mass=shift_center_of_mass)
 
 
+class SetACSFRepresentation(GraphPreProcessorBase):
+    r"""Preprocessor to precompute the atom-centered symmetry functions of
+    `Behler (2011) <https://aip.scitation.org/doi/full/10.1063/1.3553717>`__ of a graph with numpy.
+
+    For fixed geometries, i.e. if forces are not trained, the symmetry functions do not need to be computed in every
+    training step. The concatenated radial and angular representation is assigned as node property and can be passed
+    directly to :obj:`kgcnn.literature.HDNNP2nd.make_model_atom_wise` . Parameters are identical to
+    :obj:`kgcnn.literature.HDNNP2nd.make_model_behler` .
+
+    .. code-block:: python
+
+        from kgcnn.graph.preprocessor import SetACSFRepresentation
+        from kgcnn.literature.HDNNP2nd import model_default_behler
+        pp = SetACSFRepresentation(g2_kwargs=model_default_behler["g2_kwargs"],
+                                   g4_kwargs=model_default_behler["g4_kwargs"], in_place=True)
+        dataset.map_list(method="set_range", max_distance=10.0)
+        dataset.map_list(method="set_angle")
+        dataset.map_list(pp)
+
+    Args:
+        g2_kwargs (dict): Arguments for :obj:`make_acsf_radial_parameters` .
+        g4_kwargs (dict): Arguments for :obj:`make_acsf_angular_parameters` .
+        chunk_size (int): Number of edges or angles to process at once. Default is None.
+        node_number (str): Name of atomic numbers array of shape `(N, )` .
+        node_coordinates (str): Name of atomic coordinates array of shape `(N, 3)` .
+        edge_indices (str): Name of edge indices of shape `(M, 2)` for the radial part.
+        angle_indices (str): Name of angle indices of shape `(K, 3)` for the angular part.
+        node_representation (str): Name to assign the representation of shape `(N, F)` to.
+        name (str): Name of the preprocessor.
+    """
+
+    def __init__(self, *, g2_kwargs: dict = None, g4_kwargs: dict = None, chunk_size: int = None,
+                 node_number: str = "node_number", node_coordinates: str = "node_coordinates",
+                 edge_indices: str = "range_indices", angle_indices: str = "angle_indices_nodes",
+                 node_representation: str = "node_representation",
+                 name="set_acsf_representation", **kwargs):
+        super().__init__(name=name, **kwargs)
+        if g2_kwargs is None and g4_kwargs is None:
+            raise ValueError("Require at least one of `g2_kwargs` or `g4_kwargs` for ACSF representation.")
+        self._g2_params = make_acsf_radial_parameters(**g2_kwargs) if g2_kwargs is not None else None
+        self._g4_params = make_acsf_angular_parameters(**g4_kwargs) if g4_kwargs is not None else None
+        self._to_obtain.update({"node_number": node_number, "node_coordinates": node_coordinates,
+                                "edge_indices": edge_indices, "angle_indices": angle_indices})
+        self._silent = ["edge_indices", "angle_indices"]
+        self._to_assign = node_representation
+        self._call_kwargs = {"chunk_size": chunk_size}
+        self._config_kwargs.update({
+            "g2_kwargs": g2_kwargs, "g4_kwargs": g4_kwargs, "chunk_size": chunk_size, "node_number": node_number,
+            "node_coordinates": node_coordinates, "edge_indices": edge_indices, "angle_indices": angle_indices,
+            "node_representation": node_representation})
+
+    def call(self, *, node_number: np.ndarray, node_coordinates: np.ndarray, edge_indices: np.ndarray,
+             angle_indices: np.ndarray, chunk_size: int):
+        if node_number is None or node_coordinates is None:
+            return None
+        rep = []
+        if self._g2_params is not None:
+            if edge_indices is None:
+                edge_indices = np.zeros((0, 2), dtype="int64")
+            rep.append(compute_acsf_radial(
+                node_number, node_coordinates, edge_indices, chunk_size=chunk_size, **self._g2_params))
+        if self._g4_params is not None:
+            if angle_indices is None:
+                angle_indices = np.zeros((0, 3), dtype="int64")
+            rep.append(compute_acsf_angular(
+                node_number, node_coordinates, angle_indices, chunk_size=chunk_size, **self._g4_params))
+        return np.concatenate(rep, axis=-1).astype("float32")
+
+
 class ShiftToUnitCell(GraphPreProcessorBase):
     r"""Shift atomic coordinates into the Unit cell of a periodic lattice.
 
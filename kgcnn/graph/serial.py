@@ -22,6 +22,7 @@ def get_preprocessor(name: Union[str, dict], **kwargs):
         "pad_property": "PadProperty",
         "set_edge_weights_uniform": "SetEdgeWeightsUniform",
         "normalize_edge_weights_sym": "NormalizeEdgeWeightsSymmetric",
+        "propagate_node_attributes": "PropagateNodeAttributes",
         "set_range_from_edges": "SetRangeFromEdges",
         "set_range": "SetRange",
         "set_angle": "SetAngle",
@@ -31,7 +32,8 @@ def get_preprocessor(name: Union[str, dict], **kwargs):
         "principal_moments_of_inertia": "PrincipalMomentsOfInertia",
         "count_nodes_and_edges": "CountNodesAndEdges",
         "make_dense_adjacency_matrix": "MakeDenseAdjacencyMatrix",
-        "make_mask": "MakeMask"
+        "make_mask": "MakeMask",
+        "set_acsf_representation": "SetACSFRepresentation"
     }
     if isinstance(name, dict):
         return deserialize(name)
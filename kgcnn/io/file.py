@@ -1,9 +1,12 @@
 import os.path
+import json
+import logging
 import numpy as np
-import tensorflow as tf
 import h5py
 from typing import List, Union
 
+module_logger = logging.getLogger(__name__)
+
 
 def _check_for_inner_shape(array_list: List[np.ndarray]) -> Union[None, tuple, list]:
     """Simple function to verify inner shape for list of numpy arrays."""
@@ -47,7 +50,7 @@ class RaggedTensorNumpyFile:
         self.file_path = file_path
         self.compressed = compressed
 
-    def write(self, ragged_array: Union[tf.RaggedTensor, List[np.ndarray], list]):
+    def write(self, ragged_array: Union["tf.RaggedTensor", List[np.ndarray], list]):
         """Write ragged array to file.
 
         .. code-block:: python
@@ -66,6 +69,7 @@ class RaggedTensorNumpyFile:
             None.
         """
         # We use tensorflow functions to ensure an eager ragged tensor.
+        import tensorflow as tf
         if not isinstance(ragged_array, tf.RaggedTensor):
             with tf.device(self._device):
                 ragged_array = tf.ragged.constant(ragged_array, inner_shape=_check_for_inner_shape(ragged_array))
@@ -101,6 +105,7 @@ class RaggedTensorNumpyFile:
         values = data.get("values")
         row_splits = data.get("row_splits")
         if return_as_tensor:
+            import tensorflow as tf
             with tf.device(self._device):
                 out = tf.RaggedTensor.from_row_splits(values, row_splits)
             return out
@@ -170,6 +175,7 @@ class RaggedTensorHDFile:
             None.
         """
         # We use tensorflow functions to ensure an eager ragged tensor.
+        import tensorflow as tf
         if not isinstance(ragged_array, tf.RaggedTensor):
             with tf.device(self._device):
                 ragged_array = tf.ragged.constant(ragged_array, inner_shape=_check_for_inner_shape(ragged_array))
@@ -202,6 +208,7 @@ class RaggedTensorHDFile:
             values = file["values"]
             row_splits = file["row_splits"]
             if return_as_tensor:
+                import tensorflow as tf
                 with tf.device(self._device):
                     out = tf.RaggedTensor.from_row_splits(np.array(values), np.array(row_splits))
             else:
@@ -274,3 +281,123 @@ class RaggedTensorHDFile:
     def exists(self):
         """Check if file for path information of this class exists."""
         return os.path.exists(self.file_path)
+
+
+class GraphListMemoryMapFile:
+    """Class representing a directory of NumPy '.npy' files to store a list of graphs column-wise on disk.
+
+    Each graph property is stored as one array, in which the values of all graphs are concatenated along the first
+    axis, together with the row splits of the graphs. Properties that have the same shape for every graph, like graph
+    labels, are stacked without row splits. Reading the file maps the arrays into memory, so that multiple processes
+    can share the same data read-only without loading or copying it. The graphs in the returned list hold views of the
+    mapped arrays.
+    """
+
+    _metadata_file_name = "metadata.json"
+
+    def __init__(self, file_path: str):
+        """Make class for a directory of memory-mapped NumPy files.
+
+        Args:
+            file_path (str): Path to directory on disk.
+        """
+        self.file_path = file_path
+
+    def _property_file_path(self, name: str, suffix: str = "values"):
+        return os.path.join(self.file_path, "%s.%s.npy" % (name, suffix))
+
+    def write(self, graph_list: List[dict], metadata: dict = None):
+        """Write list of graphs to file.
+
+        .. code-block:: python
+
+            from kgcnn.io.file import GraphListMemoryMapFile
+            import numpy as np
+            data = [{"edge_indices": np.array([[0, 1], [1, 0]]), "graph_labels": np.array([1.0])},
+                    {"edge_indices": np.array([[0, 0]]), "graph_labels": np.array([2.0])}]
+            f = GraphListMemoryMapFile("test_graphs")
+            f.write(data)
+            print(f.read())
+
+        Properties, which are not numeric or string arrays in every graph or do not have the same rank and inner shape
+        in every graph, are not written and a warning is logged for each of them.
+
+        Args:
+            graph_list (list): List of graph dictionaries with numpy arrays as values.
+            metadata (dict): Additional information that can be serialized to json, like label names. Default is None.
+
+        Returns:
+            None.
+        """
+        os.makedirs(self.file_path, exist_ok=True)
+        names = []
+        for graph in graph_list:
+            names += [x for x in graph.keys() if x not in names]
+        properties = {}
+        for name in names:
+            values = [graph[name] if name in graph else None for graph in graph_list]
+            if not all([isinstance(x, np.ndarray) and x.dtype.kind in "biufcSU" for x in values]):
+                module_logger.warning(
+                    "Property '%s' is not a numeric or string array in every graph and is not written." % name)
+                continue
+            shapes = set([x.shape for x in values])
+            if len(shapes) == 1:
+                np.save(self._property_file_path(name), np.stack(values, axis=0) if len(values) > 0 else np.array([]))
+                properties[name] = {"ragged": False}
+                continue
+            if _check_for_inner_shape(values) is None:
+                module_logger.warning(
+                    "Property '%s' has different rank or inner shape between graphs and is not written." % name)
+                continue
+            row_splits = np.concatenate([np.zeros(1, dtype="int64"), np.cumsum([len(x) for x in values])])
+            np.save(self._property_file_path(name), np.concatenate(values, axis=0))
+            np.save(self._property_file_path(name, "row_splits"), row_splits)
+            properties[name] = {"ragged": True}
+        with open(os.path.join(self.file_path, self._metadata_file_name), "w") as file:
+            json.dump({"num_graphs": len(graph_list), "properties": properties,
+                       "metadata": metadata if metadata is not None else {}}, file)
+
+    @property
+    def metadata(self) -> dict:
+        """Additional information that has been written with the graphs."""
+        with open(os.path.join(self.file_path, self._metadata_file_name), "r") as file:
+            return json.load(file)["metadata"]
+
+    def read(self, graph_list: list = None, mmap_mode: str = "r"):
+        """Read the graphs from file with memory-mapped property arrays.
+
+        Args:
+            graph_list (list): Empty list, e.g. a :obj:`MemoryGraphDataset`, to append graphs to. Default is None,
+                which creates a new :obj:`MemoryGraphList` .
+            mmap_mode (str): Memory-map mode of :obj:`np.load` . Default is "r" for read-only.
+
+        Returns:
+            MemoryGraphList: List of graphs.
+        """
+        from kgcnn.data.base import MemoryGraphList
+        from kgcnn.graph.base import GraphDict
+        with open(os.path.join(self.file_path, self._metadata_file_name), "r") as file:
+            info = json.load(file)
+        graphs = [GraphDict() for _ in range(info["num_graphs"])]
+        for name, prop in info["properties"].items():
+            values = np.load(self._property_file_path(name), mmap_mode=mmap_mode)
+            if not prop["ragged"]:
+                for i, graph in enumerate(graphs):
+                    graph[name] = values[i, ...]
+                continue
+            row_splits = np.load(self._property_file_path(name, "row_splits"))
+            for i, graph in enumerate(graphs):
+                graph[name] = values[row_splits[i]:row_splits[i + 1]]
+        graph_list = graph_list if graph_list is not None else MemoryGraphList()
+        for graph in graphs:
+            graph_list.append(graph)
+        return graph_list
+
+    def exists(self):
+        """Check if file for path information of this class exists."""
+        return os.path.exists(os.path.join(self.file_path, self._metadata_file_name))
+
+    def __len__(self):
+        """Number of graphs on file."""
+        with open(os.path.join(self.file_path, self._metadata_file_name), "r") as file:
+            return json.load(file)["num_graphs"]
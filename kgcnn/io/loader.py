@@ -1,9 +1,7 @@
-import keras as ks
 import logging
 from typing import Union
 import numpy as np
 from numpy.random import Generator, PCG64
-import tensorflow as tf
 
 
 # Module logger
@@ -63,6 +61,7 @@ def tf_dataset_disjoint_generator(
     Returns:
         tf.data.Dataset: Tensorflow dataset to load disjoint graphs.
     """
+    import tensorflow as tf
     # Stats on the required dataset.
     dataset_size = len(graphs)
     data_index = np.arange(dataset_size)
@@ -245,3 +244,93 @@ def tf_dataset_disjoint_generator(
     )
 
     return data_loader
+
+
+def tf_dataset_neighbour_sampler_generator(
+        graph: dict,
+        inputs: list,
+        seed_nodes: np.ndarray,
+        fan_outs: list = None,
+        labels: np.ndarray = None,
+        batch_size: int = 512,
+        shuffle: bool = True,
+        seed: int = 42
+):
+    r"""Make a tensorflow dataset of sampled k-hop subgraphs for mini-batch node classification on a single graph.
+
+    For each batch of seed nodes, a subgraph is sampled by :obj:`kgcnn.io.sampler.NeighbourSampler` and returned as
+    a graph with batch dimension one, like the full graph from :obj:`MemoryGraphList.tensor` . Node properties are taken
+    for the nodes of the subgraph and edge properties for its edges. The property of an input is assigned by its name,
+    i.e. 'total_nodes' and 'total_edges' for the size of the subgraph, 'edge_indices' for the relabeled indices and
+    a 'node' or 'edge' prefix for node or edge properties. Other properties are passed unchanged.
+
+    If `labels` are given, the dataset yields `(x, y, sample_weight)` with the labels of the subgraph nodes and a sample
+    weight of one for the seed nodes, which are the first nodes of the subgraph, and zero for the sampled neighbours.
+    Models must not have a static output shape for the number of nodes, since it changes for each batch.
+
+    Args:
+        graph (dict): Dictionary of named graph properties of the full graph.
+        inputs (list): List of keras input layer configs.
+        seed_nodes (np.ndarray): Nodes to iterate over in batches, e.g. the training nodes.
+        fan_outs (list): Maximum number of neighbours for each hop. Default is None.
+        labels (np.ndarray): Node labels of the full graph. Default is None.
+        batch_size (int): Number of seed nodes per batch.
+        shuffle (bool): Whether to shuffle the seed nodes each epoch.
+        seed (int): Seed for shuffle and neighbour sampling.
+
+    Returns:
+        tf.data.Dataset: Tensorflow dataset to load sampled subgraphs.
+    """
+    import tensorflow as tf
+    from kgcnn.io.sampler import NeighbourSampler
+    num_nodes = int(np.reshape(graph["total_nodes"], -1)[0]) if "total_nodes" in graph else None
+    sampler = NeighbourSampler(graph["edge_indices"], num_nodes=num_nodes, fan_outs=fan_outs, seed=seed)
+    seed_nodes = np.array(seed_nodes, dtype="int64")
+    rng = Generator(PCG64(seed=seed))
+
+    x_spec = tuple([tf.TensorSpec(shape=tuple([1] + list(x["shape"])), dtype=x["dtype"]) for x in inputs])
+    if labels is not None:
+        output_spec = (x_spec, tf.TensorSpec(shape=tuple([1, None] + list(labels.shape[1:])), dtype=labels.dtype),
+                       tf.TensorSpec(shape=(1, None), dtype="float32"))
+    else:
+        output_spec = x_spec
+
+    def take_property(name: str, subgraph: dict):
+        if name == "total_nodes":
+            return np.array(len(subgraph["node_index"]))
+        if name == "total_edges":
+            return np.array(len(subgraph["edge_index"]))
+        if name == "edge_indices":
+            return subgraph["edge_indices"]
+        if name.startswith("node"):
+            return np.take(graph[name], subgraph["node_index"], axis=0)
+        if name.startswith("edge"):
+            return np.take(graph[name], subgraph["edge_index"], axis=0)
+        return graph[name]
+
+    def generator():
+
+        if shuffle:
+            rng.shuffle(seed_nodes)
+
+        for batch_index in range(0, len(seed_nodes), batch_size):
+            idx = seed_nodes[batch_index:batch_index + batch_size]
+            subgraph = sampler.sample(idx)
+            x = tuple([np.expand_dims(np.array(take_property(x["name"], subgraph), dtype=x["dtype"]), axis=0)
+                       for x in inputs])
+            if labels is None:
+                yield x
+                continue
+            y = np.expand_dims(labels[subgraph["node_index"]], axis=0)
+            sample_weight = np.zeros((1, len(subgraph["node_index"])), dtype="float32")
+            sample_weight[0, :len(idx)] = 1
+            yield x, y, sample_weight
+
+    data_loader = tf.data.Dataset.from_generator(
+        generator,
+        output_signature=output_spec
+    )
+    # Number of batches is known, which keras otherwise only finds after the first epoch.
+    data_loader = data_loader.apply(tf.data.experimental.assert_cardinality(-(-len(seed_nodes) // batch_size)))
+
+    return data_loader
@@ -0,0 +1,108 @@
+import numpy as np
+from typing import Union, List
+from numpy.random import Generator, PCG64
+from kgcnn import __index_receive__ as global_index_receive
+from kgcnn import __index_send__ as global_index_send
+
+
+class NeighbourSampler:
+    r"""Sample k-hop subgraphs around seed nodes with a fixed number of neighbours per hop, as proposed by
+    `GraphSAGE <http://arxiv.org/abs/1706.02216>`__ for mini-batch training on large graphs.
+
+    The incoming edges of each node are stored in compressed sparse row (CSR) format, where the receiving and sending
+    node of an edge are given by `__index_receive__` and `__index_send__` of `kgcnn` as for the message passing layers.
+    Starting from the seed nodes, for each hop at most `fan_outs[k]` incoming edges are drawn without replacement
+    for every node of the current frontier and the newly reached nodes form the next frontier. Self-loops are not
+    sampled but always kept for nodes of a frontier, since models like GCN rely on them for the node's own features.
+
+    The sampled subgraph is the union of all sampled edges. With as many message passing steps as hops, the
+    embeddings of the seed nodes only depend on the sampled neighbourhood, so that the memory per batch scales with the
+    batch size and fan-outs and not with the size of the graph.
+
+    .. code-block:: python
+
+        import numpy as np
+        from kgcnn.io.sampler import NeighbourSampler
+        sampler = NeighbourSampler(np.array([[0, 1], [1, 0], [1, 2], [2, 1]]), fan_outs=[1, 1])
+        subgraph = sampler.sample(np.array([0]))
+        print(subgraph["node_index"], subgraph["edge_indices"])
+    """
+
+    def __init__(self, edge_indices: np.ndarray, num_nodes: int = None, fan_outs: List[Union[int, None]] = None,
+                 seed: int = 42):
+        r"""Initialize sampler with the edges of the graph.
+
+        Args:
+            edge_indices (np.ndarray): Edge indices of the graph of shape `(M, 2)` .
+            num_nodes (int): Number of nodes of the graph. Default is None, which takes the largest node index.
+            fan_outs (list): Maximum number of neighbours to sample for each hop. None or -1 take all neighbours.
+                Default is None, which is `[10, 10]` .
+            seed (int): Seed of the random generator.
+        """
+        edge_indices = np.asarray(edge_indices, dtype="int64")
+        if num_nodes is None:
+            num_nodes = int(np.amax(edge_indices)) + 1 if len(edge_indices) > 0 else 0
+        self.num_nodes = int(num_nodes)
+        self.num_edges = len(edge_indices)
+        self.fan_outs = [10, 10] if fan_outs is None else [x if x is not None and x >= 0 else None for x in fan_outs]
+        self.edge_indices = edge_indices
+        self._rng = Generator(PCG64(seed=seed))
+
+        receive, send = edge_indices[:, global_index_receive], edge_indices[:, global_index_send]
+        is_self_loop = receive == send
+        self.self_loop_edge = np.full(self.num_nodes, -1, dtype="int64")
+        self.self_loop_edge[receive[is_self_loop]] = np.nonzero(is_self_loop)[0]
+        # CSR of incoming edges without self-loops. Edges of node `i` are `edge_order[indptr[i]:indptr[i+1]]` .
+        edge_id = np.nonzero(np.logical_not(is_self_loop))[0]
+        self.edge_order = edge_id[np.argsort(receive[edge_id], kind="stable")]
+        self.indptr = np.pad(np.cumsum(np.bincount(receive[edge_id], minlength=self.num_nodes)), [[1, 0]])
+        # Position of the nodes of the current subgraph to relabel edges. Only the sampled nodes are reset after use.
+        self._node_position = np.full(self.num_nodes, -1, dtype="int64")
+
+    def _sample_edges(self, nodes: np.ndarray, fan_out: Union[int, None]) -> np.ndarray:
+        starts = self.indptr[nodes]
+        degrees = self.indptr[nodes + 1] - starts
+        offsets = np.pad(np.cumsum(degrees), [[1, 0]])
+        owner = np.repeat(np.arange(len(nodes)), degrees)
+        rank = np.arange(offsets[-1]) - offsets[owner]
+        edges = self.edge_order[starts[owner] + rank]
+        if fan_out is not None:
+            # Random permutation within the edges of each node by sorting random keys grouped by node.
+            order = np.argsort(owner + self._rng.random(len(edges)))
+            edges = edges[order][rank < fan_out]
+        self_loops = self.self_loop_edge[nodes]
+        return np.concatenate([self_loops[self_loops >= 0], edges])
+
+    def sample(self, seed_nodes: np.ndarray) -> dict:
+        r"""Sample the subgraph around seed nodes.
+
+        Args:
+            seed_nodes (np.ndarray): Unique indices of seed nodes of shape `(B, )` .
+
+        Returns:
+            dict: Subgraph with 'node_index' of shape `(N, )` , the indices of its nodes in the graph with the seed
+            nodes first, 'edge_index' of shape `(M, )` , the indices of its edges in the graph, and 'edge_indices' of
+            shape `(M, 2)` , the edge indices relabeled to the nodes of the subgraph.
+        """
+        frontier = np.asarray(seed_nodes, dtype="int64")
+        position = self._node_position
+        position[frontier] = np.arange(len(frontier))
+        node_list, sampled_edges = [frontier], []
+        num_sampled_nodes = len(frontier)
+        for fan_out in self.fan_outs:
+            if len(frontier) == 0:
+                break
+            edges = self._sample_edges(frontier, fan_out)
+            sampled_edges.append(edges)
+            send = self.edge_indices[edges, global_index_send]
+            frontier = np.unique(send[position[send] < 0])
+            position[frontier] = np.arange(num_sampled_nodes, num_sampled_nodes + len(frontier))
+            num_sampled_nodes += len(frontier)
+            node_list.append(frontier)
+        nodes = np.concatenate(node_list)
+        edge_index = np.concatenate(sampled_edges) if sampled_edges else np.zeros(0, dtype="int64")
+
+        # Relabel edge indices to the position of the nodes in the subgraph.
+        edge_indices = position[self.edge_indices[edge_index]]
+        position[nodes] = -1
+        return {"node_index": nodes, "edge_index": edge_index, "edge_indices": edge_indices.reshape((-1, 2))}
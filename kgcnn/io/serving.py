@@ -0,0 +1,435 @@
+import os
+import time
+import asyncio
+import logging
+import itertools
+import numpy as np
+import keras as ks
+from keras import ops
+from collections import deque
+from typing import Union, List, Callable, Any, Iterable
+from kgcnn.data.base import MemoryGraphList
+from kgcnn.graph.base import GraphDict
+from kgcnn.utils.serial import deserialize
+
+module_logger = logging.getLogger(__name__)
+module_logger.setLevel(logging.INFO)
+
+
+def smiles_to_graph(smiles: str, add_hydrogen: bool = True, make_conformers: bool = True,
+                    optimize_conformer: bool = True) -> Union[GraphDict, None]:
+    r"""Convert a single smiles string into a :obj:`GraphDict` with the same basic properties that
+    :obj:`MoleculeNetDataset` assigns, i.e. 'node_symbol', 'node_number', 'node_coordinates', 'edge_indices' and
+    'edge_number'. Requires :obj:`rdkit` .
+
+    Args:
+        smiles (str): Smiles string of the molecule.
+        add_hydrogen (bool): Whether to add hydrogen atoms. Default is True.
+        make_conformers (bool): Whether to generate a conformer for coordinates. Default is True.
+        optimize_conformer (bool): Whether to optimize the conformer with a force field. Default is True.
+
+    Returns:
+        GraphDict: Graph dictionary of the molecule or None, if the molecule could not be generated.
+    """
+    from kgcnn.molecule.graph_rdkit import MolecularGraphRDKit
+    mg = MolecularGraphRDKit(make_directed=False).from_smiles(smiles)
+    if mg.mol is None:
+        return None
+    if add_hydrogen:
+        mg.add_hs()
+    if make_conformers:
+        mg.make_conformer()
+        if optimize_conformer:
+            mg.optimize_conformer()
+    edge_indices, edge_number = mg.edge_number
+    return GraphDict({
+        "node_symbol": np.array(mg.node_symbol, dtype="str"),
+        "node_number": np.array(mg.node_number, dtype="int64"),
+        "node_coordinates": np.array(mg.node_coordinates, dtype="float32"),
+        "edge_indices": np.array(edge_indices, dtype="int64"),
+        "edge_number": np.array(edge_number, dtype="int64")
+    })
+
+
+class GraphBatchingPredictor:
+    r"""Asynchronous model predictor that coalesces concurrent single-graph requests into disjoint batches.
+
+    Every request is converted into a :obj:`GraphDict` , passed through the graph preprocessors of the dataset
+    (e.g. :obj:`SetMolAttributes` , :obj:`SetRange` ) and queued. A worker collects queued requests until either
+    :obj:`max_batch_size` is reached or the oldest request has waited for :obj:`max_latency` seconds. The batch is
+    then cast to tensor via :obj:`MemoryGraphList.tensor()` and the model is called once for all graphs.
+    Predictions are optionally scaled back to the original units with a fitted label scaler.
+
+    .. code-block:: python
+
+        import asyncio
+        from kgcnn.io.serving import GraphBatchingPredictor
+
+        predictor = GraphBatchingPredictor(
+            model=model, model_inputs=hyper["model"]["config"]["inputs"], scaler=scaler,
+            graph_preprocessors=[{"class_name": "SetMolAttributes", "module_name": "kgcnn.molecule.preprocessor",
+                                  "config": {}}],
+            max_batch_size=64, max_latency=0.005)
+
+        async def main():
+            async with predictor:
+                results = await asyncio.gather(*[predictor.predict(s) for s in ["CCO", "c1ccccc1"]])
+            print(results, predictor.statistics())
+
+        asyncio.run(main())
+
+    """
+
+    def __init__(self,
+                 model: ks.models.Model = None,
+                 model_inputs: Union[list, dict] = None,
+                 graph_preprocessors: List[Union[Callable, dict]] = None,
+                 scaler=None,
+                 graph_converter: Callable = None,
+                 max_batch_size: int = 32,
+                 max_latency: float = 0.01,
+                 max_statistics: int = 10000,
+                 run_in_executor: bool = True):
+        r"""Initialize :obj:`GraphBatchingPredictor` class.
+
+        Args:
+            model (ks.models.Model): Single trained keras model.
+            model_inputs (list, dict): List of model input configurations as in the hyperparameter.
+            graph_preprocessors (list): List of graph preprocessors, see :obj:`kgcnn.graph.preprocessor` .
+                Serialized preprocessors as dictionary are deserialized. Default is None.
+            scaler: Fitted label scaler, e.g. :obj:`StandardLabelScaler` , which is used to inverse transform the
+                model output. Requires a model that returns a single tensor. Default is None.
+            graph_converter (Callable): Function to convert a request that is not a dictionary, like smiles strings
+                or structures, into a :obj:`GraphDict` . For strings :obj:`smiles_to_graph` is used by default.
+            max_batch_size (int): Maximum number of graphs in one model call. Default is 32.
+            max_latency (float): Maximum time in seconds a request waits for the batch to fill up. Default is 0.01.
+            max_statistics (int): Number of last requests to keep for latency statistics. Default is 10000.
+            run_in_executor (bool): Whether to run the graph conversion and the model in a thread executor to not
+                block the event loop. Default is True.
+        """
+        if graph_preprocessors is None:
+            graph_preprocessors = []
+        if max_batch_size < 1:
+            raise ValueError("Maximum batch size must be at least 1, but got '%s'." % max_batch_size)
+        self.model = model
+        self.model_inputs = model_inputs
+        self.graph_preprocessors = [deserialize(gp) if isinstance(gp, dict) else gp for gp in graph_preprocessors]
+        self.scaler = scaler
+        self.graph_converter = graph_converter
+        self.max_batch_size = int(max_batch_size)
+        self.max_latency = float(max_latency)
+        self.run_in_executor = run_in_executor
+
+        self._queue = None
+        self._worker = None
+        self._latencies = deque(maxlen=max_statistics)
+        self._batch_sizes = deque(maxlen=max_statistics)
+        self._num_requests = 0
+        self._time_start = None
+
+    def prepare_graph(self, x: Any) -> GraphDict:
+        r"""Convert a single request into a preprocessed :obj:`GraphDict` .
+
+        Args:
+            x: Graph dictionary, smiles string or any object supported by :obj:`graph_converter` .
+
+        Returns:
+            GraphDict: Preprocessed graph.
+        """
+        if isinstance(x, dict):
+            graph = GraphDict(x)
+        elif self.graph_converter is not None:
+            graph = self.graph_converter(x)
+        elif isinstance(x, str):
+            graph = smiles_to_graph(x)
+        else:
+            raise TypeError("Can not convert '%s' to graph without `graph_converter` ." % type(x))
+        if graph is None:
+            raise ValueError("Conversion of '%s' to graph failed." % x)
+        graph = GraphDict(graph)
+        for gp in self.graph_preprocessors:
+            graph.apply_preprocessor(gp)
+        return graph
+
+    def predict_batch(self, graphs: Union[list, MemoryGraphList]) -> list:
+        r"""Synchronous prediction of a list of preprocessed graphs in a single model call.
+
+        Args:
+            graphs (list): List of :obj:`GraphDict` .
+
+        Returns:
+            list: List of numpy predictions per graph.
+        """
+        graph_list = graphs if isinstance(graphs, MemoryGraphList) else MemoryGraphList(graphs)
+        tensor_input = graph_list.tensor(self.model_inputs)
+        tensor_output = self.model(tensor_input, training=False)
+        if isinstance(tensor_output, (list, tuple, dict)):
+            if self.scaler is not None:
+                raise ValueError("Scaling of model output with scaler requires a model with a single output tensor.")
+            if isinstance(tensor_output, dict):
+                output = {key: ops.convert_to_numpy(value) for key, value in tensor_output.items()}
+                return [{key: value[i] for key, value in output.items()} for i in range(len(graph_list))]
+            output = [ops.convert_to_numpy(value) for value in tensor_output]
+            return [[value[i] for value in output] for i in range(len(graph_list))]
+        output = ops.convert_to_numpy(tensor_output)
+        if self.scaler is not None:
+            output = self.scaler.inverse_transform(y=output)
+        return [output[i] for i in range(len(graph_list))]
+
+    async def start(self):
+        """Start the batching worker in the running event loop."""
+        if self._worker is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._time_start = time.perf_counter()
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Process all pending requests and stop the batching worker."""
+        if self._worker is None:
+            return
+        await self._queue.join()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        self._queue = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    async def predict(self, x: Any):
+        r"""Predict a single graph. Concurrent calls are batched together.
+
+        Args:
+            x: Graph dictionary, smiles string or any object supported by :obj:`graph_converter` .
+
+        Returns:
+            np.ndarray: Prediction for this graph.
+        """
+        if self._worker is None:
+            await self.start()
+        time_request = time.perf_counter()
+        if self.run_in_executor:
+            graph = await asyncio.get_running_loop().run_in_executor(None, self.prepare_graph, x)
+        else:
+            graph = self.prepare_graph(x)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((graph, future, time_request))
+        return await future
+
+    async def _collect_batch(self) -> list:
+        batch = [await self._queue.get()]
+        deadline = batch[0][2] + self.max_latency
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                while len(batch) < self.max_batch_size and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect_batch()
+            graphs = [b[0] for b in batch]
+            try:
+                if self.run_in_executor:
+                    results = await loop.run_in_executor(None, self.predict_batch, graphs)
+                else:
+                    results = self.predict_batch(graphs)
+            except Exception as error:
+                module_logger.error("Prediction of batch with %s graphs failed: %s" % (len(graphs), error))
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(error)
+            else:
+                time_done = time.perf_counter()
+                for (_, future, time_request), result in zip(batch, results):
+                    self._latencies.append(time_done - time_request)
+                    if not future.done():
+                        future.set_result(result)
+                self._num_requests += len(batch)
+                self._batch_sizes.append(len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def statistics(self) -> dict:
+        r"""Latency and throughput statistics of all processed requests.
+
+        Returns:
+            dict: Dictionary with number of requests, mean batch size, latency percentiles in seconds and
+            throughput in requests per second.
+        """
+        latencies = np.array(self._latencies, dtype="float64")
+        elapsed = time.perf_counter() - self._time_start if self._time_start is not None else 0.0
+        has_data = len(latencies) > 0
+        return {
+            "num_requests": self._num_requests,
+            "mean_batch_size": float(np.mean(self._batch_sizes)) if len(self._batch_sizes) > 0 else 0.0,
+            "latency_mean": float(np.mean(latencies)) if has_data else None,
+            "latency_p50": float(np.percentile(latencies, 50)) if has_data else None,
+            "latency_p99": float(np.percentile(latencies, 99)) if has_data else None,
+            "throughput": self._num_requests / elapsed if elapsed > 0 else 0.0
+        }
+
+    def reset_statistics(self):
+        """Reset latency and throughput statistics."""
+        self._latencies.clear()
+        self._batch_sizes.clear()
+        self._num_requests = 0
+        self._time_start = time.perf_counter() if self._worker is not None else None
+
+
+def predict_graphs_streaming(model: ks.models.Model,
+                             graphs: Iterable,
+                             model_inputs: Union[list, dict],
+                             output_path: str = None,
+                             num_graphs: int = None,
+                             chunk_size: int = 4096,
+                             batch_size: int = 32,
+                             graph_preprocessors: List[Union[Callable, dict]] = None,
+                             scaler=None,
+                             disjoint_loader: dict = None,
+                             log_every: int = 1) -> np.ndarray:
+    r"""Predict graph-level targets for a large number of graphs with constant memory.
+
+    Graphs are pulled in chunks of :obj:`chunk_size` from a dataset or any iterator, e.g. a generator that reads
+    molecules from file. Each chunk is cast to tensor via :obj:`MemoryGraphList.tensor()` or, if
+    :obj:`disjoint_loader` is given, batched by :obj:`kgcnn.io.loader.tf_dataset_disjoint_generator` for models
+    with disjoint input. Predictions are written to a numpy memory-map at :obj:`output_path` chunk by chunk, so that
+    neither the tensor input nor all predictions of the whole dataset are held in memory.
+
+    .. code-block:: python
+
+        from kgcnn.io.serving import predict_graphs_streaming
+
+        predictions = predict_graphs_streaming(
+            model, dataset, model_inputs=hyper["model"]["config"]["inputs"], output_path="predictions.npy",
+            chunk_size=10000, batch_size=64)
+
+    Args:
+        model (ks.models.Model): Single trained keras model with a single graph-level output.
+        graphs (Iterable): Dataset, list or iterator of graph dictionaries.
+        model_inputs (list, dict): List of model input configurations as in the hyperparameter.
+        output_path (str): File path of the `.npy` file for the predictions. If None, predictions are collected
+            in memory. Default is None.
+        num_graphs (int): Number of graphs, if :obj:`graphs` has no length. Used to allocate the memory-map. If the
+            number of graphs is unknown, predictions are appended to a temporary file first. Default is None.
+        chunk_size (int): Number of graphs that are cast to tensor at once. Default is 4096.
+        batch_size (int): Batch size for the model. Default is 32.
+        graph_preprocessors (list): List of graph preprocessors, see :obj:`kgcnn.graph.preprocessor` , that are
+            applied on each graph. Serialized preprocessors as dictionary are deserialized. Default is None.
+        scaler: Fitted label scaler, e.g. :obj:`StandardLabelScaler` , which is used to inverse transform the
+            model output. Default is None.
+        disjoint_loader (dict): Kwargs for :obj:`tf_dataset_disjoint_generator` like `assignment_to_id` or
+            `pos_batch_id` . Graphs are never shuffled. Default is None.
+        log_every (int): Log progress and throughput every number of chunks. Default is 1.
+
+    Returns:
+        np.ndarray: Predictions of shape `(num_graphs, ...)` . A read-only memory-map, if :obj:`output_path` is given.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1, but got '%s'." % chunk_size)
+    if graph_preprocessors is None:
+        graph_preprocessors = []
+    graph_preprocessors = [deserialize(gp) if isinstance(gp, dict) else gp for gp in graph_preprocessors]
+    if num_graphs is None and hasattr(graphs, "__len__"):
+        num_graphs = len(graphs)
+
+    iterator = iter(graphs)
+    output, part_file, in_memory = None, None, []
+    part_path = output_path + ".part" if output_path is not None else None
+    num_done, num_chunks = 0, 0
+    time_start = time.perf_counter()
+    try:
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if len(chunk) == 0:
+                break
+            if len(graph_preprocessors) > 0:
+                chunk = [GraphDict(g) for g in chunk]
+                for g in chunk:
+                    for gp in graph_preprocessors:
+                        g.apply_preprocessor(gp)
+            prediction = _predict_chunk(model, MemoryGraphList(chunk), model_inputs, batch_size, disjoint_loader)
+            if scaler is not None:
+                prediction = scaler.inverse_transform(y=prediction)
+            if len(prediction) != len(chunk):
+                raise ValueError("Model returned %s predictions for %s graphs. %s" % (
+                    len(prediction), len(chunk), "Only graph-level output is supported."))
+
+            if output_path is None:
+                in_memory.append(prediction)
+            elif num_graphs is not None:
+                if output is None:
+                    output = np.lib.format.open_memmap(
+                        output_path, mode="w+", dtype=prediction.dtype, shape=(num_graphs,) + prediction.shape[1:])
+                if num_done + len(prediction) > num_graphs:
+                    raise ValueError("Got more graphs than `num_graphs=%s` ." % num_graphs)
+                output[num_done:num_done + len(prediction)] = prediction
+            else:
+                if part_file is None:
+                    part_file = open(part_path, "wb")
+                    output = prediction[:0]
+                part_file.write(np.ascontiguousarray(prediction, dtype=output.dtype).tobytes())
+
+            num_done += len(prediction)
+            num_chunks += 1
+            if num_chunks % log_every == 0:
+                elapsed = time.perf_counter() - time_start
+                module_logger.info("Predicted %s%s graphs with %.1f graphs/s." % (
+                    num_done, "/%s" % num_graphs if num_graphs is not None else "", num_done / elapsed))
+    finally:
+        if part_file is not None:
+            part_file.close()
+
+    elapsed = time.perf_counter() - time_start
+    module_logger.info("Finished prediction of %s graphs in %.2f s with %.1f graphs/s." % (
+        num_done, elapsed, num_done / elapsed if elapsed > 0 else 0.0))
+
+    if output_path is None:
+        return np.concatenate(in_memory, axis=0) if len(in_memory) > 0 else np.zeros((0,))
+    if part_file is not None:
+        # Copy appended predictions of unknown length into a `.npy` file without loading them at once.
+        part = np.memmap(part_path, mode="r", dtype=output.dtype, shape=(num_done,) + output.shape[1:])
+        output = np.lib.format.open_memmap(output_path, mode="w+", dtype=part.dtype, shape=part.shape)
+        for i in range(0, num_done, chunk_size):
+            output[i:i + chunk_size] = part[i:i + chunk_size]
+        del part
+        os.remove(part_path)
+    elif output is None:
+        output = np.lib.format.open_memmap(output_path, mode="w+", dtype="float32", shape=(0,))
+    elif num_done != num_graphs:
+        raise ValueError("Expected %s graphs but got %s." % (num_graphs, num_done))
+    output.flush()
+    del output
+    return np.load(output_path, mmap_mode="r")
+
+
+def _predict_chunk(model, graph_list: MemoryGraphList, model_inputs, batch_size: int, disjoint_loader: dict = None):
+    if disjoint_loader is None:
+        prediction = model.predict(graph_list.tensor(model_inputs), batch_size=batch_size, verbose=0)
+    else:
+        loader_kwargs = dict(disjoint_loader)
+        loader_kwargs.update({"batch_size": batch_size, "shuffle": False, "epochs": 1})
+        dataset = graph_list.tf_dataset_disjoint(model_inputs, **loader_kwargs)
+        # Wrap tuple of inputs as single element, since keras would interpret it as `(x, y, sample_weight)` .
+        if isinstance(model_inputs, list):
+            dataset = dataset.map(lambda *x: (x,))
+        prediction = model.predict(dataset, verbose=0)
+    if isinstance(prediction, (list, tuple, dict)):
+        raise ValueError("Streaming prediction requires a model with a single output tensor.")
+    return np.asarray(prediction)
@@ -3,9 +3,11 @@ import keras as ks
 from keras.layers import Layer
 from keras import ops
 from kgcnn.ops.scatter import (
-    scatter_reduce_min, scatter_reduce_mean, scatter_reduce_max, scatter_reduce_sum, scatter_reduce_softmax)
+    scatter_reduce_min, scatter_reduce_mean, scatter_reduce_max, scatter_reduce_sum, scatter_reduce_softmax,
+    gather_scatter_reduce_sum, gather_scatter_reduce_mean)
 from kgcnn import __indices_axis__ as global_axis_indices
 from kgcnn import __index_receive__ as global_index_receive
+from kgcnn import __index_send__ as global_index_send
 
 
 @ks.saving.register_keras_serializable(package='kgcnn', name='Aggregate')
@@ -20,12 +22,15 @@ class Aggregate(Layer):  # noqa
     aggregate the values into.
     """
 
-    def __init__(self, pooling_method: str = "scatter_sum", axis=0, **kwargs):
+    def __init__(self, pooling_method: str = "scatter_sum", axis=0, sorted_indices: bool = False, **kwargs):
         """Initialize layer.
 
         Args:
             pooling_method (str): Method for aggregation. Default is 'scatter_sum'.
             axis (int): Axis to aggregate. Default is 0.
+            sorted_indices (bool): Whether indices are sorted in ascending order, which allows to use faster segment
+                operations of the backend. Using 'segment_sum' etc. as pooling method implies sorted indices.
+                Default is False.
         """
         super(Aggregate, self).__init__(**kwargs)
         # Shorthand notation
@@ -46,13 +51,15 @@ class Aggregate(Layer):  # noqa
             "scatter_mean": scatter_reduce_mean,
             "scatter_max": scatter_reduce_max,
             "scatter_min": scatter_reduce_min,
-            "segment_sum": None,
-            "segment_mean": None,
-            "segment_max": None,
-            "segment_min": None
+            "segment_sum": scatter_reduce_sum,
+            "segment_mean": scatter_reduce_mean,
+            "segment_max": scatter_reduce_max,
+            "segment_min": scatter_reduce_min
         }
+        self.sorted_indices = sorted_indices
         self._pool_method = pooling_by_name[pooling_method]
-        self._use_scatter = "scatter" in pooling_method
+        self._use_scatter = "scatter" in pooling_method or "segment" in pooling_method
+        self._use_sorted_indices = sorted_indices or "segment" in pooling_method
         self._use_reference_for_aggregation = "update" in pooling_method
 
     def build(self, input_shape):
@@ -82,14 +89,15 @@ class Aggregate(Layer):  # noqa
         x, index, reference = inputs
         shape = ops.shape(reference)[:1] + ops.shape(x)[1:]
         if self._use_scatter:
-            return self._pool_method(index, x, shape=shape)
+            return self._pool_method(index, x, shape=shape, sorted_indices=self._use_sorted_indices)
         else:
             raise NotImplementedError()
 
     def get_config(self):
         """Get config for layer."""
         conf = super(Aggregate, self).get_config()
-        conf.update({"pooling_method": self.pooling_method, "axis": self.axis})
+        conf.update({"pooling_method": self.pooling_method, "axis": self.axis,
+                     "sorted_indices": self.sorted_indices})
         return conf
 
 
@@ -110,6 +118,7 @@ class AggregateLocalEdges(Layer):
                  pooling_method="scatter_sum",
                  pooling_index: int = global_index_receive,
                  axis_indices: int = global_axis_indices,
+                 sorted_indices: bool = False,
                  **kwargs):
         """Initialize layer.
 
@@ -117,11 +126,14 @@ class AggregateLocalEdges(Layer):
             pooling_method (str): Pooling method to use i.e. segment_function. Default is 'scatter_sum'.
             pooling_index (int): Index to pick IDs for pooling edge-like embeddings. Default is 0.
             axis_indices (bool): The axis of the index tensor to pick IDs from. Default is 0.
+            sorted_indices (bool): Whether the edge indices at `pooling_index` are sorted in ascending order, which
+                allows to use faster segment operations of the backend. Default is False.
         """
         super(AggregateLocalEdges, self).__init__(**kwargs)
         self.pooling_index = pooling_index
         self.pooling_method = pooling_method
-        self.to_aggregate = Aggregate(pooling_method=pooling_method)
+        self.sorted_indices = sorted_indices
+        self.to_aggregate = Aggregate(pooling_method=pooling_method, sorted_indices=sorted_indices)
         self.axis_indices = axis_indices
 
     def build(self, input_shape):
@@ -161,7 +173,7 @@ class AggregateLocalEdges(Layer):
         """Update layer config."""
         conf = super(AggregateLocalEdges, self).get_config()
         conf.update({"pooling_index": self.pooling_index, "pooling_method": self.pooling_method,
-                     "axis_indices": self.axis_indices})
+                     "axis_indices": self.axis_indices, "sorted_indices": self.sorted_indices})
         return conf
 
 
@@ -187,13 +199,14 @@ class AggregateWeightedLocalEdges(AggregateLocalEdges):
             pooling_index (int): Index to pick IDs for pooling edge-like embeddings. Default is 0.
             axis_indices (bool): The axis of the index tensor to pick IDs from. Default is 0.
         """
-        super(AggregateWeightedLocalEdges, self).__init__(**kwargs)
+        super(AggregateWeightedLocalEdges, self).__init__(
+            pooling_method=pooling_method, pooling_index=pooling_index, axis_indices=axis_indices, **kwargs)
         self.normalize_by_weights = normalize_by_weights
         self.pooling_index = pooling_index
         self.pooling_method = pooling_method
         # to_aggregate already made by super
         if self.normalize_by_weights:
-            self.to_aggregate_weights = Aggregate(pooling_method="scatter_sum")
+            self.to_aggregate_weights = Aggregate(pooling_method="scatter_sum", sorted_indices=self.sorted_indices)
         self.axis_indices = axis_indices
 
     def build(self, input_shape):
@@ -245,6 +258,77 @@ class AggregateWeightedLocalEdges(AggregateLocalEdges):
         return conf
 
 
+@ks.saving.register_keras_serializable(package='kgcnn', name='AggregateLocalMessages')
+class AggregateLocalMessages(Layer):
+    r"""Fused gather and aggregation of node embeddings of neighbouring nodes, optionally weighted per edge.
+
+    Computes :math:`n_i = \sum_j w_{ij} n_j` (or the mean) and is equivalent to :obj:`GatherNodesOutgoing` ,
+    multiplication with edge weights and :obj:`AggregateLocalEdges` , which corresponds to a sparse-dense matrix
+    multiplication. However, for scalar edge weights of shape `(M, 1)` or no weights the gathered edge tensor of
+    shape `(M, F)` is not materialized. For vector weights the gathered messages are recomputed in the backward pass.
+    Only 'sum' and 'mean' aggregation is supported.
+    """
+
+    def __init__(self,
+                 pooling_method="scatter_sum",
+                 pooling_index: int = global_index_receive,
+                 gather_index: int = global_index_send,
+                 axis_indices: int = global_axis_indices,
+                 **kwargs):
+        """Initialize layer.
+
+        Args:
+            pooling_method (str): Pooling method to use, either 'sum' or 'mean'. Default is 'scatter_sum'.
+            pooling_index (int): Index to pick IDs for pooling messages. Default is 0.
+            gather_index (int): Index to pick IDs for gathering node embeddings. Default is 1.
+            axis_indices (bool): The axis of the index tensor to pick IDs from. Default is 0.
+        """
+        super(AggregateLocalMessages, self).__init__(**kwargs)
+        pooling_by_name = {"sum": gather_scatter_reduce_sum, "scatter_sum": gather_scatter_reduce_sum,
+                           "mean": gather_scatter_reduce_mean, "scatter_mean": gather_scatter_reduce_mean}
+        if pooling_method not in pooling_by_name:
+            raise ValueError("Pooling method '%s' is not supported by `AggregateLocalMessages` ." % pooling_method)
+        self.pooling_method = pooling_method
+        self.pooling_index = pooling_index
+        self.gather_index = gather_index
+        self.axis_indices = axis_indices
+        self._pool_method = pooling_by_name[pooling_method]
+
+    def build(self, input_shape):
+        """Build layer."""
+        self.built = True
+
+    def compute_output_shape(self, input_shape):
+        """Compute output shape."""
+        return input_shape[0]
+
+    def call(self, inputs, **kwargs):
+        r"""Forward pass.
+
+        Args:
+            inputs (list): [nodes, indices] or [nodes, indices, weights]
+
+                - nodes (Tensor): Node embeddings of shape `(N, F)`.
+                - indices (Tensor): Indices of edges of shape `(2, M, )`.
+                - weights (Tensor): Optional edge weights of shape `(M, 1)` or `(M, F)`.
+
+        Returns:
+            Tensor: Aggregated values of shape `(N, F)`.
+        """
+        nodes, edge_index = inputs[:2]
+        weights = inputs[2] if len(inputs) > 2 else None
+        receive_indices = ops.take(edge_index, self.pooling_index, axis=self.axis_indices)
+        send_indices = ops.take(edge_index, self.gather_index, axis=self.axis_indices)
+        return self._pool_method(nodes, send_indices, receive_indices, shape=ops.shape(nodes), weights=weights)
+
+    def get_config(self):
+        """Update layer config."""
+        conf = super(AggregateLocalMessages, self).get_config()
+        conf.update({"pooling_index": self.pooling_index, "pooling_method": self.pooling_method,
+                     "gather_index": self.gather_index, "axis_indices": self.axis_indices})
+        return conf
+
+
 @ks.saving.register_keras_serializable(package='kgcnn', name='AggregateLocalEdgesAttention')
 class AggregateLocalEdgesAttention(Layer):
     r"""Aggregate local edges via Attention mechanism.
@@ -276,7 +360,8 @@ class AggregateLocalEdgesAttention(Layer):
             softmax_method (str): Method to apply softmax to attention coefficients. Default is 'scatter_softmax'.
             pooling_method (str): Pooling method for this layer. Default is 'scatter_sum'.
             pooling_index (int): Index to pick ID's for pooling edge-like embeddings. Default is 0.
-            is_sorted (bool): If the edge indices are sorted for first ingoing index. Default is False.
+            is_sorted (bool): If the edge indices are sorted for first ingoing index, which allows to use faster
+                segment operations of the backend for softmax and pooling. Default is False.
             has_unconnected (bool): If unconnected nodes are allowed. Default is True.
             normalize_softmax (bool): Whether to use normalize in softmax. Default is False.
             axis_indices (int): The axis of the index tensor to pick IDs from. Default is 0.
@@ -288,7 +373,7 @@ class AggregateLocalEdgesAttention(Layer):
         self.has_unconnected = has_unconnected
         self.normalize_softmax = normalize_softmax
         self.softmax_method = softmax_method
-        self.to_aggregate = Aggregate(pooling_method=pooling_method)
+        self.to_aggregate = Aggregate(pooling_method=pooling_method, sorted_indices=is_sorted)
         self.axis_indices = axis_indices
 
     def build(self, input_shape):
@@ -323,7 +408,8 @@ class AggregateLocalEdgesAttention(Layer):
         reference, x, attention, edge_index = inputs
         receive_indices = ops.take(edge_index, self.pooling_index, axis=self.axis_indices)
         shape_attention = ops.shape(reference)[:1] + ops.shape(attention)[1:]
-        a = scatter_reduce_softmax(receive_indices, attention, shape=shape_attention, normalize=self.normalize_softmax)
+        a = scatter_reduce_softmax(receive_indices, attention, shape=shape_attention, normalize=self.normalize_softmax,
+                                   sorted_indices=self.is_sorted)
         x = x * ops.broadcast_to(a, ops.shape(x))
         return self.to_aggregate([x, receive_indices, reference])
 
@@ -348,6 +434,11 @@ class AggregateLocalEdgesLSTM(Layer):
 
         Must provide a max length of edges per nodes, since keras LSTM requires padded input. Also required for use
         in connection with jax backend.
+
+    With `degree_buckets` nodes are grouped by their number of incoming edges and the LSTM is run separately for
+    each group, padded only to the upper degree bound of the bucket. For a few high-degree nodes this avoids padding
+    all nodes to the maximum degree. Since the number of nodes per bucket is dynamic, this is not supported for jit
+    compiled models with jax backend.
     """
 
     def __init__(self,
@@ -364,7 +455,7 @@ class AggregateLocalEdgesLSTM(Layer):
                  activity_regularizer=None, kernel_constraint=None, recurrent_constraint=None,
                  bias_constraint=None, dropout=0.0, recurrent_dropout=0.0,
                  return_sequences=False, return_state=False, go_backwards=False, stateful=False,
-                 time_major=False, unroll=False,
+                 time_major=False, unroll=False, degree_buckets: list = None,
                  **kwargs):
         """Initialize layer.
 
@@ -430,6 +521,9 @@ class AggregateLocalEdgesLSTM(Layer):
                 else a symbolic loop will be used. Unrolling can speed-up a RNN, although
                 it tends to be more memory-intensive. Unrolling is only suitable for short
                 sequences.
+            degree_buckets (list): List of increasing upper bounds of node in-degree, e.g. `[2, 4, 8]` , to run the
+                LSTM per bucket of nodes. Nodes with larger degree are put in a last bucket bounded by
+                `max_edges_per_node` or the maximum degree. Default is None.
         """
         super(AggregateLocalEdgesLSTM, self).__init__(**kwargs)
         self.pooling_method = pooling_method
@@ -443,17 +537,88 @@ class AggregateLocalEdgesLSTM(Layer):
             activity_regularizer=activity_regularizer, kernel_constraint=kernel_constraint,
             recurrent_constraint=recurrent_constraint, bias_constraint=bias_constraint, dropout=dropout,
             recurrent_dropout=recurrent_dropout, return_sequences=return_sequences, return_state=return_state,
-            go_backwards=go_backwards, stateful=stateful, time_major=time_major, unroll=unroll
+            go_backwards=go_backwards, stateful=stateful, unroll=unroll
         )
+        if time_major:
+            raise ValueError("Keras LSTM does not support `time_major` .")
         if self.pooling_method not in ["LSTM", "lstm"]:
             raise ValueError(
                 "Aggregate method does not match layer, expected 'LSTM' but got '%s'." % self.pooling_method)
         self.max_edges_per_node = max_edges_per_node
+        self.degree_buckets = [int(x) for x in degree_buckets] if degree_buckets is not None else None
+        if self.degree_buckets is not None:
+            if return_sequences or return_state:
+                raise ValueError("Degree buckets require LSTM without `return_sequences` and `return_state` .")
+            if any(x >= y for x, y in zip(self.degree_buckets[:-1], self.degree_buckets[1:])):
+                raise ValueError("Degree buckets must be increasing but got '%s'." % self.degree_buckets)
 
     def build(self, input_shape):
         """Build layer."""
         super(AggregateLocalEdgesLSTM, self).build(input_shape)
 
+    def compute_output_shape(self, input_shape):
+        """Compute output shape."""
+        units = self.lstm_unit.units
+        if self.lstm_unit.return_sequences:
+            output_shape = tuple(input_shape[0][:1]) + (self.max_edges_per_node, units)
+        else:
+            output_shape = tuple(input_shape[0][:1]) + (units,)
+        if self.lstm_unit.return_state:
+            return [output_shape, tuple(input_shape[0][:1]) + (units,), tuple(input_shape[0][:1]) + (units,)]
+        return output_shape
+
+    @staticmethod
+    def _edge_position(receive_indices, dim_n):
+        # Position of each edge among the edges with same receiving node, i.e. the time step for the LSTM.
+        order = ops.argsort(receive_indices)
+        counts = scatter_reduce_sum(receive_indices, ops.ones_like(receive_indices), shape=(dim_n,))
+        start = ops.cumsum(counts) - counts
+        position = ops.arange(ops.shape(receive_indices)[0], dtype=receive_indices.dtype) - ops.take(
+            start, ops.take(receive_indices, order, axis=0), axis=0)
+        return ops.take(position, ops.argsort(order), axis=0), counts
+
+    def _lstm_padded(self, edges, receive_indices, edge_position, dim_n, dim_e_per_n):
+        indices = receive_indices * ops.convert_to_tensor(dim_e_per_n, dtype=receive_indices.dtype) + edge_position
+        lstm_input = scatter_reduce_sum(
+            indices, edges,
+            shape=tuple([dim_n*dim_e_per_n] + list(ops.shape(edges)[1:]))
+        )
+        lstm_mask = ops.cast(scatter_reduce_sum(
+            indices, ops.ones(ops.shape(edges)[:1], dtype=ks.backend.floatx()),
+            shape=tuple([dim_n*dim_e_per_n])
+        ), dtype="bool")
+
+        lstm_input = ops.reshape(lstm_input, tuple([dim_n, dim_e_per_n] + list(ops.shape(edges)[1:])))
+        lstm_mask = ops.reshape(lstm_mask, tuple([dim_n, dim_e_per_n]))
+        return self.lstm_unit(lstm_input, mask=lstm_mask)
+
+    def _lstm_bucketed(self, edges, receive_indices, edge_position, counts, dim_n):
+        upper = self.max_edges_per_node if self.max_edges_per_node is not None else ops.max(counts)
+        bounds = [0] + self.degree_buckets
+        out = None
+        upper_buckets = self.degree_buckets + [upper]
+        for i, (lower, upper_bucket) in enumerate(zip(bounds, upper_buckets)):
+            if isinstance(upper_bucket, int) and isinstance(upper, int) and lower >= upper:
+                break
+            # Last bucket takes all nodes above the largest degree bound.
+            if i == len(upper_buckets) - 1:
+                node_in_bucket = counts > lower
+            else:
+                node_in_bucket = ops.logical_and(counts > lower, counts <= upper_bucket)
+            node_ids = ops.cast(ops.nonzero(node_in_bucket)[0], dtype=receive_indices.dtype)
+            # Position of nodes within bucket.
+            node_position = ops.cumsum(ops.cast(node_in_bucket, dtype=receive_indices.dtype)) - 1
+            edge_ids = ops.cast(ops.nonzero(ops.take(node_in_bucket, receive_indices, axis=0))[0],
+                               dtype=receive_indices.dtype)
+            out_bucket = self._lstm_padded(
+                ops.take(edges, edge_ids, axis=0),
+                ops.take(node_position, ops.take(receive_indices, edge_ids, axis=0), axis=0),
+                ops.take(edge_position, edge_ids, axis=0),
+                ops.shape(node_ids)[0], upper_bucket)
+            out_bucket = scatter_reduce_sum(node_ids, out_bucket, shape=tuple([dim_n] + list(out_bucket.shape[1:])))
+            out = out_bucket if out is None else out + out_bucket
+        return out
+
     def call(self, inputs, **kwargs):
         r"""Forward pass.
 
@@ -463,32 +628,30 @@ class AggregateLocalEdgesLSTM(Layer):
                 - nodes (Tensor): Node embeddings of shape `(N, F)`
                 - edges (Tensor): Edge or message embeddings of shape `(M, F)`
                 - edge_indices (Tensor): Edge indices referring to nodes of shape `(2, M)`
-                - graph_id_edge (Tensor): Graph ID for each edge of shape `(M, )`
+                - graph_id_edge (Tensor): Position of each edge among edges of the same node of shape `(M, )` .
+                  Optional, is computed from edge indices if not provided.
 
         Returns:
             Tensor: Embedding tensor of aggregated edges for each node of shape `(N, F)` .
         """
-        n, edges, edge_index, edge_id = inputs
+        if len(inputs) > 3:
+            n, edges, edge_index, edge_id = inputs
+        else:
+            n, edges, edge_index = inputs
+            edge_id = None
         receive_indices = ops.take(edge_index, self.pooling_index, axis=self.axis_indices)
 
         dim_n = ops.shape(n)[0]
-        dim_e_per_n = self.max_edges_per_node if self.max_edges_per_node is not None else 2*dim_n+1
-        indices = receive_indices * ops.convert_to_tensor(dim_e_per_n, dtype=receive_indices.dtype) + ops.cast(
-            edge_id, dtype=receive_indices.dtype)
-        lstm_input = scatter_reduce_sum(
-            indices, edges,
-            shape=tuple([dim_n*dim_e_per_n] + list(ops.shape(edges)[1:]))
-        )
-        lstm_mask = ops.cast(scatter_reduce_sum(
-            indices, ops.ones(ops.shape(edges)[:1], dtype=ks.backend.floatx()),
-            shape=tuple([dim_n*dim_e_per_n])
-        ), dtype="bool")
+        if edge_id is None or self.degree_buckets is not None:
+            edge_position, counts = self._edge_position(receive_indices, dim_n)
+        else:
+            edge_position, counts = ops.cast(edge_id, dtype=receive_indices.dtype), None
 
-        lstm_input = ops.reshape(lstm_input, tuple([dim_n, dim_e_per_n] + list(ops.shape(edges)[1:])))
-        lstm_mask = ops.reshape(lstm_mask, tuple([dim_n, dim_e_per_n]))
+        if self.degree_buckets is not None:
+            return self._lstm_bucketed(edges, receive_indices, edge_position, counts, dim_n)
 
-        out = self.lstm_unit(lstm_input, mask=lstm_mask)
-        return out
+        dim_e_per_n = self.max_edges_per_node if self.max_edges_per_node is not None else 2*dim_n+1
+        return self._lstm_padded(edges, receive_indices, edge_position, dim_n, dim_e_per_n)
 
     def get_config(self):
         """Update layer config."""
@@ -503,7 +666,8 @@ class AggregateLocalEdgesLSTM(Layer):
             if x in conf_lstm:
                 config.update({x: conf_lstm[x]})
         config.update({"pooling_method": self.pooling_method, "axis_indices": self.axis_indices,
-                       "pooling_index": self.pooling_index, "max_edges_per_node": self.max_edges_per_node})
+                       "pooling_index": self.pooling_index, "max_edges_per_node": self.max_edges_per_node,
+                       "degree_buckets": self.degree_buckets})
         return config
 
 
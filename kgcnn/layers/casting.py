@@ -36,6 +36,8 @@ class _CastBatchedDisjointBase(Layer):
             remove_padded_disjoint_from_batched_output (bool): Whether to remove the first element on batched output
                 in case of padding.
         """
+        # Casting only rearranges tensors and must not round inputs to the compute dtype of a mixed precision policy.
+        kwargs.setdefault("autocast", False)
         super(_CastBatchedDisjointBase, self).__init__(**kwargs)
         self.reverse_indices = reverse_indices
         self.dtype_index = dtype_index
@@ -546,6 +548,7 @@ class _CastRaggedToDisjointBase(Layer):
             dtype_batch (str): Dtype for batch ID tensor. Default is 'int64'.
             dtype_index (str): Dtype for index tensor. Default is None.
         """
+        kwargs.setdefault("autocast", False)
         super(_CastRaggedToDisjointBase, self).__init__(**kwargs)
         self.reverse_indices = reverse_indices
         self.dtype_index = dtype_index
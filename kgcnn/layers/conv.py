@@ -1,5 +1,5 @@
 from keras.layers import Layer, Dense, Activation, Add, Multiply
-from kgcnn.layers.aggr import AggregateWeightedLocalEdges, AggregateLocalEdges
+from kgcnn.layers.aggr import AggregateWeightedLocalEdges, AggregateLocalEdges, AggregateLocalMessages
 from kgcnn.layers.gather import GatherNodesOutgoing
 from keras import ops
 import kgcnn.ops.activ
@@ -37,6 +37,7 @@ class GCN(Layer):
                  bias_constraint=None,
                  kernel_initializer='glorot_uniform',
                  bias_initializer='zeros',
+                 fused_message_passing: bool = False,
                  **kwargs):
         """Initialize layer.
 
@@ -54,6 +55,8 @@ class GCN(Layer):
             bias_constraint: Bias constrains. Default is None.
             kernel_initializer: Initializer for kernels. Default is 'glorot_uniform'.
             bias_initializer: Initializer for bias. Default is 'zeros'.
+            fused_message_passing (bool): Whether to use :obj:`AggregateLocalMessages` that does not materialize
+                gathered node embeddings per edge. Only for 'sum' or 'mean' pooling. Default is False.
         """
         super(GCN, self).__init__(**kwargs)
         # Changes in keras serialization behaviour for activations in 3.0.2.
@@ -63,6 +66,7 @@ class GCN(Layer):
         self.normalize_by_weights = normalize_by_weights
         self.pooling_method = pooling_method
         self.units = units
+        self.fused_message_passing = fused_message_passing
         kernel_args = {"kernel_regularizer": kernel_regularizer, "activity_regularizer": activity_regularizer,
                        "bias_regularizer": bias_regularizer, "kernel_constraint": kernel_constraint,
                        "bias_constraint": bias_constraint, "kernel_initializer": kernel_initializer,
@@ -70,9 +74,14 @@ class GCN(Layer):
         pool_args = {"pooling_method": pooling_method, "normalize_by_weights": normalize_by_weights}
 
         # Layers
-        self.layer_gather = GatherNodesOutgoing()
         self.layer_dense = Dense(units=self.units, activation='linear', **kernel_args)
-        self.layer_pool = AggregateWeightedLocalEdges(**pool_args)
+        if self.fused_message_passing:
+            self.layer_pool = AggregateLocalMessages(pooling_method=pooling_method)
+            if self.normalize_by_weights:
+                self.layer_pool_weights = AggregateLocalEdges(pooling_method="scatter_sum")
+        else:
+            self.layer_gather = GatherNodesOutgoing()
+            self.layer_pool = AggregateWeightedLocalEdges(**pool_args)
         self.layer_act = Activation(activation)
         
     def build(self, input_shape):
@@ -93,8 +102,13 @@ class GCN(Layer):
         """
         node, edges, edge_index = inputs
         no = self.layer_dense(node, **kwargs)
-        no = self.layer_gather([no, edge_index], **kwargs)
-        nu = self.layer_pool([node, no, edge_index, edges], **kwargs)  # Summing for each node connection
+        if self.fused_message_passing:
+            nu = self.layer_pool([no, edge_index, edges], **kwargs)
+            if self.normalize_by_weights:
+                nu = nu / self.layer_pool_weights([node, edges, edge_index], **kwargs)
+        else:
+            no = self.layer_gather([no, edge_index], **kwargs)
+            nu = self.layer_pool([node, no, edge_index, edges], **kwargs)  # Summing for each node connection
         out = self.layer_act(nu, **kwargs)
         return out
 
@@ -102,7 +116,8 @@ class GCN(Layer):
         """Update config."""
         config = super(GCN, self).get_config()
         config.update({"normalize_by_weights": self.normalize_by_weights,
-                       "pooling_method": self.pooling_method, "units": self.units})
+                       "pooling_method": self.pooling_method, "units": self.units,
+                       "fused_message_passing": self.fused_message_passing})
         conf_dense = self.layer_dense.get_config()
         for x in ["kernel_regularizer", "activity_regularizer", "bias_regularizer", "kernel_constraint",
                   "bias_constraint", "kernel_initializer", "bias_initializer", "use_bias"]:
@@ -130,6 +145,7 @@ class SchNetCFconv(Layer):
                  bias_constraint=None,
                  kernel_initializer='glorot_uniform',
                  bias_initializer='zeros',
+                 fused_message_passing: bool = False,
                  **kwargs):
         """Initialize Layer.
 
@@ -145,6 +161,8 @@ class SchNetCFconv(Layer):
             bias_constraint: Bias constrains. Default is None.
             kernel_initializer: Initializer for kernels. Default is 'glorot_uniform'.
             bias_initializer: Initializer for bias. Default is 'zeros'.
+            fused_message_passing (bool): Whether to use :obj:`AggregateLocalMessages` that recomputes the gathered
+                node embeddings per edge in the backward pass. Only for 'sum' or 'mean' pooling. Default is False.
         """
         super(SchNetCFconv, self).__init__(**kwargs)
         # Changes in keras serialization behaviour for activations in 3.0.2.
@@ -154,6 +172,7 @@ class SchNetCFconv(Layer):
         self.cfconv_pool = cfconv_pool
         self.units = units
         self.use_bias = use_bias
+        self.fused_message_passing = fused_message_passing
         kernel_args = {"kernel_regularizer": kernel_regularizer, "activity_regularizer": activity_regularizer,
                        "bias_regularizer": bias_regularizer, "kernel_constraint": kernel_constraint,
                        "bias_constraint": bias_constraint, "kernel_initializer": kernel_initializer,
@@ -161,9 +180,12 @@ class SchNetCFconv(Layer):
         # Layer
         self.lay_dense1 = Dense(units=self.units, activation=activation, use_bias=self.use_bias, **kernel_args)
         self.lay_dense2 = Dense(units=self.units, activation='linear', use_bias=self.use_bias, **kernel_args)
-        self.lay_sum = AggregateLocalEdges(pooling_method=cfconv_pool)
-        self.gather_n = GatherNodesOutgoing()
-        self.lay_mult = Multiply()
+        if self.fused_message_passing:
+            self.lay_sum = AggregateLocalMessages(pooling_method=cfconv_pool)
+        else:
+            self.lay_sum = AggregateLocalEdges(pooling_method=cfconv_pool)
+            self.gather_n = GatherNodesOutgoing()
+            self.lay_mult = Multiply()
 
     def build(self, input_shape):
         super(SchNetCFconv, self).build(input_shape)
@@ -184,6 +206,8 @@ class SchNetCFconv(Layer):
         node, edge, disjoint_indices = inputs
         x = self.lay_dense1(edge, **kwargs)
         x = self.lay_dense2(x, **kwargs)
+        if self.fused_message_passing:
+            return self.lay_sum([node, disjoint_indices, x], **kwargs)
         node2exp = self.gather_n([node, disjoint_indices], **kwargs)
         x = self.lay_mult([node2exp, x], **kwargs)
         x = self.lay_sum([node, x, disjoint_indices], **kwargs)
@@ -192,7 +216,8 @@ class SchNetCFconv(Layer):
     def get_config(self):
         """Update layer config."""
         config = super(SchNetCFconv, self).get_config()
-        config.update({"cfconv_pool": self.cfconv_pool, "units": self.units})
+        config.update({"cfconv_pool": self.cfconv_pool, "units": self.units,
+                       "fused_message_passing": self.fused_message_passing})
         config_dense = self.lay_dense1.get_config()
         for x in ["kernel_regularizer", "activity_regularizer", "bias_regularizer", "kernel_constraint",
                   "bias_constraint", "kernel_initializer", "bias_initializer", "activation", "use_bias"]:
@@ -218,6 +243,7 @@ class SchNetInteraction(Layer):
                  bias_constraint=None,
                  kernel_initializer='glorot_uniform',
                  bias_initializer='zeros',
+                 fused_message_passing: bool = False,
                  **kwargs):
         """Initialize Layer.
 
@@ -233,6 +259,8 @@ class SchNetInteraction(Layer):
             bias_constraint: Bias constrains. Default is None.
             kernel_initializer: Initializer for kernels. Default is 'glorot_uniform'.
             bias_initializer: Initializer for bias. Default is 'zeros'.
+            fused_message_passing (bool): Whether to use fused message passing in :obj:`SchNetCFconv` .
+                Default is False.
         """
         super(SchNetInteraction, self).__init__(**kwargs)
         # Changes in keras serialization behaviour for activations in 3.0.2.
@@ -242,11 +270,13 @@ class SchNetInteraction(Layer):
         self.cfconv_pool = cfconv_pool
         self.use_bias = use_bias
         self.units = units
+        self.fused_message_passing = fused_message_passing
         kernel_args = {"kernel_regularizer": kernel_regularizer, "activity_regularizer": activity_regularizer,
                        "bias_regularizer": bias_regularizer, "kernel_constraint": kernel_constraint,
                        "bias_constraint": bias_constraint, "kernel_initializer": kernel_initializer,
                        "bias_initializer": bias_initializer}
-        conv_args = {"units": self.units, "use_bias": use_bias, "activation": activation, "cfconv_pool": cfconv_pool}
+        conv_args = {"units": self.units, "use_bias": use_bias, "activation": activation, "cfconv_pool": cfconv_pool,
+                     "fused_message_passing": fused_message_passing}
 
         # Layers
         self.lay_cfconv = SchNetCFconv(**conv_args, **kernel_args)
@@ -281,7 +311,8 @@ class SchNetInteraction(Layer):
 
     def get_config(self):
         config = super(SchNetInteraction, self).get_config()
-        config.update({"cfconv_pool": self.cfconv_pool, "units": self.units, "use_bias": self.use_bias})
+        config.update({"cfconv_pool": self.cfconv_pool, "units": self.units, "use_bias": self.use_bias,
+                       "fused_message_passing": self.fused_message_passing})
         conf_dense = self.lay_dense2.get_config()
         for x in ["activation", "kernel_regularizer", "bias_regularizer", "activity_regularizer",
                   "kernel_constraint", "bias_constraint", "kernel_initializer", "bias_initializer"]:
@@ -310,20 +341,27 @@ class GIN(Layer):
     def __init__(self,
                  pooling_method='scatter_sum',
                  epsilon_learnable=False,
+                 fused_message_passing: bool = False,
                  **kwargs):
         """Initialize layer.
 
         Args:
             epsilon_learnable (bool): If epsilon is learnable or just constant zero. Default is False.
             pooling_method (str): Pooling method for summing edges. Default is 'segment_sum'.
+            fused_message_passing (bool): Whether to use :obj:`AggregateLocalMessages` that does not materialize
+                gathered node embeddings per edge. Only for 'sum' or 'mean' pooling. Default is False.
         """
         super(GIN, self).__init__(**kwargs)
         self.pooling_method = pooling_method
         self.epsilon_learnable = epsilon_learnable
+        self.fused_message_passing = fused_message_passing
 
         # Layers
-        self.lay_gather = GatherNodesOutgoing()
-        self.lay_pool = AggregateLocalEdges(pooling_method=self.pooling_method)
+        if self.fused_message_passing:
+            self.lay_pool = AggregateLocalMessages(pooling_method=self.pooling_method)
+        else:
+            self.lay_gather = GatherNodesOutgoing()
+            self.lay_pool = AggregateLocalEdges(pooling_method=self.pooling_method)
         self.lay_add = Add()
 
         # Epsilon with trainable as optional and default zeros initialized.
@@ -347,8 +385,11 @@ class GIN(Layer):
             Tensor: Node embeddings of shape `([N], F)`
         """
         node, edge_index = inputs
-        ed = self.lay_gather([node, edge_index], **kwargs)
-        nu = self.lay_pool([node, ed, edge_index], **kwargs)  # Summing for each node connection
+        if self.fused_message_passing:
+            nu = self.lay_pool([node, edge_index], **kwargs)
+        else:
+            ed = self.lay_gather([node, edge_index], **kwargs)
+            nu = self.lay_pool([node, ed, edge_index], **kwargs)  # Summing for each node connection
         no = (ops.convert_to_tensor(1, dtype=self.eps_k.dtype) + self.eps_k) * node
         out = self.lay_add([no, nu], **kwargs)
         return out
@@ -357,7 +398,8 @@ class GIN(Layer):
         """Update config."""
         config = super(GIN, self).get_config()
         config.update({"pooling_method": self.pooling_method,
-                       "epsilon_learnable": self.epsilon_learnable})
+                       "epsilon_learnable": self.epsilon_learnable,
+                       "fused_message_passing": self.fused_message_passing})
         return config
 
 
@@ -5,6 +5,7 @@ from keras import ops
 from kgcnn import __indices_axis__ as global_axis_indices
 from kgcnn import __index_send__ as global_index_send
 from kgcnn import __index_receive__ as global_index_receive
+from kgcnn.ops.core import searchsorted
 
 
 class GatherNodes(Layer):
@@ -310,4 +311,67 @@ class GatherEdgesPairs(Layer):
         """Get layer config."""
         conf = super(GatherEdgesPairs, self).get_config()
         conf.update({"axis_indices": self.axis_indices})
-        return conf
\ No newline at end of file
+        return conf
+
+class EdgeIndicesReverse(Layer):
+    """Compute the index of the reverse edge :math:`(j, i)` for each edge :math:`(i, j)` of a (disjoint) graph.
+
+    In-graph counterpart of :obj:`kgcnn.graph.methods.compute_reverse_edges_index_map` , which avoids to precompute
+    and store reverse indices for each graph. Edges :math:`(i, j)` are encoded as integer keys :math:`i N + j` ,
+    which are sorted once and the reverse keys are looked up by binary search. Edges without a reverse counterpart get
+    index `-1` , which is handled by :obj:`GatherEdgesPairs` . For duplicate edges, one of them is assigned, which
+    may not be the first one as for :obj:`compute_reverse_edges_index_map` .
+    """
+
+    def __init__(self, axis_indices: int = global_axis_indices, **kwargs):
+        """Initialize layer.
+
+        Args:
+            axis_indices (int): Axis of indices. Default is 0.
+        """
+        super(EdgeIndicesReverse, self).__init__(**kwargs)
+        self.axis_indices = axis_indices
+
+    def build(self, input_shape):
+        """Build this layer."""
+        self.built = True
+
+    def compute_output_spec(self, inputs):
+        """Compute output spec."""
+        num_edges = inputs[1].shape[1 - self.axis_indices]
+        shape = (1, num_edges) if self.axis_indices == 0 else (num_edges, 1)
+        return ks.KerasTensor(shape, dtype="int64")
+
+    def call(self, inputs, **kwargs):
+        """Forward pass.
+
+        Args:
+            inputs (list): [nodes, edge_index]
+
+                - nodes (Tensor): Node embeddings of shape ([N], F)
+                - edge_index (Tensor): Edge indices referring to nodes of shape (2, [M])
+
+        Returns:
+            Tensor: Edge indices referring to the reverse edges of shape (1, [M]).
+        """
+        nodes, edge_index = inputs
+        edge_index = ops.cast(edge_index, dtype="int64")
+        dim_n = ops.cast(ops.shape(nodes)[0], dtype="int64")
+        dim_m = ops.shape(edge_index)[1 - self.axis_indices]
+        index_i = ops.take(edge_index, 0, axis=self.axis_indices)
+        index_j = ops.take(edge_index, 1, axis=self.axis_indices)
+        keys = index_i * dim_n + index_j
+        keys_reverse = index_j * dim_n + index_i
+        order = ops.argsort(keys)
+        keys_sorted = ops.take(keys, order, axis=0)
+        position = searchsorted(keys_sorted, keys_reverse, side="left")
+        position = ops.minimum(position, ops.cast(ops.maximum(dim_m - 1, 0), dtype=position.dtype))
+        is_reverse = ops.equal(ops.take(keys_sorted, position, axis=0), keys_reverse)
+        pair_index = ops.where(is_reverse, ops.take(order, position, axis=0), -ops.ones_like(position))
+        return ops.expand_dims(pair_index, axis=self.axis_indices)
+
+    def get_config(self):
+        """Get layer config."""
+        conf = super(EdgeIndicesReverse, self).get_config()
+        conf.update({"axis_indices": self.axis_indices})
+        return conf
@@ -10,11 +10,29 @@ from kgcnn.layers.polynom import tf_spherical_bessel_jn, tf_spherical_harmonics_
 from kgcnn.layers.polynom import SphericalBesselJnExplicit, SphericalHarmonicsYl
 from kgcnn.ops.axis import get_positive_axis
 from kgcnn.ops.core import cross as kgcnn_cross
+from kgcnn.ops.core import recompute_grad
+from kgcnn.ops.scatter import scatter_reduce_sum
 from kgcnn import __geom_euclidean_norm_add_eps__ as global_geom_euclidean_norm_add_eps
 from kgcnn import __geom_euclidean_norm_no_nan__ as global_geom_euclidean_norm_no_nan
 
 
-class NodePosition(Layer):
+class _GeometryLayerBase(Layer):
+    r"""Base class for geometric layers, which compute in full precision under a mixed precision policy.
+
+    If no :obj:`dtype` is given and the global dtype policy is mixed, e.g. `mixed_bfloat16` , the layer uses the
+    variable dtype of the policy, i.e. `float32` , for computation. Low precision inputs are then cast to `float32` .
+    Distances, angles and basis expansions are therefore not affected by rounding of coordinates.
+    """
+
+    def __init__(self, **kwargs):
+        if kwargs.get("dtype") is None:
+            policy = ks.mixed_precision.global_policy()
+            if policy.compute_dtype != policy.variable_dtype:
+                kwargs["dtype"] = policy.variable_dtype
+        super(_GeometryLayerBase, self).__init__(**kwargs)
+
+
+class NodePosition(_GeometryLayerBase):
     r"""Get node position for directed edges via node indices.
 
     Directly calls :obj:`GatherNodes` with provided index tensor.
@@ -82,7 +100,7 @@ class NodePosition(Layer):
         return config
 
 
-class ShiftPeriodicLattice(Layer):
+class ShiftPeriodicLattice(_GeometryLayerBase):
     r"""Shift position tensor by multiples of the lattice constant of a periodic lattice in 3D.
 
     Let an atom have position :math:`\vec{x}_0` in the unit cell and be in a periodic lattice with lattice vectors
@@ -130,7 +148,7 @@ class ShiftPeriodicLattice(Layer):
         return x_val
 
 
-class EuclideanNorm(Layer):
+class EuclideanNorm(_GeometryLayerBase):
     r"""Compute euclidean norm for edge or node vectors.
 
     This amounts for a specific :obj:`axis` along which to sum the coordinates:
@@ -230,7 +248,7 @@ class EuclideanNorm(Layer):
         return config
 
 
-class ScalarProduct(Layer):
+class ScalarProduct(_GeometryLayerBase):
     r"""Compute geometric scalar product for edge or node coordinates.
 
     A distance based edge or node coordinates are defined by `(batch, [N], ..., D)` with last dimension D.
@@ -298,7 +316,7 @@ class ScalarProduct(Layer):
         return config
 
 
-class NodeDistanceEuclidean(Layer):
+class NodeDistanceEuclidean(_GeometryLayerBase):
     r"""Compute euclidean distance between two node coordinate tensors.
 
     Let :math:`\vec{x}_1` and :math:`\vec{x}_2` be the position of two nodes, then the output is given by:
@@ -348,7 +366,7 @@ class NodeDistanceEuclidean(Layer):
         return config
 
 
-class EdgeDirectionNormalized(Layer):
+class EdgeDirectionNormalized(_GeometryLayerBase):
     r"""Compute the normalized geometric direction between two point coordinates for e.g. a geometric edge.
 
     Let two points have position :math:`\vec{r}_{i}` and :math:`\vec{r}_{j}` for an edge :math:`e_{ij}`, then
@@ -400,7 +418,7 @@ class EdgeDirectionNormalized(Layer):
         return config
 
 
-class VectorAngle(Layer):
+class VectorAngle(_GeometryLayerBase):
     r"""Compute geometric angles between two vectors in euclidean space.
 
     The vectors :math:`\vec{v}_1` and :math:`\vec{v}_2` could be obtained from three points
@@ -458,7 +476,7 @@ class VectorAngle(Layer):
         return config
 
 
-class EdgeAngle(Layer):
+class EdgeAngle(_GeometryLayerBase):
     r"""Compute geometric angles between two vectors that represent an edge of a graph.
 
     The vectors :math:`\vec{v}_1` and :math:`\vec{v}_2` span an angles as:
@@ -524,7 +542,135 @@ class EdgeAngle(Layer):
         return config
 
 
-class GaussBasisLayer(Layer):
+class EdgeAngleIndices(Layer):
+    r"""Compute the indices of edge pairs that form an angle for a (disjoint) graph from its edge or range indices.
+
+    In-graph counterpart of :obj:`kgcnn.graph.methods.get_angle_indices` and :obj:`SetAngle` with the same options,
+    which avoids to precompute and store angle indices for each graph. For each edge :math:`(i, j)` , edges that
+    share the fixed node according to `edge_pairing` are found in a list of edges grouped by this node. The pairs
+    are expanded by repeat and range operations with segment offsets without python loop.
+
+    .. note::
+
+        The number of angles is not known before calling the layer. Therefore, with jax backend the model can not be
+        jit compiled.
+
+    If batch IDs and counts of edges are provided, the batch IDs and counts of the angles are returned additionally,
+    which can be used in place of the casting output for angle indices.
+    """
+
+    def __init__(self, edge_pairing: str = "kj", allow_multi_edges: bool = False, allow_self_edges: bool = False,
+                 allow_reverse_edges: bool = False, check_sorted: bool = True, **kwargs):
+        """Initialize layer.
+
+        Args:
+            edge_pairing (str): Determines which edge pairs for angle computation are chosen. Default is 'kj'.
+                Alternatives are for example: 'ik', 'jk', 'ki', where 'k' denotes the variable index as 'i', 'j' are
+                fixed.
+            allow_multi_edges (bool): Whether to keep angle pairs with same node indices,
+                such as angle pairings of sort `ij`, `ij`. Default is False.
+            allow_self_edges (bool): Whether to allow the exact same edge in an angle pairing. Default is False.
+            allow_reverse_edges (bool): Whether to keep angle pairs with reverse node indices,
+                such as angle pairings of sort `ij`, `ji`. Default is False.
+            check_sorted (bool): Whether to sort angle indices by first and second edge as :obj:`SetAngle` .
+                Default is True.
+        """
+        super(EdgeAngleIndices, self).__init__(**kwargs)
+        if "k" not in edge_pairing or len(edge_pairing) != 2:
+            raise ValueError("Edge pairing must have index 'k' and one of 'i' or 'j' but got '%s'." % edge_pairing)
+        if "i" not in edge_pairing and "j" not in edge_pairing:
+            raise ValueError("Edge pairing must have at least one fix index 'i' or 'j'.")
+        self.edge_pairing = edge_pairing
+        self.allow_multi_edges = allow_multi_edges
+        self.allow_self_edges = allow_self_edges
+        self.allow_reverse_edges = allow_reverse_edges
+        self.check_sorted = check_sorted
+        self._pos_fix = 0 if edge_pairing[0] != "k" else 1
+        self._pos_ij = 0 if "i" in edge_pairing else 1
+
+    def build(self, input_shape):
+        """Build layer."""
+        super(EdgeAngleIndices, self).build(input_shape)
+
+    def compute_output_spec(self, inputs):
+        """Compute output spec."""
+        angle_indices = ks.KerasTensor((2, None), dtype=inputs[1].dtype)
+        if len(inputs) < 4:
+            return angle_indices
+        return [angle_indices, ks.KerasTensor((None,), dtype=inputs[2].dtype),
+                ks.KerasTensor(inputs[3].shape, dtype=inputs[3].dtype)]
+
+    def call(self, inputs, **kwargs):
+        r"""Forward pass.
+
+        Args:
+            inputs (list): [nodes, edge_indices, (batch_id_edge, count_edges)]
+
+                - nodes (Tensor): Node embeddings or coordinates of shape `([N], F)` .
+                - edge_indices (Tensor): Edge or range indices referring to nodes of shape `(2, [M])` .
+                - batch_id_edge (Tensor): Optional batch ID of each edge of shape `([M], )` .
+                - count_edges (Tensor): Optional number of edges of each graph of shape `(batch, )` .
+
+        Returns:
+            Tensor: Angle indices referring to edges of shape `(2, [K])` . Plus batch ID and count of angles, if batch
+            ID and count of edges are given.
+        """
+        nodes, edge_index = inputs[:2]
+        dim_n = ops.shape(nodes)[0]
+        dim_m = ops.shape(edge_index)[1]
+        index_dtype = edge_index.dtype
+        index_fix = edge_index[self._pos_fix]
+        index_match = edge_index[self._pos_ij]
+
+        # Group edges by their fixed node.
+        order = ops.argsort(index_fix)
+        counts = scatter_reduce_sum(index_fix, ops.ones_like(index_fix), shape=(dim_n,))
+        start = ops.cumsum(counts) - counts
+
+        # Expand all candidate pairs for each edge.
+        num_candidates = ops.take(counts, index_match, axis=0)
+        start_pairs = ops.cumsum(num_candidates) - num_candidates
+        edge_ij = ops.repeat(ops.arange(dim_m, dtype=index_dtype), num_candidates, axis=0)
+        offset = ops.arange(ops.shape(edge_ij)[0], dtype=index_dtype) - ops.take(start_pairs, edge_ij, axis=0)
+        edge_k = ops.take(order, ops.take(start, ops.take(index_match, edge_ij, axis=0), axis=0) + offset, axis=0)
+        edge_k = ops.cast(edge_k, dtype=index_dtype)
+
+        # Filter pairs.
+        i_ij, j_ij = ops.take(edge_index[0], edge_ij, axis=0), ops.take(edge_index[1], edge_ij, axis=0)
+        i_k, j_k = ops.take(edge_index[0], edge_k, axis=0), ops.take(edge_index[1], edge_k, axis=0)
+        keep = ops.ones_like(edge_ij, dtype="bool")
+        if not self.allow_multi_edges:
+            keep = ops.logical_and(keep, ops.logical_or(i_k != i_ij, j_k != j_ij))
+        if not self.allow_reverse_edges:
+            keep = ops.logical_and(keep, ops.logical_or(i_k != j_ij, j_k != i_ij))
+        keep = ops.where(edge_ij == edge_k, self.allow_self_edges, keep)
+        selection = ops.nonzero(keep)[0]
+        edge_ij, edge_k = ops.take(edge_ij, selection, axis=0), ops.take(edge_k, selection, axis=0)
+
+        if self.check_sorted:
+            order_pairs = ops.argsort(edge_ij * ops.cast(dim_m, dtype=index_dtype) + edge_k)
+            edge_ij, edge_k = ops.take(edge_ij, order_pairs, axis=0), ops.take(edge_k, order_pairs, axis=0)
+
+        angle_indices = ops.stack([edge_ij, edge_k], axis=0)
+        if len(inputs) < 4:
+            return angle_indices
+
+        batch_id_edge, count_edges = inputs[2:4]
+        batch_id_angle = ops.take(batch_id_edge, edge_ij, axis=0)
+        count_angles = scatter_reduce_sum(
+            batch_id_angle, ops.ones_like(batch_id_angle, dtype=count_edges.dtype), shape=ops.shape(count_edges))
+        return angle_indices, batch_id_angle, count_angles
+
+    def get_config(self):
+        """Update config."""
+        config = super(EdgeAngleIndices, self).get_config()
+        config.update({"edge_pairing": self.edge_pairing, "allow_multi_edges": self.allow_multi_edges,
+                       "allow_self_edges": self.allow_self_edges, "allow_reverse_edges": self.allow_reverse_edges,
+                       "check_sorted": self.check_sorted})
+        return config
+
+
+class GaussBasisLayer(_GeometryLayerBase):
     r"""Expand a distance into a Gaussian Basis, according to
     `Schuett et al. (2017) <https://arxiv.org/abs/1706.08566>`__ .
 
@@ -604,7 +750,7 @@ class GaussBasisLayer(Layer):
         return config
 
 
-class PositionEncodingBasisLayer(Layer):
+class PositionEncodingBasisLayer(_GeometryLayerBase):
     r"""Expand a distance into a Positional Encoding basis from `Transformer <https://arxiv.org/pdf/1706.03762.pdf>`__
     models, with :math:`\sin()` and :math:`\cos()` functions, which was slightly adapted for geometric distance
     information in edge features.
@@ -722,7 +868,7 @@ class PositionEncodingBasisLayer(Layer):
         return config
 
 
-class BesselBasisLayer(Layer):
+class BesselBasisLayer(_GeometryLayerBase):
     r"""Expand a distance into a Bessel Basis with :math:`l=m=0`, according to
     `Gasteiger et al. (2020) <https://arxiv.org/abs/2011.14115>`__ .
 
@@ -817,7 +963,7 @@ class BesselBasisLayer(Layer):
         return config
 
 
-class CosCutOffEnvelope(Layer):
+class CosCutOffEnvelope(_GeometryLayerBase):
     r"""Calculate cosine cutoff envelope according to
     `Behler et al. (2011) <https://aip.scitation.org/doi/10.1063/1.3553717>`__ .
 
@@ -867,7 +1013,7 @@ class CosCutOffEnvelope(Layer):
         return config
 
 
-class CosCutOff(Layer):
+class CosCutOff(_GeometryLayerBase):
     r"""Apply cosine cutoff according to
     `Behler et al. (2011) <https://aip.scitation.org/doi/10.1063/1.3553717>`__ .
 
@@ -917,7 +1063,161 @@ class CosCutOff(Layer):
         return config
 
 
-class DisplacementVectorsASU(Layer):
+class FusedDistanceBasis(_GeometryLayerBase):
+    r"""Compute the (enveloped) basis expansion of edge distances directly from node coordinates and edge indices.
+
+    Replaces the chain :obj:`NodePosition` , :obj:`NodeDistanceEuclidean` , :obj:`GaussBasisLayer` or
+    :obj:`BesselBasisLayer` and :obj:`CosCutOffEnvelope` within a single layer call. With :obj:`recompute_grad`
+    the per-edge intermediates like positions, difference vectors and distances are not stored for the backward
+    pass but recomputed, which reduces activation memory for graphs with many neighbours.
+
+    .. code-block:: python
+
+        from keras import ops
+        from kgcnn.layers.geom import FusedDistanceBasis
+        x = ops.convert_to_tensor([[0.0, -1.0, 0.0], [1.0, 1.0, 0.0]])
+        edi = ops.convert_to_tensor([[0, 1], [1, 0]], dtype="int64")
+        rbf, env = FusedDistanceBasis(basis_type="gauss", basis_kwargs={"bins": 20, "distance": 4.0},
+                                      envelope_cutoff=5.0, return_envelope=True)([x, edi])
+
+    The outputs are returned in the order `[basis, envelope, distance, direction]` , where only the basis is
+    required and the remaining outputs are selected by the layer arguments. Periodic edges are supported by passing
+    the additional inputs of :obj:`ShiftPeriodicLattice` .
+    """
+
+    _supported_basis = ["gauss", "bessel"]
+
+    def __init__(self,
+                 basis_type: str = "gauss",
+                 basis_kwargs: dict = None,
+                 envelope_cutoff: float = None,
+                 apply_envelope: bool = False,
+                 return_envelope: bool = False,
+                 return_distance: bool = False,
+                 return_direction: bool = False,
+                 recompute_grad: bool = False,
+                 add_eps: bool = global_geom_euclidean_norm_add_eps,
+                 no_nan: bool = global_geom_euclidean_norm_no_nan,
+                 **kwargs):
+        r"""Initialize layer.
+
+        Args:
+            basis_type (str): Type of basis, either 'gauss' or 'bessel'. Default is 'gauss'.
+            basis_kwargs (dict): Arguments of :obj:`GaussBasisLayer` or :obj:`BesselBasisLayer` .
+            envelope_cutoff (float): Cutoff distance :math:`R_c` for :obj:`CosCutOffEnvelope` . Default is None.
+            apply_envelope (bool): Whether to multiply the basis with the cosine cutoff envelope. Default is False.
+            return_envelope (bool): Whether to return the cosine cutoff envelope of shape `([M], 1)` .
+                Default is False.
+            return_distance (bool): Whether to return the distance of shape `([M], 1)` . Default is False.
+            return_direction (bool): Whether to return the normalized direction of shape `([M], 3)` as
+                :obj:`EdgeDirectionNormalized` . Default is False.
+            recompute_grad (bool): Whether to recompute intermediate values in the backward pass. Default is False.
+            add_eps (bool): Whether to add epsilon before taking square root. Default is False.
+            no_nan (bool): Whether to remove NaNs on invert. Default is True.
+        """
+        super(FusedDistanceBasis, self).__init__(**kwargs)
+        if basis_type not in self._supported_basis:
+            raise ValueError("Unknown basis type '%s' for `FusedDistanceBasis` ." % basis_type)
+        self.basis_type = basis_type
+        self.basis_kwargs = dict(basis_kwargs) if basis_kwargs is not None else {}
+        self.envelope_cutoff = float(np.abs(envelope_cutoff)) if envelope_cutoff is not None else 1e8
+        self.apply_envelope = apply_envelope
+        self.return_envelope = return_envelope
+        self.return_distance = return_distance
+        self.return_direction = return_direction
+        self.recompute_grad = recompute_grad
+        self.add_eps = add_eps
+        self.no_nan = no_nan
+        if self.basis_type == "gauss":
+            self.layer_basis = GaussBasisLayer(**self.basis_kwargs)
+        else:
+            self.layer_basis = BesselBasisLayer(**self.basis_kwargs)
+        self.layer_state = GatherState()
+
+    def build(self, input_shape):
+        """Build layer."""
+        self.layer_basis.build(input_shape[0][:1] + (1,))
+        self.built = True
+
+    def _compute_outputs(self, x, lattice, edge_index, edge_image, batch_id_edge):
+        x1, x2 = ops.take(x, edge_index[0], axis=0), ops.take(x, edge_index[1], axis=0)
+        if lattice is not None:
+            lattice_rep = self.layer_state([lattice, batch_id_edge])
+            x2 = x2 + ops.sum(ops.cast(lattice_rep, dtype=x2.dtype) * ops.expand_dims(
+                ops.cast(edge_image, dtype=x2.dtype), axis=-1), axis=1)
+        diff = x1 - x2
+        d = EuclideanNorm._compute_euclidean_norm(diff, axis=-1, keepdims=True, add_eps=self.add_eps)
+        if self.basis_type == "gauss":
+            basis = self.layer_basis._compute_gauss_basis(
+                d, offset=self.layer_basis.offset, gamma=self.layer_basis.gamma, bins=self.layer_basis.bins,
+                distance=self.layer_basis.distance)
+        else:
+            basis = self.layer_basis.expand_bessel_basis(d)
+        out = [basis]
+        if self.apply_envelope or self.return_envelope:
+            env = CosCutOffEnvelope._compute_cutoff_envelope(d, cutoff=self.envelope_cutoff)
+            if self.apply_envelope:
+                out[0] = basis * env
+            if self.return_envelope:
+                out.append(env)
+        if self.return_distance:
+            out.append(d)
+        if self.return_direction:
+            inv_d = EuclideanNorm._compute_euclidean_norm(
+                diff, axis=-1, keepdims=True, invert_norm=True, add_eps=self.add_eps, no_nan=self.no_nan)
+            out.append(diff * inv_d)
+        return out
+
+    def call(self, inputs, **kwargs):
+        r"""Forward pass.
+
+        Args:
+            inputs (list): [position, edge_index] or [position, edge_index, edge_image, lattice, batch_id_edge]
+
+                - position (Tensor): Node positions of shape `(N, 3)` .
+                - edge_index (Tensor): Edge indices referring to nodes of shape `(2, M)` .
+                - edge_image (Tensor): Optional periodic image of the second node of shape `(M, 3)` .
+                - lattice (Tensor): Optional lattice vector matrix of shape `(batch, 3, 3)` .
+                - batch_id_edge (Tensor): Optional batch ID of edges of shape `(M, )` .
+
+        Returns:
+            Tensor: Basis expansion of shape `([M], bins)` or list of outputs `[basis, envelope, distance, direction]`
+            depending on the layer arguments.
+        """
+        if len(inputs) == 2:
+            x, edge_index = inputs
+            lattice, edge_image, batch_id_edge = None, None, None
+        else:
+            x, edge_index, edge_image, lattice, batch_id_edge = inputs
+        if self.recompute_grad:
+            # Only float tensors are passed for gradient computation, indices are captured.
+            if lattice is None:
+                out = recompute_grad(
+                    lambda x_: self._compute_outputs(x_, None, edge_index, None, None))(x)
+            else:
+                out = recompute_grad(
+                    lambda x_, lat_: self._compute_outputs(x_, lat_, edge_index, edge_image, batch_id_edge))(
+                    x, lattice)
+        else:
+            out = self._compute_outputs(x, lattice, edge_index, edge_image, batch_id_edge)
+        out = list(out)
+        if len(out) == 1:
+            return out[0]
+        return out
+
+    def get_config(self):
+        """Update config."""
+        config = super(FusedDistanceBasis, self).get_config()
+        config.update({
+            "basis_type": self.basis_type, "basis_kwargs": self.basis_kwargs, "envelope_cutoff": self.envelope_cutoff,
+            "apply_envelope": self.apply_envelope, "return_envelope": self.return_envelope,
+            "return_distance": self.return_distance, "return_direction": self.return_direction,
+            "recompute_grad": self.recompute_grad, "add_eps": self.add_eps, "no_nan": self.no_nan
+        })
+        return config
+
+
+class DisplacementVectorsASU(_GeometryLayerBase):
     """TODO: Add docs.
 
     """
@@ -966,7 +1266,7 @@ class DisplacementVectorsASU(Layer):
         return offset
 
 
-class DisplacementVectorsUnitCell(Layer):
+class DisplacementVectorsUnitCell(_GeometryLayerBase):
     r"""Computes displacements vectors for edges that require the sending node to be displaced or translated
     into an image of the unit cell in a periodic system.
 
@@ -1013,7 +1313,7 @@ class DisplacementVectorsUnitCell(Layer):
         return offset
 
 
-class FracToRealCoordinates(Layer):
+class FracToRealCoordinates(_GeometryLayerBase):
     r"""Layer to compute real-space coordinates from fractional coordinates with the lattice matrix.
 
     With lattice matrix :math:`\mathbf{A}` of a periodic lattice with lattice vectors
@@ -1060,7 +1360,7 @@ class FracToRealCoordinates(Layer):
         return frac_to_real
 
 
-class RealToFracCoordinates(Layer):
+class RealToFracCoordinates(_GeometryLayerBase):
     r"""Layer to compute fractional coordinates from real-space coordinates with the lattice matrix.
 
     With lattice matrix :math:`\mathbf{A}` of a periodic lattice with lattice vectors
@@ -1119,7 +1419,7 @@ class RealToFracCoordinates(Layer):
         return config
 
 
-class SphericalBasisLayer(Layer):
+class SphericalBasisLayer(_GeometryLayerBase):
     r"""Expand a distance into a Bessel Basis with :math:`l=m=0`, according to
     `Klicpera et al. 2020 <https://arxiv.org/abs/2011.14115>`__ .
     """
@@ -1,5 +1,6 @@
 import keras as ks
 from keras import ops
+from kgcnn.ops.core import recompute_grad
 
 
 class Embedding(ks.layers.Layer):
@@ -123,4 +124,50 @@ class ZerosLike(ks.layers.Layer):
         Returns:
             Tensor: Zero-like tensor of input.
         """
-        return ops.zeros_like(inputs)
\ No newline at end of file
+        return ops.zeros_like(inputs)
+
+
+class RecomputeGrad(ks.layers.Wrapper):
+    r"""Wrapper to recompute intermediate values of a layer in the backward pass instead of storing them.
+
+    This trades memory for compute in deep message passing models, in which every interaction block would otherwise
+    keep its per-edge activations for the backward pass. Uses :obj:`kgcnn.ops.core.recompute_grad` , which is
+    available for tensorflow, jax and torch. The wrapped layer is called directly on its first call, which builds its
+    weights. The wrapped layer must not use randomness like dropout, since values are recomputed.
+
+    .. code-block:: python
+
+        from kgcnn.layers.modules import RecomputeGrad
+        from kgcnn.literature.PAiNN._layers import PAiNNUpdate
+        layer = RecomputeGrad(PAiNNUpdate(units=128))
+    """
+
+    def __init__(self, layer, **kwargs):
+        """Initialize layer.
+
+        Args:
+            layer (Layer): Layer to wrap. Takes a list of tensors as input.
+        """
+        super(RecomputeGrad, self).__init__(layer, **kwargs)
+
+    def build(self, input_shape):
+        """Build layer."""
+        # Wrapped layer is built on its first call in `call` , in case it builds sub-layers lazily.
+        self.built = True
+
+    def call(self, inputs, **kwargs):
+        """Forward pass.
+
+        Args:
+            inputs (list): List of tensors of inputs to the wrapped layer.
+
+        Returns:
+            Output of the wrapped layer.
+        """
+        if not self.layer.built:
+            return self.layer(inputs, **kwargs)
+
+        def layer_call(*args):
+            return self.layer(list(args), **kwargs)
+
+        return recompute_grad(layer_call)(*inputs)
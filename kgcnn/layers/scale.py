@@ -165,9 +165,101 @@ class QMGraphLabelScaler(ks.layers.Layer):  # noqa
             s.set_scale(scaler)
 
 
+class EnergyForceExtensiveLabelScaler(ks.layers.Layer):  # noqa
+
+    max_atomic_number = 95
+
+    def __init__(self, scaling_shape: tuple = None, dtype_scale: str = "float64", trainable: bool = False,
+                 name="EnergyForceExtensiveLabelScaler", **kwargs):
+        r"""Initialize layer instance of :obj:`EnergyForceExtensiveLabelScaler` .
+
+        Layer equivalent of :obj:`kgcnn.data.transform.scaler.force.EnergyForceExtensiveLabelScaler` , which applies
+        the inverse transform to the output of a model. Energies are scaled and the fitted energy contributions of
+        each atom are added. Forces are only scaled, since the offset does not depend on coordinates. The layer
+        requires padded atomic numbers of shape `(batch, N)` with zero for padded atoms.
+
+        Args:
+            scaling_shape (tuple): Shape of the scale, which is `(1, n_states)` .
+            dtype_scale (str): Data type of the weights and of the energy output. Default is "float64".
+            trainable (bool): Whether the weights are trainable. Default is False.
+        """
+        super(EnergyForceExtensiveLabelScaler, self).__init__(**kwargs)
+        self._scaling_shape = scaling_shape
+        self.name = name
+        self._weights_trainable = trainable
+        self.dtype_scale = dtype_scale
+        self.extensive = True
+
+        if self._scaling_shape is not None:
+            self._add_weights_for_scaling()
+
+    def _add_weights_for_scaling(self):
+        self.scale_ = self.add_weight(
+            shape=self._scaling_shape,
+            initializer="ones", trainable=self._weights_trainable, dtype=self.dtype_scale
+        )
+        self.ridge_kernel_ = self.add_weight(
+            shape=tuple([self.max_atomic_number] + list(self._scaling_shape[1:])),
+            initializer="zeros", trainable=self._weights_trainable, dtype=self.dtype_scale
+        )
+        self.intercept_ = self.add_weight(
+            shape=self._scaling_shape,
+            initializer="zeros", trainable=self._weights_trainable, dtype=self.dtype_scale
+        )
+
+    def build(self, input_shape):
+        if self._scaling_shape is None:
+            if input_shape is None:
+                raise ValueError("Can not build scale and mean weights if `input_shape` and `scaling_shape` not known.")
+            self._scaling_shape = tuple([1 if i is None else i for i in input_shape[0]])
+            self._add_weights_for_scaling()
+        self.built = True
+
+    def compute_output_shape(self, input_shape):
+        return input_shape[0], input_shape[1]
+
+    def call(self, inputs, **kwargs):
+        r"""Forward pass.
+
+        Args:
+            inputs (list): `[energy, force, atomic_number]` of shape `(batch, n_states)` , force of any shape with
+                states or coordinates in the last dimension and `(batch, N)` .
+
+        Returns:
+            tuple: Scaled energy with atomic contributions and scaled force.
+        """
+        energy, force, atomic_number = inputs
+        if len(atomic_number.shape) != 2:
+            raise ValueError("`EnergyForceExtensiveLabelScaler` requires padded atomic numbers of shape `(batch, N)`.")
+        energy_per_node = ops.take(self.ridge_kernel_, ops.cast(atomic_number, dtype="int64"), axis=0)
+        extensive_energies = ops.sum(energy_per_node, axis=1) + self.intercept_
+        energy = ops.cast(energy, dtype=self.dtype_scale) * self.scale_ + extensive_energies
+        force = force * ops.cast(ops.reshape(self.scale_, [-1]), dtype=force.dtype)
+        return energy, force
+
+    def get_config(self):
+        config = super(EnergyForceExtensiveLabelScaler, self).get_config()
+        config.update({"scaling_shape": self._scaling_shape, "dtype_scale": self.dtype_scale,
+                       "trainable": self._weights_trainable})
+        return config
+
+    def set_scale(self, scaler):
+        ridge_kernel = np.transpose(np.array(scaler.ridge.coef_))
+        pos = np.sort(np.array(scaler._fit_atom_selection))
+        shape = tuple([int(self.max_atomic_number)] + list(self._scaling_shape[1:]))
+        layer_kernel = np.zeros(shape)
+        layer_kernel[pos] = np.reshape(ridge_kernel, tuple([len(pos)] + list(shape[1:])))
+        layer_kernel[0] = 0.  # Make sure padded atoms have no energy.
+        intercept = np.broadcast_to(np.array(scaler.ridge.intercept_, dtype="float64"), self._scaling_shape)
+        self.scale_.assign(np.reshape(scaler.get_scaling(), self._scaling_shape))
+        self.ridge_kernel_.assign(layer_kernel)
+        self.intercept_.assign(intercept)
+
+
 def get(scale_name: str):
     scaler_reference = {
         "StandardLabelScaler": StandardLabelScaler,
-        "ExtensiveMolecularLabelScaler": ExtensiveMolecularLabelScaler
+        "ExtensiveMolecularLabelScaler": ExtensiveMolecularLabelScaler,
+        "EnergyForceExtensiveLabelScaler": EnergyForceExtensiveLabelScaler
     }
     return scaler_reference[scale_name]
\ No newline at end of file
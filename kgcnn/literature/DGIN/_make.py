@@ -5,6 +5,7 @@ from kgcnn.models.casting import (template_cast_output, template_cast_list_input
                                   template_cast_list_input_docs, template_cast_output_docs)
 from keras.backend import backend as backend_to_use
 from kgcnn.layers.modules import Input
+from kgcnn.layers.gather import EdgeIndicesReverse
 from ._model import model_disjoint
 
 # Keep track of model version from commit date in literature.
@@ -36,6 +37,7 @@ model_default = {
     ],
     "input_tensor_type": "padded",
     "cast_disjoint_kwargs": {},
+    "make_reverse_edges": False,
     "input_embedding": None,  # deprecated
     "input_node_embedding": {"input_dim": 95, "output_dim": 64},
     "input_edge_embedding": {"input_dim": 5, "output_dim": 64},
@@ -71,6 +73,7 @@ def make_model(name: str = None,
                inputs: list = None,
                input_tensor_type: str = None,
                cast_disjoint_kwargs: dict = None,
+               make_reverse_edges: bool = None,
                input_embedding: dict = None,
                input_node_embedding: dict = None,
                input_edge_embedding: dict = None,
@@ -118,6 +121,9 @@ def make_model(name: str = None,
         inputs (list): List of dictionaries unpacked in :obj:`Input`. Order must match model definition.
         input_tensor_type (str): Input type of graph tensor. Default is "padded".
         cast_disjoint_kwargs (dict): Dictionary of arguments for casting layers if used.
+        make_reverse_edges (bool): Whether to compute the reverse edge indices in the model with
+            :obj:`EdgeIndicesReverse` instead of providing them as input. Then the inputs are
+            :obj:`[nodes, edges, edge_indices, ...]` without reverse indices. Default is False.
         input_embedding (dict): Deprecated in favour of input_node_embedding etc.
         input_node_embedding (dict): Dictionary of arguments for nodes unpacked in :obj:`Embedding` layers.
         input_edge_embedding (dict): Dictionary of arguments for edge unpacked in :obj:`Embedding` layers.
@@ -150,18 +156,36 @@ def make_model(name: str = None,
     # Make input
     model_inputs = [Input(**x) for x in inputs]
 
-    di = template_cast_list_input(
-        model_inputs, input_tensor_type=input_tensor_type,
-        cast_disjoint_kwargs=cast_disjoint_kwargs,
-        index_assignment=[None, None, 0, 2] + ([None] if use_graph_state else []),
-        mask_assignment=[0, 1, 1, 2] + ([None] if use_graph_state else [])
-    )
-
-    if use_graph_state:
-        n, ed, edi, e_pairs, gs, batch_id_node, batch_id_edge, _, node_id, edge_id, _, count_nodes, count_edges, _ = di
+    if make_reverse_edges:
+        di = template_cast_list_input(
+            model_inputs, input_tensor_type=input_tensor_type,
+            cast_disjoint_kwargs=cast_disjoint_kwargs,
+            index_assignment=[None, None, 0] + ([None] if use_graph_state else []),
+            mask_assignment=[0, 1, 1] + ([None] if use_graph_state else [])
+        )
+        if use_graph_state:
+            n, ed, edi, gs, batch_id_node, batch_id_edge, node_id, edge_id, count_nodes, count_edges = di
+        else:
+            n, ed, edi, batch_id_node, batch_id_edge, node_id, edge_id, count_nodes, count_edges = di
+            gs = None
+        e_pairs = EdgeIndicesReverse()([n, edi])
+        index_graph_state = 3
     else:
-        n, ed, edi, e_pairs, batch_id_node, batch_id_edge, _, node_id, edge_id, _, count_nodes, count_edges, _ = di
-        gs = None
+        di = template_cast_list_input(
+            model_inputs, input_tensor_type=input_tensor_type,
+            cast_disjoint_kwargs=cast_disjoint_kwargs,
+            index_assignment=[None, None, 0, 2] + ([None] if use_graph_state else []),
+            mask_assignment=[0, 1, 1, 2] + ([None] if use_graph_state else [])
+        )
+
+        if use_graph_state:
+            n, ed, edi, e_pairs, gs, batch_id_node, batch_id_edge, _, node_id, edge_id, _, count_nodes, count_edges, \
+                _ = di
+        else:
+            n, ed, edi, e_pairs, batch_id_node, batch_id_edge, _, node_id, edge_id, _, count_nodes, count_edges, \
+                _ = di
+            gs = None
+        index_graph_state = 4
 
     # Wrapping disjoint model.
     out = model_disjoint(
@@ -169,7 +193,7 @@ def make_model(name: str = None,
         use_node_embedding=("int" in inputs[0]['dtype']) if input_node_embedding is not None else False,
         use_edge_embedding=("int" in inputs[1]['dtype']) if input_edge_embedding is not None else False,
         use_graph_embedding=False if not use_graph_state else (
-                "int" in inputs[4]['dtype']) if input_graph_embedding is not None else False,
+                "int" in inputs[index_graph_state]['dtype']) if input_graph_embedding is not None else False,
         use_graph_state=use_graph_state,
         input_node_embedding=input_node_embedding,
         input_edge_embedding=input_edge_embedding,
@@ -2,6 +2,7 @@ import keras as ks
 from kgcnn.layers.scale import get as get_scaler
 from ._model import model_disjoint, model_disjoint_crystal
 from kgcnn.layers.modules import Input
+from kgcnn.layers.geom import EdgeAngleIndices
 from kgcnn.models.casting import (template_cast_output, template_cast_list_input,
                                   template_cast_list_input_docs, template_cast_output_docs)
 from kgcnn.models.utils import update_model_kwargs
@@ -43,7 +44,10 @@ model_default = {
     "emb_size": 128, "out_emb_size": 256, "int_emb_size": 64, "basis_emb_size": 8,
     "num_blocks": 4, "num_spherical": 7, "num_radial": 6,
     "cutoff": 5.0, "envelope_exponent": 5,
+    "fused_basis_args": None,
+    "make_angle_indices": False,
     "num_before_skip": 1, "num_after_skip": 2, "num_dense_output": 3,
+    "recompute_interactions": False,
     "num_targets": 64, "extensive": True, "output_init": "zeros",
     "activation": "swish", "verbose": 10,
     "output_embedding": "graph",
@@ -70,8 +74,11 @@ def make_model(inputs: list = None,
                num_radial: int = None,
                cutoff: float = None,
                envelope_exponent: int = None,
+               fused_basis_args: dict = None,
+               make_angle_indices: bool = None,
                num_before_skip: int = None,
                num_after_skip: int = None,
+               recompute_interactions: bool = None,
                num_dense_output: int = None,
                num_targets: int = None,
                activation: str = None,
@@ -93,6 +100,8 @@ def make_model(inputs: list = None,
     The supported inputs are  :obj:`[nodes, coordinates, edge_indices, angle_indices...]`
     with '...' indicating mask or ID tensors following the template below.
     Note that you must supply angle indices as index pairs that refer to two edges.
+    With `make_angle_indices` the angle indices are omitted from inputs, i.e. :obj:`[nodes, coordinates, edge_indices,
+    ...]`, and computed within the model.
 
     %s
 
@@ -117,8 +126,16 @@ def make_model(inputs: list = None,
         num_radial (int): Number of radial components in basis layer.
         cutoff (float): Distance cutoff for basis layer.
         envelope_exponent (int): Exponent in envelope function for basis layer.
+        fused_basis_args (dict): If not None, distances, directions and Bessel expansion are computed in a single
+            :obj:`FusedDistanceBasis` layer, which is unpacked with these additional layer arguments,
+            e.g. `{"recompute_grad": True}` . Default is None.
+        make_angle_indices (bool): Whether to compute the angle indices from edge indices within the model by
+            :obj:`EdgeAngleIndices` instead of providing them as input. Not supported for jit-compiled jax.
+            Default is False.
         num_before_skip (int): Number of residual layers in interaction block before skip connection
         num_after_skip (int): Number of residual layers in interaction block after skip connection
+        recompute_interactions (bool): Whether to recompute the activations of interaction blocks in the backward pass
+            instead of storing them, via :obj:`RecomputeGrad` . Saves memory for more compute. Default is False.
         num_dense_output (int): Number of dense units in output :obj:`DimNetOutputBlock`.
         num_targets (int): Number of targets or output embedding dimension of the model.
         activation (str, dict): Activation to use.
@@ -145,11 +162,16 @@ def make_model(inputs: list = None,
         model_inputs,
         input_tensor_type=input_tensor_type,
         cast_disjoint_kwargs=cast_disjoint_kwargs,
-        mask_assignment=[0, 0, 1, 2],
-        index_assignment=[None, None, 0, 2]
+        mask_assignment=[0, 0, 1] if make_angle_indices else [0, 0, 1, 2],
+        index_assignment=[None, None, 0] if make_angle_indices else [None, None, 0, 2]
     )
 
-    n, x, edi, adi, batch_id_node, batch_id_edge, batch_id_angles, node_id, edge_id, angle_id, count_nodes, count_edges, count_angles = dj
+    if make_angle_indices:
+        n, x, edi, batch_id_node, batch_id_edge, node_id, edge_id, count_nodes, count_edges = dj
+        adi = EdgeAngleIndices(edge_pairing="kj")([x, edi])
+    else:
+        n, x, edi, adi, batch_id_node, batch_id_edge, batch_id_angles, node_id, edge_id, angle_id, count_nodes, \
+            count_edges, count_angles = dj
 
     out = model_disjoint(
         [n, x, edi, adi, batch_id_node, count_nodes],
@@ -164,6 +186,7 @@ def make_model(inputs: list = None,
         num_radial=num_radial,
         cutoff=cutoff,
         envelope_exponent=envelope_exponent,
+        fused_basis_args=fused_basis_args,
         num_before_skip=num_before_skip,
         num_after_skip=num_after_skip,
         num_dense_output=num_dense_output,
@@ -173,7 +196,8 @@ def make_model(inputs: list = None,
         output_init=output_init,
         use_output_mlp=use_output_mlp,
         output_embedding=output_embedding,
-        output_mlp=output_mlp
+        output_mlp=output_mlp,
+        recompute_interactions=recompute_interactions
     )
 
     if output_scaling is not None:
@@ -228,6 +252,7 @@ model_crystal_default = {
     "num_blocks": 4, "num_spherical": 7, "num_radial": 6,
     "cutoff": 5.0, "envelope_exponent": 5,
     "num_before_skip": 1, "num_after_skip": 2, "num_dense_output": 3,
+    "recompute_interactions": False,
     "num_targets": 64, "extensive": True, "output_init": "zeros",
     "activation": "swish", "verbose": 10,
     "output_embedding": "graph",
@@ -256,6 +281,7 @@ def make_crystal_model(inputs: list = None,
                        envelope_exponent: int = None,
                        num_before_skip: int = None,
                        num_after_skip: int = None,
+                       recompute_interactions: bool = None,
                        num_dense_output: int = None,
                        num_targets: int = None,
                        activation: str = None,
@@ -308,6 +334,8 @@ def make_crystal_model(inputs: list = None,
         envelope_exponent (int): Exponent in envelope function for basis layer.
         num_before_skip (int): Number of residual layers in interaction block before skip connection
         num_after_skip (int): Number of residual layers in interaction block after skip connection
+        recompute_interactions (bool): Whether to recompute the activations of interaction blocks in the backward pass
+            instead of storing them, via :obj:`RecomputeGrad` . Saves memory for more compute. Default is False.
         num_dense_output (int): Number of dense units in output :obj:`DimNetOutputBlock`.
         num_targets (int): Number of targets or output embedding dimension of the model.
         activation (str, dict): Activation to use.
@@ -361,7 +389,8 @@ def make_crystal_model(inputs: list = None,
         output_init=output_init,
         use_output_mlp=use_output_mlp,
         output_embedding=output_embedding,
-        output_mlp=output_mlp
+        output_mlp=output_mlp,
+        recompute_interactions=recompute_interactions
     )
 
     if output_scaling is not None:
@@ -1,9 +1,10 @@
 from keras.layers import Add, Subtract, Concatenate, Dense
 from kgcnn.layers.geom import NodePosition, NodeDistanceEuclidean, BesselBasisLayer, EdgeAngle, ShiftPeriodicLattice, \
-    SphericalBasisLayer
+    SphericalBasisLayer, FusedDistanceBasis
 from kgcnn.layers.gather import GatherNodes
 from kgcnn.layers.pooling import PoolingNodes
 from kgcnn.layers.mlp import MLP
+from kgcnn.layers.modules import RecomputeGrad
 from ._layers import DimNetInteractionPPBlock, EmbeddingDimeBlock, DimNetOutputBlock
 
 
@@ -29,7 +30,9 @@ def model_disjoint(
         output_init: str = None,
         use_output_mlp: bool = None,
         output_embedding: str = None,
-        output_mlp: dict = None
+        output_mlp: dict = None,
+        fused_basis_args: dict = None,
+        recompute_interactions: bool = False
 ):
     n, x, edi, adi, batch_id_node, count_nodes = inputs
 
@@ -37,13 +40,20 @@ def model_disjoint(
     if use_node_embedding:
         n = EmbeddingDimeBlock(**input_node_embedding)(n)
 
-    # Calculate distances
-    pos1, pos2 = NodePosition()([x, edi])
-    d = NodeDistanceEuclidean()([pos1, pos2])
-    rbf = BesselBasisLayer(num_radial=num_radial, cutoff=cutoff, envelope_exponent=envelope_exponent)(d)
+    if fused_basis_args is not None:
+        # Distances, basis and directions at once. Angle is invariant to the scale of direction vectors.
+        rbf, d, v12 = FusedDistanceBasis(
+            basis_type="bessel",
+            basis_kwargs={"num_radial": num_radial, "cutoff": cutoff, "envelope_exponent": envelope_exponent},
+            return_distance=True, return_direction=True, **fused_basis_args)([x, edi])
+    else:
+        # Calculate distances
+        pos1, pos2 = NodePosition()([x, edi])
+        d = NodeDistanceEuclidean()([pos1, pos2])
+        rbf = BesselBasisLayer(num_radial=num_radial, cutoff=cutoff, envelope_exponent=envelope_exponent)(d)
+        v12 = Subtract()([pos1, pos2])
 
     # Calculate angles
-    v12 = Subtract()([pos1, pos2])
     a = EdgeAngle()([v12, adi])
     sbf = SphericalBasisLayer(num_spherical=num_spherical, num_radial=num_radial, cutoff=cutoff,
                               envelope_exponent=envelope_exponent)([d, a, adi])
@@ -60,8 +70,11 @@ def model_disjoint(
     # Interaction blocks
     add_xp = Add()
     for i in range(num_blocks):
-        x = DimNetInteractionPPBlock(emb_size, int_emb_size, basis_emb_size, num_before_skip, num_after_skip)(
-            [x, rbf, sbf, adi])
+        interaction_block = DimNetInteractionPPBlock(
+            emb_size, int_emb_size, basis_emb_size, num_before_skip, num_after_skip)
+        if recompute_interactions:
+            interaction_block = RecomputeGrad(interaction_block)
+        x = interaction_block([x, rbf, sbf, adi])
 
         p_update = DimNetOutputBlock(emb_size, out_emb_size, num_dense_output, num_targets=num_targets,
                                      output_kernel_initializer=output_init)([n, x, rbf, edi])
@@ -103,7 +116,8 @@ def model_disjoint_crystal(
         output_init: str = None,
         use_output_mlp: bool = None,
         output_embedding: str = None,
-        output_mlp: dict = None
+        output_mlp: dict = None,
+        recompute_interactions: bool = False
     ):
 
     n, x, edi, adi, edge_image, lattice, batch_id_node, batch_id_edge, count_nodes = inputs
@@ -136,8 +150,11 @@ def model_disjoint_crystal(
     # Interaction blocks
     add_xp = Add()
     for i in range(num_blocks):
-        x = DimNetInteractionPPBlock(emb_size, int_emb_size, basis_emb_size, num_before_skip, num_after_skip)(
-            [x, rbf, sbf, adi])
+        interaction_block = DimNetInteractionPPBlock(
+            emb_size, int_emb_size, basis_emb_size, num_before_skip, num_after_skip)
+        if recompute_interactions:
+            interaction_block = RecomputeGrad(interaction_block)
+        x = interaction_block([x, rbf, sbf, adi])
         p_update = DimNetOutputBlock(emb_size, out_emb_size, num_dense_output, num_targets=num_targets,
                                      output_kernel_initializer=output_init)([n, x, rbf, edi])
         ps = add_xp([ps, p_update])
@@ -2,6 +2,10 @@ import keras as ks
 import numpy as np
 import math
 from kgcnn.layers.gather import GatherNodes
+from kgcnn.graph.methods import (
+    make_acsf_radial_parameters, make_acsf_angular_parameters, make_acsf_element_pair_mapping,
+    compute_acsf_radial, compute_acsf_angular
+)
 from keras import ops
 # from kgcnn.layers.gather import GatherNodesOutgoing, GatherNodesIngoing
 from kgcnn.layers.geom import NodeDistanceEuclidean, NodePosition
@@ -137,10 +141,7 @@ class ACSFG2(Layer):
         Returns:
             dict: Kwargs input for this layer.
         """
-        eta_rs_rc = [(et, Rs, rc) for Rs in rs for et in eta]
-        elements = np.sort(elements)
-        params = np.broadcast_to(eta_rs_rc, (len(elements), len(eta_rs_rc), 3))
-        return {"eta_rs_rc": params, "element_mapping": elements, **kwargs}
+        return make_acsf_radial_parameters(eta, rs, rc, elements, **kwargs)
 
     def _find_atomic_number_maps(self, inputs):
         return ops.take(self.weight_reverse_mapping, inputs, axis=0)
@@ -215,6 +216,23 @@ class ACSFG2(Layer):
         pooled = self.pool_sum([xyz, rep, eij, zj_map], **kwargs)
         return self._flatten_relations(pooled)
 
+    def call_numpy(self, z: np.ndarray, xyz: np.ndarray, ij: np.ndarray, chunk_size: int = None) -> np.ndarray:
+        r"""Compute the radial representation of a single graph with numpy for offline precomputation.
+        Matches the output of :obj:`call` but uses the constant parameters given in :obj:`eta_rs_rc` .
+
+        Args:
+            z (np.ndarray): Atomic numbers of shape `(N, )` .
+            xyz (np.ndarray): Node coordinates of shape `(N, 3)` .
+            ij (np.ndarray): Edge indices referring to nodes of shape `(M, 2)` as stored in :obj:`GraphDict` .
+            chunk_size (int): Number of edges to process at once to bound memory. Default is None.
+
+        Returns:
+            np.ndarray: Atomic representation of shape `(N, num_relations*m)` .
+        """
+        return compute_acsf_radial(
+            z, xyz, ij, self.eta_rs_rc, self.element_mapping, add_eps=self.add_eps, epsilon=ks.backend.epsilon(),
+            chunk_size=chunk_size).astype(self.dtype)
+
     def get_config(self):
         config = super(ACSFG2, self).get_config()
         config.update({
@@ -318,16 +336,8 @@ class ACSFG4(Layer):
             self.num_relations = self.eta_zeta_lambda_rc.shape[0]
         self.element_mapping = np.array(element_mapping, dtype="int")  # of shape (N, ) with atomic number.
         if element_pair_mapping is None:
-            element_pair_index = np.expand_dims(self.element_mapping, axis=-1)
-            self.element_pair_mapping = np.concatenate([
-                    np.repeat(np.expand_dims(element_pair_index, axis=0), len(self.element_mapping), axis=0),
-                    np.repeat(np.expand_dims(element_pair_index, axis=1), len(self.element_mapping), axis=1)
-                ], axis=-1
-            ).reshape((-1, 2))
-            if not self.keep_pair_order:
-                self.element_pair_mapping = np.sort(self.element_pair_mapping, axis=-1)
-                self.element_pair_mapping = self.element_pair_mapping[
-                    np.sort(np.unique(self.element_pair_mapping, axis=0, return_index=True)[1])]
+            self.element_pair_mapping = make_acsf_element_pair_mapping(
+                self.element_mapping, keep_pair_order=self.keep_pair_order)
         else:
             self.element_pair_mapping = np.array(element_pair_mapping, dtype="int")
         assert len(self.element_pair_mapping.shape) == 2 and self.element_pair_mapping.shape[1] == 2
@@ -400,11 +410,7 @@ class ACSFG4(Layer):
         Returns:
             dict: Kwargs input for this layer.
         """
-        eta_zeta_lambda_rc = [[eta, z, la, rc] for eta in eta for z in zeta for la in lamda]
-        elements = np.sort(elements)
-        params = np.broadcast_to(
-            eta_zeta_lambda_rc, (int(len(elements) * (len(elements) + 1) / 2), len(eta_zeta_lambda_rc), 4))
-        return {"eta_zeta_lambda_rc": params, "element_mapping": elements, "element_pair_mapping": None, **kwargs}
+        return make_acsf_angular_parameters(eta, zeta, lamda, rc, elements, **kwargs)
 
     def _find_atomic_number_maps(self, inputs):
         return ops.take(self.weight_reverse_mapping, inputs, axis=0)
@@ -506,6 +512,25 @@ class ACSFG4(Layer):
         pool_ang = self.pool_sum([xyz, rep, ijk, zjk_map], **kwargs)
         return self._flatten_relations(pool_ang)
 
+    def call_numpy(self, z: np.ndarray, xyz: np.ndarray, ijk: np.ndarray, chunk_size: int = None) -> np.ndarray:
+        r"""Compute the angular representation of a single graph with numpy for offline precomputation.
+        Matches the output of :obj:`call` but uses the constant parameters given in :obj:`eta_zeta_lambda_rc` .
+
+        Args:
+            z (np.ndarray): Atomic numbers of shape `(N, )` .
+            xyz (np.ndarray): Node coordinates of shape `(N, 3)` .
+            ijk (np.ndarray): Angle indices referring to nodes of shape `(M, 3)` as stored in :obj:`GraphDict` .
+            chunk_size (int): Number of angles to process at once, which bounds the memory of the angular term for
+                large systems. Default is None.
+
+        Returns:
+            np.ndarray: Atomic representation of shape `(N, num_relations*m)` .
+        """
+        return compute_acsf_angular(
+            z, xyz, ijk, self.eta_zeta_lambda_rc, self.element_mapping, self.element_pair_mapping,
+            keep_pair_order=self.keep_pair_order, multiplicity=self.multiplicity, add_eps=self.add_eps,
+            epsilon=ks.backend.epsilon(), chunk_size=chunk_size).astype(self.dtype)
+
     def get_config(self):
         config = super(ACSFG4, self).get_config()
         config.update({
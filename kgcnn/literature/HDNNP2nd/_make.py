@@ -365,6 +365,8 @@ model_default_atom_wise = {
     "input_tensor_type": "padded",
     "has_charge_input": False,
     "cast_disjoint_kwargs": {},
+    "normalize_kwargs": None,
+    "const_normalize_kwargs": None,
     "mlp_kwargs": {"units": [64, 64, 64],
                    "num_relations": 96,
                    "activation": ["swish", "swish", "linear"]},
@@ -388,6 +390,8 @@ def make_model_atom_wise(inputs: list = None,
                          node_pooling_args: dict = None,
                          name: str = None,
                          verbose: int = None,
+                         normalize_kwargs: dict = None,
+                         const_normalize_kwargs: dict = None,
                          mlp_kwargs: dict = None,
                          output_embedding: str = None,
                          predict_dipole: bool = None,
@@ -406,7 +410,9 @@ def make_model_atom_wise(inputs: list = None,
     The supported inputs are  :obj:`[node_number, node_representation, ...]`
     with '...' indicating mask or ID tensors following the template below.
     Requires node number for atom-wise neural networks.
-    The representation are given directly to the model as they are expected to be pre-computed.
+    The representation are given directly to the model as they are expected to be pre-computed, for example
+    with :obj:`kgcnn.graph.preprocessor.SetACSFRepresentation` , which gives the same representation as
+    :obj:`make_model_behler` .
 
     %s
 
@@ -423,6 +429,8 @@ def make_model_atom_wise(inputs: list = None,
         node_pooling_args (dict): Dictionary of layer arguments unpacked in :obj:`PoolingNodes` layers.
         verbose (int): Level of verbosity.
         name (str): Name of the model.
+        normalize_kwargs (dict): Dictionary of layer arguments unpacked in :obj:`GraphBatchNormalization` layer.
+        const_normalize_kwargs (dict): Dictionary of layer arguments unpacked in :obj:`ACSFConstNormalization` layer.
         mlp_kwargs (dict): Dictionary of layer arguments unpacked in :obj:`RelationalMLP` layer.
         output_embedding (str): Main embedding task for graph network. Either "node", "edge" or "graph".
         use_output_mlp (bool): Whether to use the final output MLP. Possibility to skip final MLP.
@@ -458,6 +466,8 @@ def make_model_atom_wise(inputs: list = None,
     out = model_disjoint_atom_wise(
         [n, x, tot_charge, batch_id_node, count_nodes],
         node_pooling_args=node_pooling_args,
+        normalize_kwargs=normalize_kwargs,
+        const_normalize_kwargs=const_normalize_kwargs,
         mlp_kwargs=mlp_kwargs,
         output_embedding=output_embedding,
         use_output_mlp=use_output_mlp,
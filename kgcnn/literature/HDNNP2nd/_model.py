@@ -122,6 +122,8 @@ def model_disjoint_behler(
 def model_disjoint_atom_wise(
         inputs,
         node_pooling_args: dict = None,
+        normalize_kwargs: dict = None,
+        const_normalize_kwargs: dict = None,
         mlp_kwargs: dict = None,
         output_embedding: str = None,
         use_output_mlp: bool = None,
@@ -131,8 +133,15 @@ def model_disjoint_atom_wise(
     # Make input
     node_input, rep_input, tot_charge, batch_id_node, count_nodes = inputs
 
+    # Normalization
+    rep = rep_input
+    if normalize_kwargs:
+        rep = GraphBatchNormalization(**normalize_kwargs)([rep, batch_id_node, count_nodes])
+    if const_normalize_kwargs:
+        rep = ACSFConstNormalization(**const_normalize_kwargs)(rep)
+
     # learnable NN.
-    n = RelationalMLP(**mlp_kwargs)([rep_input, node_input, batch_id_node, count_nodes])
+    n = RelationalMLP(**mlp_kwargs)([rep, node_input, batch_id_node, count_nodes])
 
     # Output embedding choice
     if output_embedding == 'graph':
@@ -1,6 +1,8 @@
-from ._make import make_model, model_default
+from ._make import make_model, model_default, make_model_sparse, model_sparse_default
 
 __all__ = [
     "make_model",
-    "model_default"
+    "model_default",
+    "make_model_sparse",
+    "model_sparse_default"
 ]
@@ -1,6 +1,11 @@
 import keras as ks
 from keras import ops
 from typing import Union
+from kgcnn.ops.core import recompute_grad
+from kgcnn.ops.scatter import scatter_reduce_softmax
+from kgcnn.layers.aggr import AggregateLocalMessages
+from kgcnn import __index_receive__ as global_index_receive
+from kgcnn import __index_send__ as global_index_send
 
 
 class MATGlobalPool(ks.layers.Layer):
@@ -140,15 +145,29 @@ class MATExpandMask(ks.layers.Layer):
 
 
 class MATAttentionHead(ks.layers.Layer):
+    r"""Attention head of MAT that combines feature-wise self-attention with distance and adjacency matrix.
+
+    With :obj:`block_size` the attention is evaluated in blocks of query rows (nodes), which requires only
+    tensors of shape `(batch, block_size, N, units)` instead of `(batch, N, N, units)` at once. Since every block
+    contains all keys, the masked softmax of each row is exact and the result is identical to the full evaluation.
+    Blocks are only used if the number of (padded) nodes `N` is known when tracing the layer, otherwise the full
+    attention is computed. With :obj:`recompute_grad` the blocks are recomputed in the backward pass, which
+    bounds the memory also for training. Blocks with active dropout are not recomputed, since the random mask can not
+    be reproduced in the backward pass.
+    """
 
     def __init__(self, units: int = 64,
                  lambda_distance: float = 0.3, lambda_attention: float = 0.3,
                  lambda_adjacency: Union[float, None] = None, add_identity: bool = False,
                  dropout: Union[float, None] = None,
+                 block_size: Union[int, None] = None,
+                 recompute_grad: bool = False,
                  **kwargs):
         super(MATAttentionHead, self).__init__(**kwargs)
         self.units = int(units)
         self.add_identity = bool(add_identity)
+        self.block_size = int(block_size) if block_size is not None else None
+        self.recompute_grad = bool(recompute_grad)
         self.lambda_distance = lambda_distance
         self.lambda_attention = lambda_attention
         if lambda_adjacency is not None:
@@ -166,7 +185,46 @@ class MATAttentionHead(ks.layers.Layer):
     def build(self, input_shape):
         super(MATAttentionHead, self).build(input_shape)
 
-    def call(self, inputs, mask=None, **kwargs):
+    def _attention_block(self, q, k, v, a_d, a_g, q_mask, k_mask, row_start: int = 0, training=None):
+        # Shape of q, a_d, a_g is (b, block, ...) and of k, v is (b, N, F).
+        qk = ops.expand_dims(q, axis=2) * ops.expand_dims(k, axis=1) / self.scale
+        qk_mask = ops.expand_dims(k_mask, axis=1) * ops.expand_dims(q_mask, axis=2)
+        qk = qk + ops.where(
+            ops.cast(qk_mask, dtype="bool"), ops.zeros_like(qk), -ops.ones_like(qk) / ks.backend.epsilon())
+        qk = ops.nn.softmax(qk, axis=2)
+        qk = qk * qk_mask
+        if self.add_identity:
+            a_g_eye = ops.eye(ops.shape(q)[1], ops.shape(k)[1], k=row_start, dtype=a_g.dtype)
+            a_g_eye = ops.expand_dims(a_g_eye, axis=0)
+            if len(a_g.shape) > 3:
+                a_g_eye = ops.expand_dims(a_g_eye, axis=-1)
+            a_g = a_g + a_g_eye
+        att = self.lambda_attention * qk + self.lambda_distance * a_d + self.lambda_adjacency * a_g
+        if self._dropout is not None:
+            att = self.layer_dropout(att, training=training)
+        att = ops.transpose(att, axes=[0, 3, 1, 2])
+        hp = ops.matmul(att, ops.expand_dims(ops.transpose(v, axes=[0, 2, 1]), axis=3))
+        return ops.transpose(ops.squeeze(hp, axis=3), axes=[0, 2, 1])
+
+    def _call_blocked(self, h, a_d, a_g, h_mask, training=None):
+        q, k = self.dense_q(h), self.dense_k(h)
+        v = self.dense_v(h) * h_mask
+        a_d, a_g = ops.cast(a_d, dtype=h.dtype), ops.cast(a_g, dtype=h.dtype)
+        use_dropout = self._dropout is not None and training
+        hp = []
+        for i in range(0, h.shape[1], self.block_size):
+            j = min(i + self.block_size, h.shape[1])
+
+            def attention_block(*args, row_start=i):
+                return self._attention_block(*args, row_start=row_start, training=training)
+
+            if self.recompute_grad and not use_dropout:
+                attention_block = recompute_grad(attention_block)
+            hp.append(attention_block(q[:, i:j], k, v, a_d[:, i:j], a_g[:, i:j], h_mask[:, i:j], h_mask))
+        hp = ops.concatenate(hp, axis=1) if len(hp) > 1 else hp[0]
+        return hp * h_mask
+
+    def call(self, inputs, mask=None, training=None, **kwargs):
         r"""Forward pass.
 
         Args:
@@ -180,22 +238,24 @@ class MATAttentionHead(ks.layers.Layer):
         h, a_d, a_g = inputs
         h_mask, a_d_mask, a_g_mask = mask
         h_mask = ops.cast(h_mask, dtype=h.dtype)
+        if self.block_size is not None and h.shape[1] is not None:
+            return self._call_blocked(h, a_d, a_g, h_mask, training=training)
         q = ops.expand_dims(self.dense_q(h), axis=2)
         k = ops.expand_dims(self.dense_k(h), axis=1)
         v = self.dense_v(h) * h_mask
         qk = q * k / self.scale
         # Apply mask on self-attention
         qk_mask = ops.expand_dims(h_mask, axis=1) * ops.expand_dims(h_mask, axis=2)  # (b, 1, n, ...) * (b, n, 1, ...)
-        qk += ops.where(ops.cast(qk_mask, dtype="bool"), ops.zeros_like(qk), -ops.ones_like(qk) / ks.backend.epsilon())
+        qk = qk + ops.where(
+            ops.cast(qk_mask, dtype="bool"), ops.zeros_like(qk), -ops.ones_like(qk) / ks.backend.epsilon())
         qk = ops.nn.softmax(qk, axis=2)
-        qk *= qk_mask
+        qk = qk * qk_mask
         # Add diagonal to graph adjacency (optional).
         if self.add_identity:
-            a_g_eye = ops.eye(ops.shape(a_g)[1], dtype=a_g.dtype)
-            a_g_eye = ops.repeat(ops.expand_dims(a_g_eye, axis=0), ops.shape(a_g)[:1], axis=0)
-            if a_g.shape.rank > 3:
+            a_g_eye = ops.expand_dims(ops.eye(ops.shape(a_g)[1], dtype=a_g.dtype), axis=0)
+            if len(a_g.shape) > 3:
                 a_g_eye = ops.expand_dims(a_g_eye, axis=-1)
-            a_g += a_g_eye
+            a_g = a_g + a_g_eye
         # Weights
         qk = self.lambda_attention * qk
         a_d = self.lambda_distance * ops.cast(a_d, dtype=h.dtype)
@@ -205,7 +265,7 @@ class MATAttentionHead(ks.layers.Layer):
         # v has shape (b, N, F)
         # att has shape (b, N, N, F)
         if self._dropout is not None:
-            att = self.layer_dropout(att)
+            att = self.layer_dropout(att, training=training)
 
         # Or permute feature dimension to batch and apply on last axis via and permute back again
         v = ops.transpose(v, axes=[0, 2, 1])
@@ -218,11 +278,131 @@ class MATAttentionHead(ks.layers.Layer):
         # hp = tf.einsum('bij...,bjk...->bik...', att, tf.expand_dims(v, axis=2))
         # hp = tf.squeeze(hp, axis=2)
 
-        hp *= h_mask
+        hp = hp * h_mask
         return hp
 
     def get_config(self):
         config = super(MATAttentionHead, self).get_config()
+        config.update({"units": self.units, "lambda_adjacency": self.lambda_adjacency,
+                       "lambda_attention": self.lambda_attention, "lambda_distance": self.lambda_distance,
+                       "dropout": self._dropout, "add_identity": self.add_identity,
+                       "block_size": self.block_size, "recompute_grad": self.recompute_grad})
+        return config
+
+
+class MATDistanceEdges(ks.layers.Layer):
+    r"""Sparse counterpart of :obj:`MATDistanceMatrix` that computes the transformed squared distance between nodes
+    only for a list of (range) edges instead of the full distance matrix."""
+
+    def __init__(self, trafo: Union[str, None] = "exp", **kwargs):
+        super(MATDistanceEdges, self).__init__(**kwargs)
+        self.trafo = trafo
+        if self.trafo not in [None, "exp", "softmax"]:
+            raise ValueError("`trafo` must be in [None, 'exp', 'softmax']")
+
+    def build(self, input_shape):
+        super(MATDistanceEdges, self).build(input_shape)
+
+    def call(self, inputs, **kwargs):
+        r"""Forward pass.
+
+        Args:
+            inputs (list): [coordinates, edge_indices]
+
+                - coordinates (Tensor): Node coordinates of shape `(N, 3)` .
+                - edge_indices (Tensor): Edge indices of shape `(2, M)` .
+
+        Returns:
+            Tensor: Transformed squared distance of shape `(M, 1)` .
+        """
+        x, edge_index = inputs
+        diff = ops.take(x, edge_index[global_index_receive], axis=0) - ops.take(
+            x, edge_index[global_index_send], axis=0)
+        dist = ops.sum(ops.square(diff), axis=-1, keepdims=True)
+        if self.trafo == "exp":
+            dist = ops.exp(-dist)
+        elif self.trafo == "softmax":
+            dist = scatter_reduce_softmax(edge_index[global_index_receive], dist,
+                                          shape=ops.shape(x)[:1] + ops.shape(dist)[1:], normalize=True)
+        return dist
+
+    def get_config(self):
+        config = super(MATDistanceEdges, self).get_config()
+        config.update({"trafo": self.trafo})
+        return config
+
+
+class MATSparseAttentionHead(ks.layers.Layer):
+    r"""Sparse attention head of MAT for disjoint graphs.
+
+    Computes the same node update as :obj:`MATAttentionHead` but the self-attention and distance term run only over
+    a list of range edges, e.g. from :obj:`SetRange` , and the adjacency term over the (bond) edges.
+    The feature-wise softmax of attention coefficients is computed by :obj:`scatter_reduce_softmax` for each
+    receiving node. Therefore, memory scales with the number of edges instead of :math:`N^2` .
+    To obtain the dense attention of :obj:`MATAttentionHead` for a full range list, the range edges must include
+    self-loops, i.e. :obj:`SetRange` with `self_loops=True` .
+    """
+
+    def __init__(self, units: int = 64,
+                 lambda_distance: float = 0.3, lambda_attention: float = 0.3,
+                 lambda_adjacency: Union[float, None] = None, add_identity: bool = False,
+                 dropout: Union[float, None] = None,
+                 **kwargs):
+        super(MATSparseAttentionHead, self).__init__(**kwargs)
+        self.units = int(units)
+        self.add_identity = bool(add_identity)
+        self.lambda_distance = lambda_distance
+        self.lambda_attention = lambda_attention
+        if lambda_adjacency is not None:
+            self.lambda_adjacency = lambda_adjacency
+        else:
+            self.lambda_adjacency = 1.0 - self.lambda_attention - self.lambda_distance
+        self.scale = self.units ** -0.5
+        self.dense_q = ks.layers.Dense(units=units)
+        self.dense_k = ks.layers.Dense(units=units)
+        self.dense_v = ks.layers.Dense(units=units)
+        self.layer_aggregate_range = AggregateLocalMessages(pooling_method="scatter_sum")
+        self.layer_aggregate_edges = AggregateLocalMessages(pooling_method="scatter_sum")
+        self._dropout = dropout
+        if self._dropout is not None:
+            self.layer_dropout = ks.layers.Dropout(self._dropout)
+
+    def build(self, input_shape):
+        super(MATSparseAttentionHead, self).build(input_shape)
+
+    def call(self, inputs, training=None, **kwargs):
+        r"""Forward pass.
+
+        Args:
+            inputs (list): [h, a_d, range_indices, a_g, edge_indices]
+
+                - h (Tensor): Node features of shape `(N, F)` .
+                - a_d (Tensor): Transformed distances of range edges of shape `(M_r, 1)` .
+                - range_indices (Tensor): Range indices of shape `(2, M_r)` .
+                - a_g (Tensor): Adjacency weights of (bond) edges of shape `(M_e, 1)` .
+                - edge_indices (Tensor): Edge indices of shape `(2, M_e)` .
+
+        Returns:
+            Tensor: Node features of shape `(N, units)` .
+        """
+        h, a_d, range_index, a_g, edge_index = inputs
+        q, k, v = self.dense_q(h), self.dense_k(h), self.dense_v(h)
+        qk = ops.take(q, range_index[global_index_receive], axis=0) * ops.take(
+            k, range_index[global_index_send], axis=0) / self.scale
+        qk = scatter_reduce_softmax(range_index[global_index_receive], qk, shape=ops.shape(v), normalize=True)
+        att = self.lambda_attention * qk + self.lambda_distance * ops.cast(a_d, dtype=h.dtype)
+        a_g = self.lambda_adjacency * ops.cast(a_g, dtype=h.dtype)
+        if self._dropout is not None:
+            att = self.layer_dropout(att, training=training)
+            a_g = self.layer_dropout(a_g, training=training)
+        hp = self.layer_aggregate_range([v, range_index, att])
+        hp = hp + self.layer_aggregate_edges([v, edge_index, a_g])
+        if self.add_identity:
+            hp = hp + self.lambda_adjacency * v
+        return hp
+
+    def get_config(self):
+        config = super(MATSparseAttentionHead, self).get_config()
         config.update({"units": self.units, "lambda_adjacency": self.lambda_adjacency,
                        "lambda_attention": self.lambda_attention, "lambda_distance": self.lambda_distance,
                        "dropout": self._dropout, "add_identity": self.add_identity})
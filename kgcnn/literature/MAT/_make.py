@@ -1,9 +1,13 @@
 import keras as ks
 from keras.backend import backend as backend_to_use
-from kgcnn.layers.modules import Embedding
+from kgcnn.layers.modules import Embedding, Input
 from kgcnn.layers.mlp import MLP
+from kgcnn.layers.scale import get as get_scaler
+from kgcnn.models.casting import (template_cast_output, template_cast_list_input,
+                                  template_cast_list_input_docs, template_cast_output_docs)
 from kgcnn.models.utils import update_model_kwargs
 from ._layers import MATAttentionHead, MATDistanceMatrix, MATReduceMask, MATGlobalPool, MATExpandMask
+from ._model import model_disjoint_sparse
 
 # Keep track of model version from commit date in literature.
 # To be updated if model is changed in a significant way.
@@ -38,7 +42,7 @@ model_default = {
     "max_atoms": None,
     "distance_matrix_kwargs": {"trafo": "exp"},
     "attention_kwargs": {"units": 8, "lambda_attention": 0.3, "lambda_distance": 0.3, "lambda_adjacency": None,
-                         "dropout": 0.1, "add_identity": False},
+                         "dropout": 0.1, "add_identity": False, "block_size": None, "recompute_grad": False},
     "feed_forward_kwargs": {"units": [32, 32, 32], "activation": ["relu", "relu", "linear"]},
     "embedding_units": 32,
     "depth": 5,
@@ -217,3 +221,155 @@ def make_model(name: str = None,
     )
     model.__kgcnn_model_version__ = __model_version__
     return model
+
+
+model_sparse_default = {
+    "name": "MAT",
+    "inputs": [
+        {"shape": (None,), "name": "node_number", "dtype": "int64"},
+        {"shape": (None, 3), "name": "node_coordinates", "dtype": "float32"},
+        {"shape": (None, 1), "name": "edge_weights", "dtype": "float32"},
+        {"shape": (None, 2), "name": "edge_indices", "dtype": "int64"},
+        {"shape": (None, 2), "name": "range_indices", "dtype": "int64"},
+        {"shape": (), "name": "total_nodes", "dtype": "int64"},
+        {"shape": (), "name": "total_edges", "dtype": "int64"},
+        {"shape": (), "name": "total_ranges", "dtype": "int64"}
+    ],
+    "input_tensor_type": "padded",
+    "cast_disjoint_kwargs": {},
+    "input_node_embedding": {"input_dim": 95, "output_dim": 64},
+    "input_edge_embedding": {"input_dim": 95, "output_dim": 64},
+    "distance_kwargs": {"trafo": "exp"},
+    "attention_kwargs": {"units": 8, "lambda_attention": 0.3, "lambda_distance": 0.3, "lambda_adjacency": None,
+                         "dropout": 0.1, "add_identity": False},
+    "feed_forward_kwargs": {"units": [32, 32, 32], "activation": ["relu", "relu", "linear"]},
+    "embedding_units": 32,
+    "depth": 5,
+    "heads": 8,
+    "merge_heads": "concat",
+    "verbose": 10,
+    "pooling_kwargs": {"pooling_method": "sum"},
+    "output_embedding": "graph",
+    "output_mlp": {"use_bias": [True, True, True], "units": [32, 16, 1],
+                   "activation": ["relu", "relu", "linear"]},
+    "output_tensor_type": "padded",
+    "output_scaling": None
+}
+
+
+@update_model_kwargs(model_sparse_default, update_recursive=0)
+def make_model_sparse(name: str = None,
+                      inputs: list = None,
+                      input_tensor_type: str = None,
+                      cast_disjoint_kwargs: dict = None,
+                      input_node_embedding: dict = None,
+                      input_edge_embedding: dict = None,
+                      distance_kwargs: dict = None,
+                      attention_kwargs: dict = None,
+                      feed_forward_kwargs: dict = None,
+                      embedding_units: int = None,
+                      depth: int = None,
+                      heads: int = None,
+                      merge_heads: str = None,
+                      verbose: int = None,
+                      pooling_kwargs: dict = None,
+                      output_embedding: str = None,
+                      output_mlp: dict = None,
+                      output_tensor_type: str = None,
+                      output_scaling: dict = None
+                      ):
+    r"""Make sparse `MAT <https://arxiv.org/pdf/2002.08264.pdf>`__ graph network via functional API.
+    Default parameters can be found in :obj:`kgcnn.literature.MAT.model_sparse_default` .
+
+    In contrast to :obj:`make_model` , attention and distance terms are computed only for range edges, e.g. from
+    :obj:`SetRange` , on disjoint graphs and the adjacency term for the (bond) edges. Memory therefore scales with the
+    number of (range) edges instead of the squared number of atoms. For a range list of all pairs including
+    self-loops, i.e. :obj:`SetRange` with `self_loops=True` , the attention is equal to the dense model.
+
+    **Model inputs**:
+    Model uses the list template of inputs and standard output template.
+    The supported inputs are  :obj:`[nodes, coordinates, edges, edge_indices, range_indices, ...]`
+    with '...' indicating mask or ID tensors following the template below.
+    Edges can be bond weights of shape `(M, 1)` , bond attributes or bond numbers with an embedding layer.
+
+    %s
+
+    **Model outputs**:
+    The standard output template:
+
+    %s
+
+    Args:
+        name (str): Name of the model. Should be "MAT".
+        inputs (list): List of dictionaries unpacked in :obj:`Input`. Order must match model definition.
+        input_tensor_type (str): Input type of graph tensor. Default is "padded".
+        cast_disjoint_kwargs (dict): Dictionary of arguments for casting layer.
+        input_node_embedding (dict): Dictionary of embedding arguments unpacked in :obj:`Embedding` layers.
+        input_edge_embedding (dict): Dictionary of embedding arguments unpacked in :obj:`Embedding` layers.
+        distance_kwargs (dict): Dictionary of layer arguments unpacked in :obj:`MATDistanceEdges`.
+        attention_kwargs (dict): Dictionary of layer arguments unpacked in :obj:`MATSparseAttentionHead`.
+        feed_forward_kwargs (dict): Dictionary of layer arguments unpacked in feed forward :obj:`MLP`.
+        embedding_units (int): Units for node embedding.
+        depth (int): Number of graph embedding units or depth of the network.
+        heads (int): Number of attention heads
+        merge_heads (str): How to merge head, using either 'sum' or 'concat'.
+        verbose (int): Level for print information.
+        pooling_kwargs (dict): Dictionary of layer arguments unpacked in :obj:`PoolingNodes`.
+        output_embedding (str): Main embedding task for graph network. Either "node", "edge" or "graph".
+        output_mlp (dict): Dictionary of layer arguments unpacked in the final classification :obj:`MLP` layer block.
+            Defines number of model outputs and activation.
+        output_tensor_type (str): Output type of graph tensors such as nodes or edges. Default is "padded".
+        output_scaling (dict): Dictionary of layer arguments unpacked in scaling layers. Default is None.
+
+    Returns:
+        :obj:`keras.models.Model`
+    """
+    # Make input
+    model_inputs = [Input(**x) for x in inputs]
+
+    disjoint_inputs = template_cast_list_input(
+        model_inputs, input_tensor_type=input_tensor_type,
+        cast_disjoint_kwargs=cast_disjoint_kwargs,
+        mask_assignment=[0, 0, 1, 1, 2],
+        index_assignment=[None, None, None, 0, 0]
+    )
+
+    n, x, ed, edi, rgi, batch_id_node, batch_id_edge, _, node_id, edge_id, _, count_nodes, count_edges, _ = \
+        disjoint_inputs
+
+    out = model_disjoint_sparse(
+        [n, x, ed, edi, rgi, batch_id_node, count_nodes],
+        use_node_embedding=("int" in inputs[0]['dtype']) if input_node_embedding is not None else False,
+        use_edge_embedding=("int" in inputs[2]['dtype']) if input_edge_embedding is not None else False,
+        input_node_embedding=input_node_embedding, input_edge_embedding=input_edge_embedding,
+        distance_kwargs=distance_kwargs, attention_kwargs=attention_kwargs, feed_forward_kwargs=feed_forward_kwargs,
+        embedding_units=embedding_units, depth=depth, heads=heads, merge_heads=merge_heads,
+        pooling_kwargs=pooling_kwargs, output_embedding=output_embedding, output_mlp=output_mlp)
+
+    if output_scaling is not None:
+        scaler = get_scaler(output_scaling["name"])(**output_scaling)
+        if scaler.extensive:
+            out = scaler([out, n, batch_id_node])
+        else:
+            out = scaler(out)
+
+    # Output embedding choice
+    out = template_cast_output(
+        [out, batch_id_node, batch_id_edge, node_id, edge_id, count_nodes, count_edges],
+        output_embedding=output_embedding, output_tensor_type=output_tensor_type,
+        input_tensor_type=input_tensor_type, cast_disjoint_kwargs=cast_disjoint_kwargs,
+    )
+
+    model = ks.models.Model(inputs=model_inputs, outputs=out, name=name)
+    model.__kgcnn_model_version__ = __model_version__
+
+    if output_scaling is not None:
+        def set_scale(*args, **kwargs):
+            scaler.set_scale(*args, **kwargs)
+
+        setattr(model, "set_scale", set_scale)
+
+    return model
+
+
+make_model_sparse.__doc__ = make_model_sparse.__doc__ % (template_cast_list_input_docs, template_cast_output_docs)
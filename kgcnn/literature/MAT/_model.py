@@ -0,0 +1,69 @@
+import keras as ks
+from kgcnn.layers.mlp import MLP
+from kgcnn.layers.modules import Embedding
+from kgcnn.layers.pooling import PoolingNodes
+from ._layers import MATSparseAttentionHead, MATDistanceEdges
+
+
+def model_disjoint_sparse(
+        inputs,
+        use_node_embedding: bool = None,
+        use_edge_embedding: bool = None,
+        input_node_embedding: dict = None,
+        input_edge_embedding: dict = None,
+        distance_kwargs: dict = None,
+        attention_kwargs: dict = None,
+        feed_forward_kwargs: dict = None,
+        embedding_units: int = None,
+        depth: int = None,
+        heads: int = None,
+        merge_heads: str = None,
+        pooling_kwargs: dict = None,
+        output_embedding: str = None,
+        output_mlp: dict = None):
+    n, x, ed, edi, rgi, batch_id_node, count_nodes = inputs
+
+    # Embedding, if no feature dimension
+    if use_node_embedding:
+        n = Embedding(**input_node_embedding)(n)
+    if use_edge_embedding:
+        ed = Embedding(**input_edge_embedding)(ed)
+
+    # Distance term is only computed for range edges.
+    dist = MATDistanceEdges(**distance_kwargs)([x, rgi])
+
+    # Adjacency weights from bond attributes. Reduce to single value as for dense MAT.
+    if len(ed.shape) > 1 and ed.shape[-1] != 1 or use_edge_embedding:
+        adj = ks.layers.Dense(1, use_bias=False)(ed)
+    elif len(ed.shape) < 2:
+        adj = ks.layers.Reshape((1,))(ed)
+    else:
+        adj = ed
+
+    h = ks.layers.Dense(units=embedding_units, use_bias=False)(n)
+    for _ in range(depth):
+        # 1. Norm + Attention + Residual
+        hn = ks.layers.LayerNormalization()(h)
+        hs = [MATSparseAttentionHead(**attention_kwargs)([hn, dist, rgi, adj, edi]) for _ in range(heads)]
+        if merge_heads in ["add", "sum", "reduce_sum"]:
+            hu = ks.layers.Add()(hs)
+        else:
+            hu = ks.layers.Concatenate(axis=-1)(hs)
+        hu = ks.layers.Dense(units=embedding_units, use_bias=False)(hu)
+        h = ks.layers.Add()([h, hu])
+
+        # 2. Norm + MLP + Residual
+        hn = ks.layers.LayerNormalization()(h)
+        hu = MLP(**feed_forward_kwargs)(hn)
+        hu = ks.layers.Dense(units=embedding_units, use_bias=False)(hu)
+        h = ks.layers.Add()([h, hu])
+
+    out = ks.layers.LayerNormalization()(h)
+    if output_embedding == 'graph':
+        out = PoolingNodes(**pooling_kwargs)([count_nodes, out, batch_id_node])
+        out = MLP(**output_mlp)(out)
+    elif output_embedding == 'node':
+        out = MLP(**output_mlp)(out)
+    else:
+        raise ValueError("Unsupported graph embedding for mode `MAT` .")
+    return out
@@ -2,6 +2,7 @@ import keras as ks
 from kgcnn.layers.scale import get as get_scaler
 from ._model import model_disjoint
 from kgcnn.layers.modules import Input
+from kgcnn.layers.geom import EdgeAngleIndices
 from kgcnn.models.casting import (template_cast_output, template_cast_list_input,
                                   template_cast_list_input_docs, template_cast_output_docs)
 from kgcnn.models.utils import update_model_kwargs
@@ -56,6 +57,7 @@ model_default = {
     "global_mp_kwargs": {"units": 32},
     "local_mp_kwargs": {"units": 32, "output_units": 1, "output_kernel_initializer": "zeros"},
     "use_edge_attributes": False,
+    "make_angle_indices": False,
     "depth": 3,
     "verbose": 10,
     "node_pooling_args": {"pooling_method": "sum"},
@@ -82,6 +84,7 @@ def make_model(inputs: list = None,
                bessel_basis_global: dict = None,
                spherical_basis_local: dict = None,
                use_edge_attributes: bool = None,
+               make_angle_indices: bool = None,
                mlp_rbf_kwargs: dict = None,
                mlp_sbf_kwargs: dict = None,
                global_mp_kwargs: dict = None,
@@ -104,6 +107,8 @@ def make_model(inputs: list = None,
     :obj:`[nodes, coordinates, edge_attributes, edge_indices, range_indices, angle_indices_1, angle_indices_2, ...]`
     with '...' indicating mask or ID tensors following the template below.
     Note that you must supply angle indices as index pairs that refer to two edges or two range connections.
+    With `make_angle_indices` the angle indices are omitted from inputs, i.e.
+    :obj:`[nodes, coordinates, edge_attributes, edge_indices, range_indices, ...]`, and computed within the model.
 
     %s
 
@@ -126,6 +131,9 @@ def make_model(inputs: list = None,
         bessel_basis_global: Dictionary of layer arguments unpacked in global `:obj:BesselBasisLayer` layer.
         spherical_basis_local: Dictionary of layer arguments unpacked in `:obj:SphericalBasisLayer` layer.
         use_edge_attributes: Whether to add edge attributes. Default is False.
+        make_angle_indices (bool): Whether to compute both angle indices from edge indices within the model by
+            :obj:`EdgeAngleIndices` with edge pairing 'jk' and 'ik' including self-edges, instead of providing them as
+            input. Not supported for jit-compiled jax. Default is False.
         mlp_rbf_kwargs: Dictionary of layer arguments unpacked in `:obj:MLP` layer for RBF feed-forward.
         mlp_sbf_kwargs: Dictionary of layer arguments unpacked in `:obj:MLP` layer for SBF feed-forward.
         global_mp_kwargs: Dictionary of layer arguments unpacked in `:obj:MXMGlobalMP` layer.
@@ -145,13 +153,34 @@ def make_model(inputs: list = None,
     # Make input
     model_inputs = [Input(**x) for x in inputs]
 
-    dj = template_cast_list_input(
-        model_inputs,
-        input_tensor_type=input_tensor_type,
-        cast_disjoint_kwargs=cast_disjoint_kwargs,
-        mask_assignment=[0, 0, 1, 1, 2, 3, 4],
-        index_assignment=[None, None, None, 0, 0, 3, 3]
-    )
+    if make_angle_indices:
+        dj = template_cast_list_input(
+            model_inputs,
+            input_tensor_type=input_tensor_type,
+            cast_disjoint_kwargs=cast_disjoint_kwargs,
+            mask_assignment=[0, 0, 1, 1, 2],
+            index_assignment=[None, None, None, 0, 0]
+        )
+        n, x, ed, edi, rgi = dj[:5]
+        batch_id_node, batch_id_edge, batch_id_ranges = dj[5:8]
+        node_id, edge_id, range_id = dj[8:11]
+        count_nodes, count_edges, count_ranges = dj[11:]
+        adi1, batch_id_angles_1, count_angles1 = EdgeAngleIndices(edge_pairing="jk")(
+            [x, edi, batch_id_edge, count_edges])
+        adi2, batch_id_angles_2, count_angles2 = EdgeAngleIndices(edge_pairing="ik", allow_self_edges=True)(
+            [x, edi, batch_id_edge, count_edges])
+        angle_id1, angle_id2 = None, None
+        dj = [n, x, ed, edi, rgi, adi1, adi2, batch_id_node, batch_id_edge, batch_id_ranges, batch_id_angles_1,
+              batch_id_angles_2, node_id, edge_id, range_id, angle_id1, angle_id2, count_nodes, count_edges,
+              count_ranges, count_angles1, count_angles2]
+    else:
+        dj = template_cast_list_input(
+            model_inputs,
+            input_tensor_type=input_tensor_type,
+            cast_disjoint_kwargs=cast_disjoint_kwargs,
+            mask_assignment=[0, 0, 1, 1, 2, 3, 4],
+            index_assignment=[None, None, None, 0, 0, 3, 3]
+        )
 
     n, x, ed, edi, rgi, adi1, adi2 = dj[:7]
     batch_id_node, batch_id_edge, batch_id_ranges, batch_id_angles_1, batch_id_angles_2 = dj[7:12]
@@ -59,6 +59,7 @@ model_default = {
         "activation": {"class_name": "function", "config": "kgcnn>softplus2"}
     },
     "nblocks": 3, "has_ff": True, "dropout": None, "use_set2set": True,
+    "recompute_interactions": False,
     "verbose": 10,
     "output_embedding": "graph",
     "output_mlp": {"use_bias": [True, True, True], "units": [32, 16, 1],
@@ -88,6 +89,7 @@ def make_model(inputs: list = None,
                state_ff_args: dict = None,
                use_set2set: bool = None,
                nblocks: int = None,
+               recompute_interactions: bool = None,
                has_ff: bool = None,
                dropout: float = None,
                name: str = None,
@@ -132,6 +134,8 @@ def make_model(inputs: list = None,
         state_ff_args (dict): Dictionary of layer arguments unpacked in :obj:`MLP` feed-forward layer.
         use_set2set (bool): Whether to use :obj:`PoolingSet2SetEncoder` layer.
         nblocks (int): Number of graph embedding blocks or depth of the network.
+        recompute_interactions (bool): Whether to recompute the activations of :obj:`MEGnetBlock` in the backward
+            pass instead of storing them, via :obj:`RecomputeGrad` . Saves memory for more compute. Default is False.
         has_ff (bool): Use feed-forward MLP in each block.
         dropout (int): Dropout to use. Default is None.
         name (str): Name of the model.
@@ -177,7 +181,8 @@ def make_model(inputs: list = None,
         has_ff=has_ff,
         dropout=dropout,
         output_embedding=output_embedding,
-        output_mlp=output_mlp
+        output_mlp=output_mlp,
+        recompute_interactions=recompute_interactions
     )
 
     if output_scaling is not None:
@@ -247,6 +252,7 @@ model_crystal_default = {
         "activation": {"class_name": "function", "config": "kgcnn>softplus2"}
     },
     'nblocks': 3, 'has_ff': True, 'dropout': None, 'use_set2set': True,
+    'recompute_interactions': False,
     'verbose': 10,
     'output_embedding': 'graph',
     'output_mlp': {"use_bias": [True, True, True], "units": [32, 16, 1],
@@ -276,6 +282,7 @@ def make_crystal_model(inputs: list = None,
                        state_ff_args: dict = None,
                        use_set2set: bool = None,
                        nblocks: int = None,
+                       recompute_interactions: bool = None,
                        has_ff: bool = None,
                        dropout: float = None,
                        name: str = None,
@@ -318,6 +325,8 @@ def make_crystal_model(inputs: list = None,
         state_ff_args (dict): Dictionary of layer arguments unpacked in :obj:`MLP` feed-forward layer.
         use_set2set (bool): Whether to use :obj:`PoolingSet2SetEncoder` layer.
         nblocks (int): Number of graph embedding blocks or depth of the network.
+        recompute_interactions (bool): Whether to recompute the activations of :obj:`MEGnetBlock` in the backward
+            pass instead of storing them, via :obj:`RecomputeGrad` . Saves memory for more compute. Default is False.
         has_ff (bool): Use feed-forward MLP in each block.
         dropout (int): Dropout to use. Default is None.
         name (str): Name of the model.
@@ -363,7 +372,8 @@ def make_crystal_model(inputs: list = None,
         has_ff=has_ff,
         dropout=dropout,
         output_embedding=output_embedding,
-        output_mlp=output_mlp
+        output_mlp=output_mlp,
+        recompute_interactions=recompute_interactions
     )
 
     if output_scaling is not None:
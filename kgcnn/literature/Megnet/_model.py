@@ -1,4 +1,4 @@
-from kgcnn.layers.modules import Embedding
+from kgcnn.layers.modules import Embedding, RecomputeGrad
 from kgcnn.layers.geom import NodePosition, NodeDistanceEuclidean, GaussBasisLayer, ShiftPeriodicLattice
 from kgcnn.layers.mlp import MLP, GraphMLP
 from keras.layers import Dense, Dropout, Concatenate, Flatten, Add
@@ -30,6 +30,7 @@ def model_disjoint(
         dropout: float = None,
         output_embedding: str = None,
         output_mlp: dict = None,
+        recompute_interactions: bool = False
 ):
     # Make input
     vp, x, edi, up, batch_id_node, batch_id_edge, count_nodes, count_edges = inputs
@@ -64,8 +65,10 @@ def model_disjoint(
             up2 = MLP(**state_ff_args)(up)
 
         # MEGnetBlock
-        vp2, ep2, up2 = MEGnetBlock(**meg_block_args)(
-            [vp2, ep2, edi, up2, batch_id_node, batch_id_edge, count_nodes, count_edges])
+        meg_block = MEGnetBlock(**meg_block_args)
+        if recompute_interactions:
+            meg_block = RecomputeGrad(meg_block)
+        vp2, ep2, up2 = meg_block([vp2, ep2, edi, up2, batch_id_node, batch_id_edge, count_nodes, count_edges])
 
         # skip connection
         if dropout is not None:
@@ -121,6 +124,7 @@ def model_disjoint_crystal(
         dropout: float = None,
         output_embedding: str = None,
         output_mlp: dict = None,
+        recompute_interactions: bool = False
 ):
     vp, x, edi, up, edge_image, lattice, batch_id_node, batch_id_edge, count_nodes, count_edges = inputs
 
@@ -155,8 +159,10 @@ def model_disjoint_crystal(
             up2 = MLP(**state_ff_args)(up)
 
         # MEGnetBlock
-        vp2, ep2, up2 = MEGnetBlock(**meg_block_args)(
-            [vp2, ep2, edi, up2, batch_id_node, batch_id_edge, count_nodes, count_edges])
+        meg_block = MEGnetBlock(**meg_block_args)
+        if recompute_interactions:
+            meg_block = RecomputeGrad(meg_block)
+        vp2, ep2, up2 = meg_block([vp2, ep2, edi, up2, batch_id_node, batch_id_edge, count_nodes, count_edges])
 
         # skip connection
         if dropout is not None:
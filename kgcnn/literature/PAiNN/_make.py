@@ -37,11 +37,13 @@ model_default = {
     "has_equivariant_input": False,
     "equiv_initialize_kwargs": {"dim": 3, "method": "zeros", "units": 128},
     "bessel_basis": {"num_radial": 20, "cutoff": 5.0, "envelope_exponent": 5},
+    "fused_basis_args": None,
     "pooling_args": {"pooling_method": "scatter_sum"},
     "conv_args": {"units": 128, "cutoff": None, "conv_pool": "scatter_sum"},
     "update_args": {"units": 128, "add_eps": False},
     "equiv_normalization": False, "node_normalization": False,
     "depth": 3,
+    "recompute_interactions": False,
     "verbose": 10,
     "output_embedding": "graph",
     "output_to_tensor": None,  # deprecated
@@ -60,7 +62,9 @@ def make_model(inputs: list = None,
                has_equivariant_input: bool = None,
                equiv_initialize_kwargs: dict = None,
                bessel_basis: dict = None,
+               fused_basis_args: dict = None,
                depth: int = None,
+               recompute_interactions: bool = None,
                pooling_args: dict = None,
                conv_args: dict = None,
                update_args: dict = None,
@@ -99,7 +103,13 @@ def make_model(inputs: list = None,
         input_node_embedding (dict): Dictionary of embedding arguments for nodes unpacked in :obj:`Embedding` layers.
         equiv_initialize_kwargs (dict): Dictionary of layer arguments unpacked in :obj:`EquivariantInitialize` layer.
         bessel_basis (dict): Dictionary of layer arguments unpacked in final :obj:`BesselBasisLayer` layer.
+        fused_basis_args (dict): If not None, directions, cutoff envelope and Bessel expansion are computed in a single
+            :obj:`FusedDistanceBasis` layer, which is unpacked with these additional layer arguments,
+            e.g. `{"recompute_grad": True}` . Default is None.
         depth (int): Number of graph embedding units or depth of the network.
+        recompute_interactions (bool): Whether to recompute the activations of :obj:`PAiNNconv` and
+            :obj:`PAiNNUpdate` in the backward pass instead of storing them, via :obj:`RecomputeGrad` .
+            Saves memory for more compute. Default is False.
         has_equivariant_input (bool): Whether the first equivariant node embedding is passed to the model.
         pooling_args (dict): Dictionary of layer arguments unpacked in :obj:`PoolingNodes` layer.
         conv_args (dict): Dictionary of layer arguments unpacked in :obj:`PAiNNconv` layer.
@@ -140,9 +150,10 @@ def make_model(inputs: list = None,
         use_node_embedding=("int" in inputs[0]['dtype']) if input_node_embedding is not None else False,
         input_node_embedding=input_node_embedding,
         equiv_initialize_kwargs=equiv_initialize_kwargs,
-        bessel_basis=bessel_basis, depth=depth, pooling_args=pooling_args, conv_args=conv_args,
+        bessel_basis=bessel_basis, fused_basis_args=fused_basis_args, depth=depth, pooling_args=pooling_args,
+        conv_args=conv_args,
         update_args=update_args, equiv_normalization=equiv_normalization, node_normalization=node_normalization,
-        output_embedding=output_embedding, output_mlp=output_mlp
+        output_embedding=output_embedding, output_mlp=output_mlp, recompute_interactions=recompute_interactions
     )
 
     if output_scaling is not None:
@@ -193,12 +204,14 @@ model_crystal_default = {
     "has_equivariant_input": False,
     "equiv_initialize_kwargs": {"dim": 3, "method": "zeros"},
     "bessel_basis": {"num_radial": 20, "cutoff": 5.0, "envelope_exponent": 5},
+    "fused_basis_args": None,
     "pooling_args": {"pooling_method": "scatter_sum"},
     "conv_args": {"units": 128, "cutoff": None, "conv_pool": "scatter_sum"},
     "update_args": {"units": 128},
     "equiv_normalization": False,
     "node_normalization": False,
     "depth": 3,
+    "recompute_interactions": False,
     "verbose": 10,
     "output_embedding": "graph",
     "output_to_tensor": None,  # deprecated
@@ -217,7 +230,9 @@ def make_crystal_model(inputs: list = None,
                        input_node_embedding: dict = None,
                        equiv_initialize_kwargs: dict = None,
                        bessel_basis: dict = None,
+                       fused_basis_args: dict = None,
                        depth: int = None,
+                       recompute_interactions: bool = None,
                        pooling_args: dict = None,
                        conv_args: dict = None,
                        update_args: dict = None,
@@ -255,8 +270,14 @@ def make_crystal_model(inputs: list = None,
         cast_disjoint_kwargs (dict): Dictionary of arguments for casting layers.
         input_node_embedding (dict): Dictionary of embedding arguments for nodes unpacked in :obj:`Embedding` layers.
         bessel_basis (dict): Dictionary of layer arguments unpacked in final :obj:`BesselBasisLayer` layer.
+        fused_basis_args (dict): If not None, periodic directions, cutoff envelope and Bessel expansion are computed
+            in a single :obj:`FusedDistanceBasis` layer, which is unpacked with these additional layer arguments,
+            e.g. `{"recompute_grad": True}` . Default is None.
         equiv_initialize_kwargs (dict): Dictionary of layer arguments unpacked in :obj:`EquivariantInitialize` layer.
         depth (int): Number of graph embedding units or depth of the network.
+        recompute_interactions (bool): Whether to recompute the activations of :obj:`PAiNNconv` and
+            :obj:`PAiNNUpdate` in the backward pass instead of storing them, via :obj:`RecomputeGrad` .
+            Saves memory for more compute. Default is False.
         pooling_args (dict): Dictionary of layer arguments unpacked in :obj:`PoolingNodes` layer.
         has_equivariant_input (bool): Whether the first equivariant node embedding is passed to the model.
         conv_args (dict): Dictionary of layer arguments unpacked in :obj:`PAiNNconv` layer.
@@ -298,9 +319,10 @@ def make_crystal_model(inputs: list = None,
         [z, x, edi, img, lattice, batch_id_node, batch_id_edge, count_nodes, count_edges, v],
         use_node_embedding=("int" in inputs[0]['dtype']) if input_node_embedding is not None else False,
         input_node_embedding=input_node_embedding, equiv_initialize_kwargs=equiv_initialize_kwargs,
-        bessel_basis=bessel_basis, depth=depth, pooling_args=pooling_args, conv_args=conv_args,
+        bessel_basis=bessel_basis, fused_basis_args=fused_basis_args, depth=depth, pooling_args=pooling_args,
+        conv_args=conv_args,
         update_args=update_args, equiv_normalization=equiv_normalization, node_normalization=node_normalization,
-        output_embedding=output_embedding, output_mlp=output_mlp
+        output_embedding=output_embedding, output_mlp=output_mlp, recompute_interactions=recompute_interactions
     )
 
     if output_scaling is not None:
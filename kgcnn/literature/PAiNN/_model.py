@@ -1,8 +1,8 @@
 from keras.layers import Add
 from kgcnn.layers.geom import NodePosition, EdgeDirectionNormalized, NodeDistanceEuclidean, CosCutOffEnvelope, \
-    BesselBasisLayer, ShiftPeriodicLattice
+    BesselBasisLayer, ShiftPeriodicLattice, FusedDistanceBasis
 from kgcnn.layers.mlp import MLP, GraphMLP
-from kgcnn.layers.modules import Embedding
+from kgcnn.layers.modules import Embedding, RecomputeGrad
 from kgcnn.layers.norm import GraphLayerNormalization, GraphBatchNormalization
 from kgcnn.layers.pooling import PoolingNodes
 from ._layers import EquivariantInitialize, PAiNNconv, PAiNNUpdate
@@ -22,6 +22,8 @@ def model_disjoint(
         node_normalization: bool,
         output_embedding: str,
         output_mlp: dict,
+        fused_basis_args: dict = None,
+        recompute_interactions: bool = False
 ):
     z, x, edi, batch_id_node, batch_id_edge, count_nodes, count_edges, v = inputs
 
@@ -32,19 +34,27 @@ def model_disjoint(
     if use_node_embedding:
         z = Embedding(**input_node_embedding)(z)
 
-    pos1, pos2 = NodePosition()([x, edi])
-    rij = EdgeDirectionNormalized()([pos1, pos2])
-    d = NodeDistanceEuclidean()([pos1, pos2])
-    env = CosCutOffEnvelope(conv_args["cutoff"])(d)
-    rbf = BesselBasisLayer(**bessel_basis)(d)
+    if fused_basis_args is not None:
+        rbf, env, rij = FusedDistanceBasis(
+            basis_type="bessel", basis_kwargs=bessel_basis, envelope_cutoff=conv_args["cutoff"],
+            return_envelope=True, return_direction=True, **fused_basis_args)([x, edi])
+    else:
+        pos1, pos2 = NodePosition()([x, edi])
+        rij = EdgeDirectionNormalized()([pos1, pos2])
+        d = NodeDistanceEuclidean()([pos1, pos2])
+        env = CosCutOffEnvelope(conv_args["cutoff"])(d)
+        rbf = BesselBasisLayer(**bessel_basis)(d)
 
     for i in range(depth):
+        conv_layer, update_layer = PAiNNconv(**conv_args), PAiNNUpdate(**update_args)
+        if recompute_interactions:
+            conv_layer, update_layer = RecomputeGrad(conv_layer), RecomputeGrad(update_layer)
         # Message
-        ds, dv = PAiNNconv(**conv_args)([z, v, rbf, env, rij, edi])
+        ds, dv = conv_layer([z, v, rbf, env, rij, edi])
         z = Add()([z, ds])
         v = Add()([v, dv])
         # Update
-        ds, dv = PAiNNUpdate(**update_args)([z, v])
+        ds, dv = update_layer([z, v])
         z = Add()([z, ds])
         v = Add()([v, dv])
 
@@ -80,6 +90,8 @@ def model_disjoint_crystal(
         node_normalization: bool,
         output_embedding: str,
         output_mlp: dict,
+        fused_basis_args: dict = None,
+        recompute_interactions: bool = False
 ):
     z, x, edi, edge_image, lattice, batch_id_node, batch_id_edge, count_nodes, count_edges, v = inputs
 
@@ -90,20 +102,29 @@ def model_disjoint_crystal(
     if use_node_embedding:
         z = Embedding(**input_node_embedding)(z)
 
-    pos1, pos2 = NodePosition()([x, edi])
-    pos2 = ShiftPeriodicLattice()([pos2, edge_image, lattice, batch_id_edge])
-    rij = EdgeDirectionNormalized()([pos1, pos2])
-    d = NodeDistanceEuclidean()([pos1, pos2])
-    env = CosCutOffEnvelope(conv_args["cutoff"])(d)
-    rbf = BesselBasisLayer(**bessel_basis)(d)
+    if fused_basis_args is not None:
+        rbf, env, rij = FusedDistanceBasis(
+            basis_type="bessel", basis_kwargs=bessel_basis, envelope_cutoff=conv_args["cutoff"],
+            return_envelope=True, return_direction=True, **fused_basis_args)(
+            [x, edi, edge_image, lattice, batch_id_edge])
+    else:
+        pos1, pos2 = NodePosition()([x, edi])
+        pos2 = ShiftPeriodicLattice()([pos2, edge_image, lattice, batch_id_edge])
+        rij = EdgeDirectionNormalized()([pos1, pos2])
+        d = NodeDistanceEuclidean()([pos1, pos2])
+        env = CosCutOffEnvelope(conv_args["cutoff"])(d)
+        rbf = BesselBasisLayer(**bessel_basis)(d)
 
     for i in range(depth):
+        conv_layer, update_layer = PAiNNconv(**conv_args), PAiNNUpdate(**update_args)
+        if recompute_interactions:
+            conv_layer, update_layer = RecomputeGrad(conv_layer), RecomputeGrad(update_layer)
         # Message
-        ds, dv = PAiNNconv(**conv_args)([z, v, rbf, env, rij, edi])
+        ds, dv = conv_layer([z, v, rbf, env, rij, edi])
         z = Add()([z, ds])
         v = Add()([v, dv])
         # Update
-        ds, dv = PAiNNUpdate(**update_args)([z, v])
+        ds, dv = update_layer([z, v])
         z = Add()([z, ds])
         v = Add()([v, dv])
 
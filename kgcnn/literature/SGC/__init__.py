@@ -0,0 +1,7 @@
+from ._make import make_model, model_default
+
+
+__all__ = [
+    "make_model",
+    "model_default"
+]
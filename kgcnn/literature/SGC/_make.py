@@ -0,0 +1,134 @@
+import keras as ks
+from kgcnn.layers.scale import get as get_scaler
+from ._model import model_disjoint
+from kgcnn.layers.modules import Input
+from kgcnn.models.utils import update_model_kwargs
+from kgcnn.models.casting import (template_cast_output, template_cast_list_input,
+                                  template_cast_list_input_docs, template_cast_output_docs)
+from keras.backend import backend as backend_to_use
+
+
+# Keep track of model version from commit date in literature.
+__kgcnn_model_version__ = "2026-10-19"
+
+# Supported backends
+__kgcnn_model_backend_supported__ = ["tensorflow", "torch", "jax"]
+if backend_to_use() not in __kgcnn_model_backend_supported__:
+    raise NotImplementedError("Backend '%s' for model 'SGC' is not supported." % backend_to_use())
+
+# Implementation of SGC in `keras` from paper:
+# Simplifying Graph Convolutional Networks
+# by Felix Wu, Tianyi Zhang, Amauri Holanda de Souza Jr., Christopher Fifty, Tao Yu, Kilian Q. Weinberger
+# https://arxiv.org/abs/1902.07153
+# Propagation of APPNP can be precomputed in the same way:
+# Predict then Propagate: Graph Neural Networks meet Personalized PageRank
+# by Johannes Klicpera, Aleksandar Bojchevski, Stephan Günnemann
+# https://arxiv.org/abs/1810.05997
+
+model_default = {
+    "name": "SGC",
+    "inputs": [
+        {"shape": (None, 128), "name": "node_attributes_propagated", "dtype": "float32"},
+        {"shape": (), "name": "total_nodes", "dtype": "int64"}
+    ],
+    "input_tensor_type": "padded",
+    "cast_disjoint_kwargs": {},
+    "node_pooling_args": {"pooling_method": "scatter_sum"},
+    "output_embedding": "node",
+    "output_tensor_type": "padded",
+    "output_mlp": {"use_bias": True, "units": 7, "activation": "softmax"},
+    "output_scaling": None,
+}
+
+
+@update_model_kwargs(model_default, update_recursive=0)
+def make_model(inputs: list = None,
+               input_tensor_type: str = None,
+               cast_disjoint_kwargs: dict = None,
+               node_pooling_args: dict = None,
+               name: str = None,
+               verbose: int = None,  # noqa
+               output_embedding: str = None,
+               output_tensor_type: str = None,
+               output_mlp: dict = None,
+               output_scaling: dict = None
+               ):
+    r"""Make `SGC <https://arxiv.org/abs/1902.07153>`__ graph network via functional API.
+    Default parameters can be found in :obj:`kgcnn.literature.SGC.model_default` .
+
+    The model has no message passing but only an :obj:`MLP` on node attributes, which have been propagated with the
+    pre-scaled adjacency matrix before training, e.g. by the graph preprocessor
+    :obj:`kgcnn.graph.preprocessor.PropagateNodeAttributes` for :math:`A^k X` as in SGC or the personalized PageRank
+    of `APPNP <https://arxiv.org/abs/1810.05997>`__ . With a single linear layer and softmax, this is the original
+    SGC model.
+
+    **Model inputs**:
+    Model uses the list template of inputs and standard output template.
+    The supported inputs are  :obj:`[nodes, ...]`
+    with '...' indicating mask or ID tensors following the template below.
+    Nodes are the propagated node attributes.
+
+    %s
+
+    **Model outputs**:
+    The standard output template:
+
+    %s
+
+    Args:
+        inputs (list): List of dictionaries unpacked in :obj:`Input`. Order must match model definition.
+        input_tensor_type (str): Input type of graph tensor. Default is "padded".
+        cast_disjoint_kwargs (dict): Dictionary of arguments for casting layers if used.
+        node_pooling_args (dict): Dictionary of layer arguments unpacked in :obj:`PoolingNodes` layers.
+        name (str): Name of the model.
+        verbose (int): Level of print output.
+        output_embedding (str): Main embedding task for graph network. Either "node", or "graph".
+        output_tensor_type (str): Output type of graph tensors such as nodes or edges. Default is "padded".
+        output_mlp (dict): Dictionary of layer arguments unpacked in the final classification :obj:`MLP` layer block.
+            Defines number of model outputs and activation.
+        output_scaling (dict): Dictionary of layer arguments unpacked in scaling layers. Default is None.
+
+    Returns:
+        :obj:`keras.models.Model`
+    """
+    # Make input
+    model_inputs = [Input(**x) for x in inputs]
+
+    dj_inputs = template_cast_list_input(
+        model_inputs,
+        input_tensor_type=input_tensor_type,
+        cast_disjoint_kwargs=cast_disjoint_kwargs,
+        mask_assignment=[0],
+        index_assignment=[None]
+    )
+
+    n, batch_id_node, node_id, count_nodes = dj_inputs
+
+    out = model_disjoint(
+        [n, batch_id_node, count_nodes],
+        output_embedding=output_embedding, output_mlp=output_mlp, node_pooling_args=node_pooling_args
+    )
+
+    if output_scaling is not None:
+        scaler = get_scaler(output_scaling["name"])(**output_scaling)
+        out = scaler(out)
+
+    # Output embedding choice
+    out = template_cast_output(
+        [out, batch_id_node, None, node_id, None, count_nodes, None],
+        output_embedding=output_embedding, output_tensor_type=output_tensor_type,
+        input_tensor_type=input_tensor_type, cast_disjoint_kwargs=cast_disjoint_kwargs
+    )
+
+    model = ks.models.Model(inputs=model_inputs, outputs=out, name=name)
+    model.__kgcnn_model_version__ = __kgcnn_model_version__
+
+    if output_scaling is not None:
+        def set_scale(*args, **kwargs):
+            scaler.set_scale(*args, **kwargs)
+
+        setattr(model, "set_scale", set_scale)
+    return model
+
+
+make_model.__doc__ = make_model.__doc__ % (template_cast_list_input_docs, template_cast_output_docs)
@@ -0,0 +1,20 @@
+from kgcnn.layers.mlp import MLP, GraphMLP
+from kgcnn.layers.pooling import PoolingNodes
+
+
+def model_disjoint(inputs,
+                   output_embedding: str = None,
+                   output_mlp: dict = None,
+                   node_pooling_args: dict = None):
+    n, batch_id_node, count_nodes = inputs
+
+    # Output embedding choice
+    if output_embedding == "graph":
+        out = PoolingNodes(**node_pooling_args)([count_nodes, n, batch_id_node])  # will return tensor
+        out = MLP(**output_mlp)(out)
+    elif output_embedding == "node":
+        out = GraphMLP(**output_mlp)([n, batch_id_node, count_nodes])
+    else:
+        raise ValueError("Unsupported output embedding for `SGC` .")
+
+    return out
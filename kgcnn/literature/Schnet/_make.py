@@ -47,6 +47,7 @@ model_default = {
     "node_pooling_args": {"pooling_method": "sum"},
     "depth": 4,
     "gauss_args": {"bins": 20, "distance": 4, "offset": 0.0, "sigma": 0.4},
+    "fused_basis_args": None,
     "verbose": 10,
     "last_mlp": {"use_bias": [True, True], "units": [128, 64],
                  "activation": [
@@ -75,6 +76,7 @@ def make_model(inputs: list = None,
                make_distance: bool = None,
                expand_distance: bool = None,
                gauss_args: dict = None,
+               fused_basis_args: dict = None,
                interaction_args: dict = None,
                node_pooling_args: dict = None,
                depth: int = None,
@@ -115,6 +117,9 @@ def make_model(inputs: list = None,
         expand_distance (bool): If the edge input are actual edges or node coordinates instead that are expanded to
             form edges with a gauss distance basis given edge indices. Expansion uses `gauss_args`.
         gauss_args (dict): Dictionary of layer arguments unpacked in :obj:`GaussBasisLayer` layer.
+        fused_basis_args (dict): If not None, distances and Gaussian expansion are computed in a single
+            :obj:`FusedDistanceBasis` layer, which is unpacked with these additional layer arguments,
+            e.g. `{"recompute_grad": True}` . Requires `make_distance` and `expand_distance` . Default is None.
         depth (int): Number of graph embedding units or depth of the network.
         interaction_args (dict): Dictionary of layer arguments unpacked in final :obj:`SchNetInteraction` layers.
         node_pooling_args (dict): Dictionary of layer arguments unpacked in :obj:`PoolingNodes` layers.
@@ -149,6 +154,7 @@ def make_model(inputs: list = None,
         use_node_embedding=("int" in inputs[0]['dtype']) if input_node_embedding is not None else False,
         input_node_embedding=input_node_embedding,
         make_distance=make_distance, expand_distance=expand_distance, gauss_args=gauss_args,
+        fused_basis_args=fused_basis_args,
         interaction_args=interaction_args, node_pooling_args=node_pooling_args, depth=depth,
         last_mlp=last_mlp, output_embedding=output_embedding, use_output_mlp=use_output_mlp,
         output_mlp=output_mlp)
@@ -209,6 +215,7 @@ model_crystal_default = {
     "node_pooling_args": {"pooling_method": "sum"},
     "depth": 4,
     "gauss_args": {"bins": 20, "distance": 4, "offset": 0.0, "sigma": 0.4},
+    "fused_basis_args": None,
     "verbose": 10,
     "last_mlp": {"use_bias": [True, True], "units": [128, 64],
                  "activation": [
@@ -237,6 +244,7 @@ def make_crystal_model(inputs: list = None,
                        make_distance: bool = None,
                        expand_distance: bool = None,
                        gauss_args: dict = None,
+                       fused_basis_args: dict = None,
                        interaction_args: dict = None,
                        node_pooling_args: dict = None,
                        depth: int = None,
@@ -275,6 +283,9 @@ def make_crystal_model(inputs: list = None,
         expand_distance (bool): If the edge input are actual edges or node coordinates instead that are expanded to
             form edges with a gauss distance basis given edge indices. Expansion uses `gauss_args`.
         gauss_args (dict): Dictionary of layer arguments unpacked in :obj:`GaussBasisLayer` layer.
+        fused_basis_args (dict): If not None, periodic distances and Gaussian expansion are computed in a single
+            :obj:`FusedDistanceBasis` layer, which is unpacked with these additional layer arguments,
+            e.g. `{"recompute_grad": True}` . Requires `make_distance` and `expand_distance` . Default is None.
         depth (int): Number of graph embedding units or depth of the network.
         interaction_args (dict): Dictionary of layer arguments unpacked in final :obj:`SchNetInteraction` layers.
         node_pooling_args (dict): Dictionary of layer arguments unpacked in :obj:`PoolingNodes` layers.
@@ -310,6 +321,7 @@ def make_crystal_model(inputs: list = None,
         use_node_embedding=("int" in inputs[0]['dtype']) if input_node_embedding is not None else False,
         input_node_embedding=input_node_embedding,
         make_distance=make_distance, expand_distance=expand_distance, gauss_args=gauss_args,
+        fused_basis_args=fused_basis_args,
         interaction_args=interaction_args, node_pooling_args=node_pooling_args, depth=depth, last_mlp=last_mlp,
         output_embedding=output_embedding, use_output_mlp=use_output_mlp, output_mlp=output_mlp
     )
@@ -1,6 +1,7 @@
 from keras.layers import Dense
 from kgcnn.layers.conv import SchNetInteraction
-from kgcnn.layers.geom import NodePosition, NodeDistanceEuclidean, GaussBasisLayer, ShiftPeriodicLattice
+from kgcnn.layers.geom import NodePosition, NodeDistanceEuclidean, GaussBasisLayer, ShiftPeriodicLattice, \
+    FusedDistanceBasis
 from kgcnn.layers.mlp import GraphMLP, MLP
 from kgcnn.layers.modules import Embedding
 from kgcnn.layers.pooling import PoolingNodes
@@ -19,21 +20,28 @@ def model_disjoint(
         last_mlp: dict = None,
         output_embedding: str = None,
         use_output_mlp: bool = None,
-        output_mlp: dict = None):
+        output_mlp: dict = None,
+        fused_basis_args: dict = None):
     n, x, disjoint_indices, batch_id_node, count_nodes = inputs
 
     # Optional Embedding.
     if use_node_embedding:
         n = Embedding(**input_node_embedding)(n)
 
-    if make_distance:
-        pos1, pos2 = NodePosition()([x, disjoint_indices])
-        ed = NodeDistanceEuclidean()([pos1, pos2])
+    if fused_basis_args is not None:
+        if not make_distance or not expand_distance:
+            raise ValueError("Fused distance basis requires `make_distance` and `expand_distance` .")
+        ed = FusedDistanceBasis(basis_type="gauss", basis_kwargs=gauss_args, **fused_basis_args)(
+            [x, disjoint_indices])
     else:
-        ed = x
+        if make_distance:
+            pos1, pos2 = NodePosition()([x, disjoint_indices])
+            ed = NodeDistanceEuclidean()([pos1, pos2])
+        else:
+            ed = x
 
-    if expand_distance:
-        ed = GaussBasisLayer(**gauss_args)(ed)
+        if expand_distance:
+            ed = GaussBasisLayer(**gauss_args)(ed)
 
     # Model
     n = Dense(interaction_args["units"], activation='linear')(n)
@@ -70,22 +78,29 @@ def model_disjoint_crystal(
         last_mlp: dict = None,
         output_embedding: str = None,
         use_output_mlp: bool = None,
-        output_mlp: dict = None):
+        output_mlp: dict = None,
+        fused_basis_args: dict = None):
     n, x, disjoint_indices, edge_image, lattice, batch_id_node, batch_id_edge, count_nodes = inputs
 
     # Optional Embedding.
     if use_node_embedding:
         n = Embedding(**input_node_embedding)(n)
 
-    if make_distance:
-        pos1, pos2 = NodePosition()([x, disjoint_indices])
-        pos2 = ShiftPeriodicLattice()([pos2, edge_image, lattice, batch_id_edge])
-        ed = NodeDistanceEuclidean()([pos1, pos2])
+    if fused_basis_args is not None:
+        if not make_distance or not expand_distance:
+            raise ValueError("Fused distance basis requires `make_distance` and `expand_distance` .")
+        ed = FusedDistanceBasis(basis_type="gauss", basis_kwargs=gauss_args, **fused_basis_args)(
+            [x, disjoint_indices, edge_image, lattice, batch_id_edge])
     else:
-        ed, _, _, _ = x
-
-    if expand_distance:
-        ed = GaussBasisLayer(**gauss_args)(ed)
+        if make_distance:
+            pos1, pos2 = NodePosition()([x, disjoint_indices])
+            pos2 = ShiftPeriodicLattice()([pos2, edge_image, lattice, batch_id_edge])
+            ed = NodeDistanceEuclidean()([pos1, pos2])
+        else:
+            ed, _, _, _ = x
+
+        if expand_distance:
+            ed = GaussBasisLayer(**gauss_args)(ed)
 
     # Model
     n = Dense(interaction_args["units"], activation='linear')(n)
@@ -3,6 +3,7 @@ import keras.saving
 from keras import ops
 from typing import Union
 from kgcnn.models.utils import get_model_class
+from kgcnn.layers.scale import EnergyForceExtensiveLabelScaler
 from keras.saving import deserialize_keras_object, serialize_keras_object
 from keras.backend import backend
 
@@ -33,6 +34,10 @@ class EnergyForceModel(ks.models.Model):
     Note that the model simply returns the tensor type of the coordinate input for forces. No casting is done
     by this class. This means that the model returns a ragged, disjoint or padded tensor depending on the tensor
     type of the coordinates.
+
+    With :obj:`set_scale` , energies and forces are scaled within the model by a
+    :obj:`kgcnn.layers.scale.EnergyForceExtensiveLabelScaler` layer, which adds the fitted energy contributions of
+    each atom. The model then predicts the original labels and the dataset does not have to be transformed.
     """
 
     def __init__(self,
@@ -47,7 +52,9 @@ class EnergyForceModel(ks.models.Model):
                  is_physical_force: bool = True,
                  use_batch_jacobian: bool = None,
                  name: str = None,
-                 outputs: Union[dict, list] = None
+                 outputs: Union[dict, list] = None,
+                 atomic_number_input: Union[int, str] = 0,
+                 output_scaling: dict = None
                  ):
         """Initialize Force model with an energy model.
 
@@ -66,6 +73,9 @@ class EnergyForceModel(ks.models.Model):
             use_batch_jacobian: Deprecated.
             name (str): Name of the model.
             outputs: List of outputs as dictionary kwargs similar to inputs.
+            atomic_number_input (int): Position of the atomic number input for scaling. Default is 0.
+            output_scaling (dict): Kwargs for the scaling layer. Default is None, which adds the layer only when
+                calling :obj:`set_scale` .
         """
         super().__init__()
         if model_energy is None:
@@ -92,6 +102,7 @@ class EnergyForceModel(ks.models.Model):
         self.is_physical_force = is_physical_force
         self.nested_model_config = nested_model_config
         self._force_outputs = outputs
+        self.atomic_number_input = atomic_number_input
 
         self.output_as_dict = output_as_dict
         if isinstance(output_as_dict, bool):
@@ -106,6 +117,11 @@ class EnergyForceModel(ks.models.Model):
         energy_output_config = outputs[self.output_as_dict_names[0]] if self.output_as_dict_use else outputs[0]
         self._expected_energy_states = energy_output_config["shape"][0]
 
+        self._output_scaling = output_scaling
+        self.scaler = None
+        if self._output_scaling is not None:
+            self._make_scaler()
+
         # We can try to infer the model inputs from energy model, if not given explicit.
         self._inputs_to_force_model = inputs
         if self._inputs_to_force_model is None:
@@ -121,10 +137,42 @@ class EnergyForceModel(ks.models.Model):
         else:
             raise NotImplementedError("Backend '%s' not supported for force model." % backend())
 
+    def _make_scaler(self):
+        scaling_kwargs = {"scaling_shape": (1, self._expected_energy_states)}
+        scaling_kwargs.update(self._output_scaling)
+        self.scaler = EnergyForceExtensiveLabelScaler(**scaling_kwargs)
+
+    def set_scale(self, scaler):
+        """Set scale and atomic energies of a fitted :obj:`EnergyForceExtensiveLabelScaler` from
+        :obj:`kgcnn.data.transform.scaler.force` . Adds the scaling layer if the model does not have one.
+
+        Args:
+            scaler: Fitted scaler for energies and forces.
+
+        Returns:
+            None.
+        """
+        if self.scaler is None:
+            if self.built:
+                raise ValueError("Can not add scaling layer to a built model. Use `output_scaling` or call "
+                                 "`set_scale` before the model is built.")
+            self._output_scaling = {}
+            self._make_scaler()
+        self.scaler.set_scale(scaler)
+
     def build(self, input_shape):
         self.energy_model.build(input_shape)
         self.built = True
 
+    def _call_scale(self, inputs, eng, e_grad):
+        atomic_number = inputs[self.atomic_number_input]
+        if backend() == "tensorflow" and isinstance(e_grad, tf.RaggedTensor):
+            if isinstance(atomic_number, tf.RaggedTensor):
+                atomic_number = atomic_number.to_tensor()
+            eng, force = self.scaler([eng, e_grad.values, atomic_number])
+            return eng, tf.RaggedTensor.from_row_splits(force, e_grad.row_splits, validate=self.ragged_validate)
+        return self.scaler([eng, e_grad, atomic_number])
+
     def _call_grad_tf(self, inputs, training=False, **kwargs):
 
         x_in = inputs[self.coordinate_input]
@@ -187,6 +235,10 @@ class EnergyForceModel(ks.models.Model):
         if self.is_physical_force:
             e_grad = -e_grad
 
+        # Atomic energies do not depend on coordinates, so that forces only need to be scaled.
+        if self.scaler is not None:
+            eng, e_grad = self._call_scale(inputs, eng, e_grad)
+
         if self.output_as_dict_use:
             return {self.output_as_dict_names[0]: eng, self.output_as_dict_names[1]: e_grad}
         else:
@@ -212,6 +264,8 @@ class EnergyForceModel(ks.models.Model):
             "nested_model_config": self.nested_model_config,
             # "use_batch_jacobian": self.use_batch_jacobian,
             "inputs": self._inputs_to_force_model,
-            "outputs": self._force_outputs
+            "outputs": self._force_outputs,
+            "atomic_number_input": self.atomic_number_input,
+            "output_scaling": self._output_scaling
         })
         return conf
@@ -185,3 +185,53 @@ def cross(x1, x2):
     if any_symbolic_tensors((x1, x2)):
         return _Cross().symbolic_call(x1, x2)
     return kgcnn_backend.cross(x1, x2)
+
+class _SearchSorted(Operation):
+    def __init__(self, side="left"):
+        super().__init__()
+        self.side = side
+
+    def call(self, sorted_sequence, values):
+        return kgcnn_backend.searchsorted(sorted_sequence, values, side=self.side)
+
+    def compute_output_spec(self, sorted_sequence, values):
+        return KerasTensor(values.shape, dtype="int64")
+
+
+def searchsorted(sorted_sequence, values, side="left"):
+    """Find indices where values should be inserted in a sorted sequence to maintain order.
+
+    Args:
+        sorted_sequence: 1D input tensor sorted in ascending order.
+        values: 1D tensor of values to insert.
+        side (str): Either 'left' to return the first suitable index or 'right' for the last suitable index.
+
+    Returns:
+        Tensor: Insertion indices of shape of `values` and dtype 'int64'.
+    """
+    if any_symbolic_tensors((sorted_sequence, values)):
+        return _SearchSorted(side=side).symbolic_call(sorted_sequence, values)
+    return kgcnn_backend.searchsorted(sorted_sequence, values, side=side)
+
+
+
+def recompute_grad(f):
+    """Wrap a function to recompute its intermediate values in the backward pass instead of storing them.
+
+    Uses :obj:`tf.recompute_grad` , :obj:`jax.checkpoint` or :obj:`torch.utils.checkpoint` depending on the backend.
+    For symbolic tensors the function is called directly.
+
+    Args:
+        f: Function of tensors to wrap. Should only take positional tensor arguments.
+
+    Returns:
+        Callable: Function with same signature as :obj:`f` .
+    """
+    recompute_f = kgcnn_backend.recompute_grad(f)
+
+    def wrapped_f(*args):
+        if any_symbolic_tensors(args):
+            return f(*args)
+        return recompute_f(*args)
+
+    return wrapped_f
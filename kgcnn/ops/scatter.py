@@ -1,129 +1,273 @@
 import kgcnn.backend as kgcnn_backend
 from keras import KerasTensor
+from keras import ops
+from keras.backend import standardize_dtype
 from kgcnn.backend import any_symbolic_tensors
 from keras import Operation
 
+# Float types that are accumulated in float32 by the scatter reductions, e.g. under a mixed precision policy.
+_low_precision_dtypes = ("float16", "bfloat16")
+
+
+def _is_low_precision(x):
+    return hasattr(x, "dtype") and standardize_dtype(x.dtype) in _low_precision_dtypes
+
+
+def _reduce_in_float32(reduce_fn, *args, **kwargs):
+    """Call scatter reduction with low precision float arguments cast to float32 and cast the result back."""
+    low_precision = [x for x in list(args) + list(kwargs.values()) if _is_low_precision(x)]
+    if not low_precision:
+        return reduce_fn(*args, **kwargs)
+    args = [ops.cast(x, "float32") if _is_low_precision(x) else x for x in args]
+    kwargs = {key: ops.cast(x, "float32") if _is_low_precision(x) else x for key, x in kwargs.items()}
+    return ops.cast(reduce_fn(*args, **kwargs), low_precision[0].dtype)
+
 
 class _ScatterMax(Operation):
+
+    def __init__(self, sorted_indices: bool = False):
+        super().__init__()
+        self.sorted_indices = sorted_indices
+
     def call(self, indices, values, shape):
+        if self.sorted_indices:
+            return kgcnn_backend.segment_reduce_max(indices, values, shape)
         return kgcnn_backend.scatter_reduce_max(indices, values, shape)
 
     def compute_output_spec(self, indices, values, shape):
         return KerasTensor(shape, dtype=values.dtype)
 
 
-def scatter_reduce_max(indices, values, shape):
+def scatter_reduce_max(indices, values, shape, sorted_indices: bool = False):
     r"""Scatter values at indices into new tensor of shape.
 
     Args:
         indices (Tensor): 1D Indices of shape `(M, )` .
         values (Tensor): Vales of shape `(M, ...)` .
         shape (tuple): Target shape.
+        sorted_indices (bool): Whether indices are sorted in ascending order. If True, a segment reduction of the
+            backend is used, which does not require to broadcast the indices to the shape of values.
+            Unsorted indices can give wrong results in this case. Default is False.
 
     Returns:
         Tensor: Scattered values of `shape` .
     """
     if any_symbolic_tensors((indices, values, shape)):
-        return _ScatterMax().symbolic_call(indices, values, shape)
+        return _ScatterMax(sorted_indices=sorted_indices).symbolic_call(indices, values, shape)
+    if sorted_indices:
+        return kgcnn_backend.segment_reduce_max(indices, values, shape)
     return kgcnn_backend.scatter_reduce_max(indices, values, shape)
 
 
 class _ScatterMin(Operation):
+
+    def __init__(self, sorted_indices: bool = False):
+        super().__init__()
+        self.sorted_indices = sorted_indices
+
     def call(self, indices, values, shape):
+        if self.sorted_indices:
+            return kgcnn_backend.segment_reduce_min(indices, values, shape)
         return kgcnn_backend.scatter_reduce_min(indices, values, shape)
 
     def compute_output_spec(self, indices, values, shape):
         return KerasTensor(shape, dtype=values.dtype)
 
 
-def scatter_reduce_min(indices, values, shape):
+def scatter_reduce_min(indices, values, shape, sorted_indices: bool = False):
     r"""Scatter values at indices into new tensor of shape.
 
     Args:
         indices (Tensor): 1D Indices of shape `(M, )` .
         values (Tensor): Vales of shape `(M, ...)` .
         shape (tuple): Target shape.
+        sorted_indices (bool): Whether indices are sorted in ascending order. If True, a segment reduction of the
+            backend is used, which does not require to broadcast the indices to the shape of values.
+            Unsorted indices can give wrong results in this case. Default is False.
 
     Returns:
         Tensor: Scattered values of `shape` .
     """
     if any_symbolic_tensors((indices, values, shape)):
-        return _ScatterMin().symbolic_call(indices, values, shape)
+        return _ScatterMin(sorted_indices=sorted_indices).symbolic_call(indices, values, shape)
+    if sorted_indices:
+        return kgcnn_backend.segment_reduce_min(indices, values, shape)
     return kgcnn_backend.scatter_reduce_min(indices, values, shape)
 
 
 class _ScatterMean(Operation):
+
+    def __init__(self, sorted_indices: bool = False):
+        super().__init__()
+        self.sorted_indices = sorted_indices
+
     def call(self, indices, values, shape):
-        return kgcnn_backend.scatter_reduce_mean(indices, values, shape)
+        if self.sorted_indices:
+            return _reduce_in_float32(kgcnn_backend.segment_reduce_mean, indices, values, shape)
+        return _reduce_in_float32(kgcnn_backend.scatter_reduce_mean, indices, values, shape)
 
     def compute_output_spec(self, indices, values, shape):
         return KerasTensor(shape, dtype=values.dtype)
 
 
-def scatter_reduce_mean(indices, values, shape):
+def scatter_reduce_mean(indices, values, shape, sorted_indices: bool = False):
     r"""Scatter values at indices into new tensor of shape.
 
     Args:
         indices (Tensor): 1D Indices of shape `(M, )` .
         values (Tensor): Vales of shape `(M, ...)` .
         shape (tuple): Target shape.
+        sorted_indices (bool): Whether indices are sorted in ascending order. If True, a segment reduction of the
+            backend is used, which does not require to broadcast the indices to the shape of values.
+            Unsorted indices can give wrong results in this case. Default is False.
 
     Returns:
         Tensor: Scattered values of `shape` .
     """
     if any_symbolic_tensors((indices, values, shape)):
-        return _ScatterMean().symbolic_call(indices, values, shape)
-    return kgcnn_backend.scatter_reduce_mean(indices, values, shape)
+        return _ScatterMean(sorted_indices=sorted_indices).symbolic_call(indices, values, shape)
+    if sorted_indices:
+        return _reduce_in_float32(kgcnn_backend.segment_reduce_mean, indices, values, shape)
+    return _reduce_in_float32(kgcnn_backend.scatter_reduce_mean, indices, values, shape)
 
 
 class _ScatterSum(Operation):
+
+    def __init__(self, sorted_indices: bool = False):
+        super().__init__()
+        self.sorted_indices = sorted_indices
+
     def call(self, indices, values, shape):
-        return kgcnn_backend.scatter_reduce_sum(indices, values, shape)
+        if self.sorted_indices:
+            return _reduce_in_float32(kgcnn_backend.segment_reduce_sum, indices, values, shape)
+        return _reduce_in_float32(kgcnn_backend.scatter_reduce_sum, indices, values, shape)
 
     def compute_output_spec(self, indices, values, shape):
         return KerasTensor(shape, dtype=values.dtype)
 
 
-def scatter_reduce_sum(indices, values, shape):
+def scatter_reduce_sum(indices, values, shape, sorted_indices: bool = False):
     r"""Scatter values at indices into new tensor of shape.
 
     Args:
         indices (Tensor): 1D Indices of shape `(M, )` .
         values (Tensor): Vales of shape `(M, ...)` .
         shape (tuple): Target shape.
+        sorted_indices (bool): Whether indices are sorted in ascending order. If True, a segment reduction of the
+            backend is used, which does not require to broadcast the indices to the shape of values.
+            Unsorted indices can give wrong results in this case. Default is False.
 
     Returns:
         Tensor: Scattered values of `shape` .
     """
     if any_symbolic_tensors((indices, values, shape)):
-        return _ScatterSum().symbolic_call(indices, values, shape)
-    return kgcnn_backend.scatter_reduce_sum(indices, values, shape)
+        return _ScatterSum(sorted_indices=sorted_indices).symbolic_call(indices, values, shape)
+    if sorted_indices:
+        return _reduce_in_float32(kgcnn_backend.segment_reduce_sum, indices, values, shape)
+    return _reduce_in_float32(kgcnn_backend.scatter_reduce_sum, indices, values, shape)
 
 
 class _ScatterSoftmax(Operation):
 
-    def __init__(self, normalize: bool = False):
+    def __init__(self, normalize: bool = False, sorted_indices: bool = False):
         super().__init__()
         self.normalize = normalize
+        self.sorted_indices = sorted_indices
 
     def call(self, indices, values, shape):
-        return kgcnn_backend.scatter_reduce_softmax(indices, values, shape, normalize=self.normalize)
+        if self.sorted_indices:
+            return _reduce_in_float32(kgcnn_backend.segment_reduce_softmax, indices, values, shape,
+                                      normalize=self.normalize)
+        return _reduce_in_float32(kgcnn_backend.scatter_reduce_softmax, indices, values, shape,
+                                  normalize=self.normalize)
 
     def compute_output_spec(self, indices, values, shape):
         return KerasTensor(shape, dtype=values.dtype)
 
 
-def scatter_reduce_softmax(indices, values, shape, normalize: bool = False):
+def scatter_reduce_softmax(indices, values, shape, normalize: bool = False, sorted_indices: bool = False):
     r"""Scatter values at indices to normalize values via softmax.
 
     Args:
         indices (Tensor): 1D Indices of shape `(M, )` .
         values (Tensor): Vales of shape `(M, ...)` .
         shape (tuple): Target shape of scattered tensor.
+        normalize (bool): Whether to subtract the maximum value of each group before the exponential.
+            Default is False.
+        sorted_indices (bool): Whether indices are sorted in ascending order. If True, segment reductions of the
+            backend are used for the sum and maximum. Unsorted indices can give wrong results in this case.
+            Default is False.
 
     Returns:
         Tensor: Values with softmax computed by grouping at indices.
     """
     if any_symbolic_tensors((indices, values, shape)):
-        return _ScatterSoftmax(normalize=normalize).symbolic_call(indices, values, shape)
-    return kgcnn_backend.scatter_reduce_softmax(indices, values, shape, normalize=normalize)
\ No newline at end of file
+        return _ScatterSoftmax(normalize=normalize, sorted_indices=sorted_indices).symbolic_call(
+            indices, values, shape)
+    if sorted_indices:
+        return _reduce_in_float32(kgcnn_backend.segment_reduce_softmax, indices, values, shape, normalize=normalize)
+    return _reduce_in_float32(kgcnn_backend.scatter_reduce_softmax, indices, values, shape, normalize=normalize)
+
+class _GatherScatterSum(Operation):
+    def call(self, x, indices_gather, indices_scatter, shape, weights=None):
+        return _reduce_in_float32(kgcnn_backend.gather_scatter_reduce_sum, x, indices_gather, indices_scatter, shape,
+                                  weights=weights)
+
+    def compute_output_spec(self, x, indices_gather, indices_scatter, shape, weights=None):
+        return KerasTensor(shape, dtype=x.dtype)
+
+
+def gather_scatter_reduce_sum(x, indices_gather, indices_scatter, shape, weights=None):
+    r"""Fused gather of `x` at `indices_gather` , multiplication with optional weights and scatter-sum at
+    `indices_scatter` into new tensor of shape.
+
+    This is equivalent to a sparse-dense matrix multiplication :math:`A X` , where the sparse matrix :math:`A` has
+    entries of weights at positions `(indices_scatter, indices_gather)` . For scalar edge weights or no weights,
+    the sparse matrix product of the backend is used and the gathered edge tensor is not materialized.
+    For vector weights the gathered messages are recomputed in the backward pass instead of being stored.
+
+    Args:
+        x (Tensor): Node values of shape `(N, ...)` .
+        indices_gather (Tensor): 1D Indices of shape `(M, )` to gather from `x` , e.g. sending nodes.
+        indices_scatter (Tensor): 1D Indices of shape `(M, )` to scatter to, e.g. receiving nodes.
+        shape (tuple): Target shape.
+        weights (Tensor): Optional weights of shape `(M, 1)` or `(M, ...)` that broadcast to gathered values.
+            Default is None.
+
+    Returns:
+        Tensor: Scattered values of `shape` .
+    """
+    if any_symbolic_tensors((x, indices_gather, indices_scatter, shape, weights)):
+        return _GatherScatterSum().symbolic_call(x, indices_gather, indices_scatter, shape, weights=weights)
+    return _reduce_in_float32(kgcnn_backend.gather_scatter_reduce_sum, x, indices_gather, indices_scatter, shape,
+                              weights=weights)
+
+
+class _GatherScatterMean(Operation):
+    def call(self, x, indices_gather, indices_scatter, shape, weights=None):
+        return _reduce_in_float32(kgcnn_backend.gather_scatter_reduce_mean, x, indices_gather, indices_scatter, shape,
+                                  weights=weights)
+
+    def compute_output_spec(self, x, indices_gather, indices_scatter, shape, weights=None):
+        return KerasTensor(shape, dtype=x.dtype)
+
+
+def gather_scatter_reduce_mean(x, indices_gather, indices_scatter, shape, weights=None):
+    r"""Fused gather of `x` at `indices_gather` , multiplication with optional weights and scatter-mean at
+    `indices_scatter` into new tensor of shape. See :obj:`gather_scatter_reduce_sum` for details.
+
+    Args:
+        x (Tensor): Node values of shape `(N, ...)` .
+        indices_gather (Tensor): 1D Indices of shape `(M, )` to gather from `x` , e.g. sending nodes.
+        indices_scatter (Tensor): 1D Indices of shape `(M, )` to scatter to, e.g. receiving nodes.
+        shape (tuple): Target shape.
+        weights (Tensor): Optional weights of shape `(M, 1)` or `(M, ...)` that broadcast to gathered values.
+            Default is None.
+
+    Returns:
+        Tensor: Mean of scattered values of `shape` .
+    """
+    if any_symbolic_tensors((x, indices_gather, indices_scatter, shape, weights)):
+        return _GatherScatterMean().symbolic_call(x, indices_gather, indices_scatter, shape, weights=weights)
+    return _reduce_in_float32(kgcnn_backend.gather_scatter_reduce_mean, x, indices_gather, indices_scatter, shape,
+                              weights=weights)
@@ -1,5 +1,16 @@
+import glob
+import time
+import pickle
+import logging
+import functools
+import numpy as np
 import keras as ks
 import keras.callbacks
+from kgcnn.training.profiler import TrainingProfiler
+
+logging.basicConfig()
+module_logger = logging.getLogger(__name__)
+module_logger.setLevel(logging.INFO)
 
 
 class LearningRateLoggingCallback(ks.callbacks.Callback):
@@ -39,3 +50,238 @@ class LearningRateLoggingCallback(ks.callbacks.Callback):
     def from_config(cls, config):
         """Make class instance from config."""
         return cls(**config)
+
+
+class MedianStoppingCallback(ks.callbacks.Callback):
+    r"""Callback to stop training, if the monitored metric is worse than the median of finished reference runs.
+
+    The reference runs are histories stored as pickled dictionaries like from :obj:`ks.callbacks.History` , for
+    example of other trials in a hyperparameter search. After each epoch with a value of the monitored metric, the best
+    value so far is compared to the median of the best values of the references after the same number of values.
+    Histories that can not be read, since they are still written, are skipped.
+    """
+
+    def __init__(self, history_file_pattern: str, monitor: str = "val_loss", mode: str = "min", min_epochs: int = 1,
+                 min_histories: int = 2, verbose: int = 0):
+        """Initialize class.
+
+        Args:
+            history_file_pattern (str): Glob pattern of the file paths of the reference histories.
+            monitor (str): Name of the metric to compare. Default is "val_loss".
+            mode (str): Whether lower ("min") or higher ("max") values are better. Default is "min".
+            min_epochs (int): Number of values of the monitored metric before stopping is possible. Default is 1.
+            min_histories (int): Minimum number of references to compare to. Default is 2.
+            verbose (int): Verbosity. Default is 0.
+        """
+        super(MedianStoppingCallback, self).__init__()
+        if mode not in ["min", "max"]:
+            raise ValueError("Unknown mode '%s' for `MedianStoppingCallback` ." % mode)
+        self.history_file_pattern = history_file_pattern
+        self.monitor = monitor
+        self.mode = mode
+        self.min_epochs = min_epochs
+        self.min_histories = min_histories
+        self.verbose = verbose
+        self.stopped_epoch = None
+        self._values = []
+        self._references = {}
+
+    def _best(self, values):
+        return np.amin(values) if self.mode == "min" else np.amax(values)
+
+    def _load_references(self):
+        for file_path in glob.glob(self.history_file_pattern):
+            if file_path in self._references:
+                continue
+            try:
+                with open(file_path, "rb") as f:
+                    history = pickle.load(f)
+            except (EOFError, pickle.UnpicklingError):
+                continue
+            if self.monitor in history:
+                self._references[file_path] = history[self.monitor]
+
+    def on_train_begin(self, logs=None):
+        self.stopped_epoch = None
+        self._values = []
+
+    def on_epoch_end(self, epoch, logs=None):
+        """Compare the monitored metric to the references on epoch end.
+
+        Args:
+            epoch (int): Number of current epoch.
+            logs (dict): Dictionary of the logs.
+
+        Returns:
+            None.
+        """
+        logs = logs or {}
+        if self.monitor not in logs:
+            return
+        self._values.append(float(logs[self.monitor]))
+        if len(self._values) < self.min_epochs:
+            return
+        self._load_references()
+        num_values = len(self._values)
+        references = [self._best(x[:num_values]) for x in self._references.values() if len(x) >= num_values]
+        if len(references) < self.min_histories:
+            return
+        median = float(np.median(references))
+        best = float(self._best(self._values))
+        if (best > median and self.mode == "min") or (best < median and self.mode == "max"):
+            self.stopped_epoch = epoch
+            self.model.stop_training = True
+            if self.verbose > 0:
+                print("\nEpoch %05d: Stopping, since best '%s' of %s is worse than median %s of %s runs.\n" % (
+                    epoch + 1, self.monitor, best, median, len(references)))
+
+    def get_config(self):
+        """Get config for this class."""
+        config = {"history_file_pattern": self.history_file_pattern, "monitor": self.monitor, "mode": self.mode,
+                  "min_epochs": self.min_epochs, "min_histories": self.min_histories, "verbose": self.verbose}
+        return config
+
+    @classmethod
+    def from_config(cls, config):
+        """Make class instance from config."""
+        return cls(**config)
+
+
+class ProfilingCallback(ks.callbacks.Callback):
+    r"""Callback recording data wait and compute time of training steps, throughput and peak host memory.
+
+    The compute time of a step is the time of the train function of the model, which includes converting the logs.
+    Data wait is the time between two steps, in which the model waits for the next batch. Note that for the
+    `tensorflow` backend, the next element of a :obj:`tf.data.Dataset` is fetched within the train function, so that
+    its time is part of the step time. Graphs, nodes and edges per second are computed from the given size of one
+    epoch, e.g. of the training set. Validation is timed separately.
+
+    With `layer_timing` , the :obj:`call` of each layer of the model is wrapped to measure its time in the training
+    steps. This is only meaningful if the model runs eagerly, i.e. compiled with `run_eagerly=True` , and with
+    asynchronous execution on accelerators, times of layers are the times to dispatch the operations.
+
+    The records are added to a :obj:`kgcnn.training.profiler.TrainingProfiler` , which is saved at the end of the
+    training if `file_path` is given.
+    """
+
+    def __init__(self, profiler: TrainingProfiler = None, file_path: str = None, num_graphs: int = None,
+                 num_nodes: int = None, num_edges: int = None, layer_timing: bool = False,
+                 record_steps: bool = True, verbose: int = 0):
+        """Initialize class.
+
+        Args:
+            profiler (TrainingProfiler): Profiler to add records to. Default is None, which creates a new profiler.
+            file_path (str): File path of a '.json' or '.csv' trace to write on train end. Default is None.
+            num_graphs (int): Number of graphs in one epoch. Default is None.
+            num_nodes (int): Number of nodes in one epoch. Default is None.
+            num_edges (int): Number of edges in one epoch. Default is None.
+            layer_timing (bool): Whether to measure the time of each layer in eager mode. Default is False.
+            record_steps (bool): Whether to keep the times of every single step in the trace. Default is True.
+            verbose (int): Verbosity. Default is 0.
+        """
+        super(ProfilingCallback, self).__init__()
+        self.profiler = profiler if profiler is not None else TrainingProfiler()
+        self.file_path = file_path
+        self.num_graphs = num_graphs
+        self.num_nodes = num_nodes
+        self.num_edges = num_edges
+        self.layer_timing = layer_timing
+        self.record_steps = record_steps
+        self.verbose = verbose
+        self._wrapped_layers = []
+        self._in_train_step = False
+        self._reset_epoch()
+
+    def _reset_epoch(self):
+        self._step_times = []
+        self._data_wait_times = []
+        self._validation_time = 0.0
+        self._epoch_start = time.perf_counter()
+        self._last_time = self._epoch_start
+        self._test_start = None
+
+    def _wrap_layer(self, layer):
+        call = layer.call
+
+        @functools.wraps(call)
+        def timed_call(*args, **kwargs):
+            if not self._in_train_step:
+                return call(*args, **kwargs)
+            start = time.perf_counter()
+            out = call(*args, **kwargs)
+            self.profiler.add_layer_time(layer.name, time.perf_counter() - start)
+            return out
+
+        layer.call = timed_call
+        self._wrapped_layers.append(layer)
+
+    def on_train_begin(self, logs=None):
+        if not self.layer_timing:
+            return
+        if not self.model.run_eagerly and ks.backend.backend() != "torch":
+            module_logger.warning("Layer timing of `ProfilingCallback` requires a model with `run_eagerly=True` .")
+            return
+        for layer in self.model.layers:
+            self._wrap_layer(layer)
+
+    def on_train_end(self, logs=None):
+        for layer in self._wrapped_layers:
+            del layer.call
+        self._wrapped_layers = []
+        if self.file_path is not None:
+            self.profiler.save(self.file_path)
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._reset_epoch()
+
+    def on_train_batch_begin(self, batch, logs=None):
+        now = time.perf_counter()
+        self._data_wait_times.append(now - self._last_time)
+        self._last_time = now
+        self._in_train_step = True
+
+    def on_train_batch_end(self, batch, logs=None):
+        now = time.perf_counter()
+        self._in_train_step = False
+        self._step_times.append(now - self._last_time)
+        self._last_time = now
+
+    def on_test_begin(self, logs=None):
+        self._test_start = time.perf_counter()
+
+    def on_test_end(self, logs=None):
+        if self._test_start is not None:
+            self._validation_time += time.perf_counter() - self._test_start
+            self._test_start = None
+
+    def on_epoch_end(self, epoch, logs=None):
+        """Add the record of the epoch to the profiler.
+
+        Args:
+            epoch (int): Number of current epoch.
+            logs (dict): Dictionary of the logs.
+
+        Returns:
+            None.
+        """
+        record = self.profiler.add_epoch(
+            epoch, step_times=self._step_times, data_wait_times=self._data_wait_times,
+            epoch_time=time.perf_counter() - self._epoch_start, validation_time=self._validation_time,
+            num_graphs=self.num_graphs, num_nodes=self.num_nodes, num_edges=self.num_edges,
+            record_steps=self.record_steps)
+        if self.verbose > 0:
+            print("\nEpoch %05d: Data wait %.3f s, steps %.3f s, validation %.3f s, %s graphs/s.\n" % (
+                epoch + 1, record["data_wait_time"], record["step_time"], record["validation_time"],
+                "%.1f" % record["graphs_per_second"] if record["graphs_per_second"] is not None else "-"))
+
+    def get_config(self):
+        """Get config for this class."""
+        config = {"file_path": self.file_path, "num_graphs": self.num_graphs, "num_nodes": self.num_nodes,
+                  "num_edges": self.num_edges, "layer_timing": self.layer_timing, "record_steps": self.record_steps,
+                  "verbose": self.verbose}
+        return config
+
+    @classmethod
+    def from_config(cls, config):
+        """Make class instance from config."""
+        return cls(**config)
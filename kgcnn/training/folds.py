@@ -0,0 +1,116 @@
+import os
+import sys
+import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Union
+
+# Module logger
+logging.basicConfig()
+module_logger = logging.getLogger(__name__)
+module_logger.setLevel(logging.INFO)
+
+
+def thread_limit_environment(num_threads: int, environment: dict = None) -> dict:
+    r"""Environment variables that limit the thread pools of numpy and the backends in a new process.
+
+    The variables must be set before the backend is imported in the process, which is the case for a new process
+    that is started with the returned environment. Covers OpenMP, MKL and OpenBLAS, which are used by numpy and
+    `torch` , the intra- and inter-op thread pools of `tensorflow` and, for a single thread, the multithreaded Eigen
+    operations of the `jax` CPU client.
+
+    Args:
+        num_threads (int): Number of threads per process.
+        environment (dict): Environment to update. Default is None, which takes a copy of `os.environ` .
+
+    Returns:
+        dict: Environment variables for the new process.
+    """
+    environment = dict(os.environ) if environment is None else dict(environment)
+    num_threads = str(max(int(num_threads), 1))
+    for name in ["OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "TF_NUM_INTRAOP_THREADS",
+                 "TF_NUM_INTEROP_THREADS"]:
+        environment[name] = num_threads
+    if num_threads == "1":
+        # The CPU client of jax has no option for the number of threads, but can disable the Eigen thread pool.
+        xla_flags = environment.get("XLA_FLAGS", "")
+        if "--xla_cpu_multi_thread_eigen" not in xla_flags:
+            environment["XLA_FLAGS"] = (xla_flags + " --xla_cpu_multi_thread_eigen=false").strip()
+    return environment
+
+
+def make_fold_command(script: str, args: dict, **kwargs) -> List[str]:
+    r"""Command line to run a training script with the parsed arguments of the current run.
+
+    Arguments with value `None` are omitted, lists are passed with `nargs` and `kwargs` replace the parsed
+    arguments.
+
+    Args:
+        script (str): File path of the training script.
+        args (dict): Parsed command line arguments, e.g. `vars(parser.parse_args())` .
+        kwargs: Arguments to replace in `args` .
+
+    Returns:
+        list: Command to pass to :obj:`subprocess.run` .
+    """
+    args = dict(args)
+    args.update(kwargs)
+    command = [sys.executable, os.path.abspath(script)]
+    for key, value in args.items():
+        if value is None:
+            continue
+        command.append("--%s" % key)
+        command += [str(x) for x in value] if isinstance(value, (list, tuple)) else [str(value)]
+    return command
+
+
+def run_folds_in_processes(commands: Dict[int, List[str]],
+                           num_workers: int,
+                           threads_per_worker: int = None,
+                           log_file_path: str = None,
+                           gpu: Union[list, None] = None) -> Dict[int, int]:
+    r"""Run the commands for each fold concurrently in separate processes.
+
+    At most `num_workers` processes run at the same time, each with limited threads by
+    :obj:`thread_limit_environment` . The output of each process is written to a log file, since the output of
+    concurrent training runs can not be read otherwise. If GPUs are given, processes are assigned to them in turn via
+    the `--gpu` argument of the command.
+
+    Args:
+        commands (dict): Commands to run for each fold index, e.g. from :obj:`make_fold_command` .
+        num_workers (int): Maximum number of concurrent processes.
+        threads_per_worker (int): Number of threads per process. Default is None, which divides the number of CPUs
+            by `num_workers` .
+        log_file_path (str): File path for the output of each fold. The string "(i)" is replaced by the fold index.
+            Default is None, which does not keep the output.
+        gpu (list): GPU indices to distribute the processes on. Default is None.
+
+    Returns:
+        dict: Return code of the process of each fold.
+    """
+    num_workers = max(min(int(num_workers), len(commands)), 1)
+    if threads_per_worker is None:
+        threads_per_worker = max((os.cpu_count() or 1) // num_workers, 1)
+    environment = thread_limit_environment(threads_per_worker)
+
+    def run_fold(position: int, fold: int):
+        command = list(commands[fold])
+        if gpu:
+            command += ["--gpu", str(gpu[position % len(gpu)])]
+        module_logger.info("Starting fold %s with %s threads." % (fold, threads_per_worker))
+        if log_file_path is not None:
+            with open(str(log_file_path).replace("(i)", str(fold)), "w") as log_file:
+                result = subprocess.run(command, env=environment, stdout=log_file, stderr=subprocess.STDOUT)
+        else:
+            result = subprocess.run(command, env=environment, stdout=subprocess.DEVNULL)
+        module_logger.info("Finished fold %s with return code %s." % (fold, result.returncode))
+        return result.returncode
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        futures = {fold: executor.submit(run_fold, i, fold) for i, fold in enumerate(commands.keys())}
+        return_codes = {fold: future.result() for fold, future in futures.items()}
+
+    failed = [fold for fold, code in return_codes.items() if code != 0]
+    if failed:
+        raise RuntimeError("Training of folds %s failed. See '%s' for the output." % (failed, log_file_path))
+    return return_codes
@@ -268,6 +268,37 @@ class HyperParameter:
         os.makedirs(filepath, exist_ok=True)
         return filepath
 
+    def copy(self, updates: dict = None):
+        r"""Make a deep copy of the hyperparameter and optionally update values in the copy.
+
+        Values are set by a path of keys separated by a dot, like `"model.config.depth"` , in which integer keys
+        index lists.
+
+        .. code-block:: python
+
+            hyper_trial = hyper.copy({"model.config.depth": 3, "training.fit.batch_size": 64})
+
+        Args:
+            updates (dict): Dictionary of key paths and their new values. Default is None.
+
+        Returns:
+            HyperParameter: Copy of hyperparameter.
+        """
+        hyper = deepcopy(self._hyper)
+        for key_path, value in (updates if updates is not None else {}).items():
+            keys = str(key_path).split(".")
+            section = hyper
+            for key in keys[:-1]:
+                section = section[int(key)] if isinstance(section, list) else section.setdefault(key, {})
+            if isinstance(section, list):
+                section[int(keys[-1])] = value
+            else:
+                section[keys[-1]] = value
+        return HyperParameter(
+            hyper, hyper_category=self._hyper_category, model_name=self._model_name, model_module=self._model_module,
+            model_class=self._model_class, dataset_name=self._dataset_name, dataset_class=self._dataset_class,
+            dataset_module=self._dataset_module)
+
     def save(self, file_path: str):
         """Save the hyperparameter to path.
 
@@ -0,0 +1,226 @@
+import os
+import sys
+import csv
+import json
+import time
+import numpy as np
+from contextlib import contextmanager
+from typing import Union
+
+
+def peak_host_memory() -> Union[float, None]:
+    r"""Peak resident set size of the current process in MB. Returns None, if not available on the platform."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes but macOS bytes.
+    return peak / 1024.0 ** 2 if sys.platform == "darwin" else peak / 1024.0
+
+
+class TrainingProfiler:
+    r"""Collects wall times of stages, training steps, epochs and layers and writes them to a JSON or CSV trace.
+
+    The profiler can be used as a context manager, which measures the total time and saves the trace on exit.
+    Arbitrary code blocks are timed with :obj:`stage` , steps and epochs of :obj:`model.fit` are recorded by
+    :obj:`kgcnn.training.callbacks.ProfilingCallback` .
+
+    .. code-block:: python
+
+        from kgcnn.training.profiler import TrainingProfiler
+        from kgcnn.training.callbacks import ProfilingCallback
+
+        with TrainingProfiler("profile.json") as profiler:
+            with profiler.stage("tensor"):
+                x_train = dataset.tensor(inputs)
+            model.fit(x_train, y_train, callbacks=[ProfilingCallback(profiler, num_graphs=len(dataset))])
+
+    The JSON trace contains all records and a summary. The CSV trace has one row for each epoch.
+    """
+
+    def __init__(self, file_path: str = None):
+        """Initialize class.
+
+        Args:
+            file_path (str): File path of the trace to write on exit of the context. Must end with '.json' or '.csv'.
+                Default is None.
+        """
+        self.file_path = file_path
+        self.stages = {}
+        self.epochs = []
+        self.layers = {}
+        self.total_time = None
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.total_time = time.perf_counter() - self._start
+        if self.file_path is not None:
+            self.save(self.file_path)
+        return False
+
+    @contextmanager
+    def stage(self, name: str):
+        """Context to add the wall time of the enclosed code to the stage `name` ."""
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add_stage_time(name, time.perf_counter() - start)
+
+    def add_stage_time(self, name: str, duration: float):
+        """Add a measured time to a stage.
+
+        Args:
+            name (str): Name of the stage.
+            duration (float): Time in seconds.
+
+        Returns:
+            None.
+        """
+        record = self.stages.setdefault(name, {"calls": 0, "time": 0.0})
+        record["calls"] += 1
+        record["time"] += float(duration)
+
+    def add_layer_time(self, name: str, duration: float):
+        """Add a measured time of a call of a layer.
+
+        Args:
+            name (str): Name of the layer.
+            duration (float): Time in seconds.
+
+        Returns:
+            None.
+        """
+        record = self.layers.setdefault(name, {"calls": 0, "time": 0.0})
+        record["calls"] += 1
+        record["time"] += float(duration)
+
+    def add_epoch(self, epoch: int, step_times: list, data_wait_times: list, epoch_time: float,
+                  validation_time: float = 0.0, num_graphs: int = None, num_nodes: int = None,
+                  num_edges: int = None, record_steps: bool = True):
+        r"""Add the record of a training epoch.
+
+        Throughput is computed from the number of graphs, nodes and edges of one epoch divided by the training time,
+        which is the sum of data wait and step time without validation.
+
+        Args:
+            epoch (int): Index of the epoch.
+            step_times (list): Compute time of every training step in seconds.
+            data_wait_times (list): Time waited for data before every training step in seconds.
+            epoch_time (float): Wall time of the complete epoch including validation.
+            validation_time (float): Wall time of validation. Default is 0.0.
+            num_graphs (int): Number of graphs in one epoch. Default is None.
+            num_nodes (int): Number of nodes in one epoch. Default is None.
+            num_edges (int): Number of edges in one epoch. Default is None.
+            record_steps (bool): Whether to keep the times of the single steps in the record. Default is True.
+
+        Returns:
+            dict: Record of the epoch.
+        """
+        train_time = float(np.sum(step_times) + np.sum(data_wait_times))
+        record = {
+            "epoch": int(epoch),
+            "steps": len(step_times),
+            "epoch_time": float(epoch_time),
+            "train_time": train_time,
+            "validation_time": float(validation_time),
+            "data_wait_time": float(np.sum(data_wait_times)),
+            "step_time": float(np.sum(step_times)),
+            "mean_step_time": float(np.mean(step_times)) if len(step_times) > 0 else None,
+            "max_step_time": float(np.amax(step_times)) if len(step_times) > 0 else None,
+        }
+        for name, num in [("graphs", num_graphs), ("nodes", num_nodes), ("edges", num_edges)]:
+            record["%s_per_second" % name] = float(num) / train_time if num is not None and train_time > 0 else None
+        record["peak_memory_mb"] = peak_host_memory()
+        if record_steps:
+            record["step_times"] = [float(x) for x in step_times]
+            record["data_wait_times"] = [float(x) for x in data_wait_times]
+        self.epochs.append(record)
+        return record
+
+    def summary(self) -> dict:
+        r"""Aggregate the records to mean values over epochs and totals of stages and layers.
+
+        Returns:
+            dict: Summary of the profile.
+        """
+        out = {"total_time": self.total_time, "epochs": len(self.epochs), "peak_memory_mb": peak_host_memory()}
+        for key in ["epoch_time", "train_time", "validation_time", "data_wait_time", "step_time", "mean_step_time",
+                    "graphs_per_second", "nodes_per_second", "edges_per_second"]:
+            values = [x[key] for x in self.epochs if x.get(key) is not None]
+            out[key] = float(np.mean(values)) if len(values) > 0 else None
+        out["stages"] = {key: value["time"] for key, value in self.stages.items()}
+        out["layers"] = {key: value["time"] for key, value in self.layers.items()}
+        return out
+
+    def get_trace(self) -> dict:
+        """Get all records and the summary as dictionary."""
+        return {"summary": self.summary(), "stages": self.stages, "layers": self.layers, "epochs": self.epochs}
+
+    def save(self, file_path: str):
+        r"""Save trace to a '.json' file with all records or to a '.csv' file with one row for each epoch.
+
+        Args:
+            file_path (str): File path to save to.
+
+        Returns:
+            None.
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension == ".json":
+            with open(file_path, "w") as f:
+                json.dump(self.get_trace(), f, indent=2)
+        elif extension == ".csv":
+            columns = [key for key in self.epochs[0] if key not in ["step_times", "data_wait_times"]] if len(
+                self.epochs) > 0 else ["epoch"]
+            with open(file_path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(self.epochs)
+        else:
+            raise ValueError("Unknown file type '%s' for trace of `TrainingProfiler` ." % extension)
+
+
+def load_profile(file_path: str) -> dict:
+    r"""Load a trace written by :obj:`TrainingProfiler` . The records of a '.csv' trace are returned as 'epochs' .
+
+    Args:
+        file_path (str): File path of the '.json' or '.csv' trace.
+
+    Returns:
+        dict: Trace with at least the key 'epochs' .
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".json":
+        with open(file_path, "r") as f:
+            return json.load(f)
+    if extension == ".csv":
+        with open(file_path, "r", newline="") as f:
+            rows = list(csv.DictReader(f))
+        epochs = [{key: float(value) if value not in ["", None] else None for key, value in row.items()}
+                  for row in rows]
+        return {"epochs": epochs}
+    raise ValueError("Unknown file type '%s' for trace of `TrainingProfiler` ." % extension)
+
+
+def count_graph_sizes(dataset, node_key: str = "node_attributes", edge_key: str = "edge_indices") -> dict:
+    r"""Count graphs, nodes and edges of a dataset to pass to :obj:`kgcnn.training.callbacks.ProfilingCallback` .
+
+    Args:
+        dataset (MemoryGraphList): List of graphs.
+        node_key (str): Name of a node property to count nodes. Default is "node_attributes".
+        edge_key (str): Name of an edge property to count edges. Default is "edge_indices".
+
+    Returns:
+        dict: Number of graphs, nodes and edges. Counts are None if the property is not available.
+    """
+    out = {"num_graphs": len(dataset)}
+    for name, key in [("num_nodes", node_key), ("num_edges", edge_key)]:
+        values = dataset.obtain_property(key)
+        out[name] = int(sum([len(x) for x in values if x is not None])) if values is not None else None
+    return out
@@ -0,0 +1,406 @@
+import os
+import math
+import shutil
+import logging
+import itertools
+import multiprocessing
+import numpy as np
+import pandas as pd
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from typing import Union, List
+from kgcnn.training.hyper import HyperParameter
+from kgcnn.training.folds import thread_limit_environment
+from kgcnn.training.history import save_history_score
+from kgcnn.training.callbacks import MedianStoppingCallback
+from kgcnn.io.file import GraphListMemoryMapFile
+from kgcnn.data.utils import save_pickle_file, save_json_file
+
+# Module logger
+logging.basicConfig()
+module_logger = logging.getLogger(__name__)
+module_logger.setLevel(logging.INFO)
+
+# Memory-mapped datasets, which have been opened by this process. Worker processes of a sweep keep the dataset
+# between trials.
+_dataset_cache = {}
+
+
+def _load_dataset_file(file_path: str):
+    if file_path not in _dataset_cache:
+        from kgcnn.data.base import MemoryGraphDataset
+        _dataset_cache[file_path] = GraphListMemoryMapFile(file_path).read(MemoryGraphDataset())
+    return _dataset_cache[file_path]
+
+
+@contextmanager
+def _environment(environment: dict):
+    previous = dict(os.environ)
+    os.environ.update(environment)
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(previous)
+
+
+def train_trial(hyper: HyperParameter,
+                dataset,
+                splits: list,
+                trial_path: str,
+                epochs: int,
+                initial_epoch: int = 0,
+                early_stopping: dict = None) -> dict:
+    r"""Train a trial of a sweep on graph labels, like `training/train_graph.py` , for the given splits.
+
+    For `initial_epoch` larger than zero, the weights of the previous call are loaded from `trial_path` and
+    training is continued. The weights after training are saved to `trial_path` .
+
+    Args:
+        hyper (HyperParameter): Hyperparameter of the trial.
+        dataset (MemoryGraphList, str): Cleaned dataset with selected labels or file path of a
+            :obj:`GraphListMemoryMapFile` .
+        splits (list): List of tuples of split index, train and test indices.
+        trial_path (str): Directory for the weights of the trial.
+        epochs (int): Epoch to train until.
+        initial_epoch (int): Epoch to start training at. Default is 0.
+        early_stopping (dict): Kwargs of :obj:`MedianStoppingCallback` , in which `history_file_pattern` has "(i)"
+            for the split index. Histories of each split are written to this pattern. Default is None.
+
+    Returns:
+        dict: Histories of each split and whether training was stopped early.
+    """
+    from kgcnn.models.serial import deserialize as deserialize_model
+    from kgcnn.data.transform.scaler.serial import deserialize as deserialize_scaler
+    from kgcnn.metrics.metrics import ScaledMeanAbsoluteError, ScaledRootMeanSquaredError
+
+    if isinstance(dataset, str):
+        dataset = _load_dataset_file(dataset)
+    os.makedirs(trial_path, exist_ok=True)
+    histories, stopped = [], False
+    for current_split, train_index, test_index in splits:
+        dataset_train, dataset_test = dataset[train_index], dataset[test_index]
+        model = deserialize_model(hyper["model"])
+
+        scaled_metrics = None
+        if "scaler" in hyper["training"]:
+            scaler = deserialize_scaler(hyper["training"]["scaler"])
+            scaler.fit_dataset(dataset_train)
+            if hasattr(model, "set_scale"):
+                model.set_scale(scaler)
+            else:
+                dataset_train = scaler.transform_dataset(dataset_train, copy_dataset=True, copy=True)
+                dataset_test = scaler.transform_dataset(dataset_test, copy_dataset=True, copy=True)
+                scaler_scale = scaler.get_scaling()
+                mae_metric = ScaledMeanAbsoluteError(scaler_scale.shape, name="scaled_mean_absolute_error")
+                rms_metric = ScaledRootMeanSquaredError(scaler_scale.shape, name="scaled_root_mean_squared_error")
+                if scaler_scale is not None:
+                    mae_metric.set_scale(scaler_scale)
+                    rms_metric.set_scale(scaler_scale)
+                scaled_metrics = [mae_metric, rms_metric]
+
+        x_train = dataset_train.tensor(hyper["model"]["config"]["inputs"], make_copy=False)
+        y_train = np.array(dataset_train.get("graph_labels"))
+        x_test = dataset_test.tensor(hyper["model"]["config"]["inputs"], make_copy=False)
+        y_test = np.array(dataset_test.get("graph_labels"))
+
+        model.compile(**hyper.compile(metrics=scaled_metrics))
+        weights_path = os.path.join(trial_path, "model_fold_%s.weights.h5" % current_split)
+        if initial_epoch > 0:
+            model.load_weights(weights_path)
+
+        fit_kwargs = hyper.fit()
+        fit_kwargs.update({"epochs": epochs, "initial_epoch": initial_epoch})
+        callback = None
+        if early_stopping is not None:
+            callback_kwargs = {key: value for key, value in early_stopping.items() if key != "history_file_pattern"}
+            history_file_pattern = early_stopping["history_file_pattern"].replace("(i)", str(current_split))
+            callback = MedianStoppingCallback(history_file_pattern.replace("(k)", "*"), **callback_kwargs)
+            fit_kwargs["callbacks"] = (fit_kwargs["callbacks"] if fit_kwargs["callbacks"] else []) + [callback]
+        hist = model.fit(x_train, y_train, validation_data=(x_test, y_test), **fit_kwargs)
+        model.save_weights(weights_path)
+        histories.append(hist.history)
+
+        if callback is not None:
+            save_pickle_file(hist.history, history_file_pattern.replace("(k)", os.path.basename(trial_path)))
+            # A trial, that is stopped in a split, is not trained on further splits.
+            if callback.stopped_epoch is not None and callback.stopped_epoch < epochs - 1:
+                stopped = True
+                break
+    return {"histories": histories, "stopped": stopped}
+
+
+class HyperParameterSweep:
+    r"""Search of hyperparameter for training on graph labels, based on a :obj:`HyperParameter` of a training script.
+
+    Trials are made from a base hyperparameter and a search space, which maps a path of keys in the hyperparameter,
+    as in :obj:`HyperParameter.copy` , to either a list of values or to a range given by a dictionary with "low", "high"
+    and optionally "log" and "dtype" keys. Ranges can only be sampled randomly.
+    Supported methods are "grid", which runs every combination of the lists, "random", which samples `num_trials`
+    trials, and "successive_halving". The latter trains the sampled trials for `min_epochs` , keeps the best fraction
+    of `1/reduction_factor` of the trials and continues their training for `reduction_factor` times as many epochs,
+    until the epochs of the hyperparameter are reached.
+
+    The dataset is loaded, cleaned and the labels are selected once from the dataset section of the hyperparameter,
+    which therefore must not be in the search space. With multiple workers, the trials are trained in a pool of
+    processes, which share the dataset read-only via a :obj:`GraphListMemoryMapFile` . Trials are stopped early by
+    :obj:`MedianStoppingCallback` , if they are worse than the median of the finished trials of the same round.
+
+    Each trial writes a score file into its own folder next to the results of the training scripts, e.g.
+    `results/ESOLDataset/GIN_trial_0` , so that trials are listed by `training/results/summary.py` .
+    A table of all trials is written to `results/ESOLDataset/GIN_sweep/sweep_summary.csv` and as markdown.
+
+    .. code-block:: python
+
+        from kgcnn.training.hyper import HyperParameter
+        from kgcnn.training.sweep import HyperParameterSweep
+
+        hyper = HyperParameter("hyper/hyper_esol.py", hyper_category="GIN")
+        sweep = HyperParameterSweep(hyper, search_space={
+            "model.config.depth": [3, 4, 5],
+            "training.compile.optimizer.config.learning_rate": {"low": 1e-4, "high": 1e-2, "log": True}},
+            method="successive_halving", num_trials=9, min_epochs=20)
+        summary = sweep.run(num_workers=3)
+    """
+
+    _methods = ["grid", "random", "successive_halving"]
+
+    def __init__(self,
+                 hyper: HyperParameter,
+                 search_space: dict,
+                 method: str = "grid",
+                 num_trials: int = None,
+                 folds: Union[list, None] = None,
+                 monitor: str = "val_loss",
+                 mode: str = "min",
+                 min_epochs: int = 1,
+                 reduction_factor: int = 3,
+                 early_stopping: bool = True,
+                 early_stopping_min_epochs: int = 1,
+                 seed: int = 42):
+        r"""Initialize sweep.
+
+        Args:
+            hyper (HyperParameter): Base hyperparameter of the trials.
+            search_space (dict): Dictionary of key paths and a list of values or a range to sample from.
+            method (str): Search method "grid", "random" or "successive_halving". Default is "grid".
+            num_trials (int): Number of trials for random sampling. Default is None, which runs all combinations of
+                the search space, if it only has lists of values. If the search space only has lists of values,
+                distinct combinations are sampled and the number of trials is at most the number of combinations.
+            folds (list): Indices of the cross-validation splits to train each trial on. Default is None, which is
+                the first split.
+            monitor (str): Metric of the history to rank trials. Default is "val_loss".
+            mode (str): Whether lower ("min") or higher ("max") values of the metric are better. Default is "min".
+            min_epochs (int): Epochs of the first round of successive halving. Default is 1.
+            reduction_factor (int): Factor to reduce trials and increase epochs for successive halving. Default is 3.
+            early_stopping (bool): Whether to stop trials that are worse than the median. Default is True.
+            early_stopping_min_epochs (int): Number of values of the metric before stopping is possible.
+                Default is 1.
+            seed (int): Seed for random sampling of trials. Default is 42.
+        """
+        if method not in self._methods:
+            raise ValueError("Unknown sweep method '%s'. Choose one of %s." % (method, self._methods))
+        if mode not in ["min", "max"]:
+            raise ValueError("Unknown mode '%s' to rank trials." % mode)
+        for key in search_space.keys():
+            if key.split(".")[0] in ["dataset", "data"]:
+                raise ValueError("Dataset is loaded once for all trials and can not be in search space '%s'." % key)
+        self.hyper = hyper
+        self.search_space = search_space
+        self.method = method
+        self.num_trials = num_trials
+        self.folds = folds if folds is not None else [0]
+        self.monitor = monitor
+        self.mode = mode
+        self.min_epochs = min_epochs
+        self.reduction_factor = reduction_factor
+        self.early_stopping = early_stopping
+        self.early_stopping_min_epochs = early_stopping_min_epochs
+        self.seed = seed
+
+    def make_trials(self) -> List[dict]:
+        r"""Make the parameters of the trials from the search space.
+
+        Returns:
+            list: List of dictionaries of key paths and values for each trial.
+        """
+        keys = list(self.search_space.keys())
+        is_grid = all([isinstance(x, (list, tuple)) for x in self.search_space.values()])
+        if self.method == "grid" or (self.num_trials is None and is_grid):
+            if not is_grid:
+                raise ValueError("Grid search requires a list of values for every key in search space.")
+            return [dict(zip(keys, values)) for values in itertools.product(*self.search_space.values())]
+        if self.num_trials is None:
+            raise ValueError("Random sampling of search space requires `num_trials` .")
+        rng = np.random.default_rng(self.seed)
+        if is_grid:
+            # Sample distinct combinations of the lists of values, which are at most all combinations.
+            grid_shape = [len(x) for x in self.search_space.values()]
+            num_combinations = int(np.prod(grid_shape))
+            if self.num_trials > num_combinations:
+                module_logger.warning("Search space has only %s combinations for %s trials." % (
+                    num_combinations, self.num_trials))
+            choice = rng.choice(num_combinations, size=min(self.num_trials, num_combinations), replace=False)
+            return [{key: space[int(i)] for (key, space), i in zip(self.search_space.items(), index)}
+                    for index in zip(*np.unravel_index(choice, grid_shape))]
+        trials = []
+        for _ in range(self.num_trials):
+            params = {}
+            for key, space in self.search_space.items():
+                if isinstance(space, (list, tuple)):
+                    params[key] = space[int(rng.integers(0, len(space)))]
+                    continue
+                low, high = float(space["low"]), float(space["high"])
+                if "log" in space and space["log"]:
+                    value = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+                else:
+                    value = float(rng.uniform(low, high))
+                params[key] = int(round(value)) if "dtype" in space and space["dtype"] == "int" else value
+            trials.append(params)
+        return trials
+
+    def _score(self, histories: list):
+        best = np.amin if self.mode == "min" else np.amax
+        values = [best(x[self.monitor]) for x in histories if self.monitor in x and len(x[self.monitor]) > 0]
+        if len(values) == 0:
+            return math.inf if self.mode == "min" else -math.inf
+        return float(np.mean(values))
+
+    def _rounds(self, max_epochs: int):
+        if self.method != "successive_halving":
+            return [max_epochs]
+        rounds, epochs = [], self.min_epochs
+        while epochs < max_epochs:
+            rounds.append(epochs)
+            epochs = epochs * self.reduction_factor
+        return rounds + [max_epochs]
+
+    def run(self, num_workers: int = 1, threads_per_worker: int = None, results_path: str = "results"):
+        r"""Run the sweep.
+
+        Args:
+            num_workers (int): Number of trials trained concurrently in separate processes. Default is 1, which
+                trains the trials in this process.
+            threads_per_worker (int): Number of threads for each process. Default is None, which divides the number
+                of CPUs by `num_workers` .
+            results_path (str): Directory for results. Default is "results".
+
+        Returns:
+            pd.DataFrame: Summary of the trials ordered by rank.
+        """
+        from kgcnn.data.serial import deserialize as deserialize_dataset
+
+        hyper = self.hyper
+        postfix = str(hyper["info"]["postfix"]) if "postfix" in hyper["info"] else ""
+        postfix_file = hyper["info"]["postfix_file"] if "postfix_file" in hyper["info"] else ""
+        category = hyper.hyper_category.replace(".", "_") + postfix
+        dataset_path = os.path.join(results_path, hyper.dataset_class)
+        sweep_path = os.path.join(dataset_path, "%s_sweep" % category)
+        os.makedirs(sweep_path, exist_ok=True)
+
+        dataset = deserialize_dataset(hyper["dataset"])
+        dataset.assert_valid_model_input(hyper["model"]["config"]["inputs"], make_copy=False)
+        dataset.clean(hyper["model"]["config"]["inputs"])
+        label_names, label_units = dataset.set_multi_target_labels(
+            "graph_labels",
+            hyper["training"]["multi_target_indices"] if "multi_target_indices" in hyper["training"] else None,
+            data_unit=hyper["data"]["data_unit"] if "data_unit" in hyper["data"] else None
+        )
+        if "cross_validation" in hyper["training"]:
+            from sklearn.model_selection import KFold
+            splitter = KFold(**hyper["training"]["cross_validation"]["config"])
+            train_test_indices = list(splitter.split(X=np.zeros((len(dataset), 1))))
+        else:
+            train_test_indices = dataset.get_train_test_indices(train="train", test="test")
+        splits = [(i, train_test_indices[i][0], train_test_indices[i][1]) for i in self.folds]
+
+        trials = self.make_trials()
+        trial_hyper = [hyper.copy(params) for params in trials]
+        trial_paths = [os.path.join(sweep_path, "trial_%s" % k) for k in range(len(trials))]
+        save_json_file({"method": self.method, "search_space": self.search_space, "trials": trials,
+                        "folds": self.folds, "monitor": self.monitor, "mode": self.mode},
+                       os.path.join(sweep_path, "sweep.json"))
+
+        if num_workers > 1:
+            dataset_file_path = os.path.join(sweep_path, "dataset_memmap")
+            GraphListMemoryMapFile(dataset_file_path).write(dataset)
+            dataset_input = dataset_file_path
+            if threads_per_worker is None:
+                threads_per_worker = max((os.cpu_count() or 1) // num_workers, 1)
+            executor = ProcessPoolExecutor(max_workers=num_workers, mp_context=multiprocessing.get_context("spawn"))
+            environment = thread_limit_environment(threads_per_worker, environment={})
+        else:
+            dataset_input, executor, environment = dataset, None, {}
+
+        histories = {k: [{} for _ in splits] for k in range(len(trials))}
+        status = {k: "completed" for k in range(len(trials))}
+        active, epochs_done = list(range(len(trials))), 0
+        rounds = self._rounds(hyper.fit()["epochs"])
+        with _environment(environment):
+            for current_round, epochs in enumerate(rounds):
+                module_logger.info("Training %s trials until epoch %s." % (len(active), epochs))
+                early_stopping = None
+                if self.early_stopping:
+                    early_stopping = {
+                        "history_file_pattern": os.path.join(
+                            sweep_path, "round_%s" % current_round, "history_(k)_fold_(i).pickle"),
+                        "monitor": self.monitor, "mode": self.mode, "min_epochs": self.early_stopping_min_epochs}
+                    os.makedirs(os.path.join(sweep_path, "round_%s" % current_round), exist_ok=True)
+                args = [(trial_hyper[k], dataset_input, splits, trial_paths[k], epochs, epochs_done, early_stopping)
+                        for k in active]
+                if executor is not None:
+                    results = list(executor.map(train_trial, *zip(*args)))
+                else:
+                    results = [train_trial(*x) for x in args]
+                for k, result in zip(active, results):
+                    for i, hist in enumerate(result["histories"]):
+                        for key, value in hist.items():
+                            histories[k][i][key] = histories[k][i].get(key, []) + list(value)
+                    if result["stopped"]:
+                        status[k] = "stopped at epoch %s" % max([len(x.get("loss", [])) for x in histories[k]])
+                epochs_done = epochs
+                active = [k for k in active if status[k] == "completed"]
+                if current_round < len(rounds) - 1:
+                    ranked = sorted(active, key=lambda k: self._score(histories[k]), reverse=self.mode == "max")
+                    num_keep = max(len(active) // self.reduction_factor, 1)
+                    for k in ranked[num_keep:]:
+                        status[k] = "eliminated at epoch %s" % epochs
+                    active = [k for k in active if k in ranked[:num_keep]]
+                if len(active) == 0:
+                    break
+        if executor is not None:
+            executor.shutdown()
+            shutil.rmtree(dataset_input)
+
+        rows = []
+        for k, params in enumerate(trials):
+            trial_histories = [x for x in histories[k] if len(x) > 0]
+            if len(trial_histories) == len(splits) and len(set([len(x["loss"]) for x in trial_histories])) == 1:
+                model_name = "%s_trial_%s" % (hyper.model_name, k)
+                trial_result_path = os.path.join(dataset_path, "%s_trial_%s" % (category, k))
+                os.makedirs(trial_result_path, exist_ok=True)
+                save_history_score(
+                    trial_histories, loss_name=None, val_loss_name=None, model_name=model_name,
+                    data_unit=label_units, dataset_name=hyper.dataset_class, model_class=hyper.model_class,
+                    multi_target_indices=hyper["training"]["multi_target_indices"] if "multi_target_indices" in hyper[
+                        "training"] else None,
+                    execute_folds=self.folds, seed=self.seed, filepath=trial_result_path,
+                    file_name=f"score{postfix_file}.yaml")
+                trial_hyper[k].save(os.path.join(trial_result_path, f"{model_name}_hyper{postfix_file}.json"))
+            values = [
+                (np.amin if self.mode == "min" else np.amax)(x[self.monitor]) for x in trial_histories
+                if self.monitor in x and len(x[self.monitor]) > 0]
+            rows.append({"trial": k, "status": status[k],
+                         "epochs": max([len(x.get("loss", [])) for x in trial_histories] + [0]),
+                         self.monitor: float(np.mean(values)) if values else np.nan,
+                         "%s_std" % self.monitor: float(np.std(values)) if values else np.nan, **params})
+
+        summary = pd.DataFrame(rows)
+        summary = summary.sort_values(self.monitor, ascending=self.mode == "min", na_position="last")
+        summary.to_csv(os.path.join(sweep_path, "sweep_summary.csv"), index=False)
+        with open(os.path.join(sweep_path, "sweep_summary.md"), "w") as f:
+            f.write("# Sweep of %s on %s\n\n" % (hyper.model_name, hyper.dataset_class))
+            f.write("Method '%s' ranked by best '%s' on splits %s.\n\n" % (self.method, self.monitor, self.folds))
+            f.write(summary.to_markdown(index=False))
+            f.write("\n")
+        return summary
@@ -28,6 +28,30 @@ def compare_static_shapes(found: Union[tuple, None], expected: Union[tuple, None
     return all(shapes_okay)
 
 
+def make_graphs(num_graphs: int, num_nodes: tuple = (2, 7), node_number: tuple = (1, 6, 8), seed: int = 42) -> list:
+    r"""Make random fully connected molecular graphs for tests.
+
+    Args:
+        num_graphs (int): Number of graphs.
+        num_nodes (tuple): Lowest and highest number of nodes of a graph. Default is (2, 7).
+        node_number (tuple): Atomic numbers to choose from for the nodes. Default is (1, 6, 8).
+        seed (int): Seed of the random generator. Default is 42.
+
+    Returns:
+        list: List of dictionaries with 'node_number', 'node_coordinates', 'edge_indices', 'total_nodes' and
+            'total_edges' of each graph.
+    """
+    rng = np.random.default_rng(seed)
+    graphs = []
+    for n in rng.integers(num_nodes[0], num_nodes[1] + 1, size=num_graphs):
+        receive, send = np.nonzero(1 - np.eye(n))
+        graphs.append({"node_number": rng.choice(node_number, size=n),
+                       "node_coordinates": rng.uniform(0.0, 3.0, size=(n, 3)),
+                       "edge_indices": np.stack([receive, send], axis=-1),
+                       "total_nodes": np.array(n), "total_edges": np.array(len(receive))})
+    return graphs
+
+
 class TestCase(unittest.TestCase):
 
     def __init__(self, *args, **kwargs):
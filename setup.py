@@ -44,7 +44,7 @@ setup(
     extras_require={
         "openbabel": ["openbabel"],
     },
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     include_package_data=True,
     package_data={"kgcnn": ["*.json", "*.yaml", "*.csv", "*.md"]},
     classifiers=[
@@ -0,0 +1,160 @@
+import gc
+import os
+import sys
+import weakref
+import subprocess
+import numpy as np
+from kgcnn.utils.tests import TestCase, make_graphs
+from kgcnn.data.base import MemoryGraphList, MemoryGraphDataset
+
+
+class MemoryGraphListTensorTest(TestCase):
+
+    inputs = [{"shape": (None, 3), "name": "node_coordinates", "dtype": "float32"},
+              {"shape": (None, 2), "name": "edge_indices", "dtype": "int64", "ragged": True}]
+
+    def _make_graphs(self, num_graphs: int = 5):
+        return MemoryGraphList(make_graphs(num_graphs, num_nodes=(1, 5)))
+
+    def test_cache(self):
+        graphs = self._make_graphs()
+        expected = graphs.tensor(self.inputs)
+        cached = graphs.tensor(self.inputs, make_copy=False)
+        self.assertAllClose(cached[0], expected[0])
+        self.assertAllClose(cached[1].flat_values, expected[1].flat_values)
+        self.assertAllClose(cached[1].row_splits, expected[1].row_splits)
+        self.assertEqual(cached[0].dtype, np.float32)
+        again = graphs.tensor(self.inputs, make_copy=False)
+        self.assertTrue(again[0] is cached[0])
+        self.assertTrue(again[1] is cached[1])
+        self.assertFalse(graphs.tensor(self.inputs)[0] is cached[0])
+
+    def test_cache_invalidation(self):
+        graphs = self._make_graphs()
+        cached = graphs.tensor(self.inputs, make_copy=False)
+        graphs[0].set("node_coordinates", np.ones((7, 3)))
+        updated = graphs.tensor(self.inputs, make_copy=False)
+        self.assertFalse(updated[0] is cached[0])
+        self.assertTrue(updated[1] is cached[1])
+        self.assertEqual(updated[0].shape[1], 7)
+        self.assertAllClose(updated[0][0], np.ones((7, 3)))
+
+        graphs.append(self._make_graphs(1)[0])
+        appended = graphs.tensor(self.inputs, make_copy=False)
+        self.assertEqual(appended[0].shape[0], 6)
+        self.assertEqual(int(appended[1].nrows()), 6)
+
+        graphs.clear_tensor_cache()
+        self.assertFalse(graphs.tensor(self.inputs, make_copy=False)[0] is appended[0])
+
+    def test_cache_folds(self):
+        graphs = self._make_graphs(8)
+        inputs = self.inputs + [{"shape": (), "name": "total_nodes", "dtype": "int64"}]
+        flat_values = graphs._flat_values("node_coordinates", "float32")
+        for index in [np.array([0, 3, 5]), [7, 1, 2, 4, 6], slice(2, 6)]:
+            fold = graphs[index]
+            result, expected = fold.tensor(inputs, make_copy=False), fold.tensor(inputs)
+            self.assertAllClose(result[0], expected[0])
+            self.assertAllClose(result[1].flat_values, expected[1].flat_values)
+            self.assertAllClose(result[1].row_splits, expected[1].row_splits)
+            self.assertAllClose(result[2], expected[2])
+            # Each fold slices the arrays that have been concatenated once for all graphs.
+            self.assertTrue(graphs._flat_values("node_coordinates", "float32")[0] is flat_values[0])
+        fold = graphs[[1, 2, 5]][[2, 0]]
+        self.assertTrue(fold._tensor_root()[0] is graphs)
+        self.assertAllClose(fold.tensor(inputs, make_copy=False)[0], fold.tensor(inputs)[0])
+        # Folds of graphs that have been replaced in the list make their tensors again.
+        graphs[5] = self._make_graphs(1)[0]
+        self.assertTrue(fold._tensor_root()[0] is fold)
+        self.assertAllClose(fold.tensor(inputs, make_copy=False)[0], fold.tensor(inputs)[0])
+
+    def test_cache_clean(self):
+        graphs = self._make_graphs(6)
+        graphs[2]["node_number"] = None
+        flat_values = graphs._flat_values("node_coordinates", "float32")
+        graphs.clean(["node_number"])
+        self.assertEqual(len(graphs), 5)
+        # Cached arrays are kept for the remaining graphs.
+        sliced = graphs.__dict__["_flat_cache"][("node_coordinates", "float32")][1]
+        values, row_splits = graphs._flat_values("node_coordinates", "float32")
+        self.assertFalse(values is flat_values[0])
+        self.assertTrue(values is sliced)
+        self.assertAllClose(values, np.concatenate(graphs.get("node_coordinates"), axis=0).astype("float32"))
+        self.assertAllClose(np.diff(row_splits), [len(x) for x in graphs.get("node_coordinates")])
+
+    def test_cache_release(self):
+        graphs = self._make_graphs()
+        cached = graphs.tensor(self.inputs, make_copy=False)
+        references = [weakref.ref(x) for x in cached]
+        del cached
+        gc.collect()
+        # The list does not keep tensors alive that are not used anymore.
+        self.assertTrue(all(x() is None for x in references))
+        again = graphs.tensor(self.inputs, make_copy=False)
+        self.assertAllClose(again[0], graphs.tensor(self.inputs)[0])
+        self.assertTrue(graphs.tensor(self.inputs, make_copy=False)[0] is again[0])
+
+
+class MemoryGraphListCleanTest(TestCase):
+
+    def _make_graphs(self):
+        graphs = MemoryGraphList()
+        graphs.empty(6)
+        graphs.set("node_number", [np.array([1, 2]), np.array([3]), None, np.array([4]), np.array([5]), np.array([7])])
+        graphs.set("edge_indices", [np.array([[0, 1]]), np.zeros((0, 2)), np.array([[0, 0]]), None,
+                                    np.array([[0, 1]]), np.array([[0, 0]])])
+        graphs[4]["node_number"] = [5, 6]  # Not converted to numpy array.
+        return graphs
+
+    def test_clean(self):
+        graphs = self._make_graphs()
+        kept = [graphs[0], graphs[5]]
+        removed = graphs.clean(["node_number", {"name": "edge_indices"}])
+        self.assertAllClose(removed, np.array([4, 3, 2, 1]))
+        self.assertEqual(len(graphs), 2)
+        self.assertTrue(graphs[0] is kept[0] and graphs[1] is kept[1])
+
+    def test_report(self):
+        graphs = self._make_graphs()
+        report = graphs.clean(["node_number", "edge_indices", "graph_labels"], return_report=True)
+        self.assertEqual(report["num_graphs"], 6)
+        self.assertAllClose(report["invalid_graphs"], np.array([1, 2, 3, 4]))
+        self.assertAllClose(report["properties"]["node_number"]["undefined"], np.array([2]))
+        self.assertAllClose(report["properties"]["node_number"]["not_array"], np.array([4]))
+        self.assertAllClose(report["properties"]["edge_indices"]["empty"], np.array([1]))
+        self.assertEqual(report["properties"]["edge_indices"]["ranks"], [2])
+        self.assertFalse(report["properties"]["graph_labels"]["assigned"])
+        self.assertEqual(len(graphs), 2)
+
+    def test_assert_valid_model_input(self):
+        graphs = MemoryGraphDataset()
+        graphs.extend(self._make_graphs())
+        graphs.assert_valid_model_input([{"shape": (None, 2), "name": "edge_indices", "dtype": "int64"}])
+        graphs[5].set("edge_indices", np.array([[0, 0, 1]]))
+        with self.assertRaises(ValueError):
+            graphs.assert_valid_model_input([{"shape": (None, 2), "name": "edge_indices", "dtype": "int64"}])
+
+
+class LazyImportTest(TestCase):
+
+    def test_no_tensorflow_import(self):
+        # Datasets and loaders must not import tensorflow or keras before a tensorflow function is used.
+        code = "import sys, kgcnn.data.base, kgcnn.data.utils, kgcnn.io.file, kgcnn.io.loader; " \
+               "print([x for x in ['tensorflow', 'keras', 'sklearn'] if x in sys.modules])"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                             env=dict(os.environ, KERAS_BACKEND="jax"))
+        self.assertEqual(out.stdout.strip(), "[]")
+
+
+if __name__ == "__main__":
+
+    MemoryGraphListTensorTest().test_cache()
+    MemoryGraphListTensorTest().test_cache_invalidation()
+    MemoryGraphListTensorTest().test_cache_folds()
+    MemoryGraphListTensorTest().test_cache_clean()
+    MemoryGraphListTensorTest().test_cache_release()
+    MemoryGraphListCleanTest().test_clean()
+    MemoryGraphListCleanTest().test_report()
+    MemoryGraphListCleanTest().test_assert_valid_model_input()
+    LazyImportTest().test_no_tensorflow_import()
+    print("Tests passed.")
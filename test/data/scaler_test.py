@@ -0,0 +1,116 @@
+import os
+import tempfile
+import numpy as np
+from kgcnn.utils.tests import TestCase, make_graphs
+from kgcnn.data.transform.scaler.molecule import ExtensiveMolecularScaler, ExtensiveMolecularLabelScaler, \
+    QMGraphLabelScaler
+from kgcnn.data.transform.scaler.standard import StandardLabelScaler
+from kgcnn.data.transform.scaler.force import EnergyForceExtensiveLabelScaler
+
+
+def _composition_reference(atomic_number, selection):
+    total_number = []
+    for x in atomic_number:
+        unique_per_mol, num_unique = np.unique(x, return_counts=True)
+        array_atoms = np.zeros(95)
+        array_atoms[unique_per_mol] = num_unique
+        total_number.append(array_atoms[selection])
+    return np.array(total_number)
+
+
+class ExtensiveMolecularScalerTest(TestCase):
+
+    rng = np.random.default_rng(42)
+    atomic_number = [x["node_number"] for x in make_graphs(50, num_nodes=(1, 19), node_number=(1, 6, 7, 8))]
+    energy = np.array([[np.sum(x) * 0.5 + 1.0, np.sum(x == 1) * 2.0] for x in atomic_number])
+
+    def test_correctness(self):
+        scaler = ExtensiveMolecularScaler()
+        scaler.fit(X=self.energy, atomic_number=self.atomic_number)
+        self.assertAllClose(scaler._fit_atom_selection, np.array([1, 6, 7, 8]))
+        expected = scaler.ridge.predict(_composition_reference(self.atomic_number, scaler._fit_atom_selection))
+        self.assertAllClose(scaler._predict(self.atomic_number), expected)
+        transformed = scaler.transform(X=self.energy, atomic_number=self.atomic_number)
+        self.assertAllClose(scaler.inverse_transform(X=transformed, atomic_number=self.atomic_number), self.energy)
+
+    def test_unknown_species(self):
+        scaler = ExtensiveMolecularScaler()
+        scaler.fit(X=self.energy, atomic_number=self.atomic_number)
+        atomic_number = [np.array([6, 1, 1, 1, 9]), np.array([9])]
+        expected = scaler.ridge.predict(_composition_reference(atomic_number, scaler._fit_atom_selection))
+        self.assertAllClose(scaler._predict(atomic_number), expected)
+
+    def test_composition(self):
+        composition = ExtensiveMolecularScaler()._composition(self.atomic_number).toarray()
+        expected = np.array([np.bincount(x, minlength=ExtensiveMolecularScaler.max_atomic_number)
+                             for x in self.atomic_number])
+        self.assertAllClose(composition, expected)
+
+    def test_energy_force_in_place(self):
+        force = [self.rng.normal(size=(len(x), 3)) for x in self.atomic_number]
+        scaler = EnergyForceExtensiveLabelScaler()
+        scaler.fit(X=self.atomic_number, y=(self.energy[:, :1], force))
+        expected_energy, expected_force = scaler.transform(X=self.atomic_number, y=(self.energy[:, :1], force))
+        energy, force_copy = np.array(self.energy[:, :1]), [np.array(f) for f in force]
+        energy, force_copy = scaler.transform(X=self.atomic_number, y=(energy, force_copy), copy=False)
+        self.assertAllClose(energy, expected_energy)
+        self.assertAllClose(force_copy[3], expected_force[3])
+
+    def test_partial_fit(self):
+        sample_weight = self.rng.uniform(0.5, 2.0, size=len(self.atomic_number))
+        for kwargs in [{}, {"fit_intercept": True}]:
+            scaler = ExtensiveMolecularScaler(**kwargs)
+            scaler.fit(X=self.energy, atomic_number=self.atomic_number, sample_weight=sample_weight)
+            scaler_chunks = ExtensiveMolecularScaler(**kwargs)
+            for i in range(0, len(self.atomic_number), 15):
+                scaler_chunks.partial_fit(X=self.energy[i:i + 15], atomic_number=self.atomic_number[i:i + 15],
+                                          sample_weight=sample_weight[i:i + 15])
+            self.assertAllClose(scaler_chunks._predict(self.atomic_number), scaler._predict(self.atomic_number))
+            self.assertAllClose(scaler_chunks.scale_, scaler.scale_)
+
+        # Statistics of the fit are not saved, so that a loaded scaler can not continue the fit.
+        with tempfile.TemporaryDirectory() as directory:
+            scaler.save(os.path.join(directory, "scaler.json"))
+            scaler_loaded = ExtensiveMolecularScaler().load(os.path.join(directory, "scaler.json"))
+        self.assertAllClose(scaler_loaded._predict(self.atomic_number), scaler._predict(self.atomic_number))
+        with self.assertRaises(ValueError):
+            scaler_loaded.partial_fit(X=self.energy[:15], atomic_number=self.atomic_number[:15])
+
+    def test_partial_fit_large_offset(self):
+        # Total energies with large offsets and a small spread, for which sums of squares of the energies cancel.
+        atomic_number = self.atomic_number * 40
+        energy = np.array([[np.sum(x == 6) * -2.4e4 + np.sum(x == 1) * -3.1e2 + np.sum(x == 8) * -4.7e4]
+                           for x in atomic_number]) - 5e5 + 0.2 * np.cos(np.arange(len(atomic_number)))[:, None]
+        scaler = ExtensiveMolecularScaler(fit_intercept=True)
+        scaler.fit(X=energy, atomic_number=atomic_number)
+        scaler_chunks = ExtensiveMolecularScaler(fit_intercept=True)
+        for i in range(0, len(atomic_number), 100):
+            scaler_chunks.partial_fit(X=energy[i:i + 100], atomic_number=atomic_number[i:i + 100])
+        self.assertAllClose(scaler_chunks._predict(atomic_number), scaler._predict(atomic_number), rtol=1e-9)
+        self.assertAllClose(scaler_chunks.scale_, scaler.scale_, rtol=1e-6)
+
+    def test_fit_dataset_chunks(self):
+        force = [self.rng.normal(size=(len(x), 3)) for x in self.atomic_number]
+        dataset = [{"energy": e[:1], "force": f, "atomic_number": x, "graph_labels": e}
+                   for e, f, x in zip(self.energy, force, self.atomic_number)]
+        scaler = EnergyForceExtensiveLabelScaler().fit_dataset(dataset)
+        scaler_chunks = EnergyForceExtensiveLabelScaler().fit_dataset(iter(dataset), chunk_size=16)
+        self.assertAllClose(scaler_chunks._predict(self.atomic_number), scaler._predict(self.atomic_number))
+        self.assertAllClose(scaler_chunks.get_scaling(), scaler.get_scaling())
+        scaler = QMGraphLabelScaler([ExtensiveMolecularLabelScaler(), StandardLabelScaler()]).fit_dataset(dataset)
+        scaler_chunks = QMGraphLabelScaler([ExtensiveMolecularLabelScaler(), StandardLabelScaler()]).fit_dataset(
+            dataset, chunk_size=16)
+        self.assertAllClose(scaler_chunks.transform(y=self.energy, atomic_number=self.atomic_number),
+                            scaler.transform(y=self.energy, atomic_number=self.atomic_number))
+
+
+if __name__ == "__main__":
+
+    ExtensiveMolecularScalerTest().test_correctness()
+    ExtensiveMolecularScalerTest().test_unknown_species()
+    ExtensiveMolecularScalerTest().test_composition()
+    ExtensiveMolecularScalerTest().test_energy_force_in_place()
+    ExtensiveMolecularScalerTest().test_partial_fit()
+    ExtensiveMolecularScalerTest().test_partial_fit_large_offset()
+    ExtensiveMolecularScalerTest().test_fit_dataset_chunks()
+    print("Tests passed.")
@@ -0,0 +1,53 @@
+import sys
+import subprocess
+import numpy as np
+from kgcnn.utils.tests import TestCase
+from kgcnn.graph.base import GraphDict
+
+
+class PropagateNodeAttributesTest(TestCase):
+
+    rng = np.random.default_rng(42)
+    node_attributes = rng.normal(size=(6, 3))
+    edge_indices = np.array([[0, 1], [1, 0], [1, 2], [2, 1], [3, 4], [4, 3], [0, 0], [5, 5]])
+    edge_weights = rng.uniform(size=(8, 1))
+
+    def test_correctness(self):
+        adj = np.zeros((6, 6))
+        adj[self.edge_indices[:, 0], self.edge_indices[:, 1]] = self.edge_weights[:, 0]
+        graph = GraphDict({"node_attributes": self.node_attributes, "edge_indices": self.edge_indices,
+                           "edge_weights": self.edge_weights})
+        graph.apply_preprocessor("propagate_node_attributes", hops=[0, 1, 3])
+        expected = np.concatenate([self.node_attributes, adj @ self.node_attributes,
+                                   adj @ adj @ adj @ self.node_attributes], axis=-1)
+        self.assertAllClose(graph["node_attributes_propagated"], expected)
+
+        alpha = 0.1
+        graph.apply_preprocessor("propagate_node_attributes", hops=[2], alpha=alpha)
+        h = (1 - alpha) * adj @ self.node_attributes + alpha * self.node_attributes
+        h = (1 - alpha) * adj @ h + alpha * self.node_attributes
+        self.assertAllClose(graph["node_attributes_propagated"], h)
+
+
+class LazyImportTest(TestCase):
+
+    def test_no_pymatgen_import(self):
+        code = ("import sys, kgcnn.graph.preprocessor; "
+                "print([x for x in ['pymatgen', 'tensorflow'] if x in sys.modules])")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "[]")
+
+    def test_no_model_import(self):
+        code = ("import sys, kgcnn.graph.serial; kgcnn.graph.serial.get_preprocessor('set_acsf_representation', "
+                "g2_kwargs={'eta': [0.1], 'rs': [0.0], 'rc': 5.0, 'elements': [1, 6]}); "
+                "print([x for x in ['keras', 'kgcnn.literature'] if x in sys.modules])")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "[]")
+
+
+if __name__ == "__main__":
+
+    PropagateNodeAttributesTest().test_correctness()
+    LazyImportTest().test_no_pymatgen_import()
+    LazyImportTest().test_no_model_import()
+    print("Tests passed.")
@@ -0,0 +1,61 @@
+import tempfile
+import numpy as np
+from kgcnn.utils.tests import TestCase, make_graphs
+from kgcnn.data.base import MemoryGraphList, MemoryGraphDataset
+from kgcnn.io.file import GraphListMemoryMapFile
+
+
+class GraphListMemoryMapFileTest(TestCase):
+
+    def _make_graphs(self):
+        graphs = make_graphs(7, num_nodes=(1, 5))
+        for i, graph in enumerate(graphs):
+            graph["graph_labels"] = np.array([i, 2.0 * i])
+            graph["node_symbol"] = np.array(["C"] * len(graph["node_number"]))
+        graphs[3]["edge_indices"] = np.zeros((0, 2), dtype="int64")
+        graphs[2]["graph_attributes"] = np.array([1.0])  # Not set on all graphs.
+        return MemoryGraphList(graphs)
+
+    def test_correctness(self):
+        graphs = self._make_graphs()
+        with tempfile.TemporaryDirectory() as directory:
+            file = GraphListMemoryMapFile(directory)
+            file.write(graphs, metadata={"label_names": ["a", "b"]})
+            self.assertTrue(file.exists())
+            self.assertEqual(len(file), len(graphs))
+            self.assertEqual(file.metadata, {"label_names": ["a", "b"]})
+            result = file.read(MemoryGraphDataset())
+            self.assertIsInstance(result, MemoryGraphDataset)
+            for x, y in zip(graphs, result):
+                self.assertEqual(set(y.keys()), set(x.keys()) - {"graph_attributes"})
+                for key, value in y.items():
+                    if value.size > 0:
+                        self.assertIsInstance(value, np.memmap)
+                    self.assertEqual(value.shape, x[key].shape)
+                    self.assertEqual(value.dtype, x[key].dtype)
+                    self.assertTrue(np.all(value == x[key]))
+                with self.assertRaises(ValueError):
+                    y["node_coordinates"][...] = 0.0  # Read-only.
+            self.assertAllClose(np.array(result.tensor([{"name": "graph_labels", "shape": (2, )}])),
+                                np.array(graphs.tensor([{"name": "graph_labels", "shape": (2, )}])))
+
+    def test_skipped_properties(self):
+        graphs = self._make_graphs()
+        graphs[0]["node_label"] = np.array([None], dtype="object")
+        for i, graph in enumerate(graphs):
+            graph["edge_attributes"] = np.zeros((2, 3)) if i != 1 else np.zeros((2,))
+        with tempfile.TemporaryDirectory() as directory:
+            file = GraphListMemoryMapFile(directory)
+            with self.assertLogs("kgcnn.io.file", level="WARNING") as logs:
+                file.write(graphs)
+            self.assertEqual(len(logs.output), 3)
+            for name in ["graph_attributes", "node_label", "edge_attributes"]:
+                self.assertTrue(any(["'%s'" % name in x for x in logs.output]))
+            self.assertNotIn("edge_attributes", file.read()[0])
+
+
+if __name__ == "__main__":
+
+    GraphListMemoryMapFileTest().test_correctness()
+    GraphListMemoryMapFileTest().test_skipped_properties()
+    print("Tests passed.")
@@ -0,0 +1,100 @@
+import os
+import asyncio
+import tempfile
+import numpy as np
+from kgcnn.utils.tests import TestCase, make_graphs
+from kgcnn.data.base import MemoryGraphList
+from kgcnn.io.serving import predict_graphs_streaming, GraphBatchingPredictor
+from kgcnn.literature.GIN import make_model
+
+
+class PredictGraphsStreamingTest(TestCase):
+
+    num_graphs = 11
+    inputs = [{"shape": (None,), "name": "node_number", "dtype": "int64"},
+              {"shape": (None, 2), "name": "edge_indices", "dtype": "int64"},
+              {"shape": (), "name": "total_nodes", "dtype": "int64"},
+              {"shape": (), "name": "total_edges", "dtype": "int64"}]
+
+    def test_correctness(self):
+        graphs = make_graphs(self.num_graphs)
+        model = make_model(output_mlp={"units": 1, "activation": "linear"})
+        inputs = self.inputs
+        expected = model.predict(MemoryGraphList(graphs).tensor(inputs), verbose=0)
+
+        in_memory = predict_graphs_streaming(model, graphs, inputs, chunk_size=3, batch_size=2)
+        self.assertAllClose(in_memory, expected, atol=1e-5, rtol=1e-5)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "predictions.npy")
+            mapped = predict_graphs_streaming(model, MemoryGraphList(graphs), inputs, output_path=path, chunk_size=4)
+            self.assertAllClose(np.array(mapped), expected, atol=1e-5, rtol=1e-5)
+            del mapped
+            mapped = predict_graphs_streaming(model, (g for g in graphs), inputs, output_path=path, chunk_size=4)
+            self.assertAllClose(np.array(mapped), expected, atol=1e-5, rtol=1e-5)
+            self.assertFalse(os.path.exists(path + ".part"))
+            del mapped
+
+    def test_correctness_disjoint(self):
+        graphs = make_graphs(self.num_graphs)
+        model = make_model(output_mlp={"units": 1, "activation": "linear"})
+        expected = model.predict(MemoryGraphList(graphs).tensor(self.inputs), verbose=0)
+
+        inputs_disjoint = [{"shape": (), "name": "node_number", "dtype": "int64"},
+                           {"shape": (None,), "name": "edge_indices", "dtype": "int64"},  # shape is (2, None)
+                           {"shape": (), "name": "batch_id_node", "dtype": "int64"},
+                           {"shape": (), "name": "batch_id_edge", "dtype": "int64"},
+                           {"shape": (), "name": "node_id", "dtype": "int64"},
+                           {"shape": (), "name": "edge_id", "dtype": "int64"},
+                           {"shape": (), "name": "count_nodes", "dtype": "int64"},
+                           {"shape": (), "name": "count_edges", "dtype": "int64"}]
+        model_disjoint = make_model(inputs=inputs_disjoint, input_tensor_type="disjoint",
+                                    output_mlp={"units": 1, "activation": "linear"})
+        model_disjoint.set_weights(model.get_weights())
+        loader = {"assignment_to_id": [0, 1], "assignment_of_indices": [None, 0], "pos_batch_id": [2, 3],
+                  "pos_subgraph_id": [4, 5], "pos_count": [6, 7]}
+        predictions = predict_graphs_streaming(model_disjoint, graphs, inputs_disjoint, chunk_size=5, batch_size=2,
+                                               disjoint_loader=loader)
+        self.assertAllClose(predictions, expected, atol=1e-5, rtol=1e-5)
+
+
+class GraphBatchingPredictorTest(TestCase):
+
+    num_graphs = 11
+    inputs = PredictGraphsStreamingTest.inputs
+
+    def _predict_concurrent(self, predictor, graphs):
+        async def main():
+            async with predictor:
+                return await asyncio.gather(*[predictor.predict(g) for g in graphs])
+        return asyncio.run(main())
+
+    def test_correctness(self):
+        graphs = make_graphs(self.num_graphs)
+        model = make_model(output_mlp={"units": 1, "activation": "linear"})
+        expected = model.predict(MemoryGraphList(graphs).tensor(self.inputs), verbose=0)
+        for run_in_executor in [True, False]:
+            predictor = GraphBatchingPredictor(model=model, model_inputs=self.inputs, max_batch_size=4,
+                                               max_latency=1.0, run_in_executor=run_in_executor)
+            results = self._predict_concurrent(predictor, graphs)
+            self.assertAllClose(np.stack(results), expected, atol=1e-5, rtol=1e-5)
+            statistics = predictor.statistics()
+            self.assertEqual(statistics["num_requests"], self.num_graphs)
+            # Requests are coalesced into three batches of at most four graphs.
+            self.assertEqual(list(predictor._batch_sizes), [4, 4, 3])
+
+    def test_scaler_multiple_outputs(self):
+        model = make_model(output_mlp={"units": 1, "activation": "linear"})
+        predictor = GraphBatchingPredictor(model=model, model_inputs=self.inputs, scaler=object())
+        predictor.model = lambda x, training=False: [model(x), model(x)]
+        with self.assertRaises(ValueError):
+            predictor.predict_batch(make_graphs(self.num_graphs))
+
+
+if __name__ == "__main__":
+
+    PredictGraphsStreamingTest().test_correctness()
+    PredictGraphsStreamingTest().test_correctness_disjoint()
+    GraphBatchingPredictorTest().test_correctness()
+    GraphBatchingPredictorTest().test_scaler_multiple_outputs()
+    print("Tests passed.")
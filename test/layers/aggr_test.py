@@ -1,7 +1,10 @@
 import numpy as np
 from keras import ops
+from keras.backend import standardize_dtype
+from keras.mixed_precision import set_global_policy
 from kgcnn.utils.tests import TestCase
-from kgcnn.layers.aggr import AggregateLocalEdges, AggregateLocalEdgesAttention
+from kgcnn.layers.aggr import AggregateLocalEdges, AggregateLocalEdgesAttention, AggregateLocalMessages, \
+    AggregateLocalEdgesLSTM
 
 
 class TestAggregateLocalEdges(TestCase):
@@ -24,6 +27,56 @@ class TestAggregateLocalEdges(TestCase):
         expected_output = np.array([[0., 0., 0.5], [0.5, 1., 0.5], [1., 0., 0.5], [1., 1., 0.5]])
         self.assertAllClose(nodes_aggr, expected_output)
 
+    def test_correctness_sorted_indices(self):
+        edge_index = ops.cast(self.edge_index, dtype="int64")
+        for method in ["sum", "mean", "max", "min"]:
+            layer = AggregateLocalEdges(pooling_method=method, pooling_index=0)
+            layer_sorted = AggregateLocalEdges(pooling_method=method, pooling_index=0, sorted_indices=True)
+            layer_segment = AggregateLocalEdges(pooling_method="segment_" + method, pooling_index=0)
+            # Last node has no edges.
+            nodes = np.concatenate([self.node_attr, np.ones((1, 2))], axis=0)
+            expected_output = layer([nodes, self.edge_attr, edge_index])
+            self.assertAllClose(layer_sorted([nodes, self.edge_attr, edge_index]), expected_output)
+            self.assertAllClose(layer_segment([nodes, self.edge_attr, edge_index]), expected_output)
+
+    def test_correctness_mixed_precision(self):
+        # Summation of many values in bfloat16 stalls at 256, since adding 1.0 is below its precision.
+        nodes = ops.zeros((2, 1), dtype="bfloat16")
+        edges = ops.ones((1000, 1), dtype="bfloat16")
+        edge_index = ops.convert_to_tensor(np.zeros((2, 1000)), dtype="int64")
+        set_global_policy("mixed_bfloat16")
+        try:
+            for method in ["sum", "mean", "segment_sum"]:
+                layer = AggregateLocalEdges(pooling_method=method, pooling_index=0)
+                nodes_aggr = layer([nodes, edges, edge_index])
+                self.assertEqual(standardize_dtype(nodes_aggr.dtype), "bfloat16")
+                self.assertAllClose(ops.cast(nodes_aggr, "float32"),
+                                    np.array([[1000.0], [0.0]]) if "sum" in method else np.array([[1.0], [0.0]]))
+        finally:
+            set_global_policy("float32")
+
+
+class TestAggregateLocalMessages(TestCase):
+    node_attr = np.array([[0.0, 0.0], [0.0, 1.0], [1.0, 0.0], [1.0, 1.0], [2.0, 2.0]])
+    edge_weights = np.array([[0.5], [2.0], [0.0], [1.0], [1.0], [1.0], [10.0], [1.0]])
+    edge_index = np.array([[0, 0, 1, 1, 2, 2, 3, 3],
+                           [1, 2, 0, 3, 3, 0, 1, 2]], dtype="int64")
+
+    def test_correctness(self):
+        edge_index = ops.cast(self.edge_index, dtype="int64")
+        nodes = ops.convert_to_tensor(self.node_attr, dtype="float32")
+        weights = ops.convert_to_tensor(self.edge_weights, dtype="float32")
+        vector_weights = ops.convert_to_tensor(np.tile(self.edge_weights, (1, 2)) * np.array([[1.0, -1.0]]),
+                                               dtype="float32")
+        for method in ["sum", "mean"]:
+            for w in [None, weights, vector_weights]:
+                inputs = [nodes, edge_index] if w is None else [nodes, edge_index, w]
+                nodes_aggr = AggregateLocalMessages(pooling_method=method)(inputs)
+                edges = ops.take(nodes, edge_index[1], axis=0)
+                edges = edges if w is None else edges * w
+                expected_output = AggregateLocalEdges(pooling_method=method)([nodes, edges, edge_index])
+                self.assertAllClose(nodes_aggr, expected_output)
+
 
 class TestAggregateLocalEdgesAttention(TestCase):
     node_attr = np.array([[0.0, 0.0], [0.0, 1.0], [1.0, 0.0], [1.0, 1.0]])
@@ -44,9 +97,47 @@ class TestAggregateLocalEdgesAttention(TestCase):
 
         self.assertAllClose(nodes_aggr, expected_output)
 
+    def test_correctness_sorted_indices(self):
+        edge_index = ops.cast(self.edge_index, dtype="int64")
+        # Last node has no edges.
+        nodes = np.concatenate([self.node_attr, np.ones((1, 2))], axis=0)
+        for normalize in [False, True]:
+            layer = AggregateLocalEdgesAttention(pooling_index=1, normalize_softmax=normalize)
+            layer_sorted = AggregateLocalEdgesAttention(pooling_index=1, normalize_softmax=normalize, is_sorted=True)
+            expected_output = layer([nodes, self.edge_attr, self.edge_att, edge_index])
+            self.assertAllClose(layer_sorted([nodes, self.edge_attr, self.edge_att, edge_index]), expected_output)
+
+
+class TestAggregateLocalEdgesLSTM(TestCase):
+    node_attr = np.array([[0.0, 0.0], [0.0, 1.0], [1.0, 0.0], [1.0, 1.0], [2.0, 1.0]], dtype="float32")
+    edge_attr = np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 1.0], [0.0, 1.0, 0.0], [1.0, 1.0, 1.0],
+                          [1.0, 0.0, 0.0], [1.0, 0.0, 1.0], [1.0, 1.0, 0.0], [2.0, 1.0, 1.0]], dtype="float32")
+    edge_index = np.array([[3, 0, 3, 1, 3, 1, 3, 2], [0, 1, 0, 1, 2, 3, 2, 3]], dtype="int64")
+
+    def test_correctness_degree_buckets(self):
+        layer = AggregateLocalEdgesLSTM(units=4, max_edges_per_node=4)
+        inputs = [self.node_attr, self.edge_attr, ops.convert_to_tensor(self.edge_index)]
+        expected_output = layer(inputs)
+        for degree_buckets in [[1, 2], [1, 2, 4], [3]]:
+            layer_buckets = AggregateLocalEdgesLSTM(units=4, max_edges_per_node=4, degree_buckets=degree_buckets)
+            layer_buckets(inputs)
+            layer_buckets.set_weights(layer.get_weights())
+            self.assertAllClose(layer_buckets(inputs), expected_output)
+        # Upper bound of the last bucket is the maximum degree of the input.
+        for degree_buckets in [[1], [2, 4]]:
+            layer_buckets = AggregateLocalEdgesLSTM(units=4, max_edges_per_node=None, degree_buckets=degree_buckets)
+            layer_buckets(inputs)
+            layer_buckets.set_weights(layer.get_weights())
+            self.assertAllClose(layer_buckets(inputs), expected_output)
+
 
 if __name__ == "__main__":
     TestAggregateLocalEdges().test_correctness()
     TestAggregateLocalEdges().test_correctness_mean()
+    TestAggregateLocalEdges().test_correctness_sorted_indices()
+    TestAggregateLocalEdges().test_correctness_mixed_precision()
+    TestAggregateLocalMessages().test_correctness()
     TestAggregateLocalEdgesAttention().test_correctness()
+    TestAggregateLocalEdgesAttention().test_correctness_sorted_indices()
+    TestAggregateLocalEdgesLSTM().test_correctness_degree_buckets()
     print("Tests passed.")
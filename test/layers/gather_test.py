@@ -1,7 +1,8 @@
 import numpy as np
 from kgcnn.utils.tests import TestCase
 from keras import ops
-from kgcnn.layers.gather import GatherNodes
+from kgcnn.layers.gather import GatherNodes, EdgeIndicesReverse
+from kgcnn.graph.methods import compute_reverse_edges_index_map
 
 
 class GatherNodesTest(TestCase):
@@ -21,7 +22,21 @@ class GatherNodesTest(TestCase):
         self.assertAllClose(nodes_per_edge, expected_output)
 
 
+class EdgeIndicesReverseTest(TestCase):
+
+    edge_index = np.array([[0, 1, 1, 2, 3, 2, 0, 4], [1, 0, 2, 1, 2, 3, 3, 0]], dtype="int64")
+
+    def test_correctness(self):
+
+        layer = EdgeIndicesReverse()
+        pair_index = layer([ops.zeros((5, 1)), ops.convert_to_tensor(self.edge_index)])
+        expected_output = compute_reverse_edges_index_map(np.transpose(self.edge_index))
+        expected_output = np.where(expected_output >= 0, expected_output, -1)
+        self.assertAllClose(pair_index, np.expand_dims(expected_output, axis=0))
+
+
 if __name__ == "__main__":
 
     GatherNodesTest().test_correctness()
+    EdgeIndicesReverseTest().test_correctness()
     print("Tests passed.")
\ No newline at end of file
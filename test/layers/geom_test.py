@@ -0,0 +1,152 @@
+import numpy as np
+from kgcnn.utils.tests import TestCase
+from keras import ops
+from keras.backend import standardize_dtype, backend
+from keras.mixed_precision import set_global_policy
+from kgcnn.layers.geom import NodePosition, NodeDistanceEuclidean, GaussBasisLayer, BesselBasisLayer, \
+    CosCutOffEnvelope, EdgeDirectionNormalized, FusedDistanceBasis, EdgeAngleIndices, ShiftPeriodicLattice
+from kgcnn.graph.methods import get_angle_indices
+
+
+def _gradient(f, x):
+    # Gradient of a scalar function with the autodiff of the current keras backend.
+    if backend() == "tensorflow":
+        import tensorflow as tf
+        x = tf.convert_to_tensor(x)
+        with tf.GradientTape() as tape:
+            tape.watch(x)
+            y = f(x)
+        return tape.gradient(y, x)
+    elif backend() == "jax":
+        import jax
+        return jax.grad(f)(ops.convert_to_tensor(x))
+    elif backend() == "torch":
+        import torch
+        x = ops.convert_to_tensor(x).requires_grad_(True)
+        return torch.autograd.grad(f(x), x)[0]
+    raise NotImplementedError("Gradient is not supported for backend '%s'." % backend())
+
+
+class FusedDistanceBasisTest(TestCase):
+
+    node_coordinates = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 2.0, 0.0], [1.0, 1.0, 3.0]],
+                                dtype="float32")
+    edge_index = np.array([[0, 0, 1, 1, 2, 2, 3, 3], [1, 2, 0, 3, 3, 0, 1, 2]], dtype="int64")
+
+    def _expected_outputs(self, basis_layer):
+        x, ei = ops.convert_to_tensor(self.node_coordinates), ops.convert_to_tensor(self.edge_index)
+        pos1, pos2 = NodePosition()([x, ei])
+        d = NodeDistanceEuclidean()([pos1, pos2])
+        return [basis_layer(d), CosCutOffEnvelope(3.0)(d), d, EdgeDirectionNormalized()([pos1, pos2])]
+
+    def test_correctness_gauss(self):
+
+        for recompute in [False, True]:
+            layer = FusedDistanceBasis(basis_type="gauss", basis_kwargs={"bins": 10, "distance": 4.0},
+                                       envelope_cutoff=3.0, return_envelope=True, return_distance=True,
+                                       return_direction=True, recompute_grad=recompute)
+            outputs = layer([ops.convert_to_tensor(self.node_coordinates), ops.convert_to_tensor(self.edge_index)])
+            expected = self._expected_outputs(GaussBasisLayer(bins=10, distance=4.0))
+            for out, exp in zip(outputs, expected):
+                self.assertAllClose(out, exp)
+
+    def test_correctness_bessel(self):
+
+        layer = FusedDistanceBasis(basis_type="bessel", basis_kwargs={"num_radial": 6, "cutoff": 5.0},
+                                   envelope_cutoff=3.0, apply_envelope=True)
+        outputs = layer([ops.convert_to_tensor(self.node_coordinates), ops.convert_to_tensor(self.edge_index)])
+        expected = self._expected_outputs(BesselBasisLayer(num_radial=6, cutoff=5.0))
+        self.assertAllClose(outputs, expected[0] * expected[1])
+
+    def test_correctness_periodic(self):
+
+        edge_image = np.array([[0, 0, 0], [1, 0, 0], [0, -1, 0], [0, 0, 1], [1, 1, 0], [0, 0, 0], [-1, 0, 0],
+                               [0, 1, -1]], dtype="int64")
+        lattice = np.array([[[4.0, 0.0, 0.0], [0.5, 4.0, 0.0], [0.0, 0.0, 5.0]]], dtype="float32")
+        batch_id_edge = np.zeros(len(edge_image), dtype="int64")
+        inputs = [ops.convert_to_tensor(v) for v in [self.node_coordinates, self.edge_index, edge_image, lattice,
+                                                       batch_id_edge]]
+        pos1, pos2 = NodePosition()(inputs[:2])
+        pos2 = ShiftPeriodicLattice()([pos2] + inputs[2:])
+        d = NodeDistanceEuclidean()([pos1, pos2])
+        expected = [BesselBasisLayer(num_radial=6, cutoff=5.0)(d), CosCutOffEnvelope(3.0)(d),
+                    EdgeDirectionNormalized()([pos1, pos2])]
+        for recompute in [False, True]:
+            layer = FusedDistanceBasis(basis_type="bessel", basis_kwargs={"num_radial": 6, "cutoff": 5.0},
+                                       envelope_cutoff=3.0, return_envelope=True, return_direction=True,
+                                       recompute_grad=recompute)
+            for out, exp in zip(layer(inputs), expected):
+                self.assertAllClose(out, exp)
+
+    def test_mixed_precision(self):
+
+        set_global_policy("mixed_bfloat16")
+        try:
+            layer = FusedDistanceBasis(basis_type="bessel", basis_kwargs={"num_radial": 6, "cutoff": 5.0},
+                                       envelope_cutoff=3.0, apply_envelope=True)
+            x = ops.convert_to_tensor(self.node_coordinates, dtype="bfloat16")
+            outputs = layer([x, ops.convert_to_tensor(self.edge_index)])
+        finally:
+            set_global_policy("float32")
+        self.assertEqual(standardize_dtype(outputs.dtype), "float32")
+        expected = self._expected_outputs(BesselBasisLayer(num_radial=6, cutoff=5.0))
+        self.assertAllClose(outputs, expected[0] * expected[1], atol=1e-6, rtol=1e-5)
+
+    def test_gradient_recompute(self):
+
+        for basis_type, basis_kwargs in [("gauss", {"bins": 10, "distance": 4.0}),
+                                         ("bessel", {"num_radial": 6, "cutoff": 5.0})]:
+            gradients = []
+            for recompute in [False, True]:
+                layer = FusedDistanceBasis(basis_type=basis_type, basis_kwargs=basis_kwargs, envelope_cutoff=3.0,
+                                           apply_envelope=True, return_distance=True, return_direction=True,
+                                           recompute_grad=recompute)
+                edge_index = ops.convert_to_tensor(self.edge_index)
+                weights = ops.convert_to_tensor(np.linspace(-1.0, 1.0, 3 * self.edge_index.shape[1]).reshape(
+                    (-1, 3)).astype("float32"))
+
+                def loss(x):
+                    basis, distance, direction = layer([x, edge_index])
+                    return ops.sum(ops.square(basis)) + ops.sum(distance) + ops.sum(direction * weights)
+
+                gradients.append(ops.convert_to_numpy(_gradient(loss, self.node_coordinates)))
+            self.assertTrue(np.all(np.isfinite(gradients[0])))
+            self.assertGreater(np.max(np.abs(gradients[0])), 0.0)
+            self.assertAllClose(gradients[1], gradients[0], atol=1e-6, rtol=1e-5)
+
+
+class EdgeAngleIndicesTest(TestCase):
+
+    node_coordinates = np.zeros((6, 3), dtype="float32")
+    edge_index = np.array([[0, 0, 1, 1, 1, 2, 2, 3, 3, 4, 5, 5], [1, 2, 0, 2, 3, 0, 1, 1, 3, 5, 4, 4]], dtype="int64")
+
+    def test_correctness(self):
+
+        for kwargs in [{"edge_pairing": "kj"}, {"edge_pairing": "jk"}, {"edge_pairing": "ik", "allow_self_edges": True},
+                       {"edge_pairing": "ki", "allow_reverse_edges": True}, {"edge_pairing": "kj",
+                                                                           "allow_multi_edges": True}]:
+            layer = EdgeAngleIndices(**kwargs)
+            angles = layer([ops.convert_to_tensor(self.node_coordinates), ops.convert_to_tensor(self.edge_index)])
+            _, _, expected = get_angle_indices(np.transpose(self.edge_index), **kwargs)
+            self.assertAllClose(angles, np.transpose(expected))
+
+    def test_correctness_batch(self):
+
+        batch_id_edge = np.array([0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1], dtype="int64")
+        count_edges = np.array([9, 3], dtype="int64")
+        angles, batch_id_angles, count_angles = EdgeAngleIndices()(
+            [ops.convert_to_tensor(x) for x in [self.node_coordinates, self.edge_index, batch_id_edge, count_edges]])
+        self.assertAllClose(batch_id_angles, batch_id_edge[ops.convert_to_numpy(angles)[0]])
+        self.assertAllClose(count_angles, np.bincount(batch_id_edge[ops.convert_to_numpy(angles)[0]], minlength=2))
+
+
+if __name__ == "__main__":
+
+    FusedDistanceBasisTest().test_correctness_gauss()
+    FusedDistanceBasisTest().test_correctness_bessel()
+    FusedDistanceBasisTest().test_correctness_periodic()
+    FusedDistanceBasisTest().test_mixed_precision()
+    FusedDistanceBasisTest().test_gradient_recompute()
+    EdgeAngleIndicesTest().test_correctness()
+    EdgeAngleIndicesTest().test_correctness_batch()
+    print("Tests passed.")
@@ -0,0 +1,43 @@
+import numpy as np
+import keras as ks
+from keras import ops
+from kgcnn.utils.tests import TestCase
+from kgcnn.layers.modules import RecomputeGrad
+from kgcnn.literature.PAiNN._layers import PAiNNUpdate
+
+
+class RecomputeGradTest(TestCase):
+
+    nodes = np.random.default_rng(42).normal(size=(5, 8)).astype("float32")
+    equivariant = np.random.default_rng(43).normal(size=(5, 3, 8)).astype("float32")
+
+    def _make_model(self, recompute: bool):
+        ks.utils.set_random_seed(1)
+        layer = PAiNNUpdate(units=8)
+        if recompute:
+            layer = RecomputeGrad(layer)
+        inputs = [ks.layers.Input(shape=(8,)), ks.layers.Input(shape=(3, 8))]
+        ds, dv = layer(inputs)
+        model = ks.models.Model(inputs=inputs, outputs=[ds, dv])
+        model.compile(loss="mean_squared_error", optimizer=ks.optimizers.SGD(learning_rate=0.1))
+        return model
+
+    def test_correctness(self):
+
+        model = self._make_model(recompute=False)
+        model_recompute = self._make_model(recompute=True)
+        model_recompute.set_weights(model.get_weights())
+        inputs = [self.nodes, self.equivariant]
+        for out, expected in zip(model_recompute(inputs), model(inputs)):
+            self.assertAllClose(out, expected, atol=1e-5, rtol=1e-5)
+        targets = [np.ones((5, 8)), np.ones((5, 3, 8))]
+        model.train_on_batch(inputs, targets)
+        model_recompute.train_on_batch(inputs, targets)
+        for w, expected in zip(model_recompute.get_weights(), model.get_weights()):
+            self.assertAllClose(w, expected, atol=1e-5, rtol=1e-5)
+
+
+if __name__ == "__main__":
+
+    RecomputeGradTest().test_correctness()
+    print("Tests passed.")
@@ -0,0 +1,70 @@
+import numpy as np
+import keras as ks
+from keras import ops
+from kgcnn.utils.tests import TestCase, make_graphs
+from kgcnn.layers.scale import EnergyForceExtensiveLabelScaler
+from kgcnn.data.transform.scaler.force import EnergyForceExtensiveLabelScaler as EnergyForceScaler
+from kgcnn.models.force import EnergyForceModel
+
+
+class _SquaredDistanceEnergy(ks.models.Model):
+
+    def call(self, inputs, **kwargs):
+        # Energy of each graph as sum of squared coordinates, which gives a force of `-2x` .
+        return ops.sum(ops.sum(ops.square(inputs[1]), axis=-1), axis=1, keepdims=True)
+
+
+class TestEnergyForceExtensiveLabelScaler(TestCase):
+
+    graphs = make_graphs(20)
+    atomic_number = [x["node_number"] for x in graphs]
+    coordinates = [x["node_coordinates"] - 1.5 for x in graphs]
+    energy = np.array([[np.sum(x) * 0.5 + 1.0 + np.cos(i)] for i, x in enumerate(atomic_number)])
+    force = [np.sin(x + i) for i, x in enumerate(coordinates)]
+
+    def _padded(self, values):
+        out = np.zeros([len(values), max([len(x) for x in values])] + list(values[0].shape[1:]))
+        for i, x in enumerate(values):
+            out[i, :len(x)] = x
+        return out
+
+    def _make_scaler(self):
+        scaler = EnergyForceScaler()
+        scaler.fit(y=[self.energy, self.force], X=self.atomic_number)
+        return scaler
+
+    def test_correctness(self):
+        scaler = self._make_scaler()
+        energy, force = scaler.transform(y=[self.energy, self.force], X=self.atomic_number)
+        layer = EnergyForceExtensiveLabelScaler(scaling_shape=(1, 1))
+        layer.set_scale(scaler)
+        out_energy, out_force = layer([energy, self._padded(force).astype("float32"),
+                                       self._padded(self.atomic_number).astype("int32")])
+        self.assertAllClose(out_energy, self.energy)
+        self.assertAllClose(out_force, self._padded(self.force), atol=1e-5, rtol=1e-5)
+
+    def test_energy_force_model(self):
+        scaler = self._make_scaler()
+        outputs = {"energy": {"name": "energy", "shape": (1,)}, "force": {"name": "force", "shape": (None, 3)}}
+        model_raw, model = [EnergyForceModel(
+            model_energy=_SquaredDistanceEnergy(), coordinate_input=1, output_squeeze_states=True, name="force",
+            outputs=outputs) for _ in range(2)]
+        x = [ops.convert_to_tensor(self._padded(self.atomic_number).astype("int32")),
+             ops.convert_to_tensor(self._padded(self.coordinates).astype("float32"))]
+        raw = model_raw(x)
+        model.set_scale(scaler)
+        self.assertEqual(model.get_config()["output_scaling"], {})
+        out = model(x)
+        num_atoms = [len(a) for a in self.atomic_number]
+        raw_force = [np.array(f)[:n] for f, n in zip(ops.convert_to_numpy(raw["force"]), num_atoms)]
+        expected_energy, expected_force = scaler.inverse_transform(
+            y=[ops.convert_to_numpy(raw["energy"]), raw_force], X=self.atomic_number)
+        self.assertAllClose(out["energy"], expected_energy, atol=1e-4, rtol=1e-5)
+        self.assertAllClose(out["force"], self._padded(expected_force), atol=1e-4, rtol=1e-5)
+
+
+if __name__ == "__main__":
+
+    TestEnergyForceExtensiveLabelScaler().test_correctness()
+    TestEnergyForceExtensiveLabelScaler().test_energy_force_model()
+    print("Tests passed.")
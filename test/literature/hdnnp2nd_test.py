@@ -0,0 +1,79 @@
+import itertools
+import numpy as np
+from keras import ops
+from kgcnn.utils.tests import TestCase, make_graphs
+from kgcnn.graph.base import GraphDict
+from kgcnn.graph.preprocessor import SetACSFRepresentation
+from kgcnn.literature.HDNNP2nd import model_default_behler
+from kgcnn.literature.HDNNP2nd._acsf import ACSFG2, ACSFG4
+
+
+def _make_molecules(num_molecules: int = 3):
+    molecules = make_graphs(num_molecules, num_nodes=(3, 6), node_number=(1, 6, 16))
+    for m in molecules:
+        m["range_indices"] = m["edge_indices"]
+        m["angle_indices_nodes"] = np.array(list(itertools.permutations(range(len(m["node_number"])), 3)))
+    return molecules
+
+
+def _disjoint(molecules, name):
+    offsets = np.cumsum([0] + [len(m["node_number"]) for m in molecules])[:-1]
+    return np.concatenate([m[name] + offset for m, offset in zip(molecules, offsets)], axis=0)
+
+
+class ACSFTest(TestCase):
+
+    molecules = _make_molecules()
+    g2_kwargs = model_default_behler["g2_kwargs"]
+    g4_kwargs = model_default_behler["g4_kwargs"]
+
+    def _layer_inputs(self, name):
+        z = np.concatenate([m["node_number"] for m in self.molecules], axis=0)
+        xyz = np.concatenate([m["node_coordinates"] for m in self.molecules], axis=0).astype("float32")
+        return [ops.convert_to_tensor(z), ops.convert_to_tensor(xyz),
+                ops.convert_to_tensor(np.transpose(_disjoint(self.molecules, name)))]
+
+    def _assert_numpy_matches_layer(self, layer, name):
+        expected = ops.convert_to_numpy(layer(self._layer_inputs(name)))
+        for chunk_size in [None, 1, 7]:
+            result = np.concatenate([layer.call_numpy(
+                m["node_number"], m["node_coordinates"], m[name], chunk_size=chunk_size) for m in self.molecules])
+            self.assertAllClose(result, expected, atol=1e-5, rtol=1e-4)
+
+    def test_g2_call_numpy(self):
+        layer = ACSFG2(**ACSFG2.make_param_table(**self.g2_kwargs))
+        self._assert_numpy_matches_layer(layer, "range_indices")
+
+    def test_g4_call_numpy(self):
+        layer = ACSFG4(**ACSFG4.make_param_table(**self.g4_kwargs))
+        self._assert_numpy_matches_layer(layer, "angle_indices_nodes")
+
+    def test_preprocessor(self):
+        layer_g2 = ACSFG2(**ACSFG2.make_param_table(**self.g2_kwargs))
+        layer_g4 = ACSFG4(**ACSFG4.make_param_table(**self.g4_kwargs))
+        molecule = self.molecules[0]
+        graph = GraphDict({"node_number": molecule["node_number"], "node_coordinates": molecule["node_coordinates"]})
+        graph.apply_preprocessor("set_range", max_distance=10.0, max_neighbours=10000)
+        graph.apply_preprocessor("set_angle")
+        graph.apply_preprocessor("set_acsf_representation", g2_kwargs=self.g2_kwargs, g4_kwargs=self.g4_kwargs,
+                                 chunk_size=5)
+        expected = np.concatenate([
+            layer_g2.call_numpy(graph["node_number"], graph["node_coordinates"], graph["range_indices"]),
+            layer_g4.call_numpy(graph["node_number"], graph["node_coordinates"], graph["angle_indices_nodes"])
+        ], axis=-1)
+        self.assertEqual(graph["node_representation"].shape, (len(molecule["node_number"]), expected.shape[-1]))
+        self.assertAllClose(graph["node_representation"], expected)
+
+        preprocessor = SetACSFRepresentation(g2_kwargs=self.g2_kwargs, node_representation="node_g2")
+        config = preprocessor.get_config()
+        self.assertEqual(config["g2_kwargs"], self.g2_kwargs)
+        graph.apply_preprocessor(preprocessor)
+        self.assertAllClose(graph["node_g2"], expected[:, :graph["node_g2"].shape[-1]])
+
+
+if __name__ == "__main__":
+
+    ACSFTest().test_g2_call_numpy()
+    ACSFTest().test_g4_call_numpy()
+    ACSFTest().test_preprocessor()
+    print("Tests passed.")
@@ -0,0 +1,134 @@
+import numpy as np
+from keras import ops
+from kgcnn.utils.tests import TestCase
+from kgcnn.literature.MAT._layers import MATAttentionHead, MATSparseAttentionHead, MATDistanceEdges, \
+    MATDistanceMatrix
+from kgcnn.literature.MAT import make_model_sparse
+
+
+def _make_padded_graphs(rng, num_nodes: list, max_nodes: int, units: int = 5):
+    h = rng.normal(size=(len(num_nodes), max_nodes, units)).astype("float32")
+    a_d = rng.uniform(size=(len(num_nodes), max_nodes, max_nodes, 1)).astype("float32")
+    a_g = rng.integers(0, 2, size=(len(num_nodes), max_nodes, max_nodes, 1)).astype("float32")
+    h_mask = np.zeros((len(num_nodes), max_nodes, 1), dtype="float32")
+    for i, n in enumerate(num_nodes):
+        h_mask[i, :n] = 1.0
+    a_mask = np.expand_dims(h_mask, axis=1) * np.expand_dims(h_mask, axis=2)
+    return [h * h_mask, a_d * a_mask, a_g * a_mask], [h_mask, a_mask, a_mask]
+
+
+def _make_disjoint_graphs(inputs, num_nodes: list):
+    # Disjoint graphs with a fully connected range list including self-loops and bonds of the adjacency matrix.
+    h, a_d, a_g = inputs
+    offsets = np.cumsum([0] + num_nodes)[:-1]
+    nodes, range_index, range_attr, edge_index, edge_attr = [], [], [], [], []
+    for b, (n, offset) in enumerate(zip(num_nodes, offsets)):
+        nodes.append(h[b, :n])
+        receive, send = [x.flatten() for x in np.meshgrid(np.arange(n), np.arange(n), indexing="ij")]
+        range_index.append(np.stack([receive, send]) + offset)
+        range_attr.append(a_d[b, receive, send])
+        bond = a_g[b, receive, send, 0] > 0
+        edge_index.append(np.stack([receive[bond], send[bond]]) + offset)
+        edge_attr.append(a_g[b, receive[bond], send[bond]])
+    return [np.concatenate(nodes, axis=0), np.concatenate(range_attr, axis=0),
+            np.concatenate(range_index, axis=1), np.concatenate(edge_attr, axis=0), np.concatenate(edge_index, axis=1)]
+
+
+class MATAttentionHeadTest(TestCase):
+
+    inputs, masks = _make_padded_graphs(np.random.default_rng(42), num_nodes=[6, 4], max_nodes=6)
+
+    def test_correctness_blocked(self):
+        inputs = [ops.convert_to_tensor(x) for x in self.inputs]
+        masks = [ops.convert_to_tensor(x) for x in self.masks]
+        for add_identity in [False, True]:
+            layer = MATAttentionHead(units=8, add_identity=add_identity)
+            expected = layer(inputs, mask=masks)
+            self.assertAllClose(ops.convert_to_numpy(expected)[1, 4:], np.zeros((2, 8)))
+            # Block size of 2 and 3 divide the number of nodes 6, block size 4 and 7 do not.
+            for block_size in [1, 2, 3, 4, 7]:
+                for recompute_grad in [False, True]:
+                    layer_blocked = MATAttentionHead(units=8, add_identity=add_identity, block_size=block_size,
+                                                     recompute_grad=recompute_grad)
+                    layer_blocked(inputs, mask=masks)
+                    layer_blocked.set_weights(layer.get_weights())
+                    result = layer_blocked(inputs, mask=masks)
+                    self.assertAllClose(result, expected, atol=1e-6, rtol=1e-5)
+                    # Padded nodes are masked in the output.
+                    self.assertAllClose(ops.convert_to_numpy(result)[1, 4:], np.zeros((2, 8)))
+
+
+class MATSparseAttentionHeadTest(TestCase):
+
+    num_nodes = [6, 4]
+    inputs, masks = _make_padded_graphs(np.random.default_rng(42), num_nodes=num_nodes, max_nodes=6)
+
+    def test_correctness(self):
+        inputs = [ops.convert_to_tensor(x) for x in self.inputs]
+        masks = [ops.convert_to_tensor(x) for x in self.masks]
+        disjoint = [ops.convert_to_tensor(x) for x in _make_disjoint_graphs(self.inputs, self.num_nodes)]
+        for add_identity in [False, True]:
+            layer = MATAttentionHead(units=8, add_identity=add_identity)
+            dense = ops.convert_to_numpy(layer(inputs, mask=masks))
+            expected = np.concatenate([dense[b, :n] for b, n in enumerate(self.num_nodes)], axis=0)
+            layer_sparse = MATSparseAttentionHead(units=8, add_identity=add_identity)
+            layer_sparse(disjoint)
+            layer_sparse.set_weights(layer.get_weights())
+            self.assertAllClose(layer_sparse(disjoint), expected, atol=1e-6, rtol=1e-5)
+
+    def test_correctness_distance(self):
+        coordinates = np.random.default_rng(1).normal(size=(1, 5, 3)).astype("float32")
+        mask = np.ones((1, 5, 1), dtype="float32")
+        for trafo in ["exp", "softmax"]:
+            dense, _ = MATDistanceMatrix(trafo=trafo)(ops.convert_to_tensor(coordinates), mask=mask)
+            receive, send = [x.flatten() for x in np.meshgrid(np.arange(5), np.arange(5), indexing="ij")]
+            sparse = MATDistanceEdges(trafo=trafo)([ops.convert_to_tensor(coordinates[0]),
+                                                    ops.convert_to_tensor(np.stack([receive, send]))])
+            self.assertAllClose(sparse, ops.convert_to_numpy(dense)[0, receive, send], atol=1e-6, rtol=1e-5)
+
+
+class MakeModelSparseTest(TestCase):
+
+    def test_disjoint(self):
+        rng = np.random.default_rng(42)
+        num_nodes = [3, 5]
+        node_number = np.concatenate([rng.integers(1, 10, size=n) for n in num_nodes])
+        coordinates = rng.normal(size=(sum(num_nodes), 3)).astype("float32")
+        batch_id_node = np.repeat(np.arange(len(num_nodes)), num_nodes)
+        node_id = np.concatenate([np.arange(n) for n in num_nodes])
+        offsets = np.cumsum([0] + num_nodes)[:-1]
+        range_index = np.concatenate([np.stack(
+            np.nonzero(np.ones((n, n)))) + o for n, o in zip(num_nodes, offsets)], axis=1)
+        edge_index = np.concatenate([np.stack(
+            [np.arange(n - 1), np.arange(1, n)]) + o for n, o in zip(num_nodes, offsets)], axis=1)
+        batch_id_range, batch_id_edge = batch_id_node[range_index[0]], batch_id_node[edge_index[0]]
+        range_id = np.concatenate([np.arange(np.sum(batch_id_range == b)) for b in range(len(num_nodes))])
+        edge_id = np.concatenate([np.arange(np.sum(batch_id_edge == b)) for b in range(len(num_nodes))])
+        x = [node_number, coordinates, np.ones((edge_index.shape[1], 1), dtype="float32"), edge_index, range_index,
+             batch_id_node, batch_id_edge, batch_id_range, node_id, edge_id, range_id, np.array(num_nodes),
+             np.bincount(batch_id_edge), np.bincount(batch_id_range)]
+
+        inputs = [{"shape": (), "name": "node_number", "dtype": "int64"},
+                  {"shape": (3,), "name": "node_coordinates", "dtype": "float32"},
+                  {"shape": (1,), "name": "edge_weights", "dtype": "float32"},
+                  {"shape": (None,), "name": "edge_indices", "dtype": "int64"},
+                  {"shape": (None,), "name": "range_indices", "dtype": "int64"}] + [
+            {"shape": (), "name": name, "dtype": "int64"} for name in [
+                "batch_id_node", "batch_id_edge", "batch_id_range", "node_id", "edge_id", "range_id",
+                "count_nodes", "count_edges", "count_ranges"]]
+        model = make_model_sparse(inputs=inputs, input_tensor_type="disjoint", depth=2, heads=2,
+                                  output_mlp={"units": [16, 1], "activation": ["relu", "linear"]})
+        x = [ops.convert_to_tensor(v) for v in x]
+        prediction = ops.convert_to_numpy(model(x, training=False))
+        self.assertEqual(prediction.shape, (len(num_nodes), 1))
+        self.assertTrue(np.all(np.isfinite(prediction)))
+        self.assertAllClose(model.predict_on_batch(x), prediction, atol=1e-5, rtol=1e-5)
+
+
+if __name__ == "__main__":
+
+    MATAttentionHeadTest().test_correctness_blocked()
+    MATSparseAttentionHeadTest().test_correctness()
+    MATSparseAttentionHeadTest().test_correctness_distance()
+    MakeModelSparseTest().test_disjoint()
+    print("Tests passed.")
@@ -0,0 +1,65 @@
+import numpy as np
+import keras as ks
+from keras import ops
+from keras.mixed_precision import set_global_policy
+from kgcnn.utils.tests import TestCase, make_graphs
+from kgcnn.literature.Schnet import make_model as make_schnet
+from kgcnn.literature.GIN import make_model as make_gin
+from kgcnn.literature.DMPNN import make_model as make_dmpnn
+
+
+class MixedPrecisionTest(TestCase):
+
+    num_graphs, num_nodes = 8, 12
+
+    def _make_inputs(self):
+        graphs = make_graphs(self.num_graphs, num_nodes=(self.num_nodes, self.num_nodes), node_number=range(1, 10))
+        node_number, coordinates, edges, total_nodes, total_edges = [np.stack([x[key] for x in graphs]) for key in [
+            "node_number", "node_coordinates", "edge_indices", "total_nodes", "total_edges"]]
+        return node_number, coordinates.astype("float32"), edges, total_nodes, total_edges
+
+    def _assert_parity(self, make_model, inputs, rtol=0.05):
+        set_global_policy("float32")
+        ks.utils.set_random_seed(1)
+        model = make_model()
+        expected = ops.convert_to_numpy(model(inputs))
+        set_global_policy("mixed_bfloat16")
+        try:
+            model_mixed = make_model()
+            model_mixed.set_weights(model.get_weights())
+            outputs = ops.convert_to_numpy(ops.cast(model_mixed(inputs), "float32"))
+        finally:
+            set_global_policy("float32")
+        self.assertLess(np.linalg.norm(outputs - expected) / np.linalg.norm(expected), rtol)
+
+    def test_schnet(self):
+        node_number, coordinates, edges, total_nodes, total_edges = self._make_inputs()
+        self._assert_parity(
+            lambda: make_schnet(output_mlp={"use_bias": [True, True], "units": [64, 1],
+                                            "activation": ["relu", "linear"]}),
+            [node_number, coordinates, edges, total_nodes, total_edges])
+
+    def test_gin(self):
+        node_number, coordinates, edges, total_nodes, total_edges = self._make_inputs()
+        self._assert_parity(lambda: make_gin(output_mlp={"units": 1, "activation": "linear"}),
+                            [node_number, edges, total_nodes, total_edges])
+
+    def test_dmpnn(self):
+        node_number, coordinates, edges, total_nodes, total_edges = self._make_inputs()
+        inputs = [{"shape": (None,), "name": "node_number", "dtype": "int64"},
+                  {"shape": (None,), "name": "edge_number", "dtype": "int64"},
+                  {"shape": (None, 2), "name": "edge_indices", "dtype": "int64"},
+                  {"shape": (), "name": "total_nodes", "dtype": "int64"},
+                  {"shape": (), "name": "total_edges", "dtype": "int64"}]
+        self._assert_parity(
+            lambda: make_dmpnn(inputs=inputs, make_reverse_edges=True,
+                               input_edge_embedding={"input_dim": 5, "output_dim": 64},
+                               output_mlp={"use_bias": True, "units": 1, "activation": "linear"}),
+            [node_number, np.ones(edges.shape[:2], dtype="int64"), edges, total_nodes, total_edges])
+
+
+if __name__ == "__main__":
+    MixedPrecisionTest().test_schnet()
+    MixedPrecisionTest().test_gin()
+    MixedPrecisionTest().test_dmpnn()
+    print("Tests passed.")
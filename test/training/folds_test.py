@@ -0,0 +1,47 @@
+import os
+import sys
+import tempfile
+from kgcnn.utils.tests import TestCase
+from kgcnn.training.folds import thread_limit_environment, make_fold_command, run_folds_in_processes
+
+
+class FoldsTest(TestCase):
+
+    def test_thread_limit_environment(self):
+        environment = thread_limit_environment(2, environment={"PATH": "/bin"})
+        self.assertEqual(environment["PATH"], "/bin")
+        self.assertEqual(environment["OMP_NUM_THREADS"], "2")
+        self.assertEqual(environment["TF_NUM_INTRAOP_THREADS"], "2")
+        self.assertNotIn("XLA_FLAGS", environment)
+        environment = thread_limit_environment(1, environment={"XLA_FLAGS": "--xla_dump_to=/tmp"})
+        self.assertEqual(environment["TF_NUM_INTEROP_THREADS"], "1")
+        self.assertEqual(environment["XLA_FLAGS"], "--xla_dump_to=/tmp --xla_cpu_multi_thread_eigen=false")
+
+    def test_make_fold_command(self):
+        args = {"hyper": "hyper/hyper_esol.py", "gpu": [0, 1], "fold": None, "seed": 42, "num_workers": 2}
+        command = make_fold_command("train_graph.py", args, fold=[3], num_workers=1, gpu=None)
+        self.assertEqual(command[0], sys.executable)
+        self.assertEqual(command[2:], ["--hyper", "hyper/hyper_esol.py", "--fold", "3", "--seed", "42",
+                                       "--num_workers", "1"])
+
+    def test_run_folds_in_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            commands = {i: [sys.executable, "-c", "import os; print(os.environ['OMP_NUM_THREADS'], %s)" % i]
+                        for i in [0, 2, 3]}
+            log_file_path = os.path.join(directory, "log_fold_(i).txt")
+            return_codes = run_folds_in_processes(commands, num_workers=2, threads_per_worker=1,
+                                                  log_file_path=log_file_path)
+            self.assertEqual(return_codes, {0: 0, 2: 0, 3: 0})
+            for i in commands:
+                with open(log_file_path.replace("(i)", str(i)), "r") as file:
+                    self.assertEqual(file.read().strip(), "1 %s" % i)
+            with self.assertRaises(RuntimeError):
+                run_folds_in_processes({0: [sys.executable, "-c", "raise ValueError()"]}, num_workers=2)
+
+
+if __name__ == "__main__":
+
+    FoldsTest().test_thread_limit_environment()
+    FoldsTest().test_make_fold_command()
+    FoldsTest().test_run_folds_in_processes()
+    print("Tests passed.")
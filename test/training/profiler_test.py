@@ -0,0 +1,61 @@
+import os
+import tempfile
+import numpy as np
+import keras as ks
+from kgcnn.utils.tests import TestCase
+from kgcnn.training.profiler import TrainingProfiler, load_profile
+from kgcnn.training.callbacks import ProfilingCallback
+
+
+class TrainingProfilerTest(TestCase):
+
+    def make_model(self):
+        inputs = ks.Input((3,))
+        outputs = ks.layers.Dense(1, name="output")(ks.layers.Dense(4, name="hidden")(inputs))
+        return ks.models.Model(inputs, outputs)
+
+    def test_stages_and_trace(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "profile.json")
+            with TrainingProfiler(file_path) as profiler:
+                for _ in range(2):
+                    with profiler.stage("sleep"):
+                        pass
+                profiler.add_epoch(0, step_times=[0.1, 0.3], data_wait_times=[0.05, 0.05], epoch_time=1.0,
+                                   validation_time=0.2, num_graphs=10, num_nodes=50)
+            trace = load_profile(file_path)
+            self.assertEqual(trace["stages"]["sleep"]["calls"], 2)
+            self.assertAllClose(trace["epochs"][0]["train_time"], 0.5)
+            self.assertAllClose(trace["epochs"][0]["graphs_per_second"], 20.0)
+            self.assertAllClose(trace["summary"]["nodes_per_second"], 100.0)
+            self.assertIsNone(trace["summary"]["edges_per_second"])
+            self.assertGreater(trace["summary"]["total_time"], 0.0)
+
+            file_path = os.path.join(directory, "profile.csv")
+            profiler.save(file_path)
+            epochs = load_profile(file_path)["epochs"]
+            self.assertEqual(len(epochs), 1)
+            self.assertAllClose(epochs[0]["mean_step_time"], 0.2)
+            self.assertNotIn("step_times", epochs[0])
+
+    def test_callback(self):
+        x, y = np.ones((20, 3)), np.ones((20, 1))
+        model = self.make_model()
+        model.compile(loss="mean_squared_error", run_eagerly=True)
+        callback = ProfilingCallback(num_graphs=20, num_edges=100, layer_timing=True)
+        model.fit(x, y, batch_size=8, epochs=2, validation_data=(x, y), verbose=0, callbacks=[callback])
+        epochs = callback.profiler.epochs
+        self.assertEqual(len(epochs), 2)
+        self.assertEqual([len(x["step_times"]) for x in epochs], [3, 3])
+        self.assertTrue(all([x["validation_time"] > 0 for x in epochs]))
+        self.assertTrue(all([x["epoch_time"] >= x["train_time"] for x in epochs]))
+        self.assertAllClose(epochs[0]["edges_per_second"], 5 * epochs[0]["graphs_per_second"])
+        self.assertEqual(callback.profiler.layers["hidden"]["calls"], 6)
+        self.assertNotIn("call", model.get_layer("hidden").__dict__)
+
+
+if __name__ == "__main__":
+
+    TrainingProfilerTest().test_stages_and_trace()
+    TrainingProfilerTest().test_callback()
+    print("Tests passed.")
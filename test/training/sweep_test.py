@@ -0,0 +1,135 @@
+import os
+import tempfile
+import numpy as np
+import keras as ks
+from kgcnn.utils.tests import TestCase, make_graphs
+from kgcnn.data.utils import save_pickle_file
+from kgcnn.training.hyper import HyperParameter
+from kgcnn.training.callbacks import MedianStoppingCallback
+from kgcnn.training.sweep import HyperParameterSweep
+from kgcnn.data.base import MemoryGraphDataset
+
+
+def _save_dataset(directory: str, num_graphs: int = 8):
+    graphs = make_graphs(num_graphs, num_nodes=(2, 5), node_number=range(1, 10))
+    dataset = MemoryGraphDataset(data_directory=directory, dataset_name="Toy")
+    for key in graphs[0].keys():
+        dataset.assign_property(key, [x[key] for x in graphs])
+    dataset.assign_property("graph_labels", [np.array([np.sum(x["node_coordinates"])]) for x in graphs])
+    file_path = os.path.join(directory, "toy.pickle")
+    dataset.save(file_path)
+    return file_path
+
+
+class HyperParameterSweepTest(TestCase):
+
+    hyper_info = {"model": {"class_name": "make_model", "module_name": "kgcnn.literature.GIN",
+                            "config": {"name": "GIN", "depth": 2, "inputs": [{"name": "node_number"}]}},
+                  "training": {"fit": {"epochs": 10}, "compile": {"optimizer": {"config": {"learning_rate": 1e-3}}}},
+                  "dataset": {"class_name": "MemoryGraphDataset"}, "data": {}, "info": {}}
+
+    def test_copy(self):
+        hyper = HyperParameter(self.hyper_info, hyper_category="GIN")
+        hyper_trial = hyper.copy({"model.config.depth": 4, "model.config.inputs.0.name": "node_attributes",
+                                  "training.fit.batch_size": 16})
+        self.assertEqual(hyper_trial["model"]["config"]["depth"], 4)
+        self.assertEqual(hyper_trial["model"]["config"]["inputs"][0]["name"], "node_attributes")
+        self.assertEqual(hyper_trial["training"]["fit"], {"epochs": 10, "batch_size": 16})
+        self.assertEqual(hyper_trial.hyper_category, "GIN")
+        self.assertEqual(hyper["model"]["config"]["depth"], 2)
+        self.assertEqual(hyper["model"]["config"]["inputs"][0]["name"], "node_number")
+
+    def test_make_trials(self):
+        hyper = HyperParameter(self.hyper_info)
+        sweep = HyperParameterSweep(hyper, {"model.config.depth": [1, 2, 3], "training.fit.batch_size": [16, 32]})
+        trials = sweep.make_trials()
+        self.assertEqual(len(trials), 6)
+        self.assertEqual(trials[1], {"model.config.depth": 1, "training.fit.batch_size": 32})
+
+        space = {"model.config.depth": [1, 2, 3],
+                 "training.compile.optimizer.config.learning_rate": {"low": 1e-4, "high": 1e-2, "log": True},
+                 "training.fit.batch_size": {"low": 8, "high": 64, "dtype": "int"}}
+        sweep = HyperParameterSweep(hyper, space, method="random", num_trials=20)
+        trials = sweep.make_trials()
+        self.assertEqual(trials, HyperParameterSweep(hyper, space, method="random", num_trials=20).make_trials())
+        self.assertEqual(len(trials), 20)
+        for x in trials:
+            self.assertIn(x["model.config.depth"], [1, 2, 3])
+            self.assertTrue(1e-4 <= x["training.compile.optimizer.config.learning_rate"] <= 1e-2)
+            self.assertIsInstance(x["training.fit.batch_size"], int)
+        with self.assertRaises(ValueError):
+            HyperParameterSweep(hyper, space, method="grid").make_trials()
+        with self.assertRaises(ValueError):
+            HyperParameterSweep(hyper, {"dataset.config.file_name": ["a", "b"]})
+
+        sweep = HyperParameterSweep(hyper, space, method="successive_halving", min_epochs=1, reduction_factor=3)
+        self.assertEqual(sweep._rounds(10), [1, 3, 9, 10])
+
+    def test_make_trials_distinct(self):
+        hyper = HyperParameter(self.hyper_info)
+        space = {"model.config.depth": [1, 2, 3], "training.fit.batch_size": [16, 32]}
+        for num_trials in [4, 6, 20]:
+            trials = HyperParameterSweep(hyper, space, method="random", num_trials=num_trials).make_trials()
+            self.assertEqual(len(trials), min(num_trials, 6))
+            self.assertEqual(len(set([tuple(x.items()) for x in trials])), len(trials))
+        self.assertEqual(
+            sorted([tuple(x.items()) for x in trials]),
+            sorted([tuple(x.items()) for x in HyperParameterSweep(hyper, space).make_trials()]))
+
+    def test_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            hyper_info = {
+                "model": {"class_name": "make_model", "module_name": "kgcnn.literature.GIN",
+                          "config": {"name": "GIN", "depth": 1,
+                                     "inputs": [{"shape": (None,), "name": "node_number", "dtype": "int64"},
+                                                {"shape": (None, 2), "name": "edge_indices", "dtype": "int64"},
+                                                {"shape": (), "name": "total_nodes", "dtype": "int64"},
+                                                {"shape": (), "name": "total_edges", "dtype": "int64"}],
+                                     "input_node_embedding": {"input_dim": 10, "output_dim": 8},
+                                     "gin_mlp": {"units": [8], "use_bias": True, "activation": ["relu"]},
+                                     "output_mlp": {"use_bias": True, "units": [1], "activation": ["linear"]}}},
+                "training": {"fit": {"epochs": 2, "batch_size": 4, "verbose": 0},
+                             "compile": {"optimizer": {"class_name": "Adam", "config": {"learning_rate": 1e-3}},
+                                         "loss": "mean_absolute_error"},
+                             "cross_validation": {"class_name": "KFold", "config": {"n_splits": 2}}},
+                "dataset": {"class_name": "MemoryGraphDataset", "module_name": "kgcnn.data.base",
+                            "config": {"data_directory": directory, "dataset_name": "Toy"},
+                            "methods": [{"load": {"filepath": _save_dataset(directory)}}]},
+                "data": {}, "info": {}}
+            hyper = HyperParameter(hyper_info, hyper_category="GIN")
+            sweep = HyperParameterSweep(hyper, {"model.config.depth": [1, 2]}, folds=[0, 1], early_stopping=False)
+            results_path = os.path.join(directory, "results")
+            summary = sweep.run(num_workers=1, results_path=results_path)
+            self.assertEqual(sorted(summary["trial"]), [0, 1])
+            self.assertEqual(list(summary["status"]), ["completed"] * 2)
+            self.assertEqual(list(summary["epochs"]), [2, 2])
+            self.assertTrue(np.all(np.isfinite(summary["val_loss"])))
+            sweep_path = os.path.join(results_path, "MemoryGraphDataset", "GIN_sweep")
+            for file_name in ["sweep.json", "sweep_summary.csv", "sweep_summary.md"]:
+                self.assertTrue(os.path.exists(os.path.join(sweep_path, file_name)))
+            for k in range(2):
+                self.assertTrue(os.path.exists(os.path.join(results_path, "MemoryGraphDataset", "GIN_trial_%s" % k)))
+
+    def test_median_stopping(self):
+        x, y = np.random.normal(size=(16, 2)), np.random.normal(size=(16, 1))
+        model = ks.models.Sequential([ks.layers.Input(shape=(2,)), ks.layers.Dense(1)])
+        model.compile(loss="mean_absolute_error", optimizer="sgd")
+        with tempfile.TemporaryDirectory() as directory:
+            callback = MedianStoppingCallback(os.path.join(directory, "*.pickle"), monitor="loss", min_epochs=2)
+            model.fit(x, y, epochs=5, verbose=0, callbacks=[callback])
+            self.assertIsNone(callback.stopped_epoch)
+            for i in range(2):
+                save_pickle_file({"loss": [0.0] * 5}, os.path.join(directory, "history_%s.pickle" % i))
+            hist = model.fit(x, y, epochs=5, verbose=0, callbacks=[callback])
+            self.assertEqual(callback.stopped_epoch, 1)
+            self.assertEqual(len(hist.history["loss"]), 2)
+
+
+if __name__ == "__main__":
+
+    HyperParameterSweepTest().test_copy()
+    HyperParameterSweepTest().test_make_trials()
+    HyperParameterSweepTest().test_make_trials_distinct()
+    HyperParameterSweepTest().test_run()
+    HyperParameterSweepTest().test_median_stopping()
+    print("Tests passed.")
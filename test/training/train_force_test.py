@@ -0,0 +1,87 @@
+import os
+import sys
+import tempfile
+import subprocess
+import numpy as np
+from kgcnn.utils.tests import TestCase, make_graphs
+from kgcnn.data.base import MemoryGraphDataset
+from kgcnn.data.utils import save_json_file, load_pickle_file
+
+training_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "training")
+
+
+def _save_dataset(directory: str, num_graphs: int = 8):
+    graphs = make_graphs(num_graphs, num_nodes=(2, 5))
+    dataset = MemoryGraphDataset(data_directory=directory, dataset_name="Toy")
+    dataset.assign_property("atomic_number", [x["node_number"] for x in graphs])
+    dataset.assign_property("node_coordinates", [x["node_coordinates"] for x in graphs])
+    dataset.assign_property("range_indices", [x["edge_indices"] for x in graphs])
+    dataset.assign_property("total_nodes", [x["total_nodes"] for x in graphs])
+    dataset.assign_property("total_ranges", [x["total_edges"] for x in graphs])
+    dataset.assign_property("energy", [np.array([np.sum(np.square(x["node_coordinates"]))]) for x in graphs])
+    dataset.assign_property("force", [-2.0 * x["node_coordinates"] for x in graphs])
+    file_path = os.path.join(directory, "toy.pickle")
+    dataset.save(file_path)
+    return file_path
+
+
+class TrainForceTest(TestCase):
+
+    inputs = [{"shape": [None], "name": "atomic_number", "dtype": "int32"},
+              {"shape": [None, 3], "name": "node_coordinates", "dtype": "float32"},
+              {"shape": [None, 2], "name": "range_indices", "dtype": "int64"},
+              {"shape": (), "name": "total_nodes", "dtype": "int64"},
+              {"shape": (), "name": "total_ranges", "dtype": "int64"}]
+
+    def _make_hyper(self, directory: str):
+        model_energy = {
+            "class_name": "make_model", "module_name": "kgcnn.literature.Schnet",
+            "config": {"name": "Schnet", "inputs": self.inputs, "cast_disjoint_kwargs": {"padded_disjoint": True},
+                       "input_node_embedding": {"input_dim": 95, "output_dim": 8},
+                       "last_mlp": {"use_bias": [True], "units": [1], "activation": ["linear"]},
+                       "interaction_args": {"units": 8, "use_bias": True, "activation": "swish",
+                                            "cfconv_pool": "scatter_sum"},
+                       "node_pooling_args": {"pooling_method": "scatter_sum"}, "depth": 1,
+                       "gauss_args": {"bins": 4, "distance": 4, "offset": 0.0, "sigma": 0.4},
+                       "output_embedding": "graph", "use_output_mlp": False, "output_mlp": None}}
+        return {"Schnet.EnergyForceModel": {
+            "model": {"class_name": "EnergyForceModel", "module_name": "kgcnn.models.force",
+                      "config": {"name": "Schnet", "coordinate_input": 1, "inputs": self.inputs,
+                                 "nested_model_config": True, "output_to_tensor": False,
+                                 "output_squeeze_states": True, "model_energy": model_energy,
+                                 "outputs": {"energy": {"name": "energy", "shape": (1,)},
+                                             "force": {"name": "force", "shape": (None, 3)}}}},
+            "training": {"fit": {"batch_size": 4, "epochs": 2, "validation_freq": 1, "verbose": 0},
+                         "compile": {"optimizer": {"class_name": "Adam", "config": {"learning_rate": 1e-03}},
+                                     "loss_weights": {"energy": 0.02, "force": 0.98}},
+                         "cross_validation": {"class_name": "KFold", "config": {"n_splits": 2}},
+                         "execute_folds": [0],
+                         "scaler": {"class_name": "EnergyForceExtensiveLabelScaler",
+                                    "config": {"standardize_scale": True}}},
+            "dataset": {"class_name": "MemoryGraphDataset", "module_name": "kgcnn.data.base",
+                        "config": {"data_directory": directory, "dataset_name": "Toy"},
+                        "methods": [{"load": {"filepath": _save_dataset(directory)}}]},
+            "data": {},
+            "info": {"postfix": "", "postfix_file": "", "kgcnn_version": "4.0.0"}}}
+
+    def test_history(self):
+        with tempfile.TemporaryDirectory() as directory:
+            hyper_path = os.path.join(directory, "hyper.json")
+            save_json_file(self._make_hyper(directory), hyper_path)
+            environment = dict(os.environ, PYTHONPATH=os.path.dirname(training_path), MPLBACKEND="Agg")
+            subprocess.run([sys.executable, os.path.join(training_path, "train_force.py"), "--hyper", hyper_path,
+                            "--category", "Schnet.EnergyForceModel"], cwd=directory, env=environment, check=True,
+                           capture_output=True)
+            history = load_pickle_file(os.path.join(
+                directory, "results", "MemoryGraphDataset", "Schnet_EnergyForceModel", "history_fold_0.pickle"))
+        # Errors in units of the original targets are logged for the summary of results.
+        for key in ["val_energy_scaled_mean_absolute_error", "val_force_scaled_mean_absolute_error"]:
+            self.assertIn(key, history)
+            self.assertEqual(len(history[key]), 2)
+            self.assertTrue(np.all(np.isfinite(history[key])))
+
+
+if __name__ == "__main__":
+
+    TrainForceTest().test_history()
+    print("Tests passed.")
@@ -399,4 +399,65 @@ hyper = {
             "kgcnn_version": "4.0.0"
         }
     },
+    "SGC": {
+        "model": {
+            "class_name": "make_model",
+            "module_name": "kgcnn.literature.SGC",
+            "config": {
+                "name": "SGC",
+                "inputs": [
+                    {"shape": [None, 8710], "name": "node_attributes", "dtype": "float32"},
+                    {"shape": (), "name": "total_nodes", "dtype": "int64"}
+                ],
+                "cast_disjoint_kwargs": {"padded_disjoint": False, "static_batched_node_output_shape": (19793, 70)},
+                "output_embedding": "node",
+                "output_mlp": {"use_bias": [True, False], "units": [64, 70], "activation": ["relu", "softmax"],
+                               "use_dropout": [True, False], "rate": [0.5, None]},
+            }
+        },
+        "training": {
+            "fit": {
+                "batch_size": 1,
+                "epochs": 300,
+                "validation_freq": 10,
+                "verbose": 2,
+                "callbacks": [
+                    {
+                        "class_name": "kgcnn>LinearLearningRateScheduler", "config": {
+                            "learning_rate_start": 1e-02, "learning_rate_stop": 1e-03, "epo_min": 200, "epo": 300,
+                            "verbose": 0
+                        }
+                    }
+                ]
+            },
+            "compile": {
+                "optimizer": {"class_name": "Adam", "config": {"learning_rate": 1e-02}},
+                "loss": "categorical_crossentropy",
+                "weighted_metrics": ["categorical_accuracy", {"class_name": "AUC", "config": {"name": "auc"}}]
+            },
+            "cross_validation": {"class_name": "KFold",
+                                 "config": {"n_splits": 5, "random_state": 42, "shuffle": True}},
+            "multi_target_indices": None
+        },
+        "data": {
+            "dataset": {
+                "class_name": "CoraDataset",
+                "module_name": "kgcnn.data.datasets.CoraDataset",
+                "config": {},
+                "methods": [
+                    {"map_list": {"method": "make_undirected_edges"}},
+                    {"map_list": {"method": "add_edge_self_loops"}},
+                    {"map_list": {"method": "normalize_edge_weights_sym"}},
+                    {"map_list": {"method": "propagate_node_attributes", "hops": [2],
+                                  "node_attributes_propagated": "node_attributes"}},
+                    {"map_list": {"method": "count_nodes_and_edges"}},
+                ]
+            },
+        },
+        "info": {
+            "postfix": "",
+            "postfix_file": "",
+            "kgcnn_version": "4.0.0"
+        }
+    },
 }
@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 import yaml
 from math import nan
+from kgcnn.training.profiler import load_profile
 
 parser = argparse.ArgumentParser(description='Summary of training stats.')
 parser.add_argument("--min_max", required=False, help="Show min/max values for stats.", default=False, type=bool)
@@ -400,6 +401,9 @@ def make_table_line(tab_list: list):
     return "| " + "".join([str(tab) + " | " for tab in tab_list]) + "\n"
 
 
+# Columns for profile traces written by training scripts with '--profile'. Mean of epochs and folds.
+profile_columns = {"train_time": "Time/epoch [s]", "graphs_per_second": "Graphs/s"}
+
 output_file_name = "README%s.md" % ("_min_max" if show_min_max else "")
 
 
@@ -481,6 +485,16 @@ with open(output_file_name, "w") as f:
                         result_dict[x["name"]] = (np.mean(target_res), nan)
                     else:
                         result_dict[x["name"]] = (np.mean(target_res), np.std(target_res))
+
+            # Aggregate optional profile traces of the training folds.
+            profile_files = [
+                f for f in os.listdir(search_path) if f.startswith("profile") and f.endswith((".json", ".csv"))]
+            profiles = [load_profile(os.path.join(search_path, f)) for f in profile_files]
+            for key, name in profile_columns.items():
+                values = [[e[key] for e in p["epochs"] if e.get(key) is not None] for p in profiles]
+                values = [np.mean(x) for x in values if len(x) > 0]
+                if len(values) > 0:
+                    result_dict[name] = (np.mean(values), np.std(values) if len(values) > 1 else nan)
             df = pd.concat([df, pd.DataFrame({key: [value] for key, value in result_dict.items()})])
 
         # Pandas style does not seem to support mark-down formatting.
@@ -501,5 +515,10 @@ with open(output_file_name, "w") as f:
                     if data_targets["is_min_max"]:
                         del df[data_targets["name"]]
 
+        for name in profile_columns.values():
+            if name in df:
+                df[name] = ["{0:0.2f} &pm; {1:0.2f}".format(*v) if isinstance(v, (list, tuple, np.ndarray)) else ""
+                            for v in df[name]]
+
         f.write(df.to_markdown(index=False))
         f.write("\n\n")
@@ -0,0 +1,72 @@
+import argparse
+import numpy as np
+import keras as ks
+import kgcnn.training.scheduler  # noqa
+import kgcnn.training.schedule  # noqa
+import kgcnn.losses.losses
+import kgcnn.metrics.metrics
+from kgcnn.data.utils import load_hyper_file
+from kgcnn.training.hyper import HyperParameter
+from kgcnn.training.sweep import HyperParameterSweep
+from kgcnn.utils.devices import check_device, set_cuda_device
+
+# Input arguments from command line with default values from example.
+# The search space is a '.json' or '.yaml' file, which maps a path of keys in the hyperparameter to a list of values or
+# a range like {"model.config.depth": [3, 4, 5], "training.fit.batch_size": {"low": 16, "high": 64, "dtype": "int"}}.
+parser = argparse.ArgumentParser(description='Search hyperparameter of a GNN on a graph regression or classification.')
+parser.add_argument("--hyper", required=False, help="Filepath to hyperparameter config file (.py or .json).",
+                    default="hyper/hyper_esol.py")
+parser.add_argument("--category", required=False, help="Graph model to train.", default="GIN")
+parser.add_argument("--model", required=False, help="Graph model to train.", default=None)
+parser.add_argument("--dataset", required=False, help="Name of the dataset.", default=None)
+parser.add_argument("--make", required=False, help="Name of the class for model.", default=None)
+parser.add_argument("--search_space", required=True, help="Filepath to search space (.json or .yaml).")
+parser.add_argument("--method", required=False, help="Search method.", default="grid",
+                    choices=["grid", "random", "successive_halving"])
+parser.add_argument("--num_trials", required=False, help="Number of sampled trials.", default=None, type=int)
+parser.add_argument("--min_epochs", required=False, help="Epochs of first round of successive halving.", default=1,
+                    type=int)
+parser.add_argument("--reduction_factor", required=False, help="Reduction factor of successive halving.", default=3,
+                    type=int)
+parser.add_argument("--monitor", required=False, help="Metric to rank trials.", default="val_loss")
+parser.add_argument("--mode", required=False, help="Whether to minimize or maximize metric.", default="min",
+                    choices=["min", "max"])
+parser.add_argument("--no_early_stopping", required=False, help="Train every trial to the end.", action="store_true")
+parser.add_argument("--fold", required=False, help="Split or fold indices to train trials on.", default=None,
+                    nargs="+", type=int)
+parser.add_argument("--num_workers", required=False, help="Number of trials to train concurrently in processes.",
+                    default=1, type=int)
+parser.add_argument("--threads_per_worker", required=False, help="Number of threads for each process.",
+                    default=None, type=int)
+parser.add_argument("--gpu", required=False, help="GPU index used for training.", default=None, nargs="+", type=int)
+parser.add_argument("--seed", required=False, help="Set random seed.", default=42, type=int)
+
+# Trials are trained in processes, which are started by `spawn` and import this script as module.
+if __name__ == "__main__":
+
+    args = vars(parser.parse_args())
+    print("Input of argparse:", args)
+
+    # Check and set device
+    if args["gpu"] is not None:
+        set_cuda_device(args["gpu"])
+    print(check_device())
+
+    # Set seed.
+    np.random.seed(args["seed"])
+    ks.utils.set_random_seed(args["seed"])
+
+    # A class `HyperParameter` is used to expose and verify hyperparameter. Trials are copies of this hyperparameter.
+    hyper = HyperParameter(
+        hyper_info=args["hyper"], hyper_category=args["category"],
+        model_name=args["model"], model_class=args["make"], dataset_class=args["dataset"])
+    hyper.verify()
+
+    sweep = HyperParameterSweep(
+        hyper, search_space=load_hyper_file(args["search_space"]), method=args["method"], num_trials=args["num_trials"],
+        folds=args["fold"], monitor=args["monitor"], mode=args["mode"], min_epochs=args["min_epochs"],
+        reduction_factor=args["reduction_factor"], early_stopping=not args["no_early_stopping"], seed=args["seed"])
+
+    # Dataset is loaded once. Results of each trial are written like the results of `train_graph.py` .
+    summary = sweep.run(num_workers=args["num_workers"], threads_per_worker=args["threads_per_worker"])
+    print(summary.to_string(index=False))
@@ -1,6 +1,8 @@
 import numpy as np
 import time
 import os
+import sys
+import shutil
 import argparse
 import keras as ks
 from datetime import timedelta
@@ -14,7 +16,12 @@ from kgcnn.training.history import save_history_score, load_history_list, load_t
 from kgcnn.utils.plots import plot_train_test_loss, plot_predict_true
 from kgcnn.models.serial import deserialize as deserialize_model
 from kgcnn.data.serial import deserialize as deserialize_dataset
+from kgcnn.data.base import MemoryGraphDataset
+from kgcnn.io.file import GraphListMemoryMapFile
+from kgcnn.training.folds import make_fold_command, run_folds_in_processes
 from kgcnn.training.hyper import HyperParameter
+from kgcnn.training.callbacks import ProfilingCallback
+from kgcnn.training.profiler import count_graph_sizes
 from kgcnn.losses.losses import ForceMeanAbsoluteError, MeanAbsoluteError
 from kgcnn.metrics.metrics import ScaledMeanAbsoluteError, ScaledForceMeanAbsoluteError
 from kgcnn.data.transform.scaler.force import EnergyForceExtensiveLabelScaler
@@ -31,6 +38,14 @@ parser.add_argument("--module", required=False, help="Name of the module for mod
 parser.add_argument("--gpu", required=False, help="GPU index used for training.", default=None, nargs="+", type=int)
 parser.add_argument("--fold", required=False, help="Split or fold indices to run.", default=None, nargs="+", type=int)
 parser.add_argument("--seed", required=False, help="Set random seed.", default=42, type=int)
+parser.add_argument("--num_workers", required=False, help="Number of folds to train concurrently in processes.",
+                    default=1, type=int)
+parser.add_argument("--threads_per_worker", required=False, help="Number of threads for each process.",
+                    default=None, type=int)
+parser.add_argument("--dataset_file", required=False, help="Memory-mapped dataset of a run with parallel folds.",
+                    default=None)
+parser.add_argument("--profile", required=False, help="Write a profile trace of training in this format.",
+                    default=None, choices=["json", "csv"])
 args = vars(parser.parse_args())
 print("Input of argparse:", args)
 
@@ -49,32 +64,39 @@ hyper = HyperParameter(
     model_name=args["model"], model_class=args["make"], dataset_class=args["dataset"], model_module=args["module"])
 hyper.verify()
 
-# Loading a specific per-defined dataset from a module in kgcnn.data.datasets.
-# However, the construction must be fully defined in the data section of the hyperparameter,
-# including all methods to run on the dataset. Information required in hyperparameter are for example 'file_path',
-# 'data_directory' etc.
-# Making a custom training script rather than configuring the dataset via hyperparameter can be
-# more convenient.
-dataset = deserialize_dataset(hyper["dataset"])
-
-# Check if dataset has the required properties for model input. This includes a quick shape comparison.
-# The name of the keras `Input` layer of the model is directly connected to property of the dataset.
-# Example 'edge_indices' or 'node_attributes'. This couples the keras model to the dataset.
-dataset.assert_valid_model_input(hyper["model"]["config"]["inputs"])
-
-# Filter the dataset for invalid graphs. At the moment invalid graphs are graphs which do not have the property set,
-# which is required by the model's input layers, or if a tensor-like property has zero length.
-dataset.clean(hyper["model"]["config"]["inputs"])
+if args["dataset_file"] is None:
+    # Loading a specific per-defined dataset from a module in kgcnn.data.datasets.
+    # However, the construction must be fully defined in the data section of the hyperparameter,
+    # including all methods to run on the dataset. Information required in hyperparameter are for example 'file_path',
+    # 'data_directory' etc.
+    # Making a custom training script rather than configuring the dataset via hyperparameter can be
+    # more convenient.
+    dataset = deserialize_dataset(hyper["dataset"])
+
+    # Check if dataset has the required properties for model input. This includes a quick shape comparison.
+    # The name of the keras `Input` layer of the model is directly connected to property of the dataset.
+    # Example 'edge_indices' or 'node_attributes'. This couples the keras model to the dataset.
+    dataset.assert_valid_model_input(hyper["model"]["config"]["inputs"], make_copy=False)
+
+    # Filter the dataset for invalid graphs. At the moment invalid graphs are graphs which do not have the property
+    # set, which is required by the model's input layers, or if a tensor-like property has zero length.
+    dataset.clean(hyper["model"]["config"]["inputs"])
+
+    # Always train on `energy` .
+    # Just making sure that the target is of shape `(N, #labels)`. This means output embedding is on graph level.
+    label_names, label_units = dataset.set_multi_target_labels(
+        "energy",
+        hyper["training"]["multi_target_indices"] if "multi_target_indices" in hyper["training"] else None,
+        data_unit=hyper["data"]["data_unit"] if "data_unit" in hyper["data"] else None
+    )
+else:
+    # Process of a parallel fold. The dataset has been loaded, cleaned and labels have been selected by the main
+    # process and is shared read-only via a memory-mapped file.
+    dataset_file = GraphListMemoryMapFile(args["dataset_file"])
+    dataset = dataset_file.read(MemoryGraphDataset(dataset_name=hyper.dataset_class))
+    label_names, label_units = dataset_file.metadata["label_names"], dataset_file.metadata["label_units"]
 data_length = len(dataset)  # Length of the cleaned dataset.
 
-# Always train on `energy` .
-# Just making sure that the target is of shape `(N, #labels)`. This means output embedding is on graph level.
-label_names, label_units = dataset.set_multi_target_labels(
-    "energy",
-    hyper["training"]["multi_target_indices"] if "multi_target_indices" in hyper["training"] else None,
-    data_unit=hyper["data"]["data_unit"] if "data_unit" in hyper["data"] else None
-)
-
 # Make output directory
 filepath = hyper.results_file_path()
 postfix_file = hyper["info"]["postfix_file"]
@@ -94,6 +116,25 @@ train_indices_all, test_indices_all = [], []
 
 # Run Splits.
 execute_folds = args["fold"] if "execute_folds" not in hyper["training"] else hyper["training"]["execute_folds"]
+if args["dataset_file"] is not None:
+    execute_folds = args["fold"]
+
+# With multiple workers, each split is trained by this script in a separate process, which writes the same files
+# for its split as the sequential loop below. The dataset is shared with the processes via a memory-mapped file.
+run_folds_parallel = args["num_workers"] > 1 and args["dataset_file"] is None
+if run_folds_parallel:
+    dataset_file_path = os.path.join(filepath, f"dataset{postfix_file}_memmap")
+    GraphListMemoryMapFile(dataset_file_path).write(
+        dataset, metadata={"label_names": label_names, "label_units": label_units})
+    try:
+        run_folds_in_processes(
+            {i: make_fold_command(__file__, args, fold=[i], num_workers=1, gpu=None, dataset_file=dataset_file_path)
+             for i in range(len(train_test_indices)) if not execute_folds or i in execute_folds},
+            num_workers=args["num_workers"], threads_per_worker=args["threads_per_worker"], gpu=args["gpu"],
+            log_file_path=os.path.join(filepath, f"log{postfix_file}_fold_(i).txt"))
+    finally:
+        shutil.rmtree(dataset_file_path, ignore_errors=True)
+
 model, scaled_predictions, splits_done, current_split = None, False, 0, None
 for current_split, (train_index, test_index) in enumerate(train_test_indices):
 
@@ -105,6 +146,8 @@ for current_split, (train_index, test_index) in enumerate(train_test_indices):
     if execute_folds:
         if current_split not in execute_folds:
             continue
+    if run_folds_parallel:
+        continue
     print("Running training on split: '%s'." % current_split)
 
     # Make the model for current split using model kwargs from hyperparameter.
@@ -117,6 +160,8 @@ for current_split, (train_index, test_index) in enumerate(train_test_indices):
     # Normalize training and test targets.
     # For Force datasets this training script uses the `EnergyForceExtensiveLabelScaler` class.
     # Note that `EnergyForceExtensiveLabelScaler` uses both energy and forces for scaling.
+    # The `EnergyForceModel` applies the scaler within the model via `set_scale`, so that the train and test datasets
+    # with coordinates and forces do not have to be copied for transformed labels.
     # Adapt output-scale via a transform.
     # Scaler is applied to target if 'scaler' appears in hyperparameter. Only use for regression.
     scaled_metrics = None
@@ -124,7 +169,20 @@ for current_split, (train_index, test_index) in enumerate(train_test_indices):
         print("Using Scaler to adjust output scale of model.")
         scaler = deserialize_scaler(hyper["training"]["scaler"])
         scaler.fit_dataset(dataset_train)
+        # Metrics of the mean absolute error in units of the original targets are named 'scaled_mean_absolute_error'
+        # in the history of both branches below.
+        scaler_scale = scaler.get_scaling()
+        force_output_parameter = hyper["model"]["config"]["outputs"]["force"]
+        is_ragged = force_output_parameter["ragged"] if "ragged" in force_output_parameter else False
+        mae_metric_energy = ScaledMeanAbsoluteError(scaler_scale.shape, name="scaled_mean_absolute_error")
+        if is_ragged:
+            mae_metric_force = ScaledMeanAbsoluteError(
+                scaler_scale.shape, name="scaled_mean_absolute_error", ragged=True)
+        else:
+            mae_metric_force = ScaledForceMeanAbsoluteError(scaler_scale.shape, name="scaled_mean_absolute_error")
+        scaled_metrics = {"energy": [mae_metric_energy], "force": [mae_metric_force]}
         if hasattr(model, "set_scale"):
+            # The model predicts energies and forces in original units, so that the metrics keep a scale of one.
             print("Setting scale at model.")
             model.set_scale(scaler)
         else:
@@ -133,31 +191,20 @@ for current_split, (train_index, test_index) in enumerate(train_test_indices):
             dataset_test = scaler.transform_dataset(dataset_test, copy_dataset=True, copy=True)
             # If scaler was used we add rescaled standard metrics to compile, since otherwise the keras history will not
             # directly log the original target values, but the scaled ones.
-            scaler_scale = scaler.get_scaling()
-            force_output_parameter = hyper["model"]["config"]["outputs"]["force"]
-            is_ragged = force_output_parameter["ragged"] if "ragged" in force_output_parameter else False
-            mae_metric_energy = ScaledMeanAbsoluteError(scaler_scale.shape, name="scaled_mean_absolute_error")
-            if is_ragged:
-                mae_metric_force = ScaledMeanAbsoluteError(
-                    scaler_scale.shape, name="scaled_mean_absolute_error", ragged=True)
-            else:
-                mae_metric_force = ScaledForceMeanAbsoluteError(scaler_scale.shape, name="scaled_mean_absolute_error")
-            if scaler_scale is not None:
-                mae_metric_energy.set_scale(scaler_scale)
-                mae_metric_force.set_scale(scaler_scale)
-            scaled_metrics = {"energy": [mae_metric_energy], "force": [mae_metric_force]}
+            mae_metric_energy.set_scale(scaler_scale)
+            mae_metric_force.set_scale(scaler_scale)
             scaled_predictions = True
 
         # Save scaler to file
         scaler.save(os.path.join(filepath, f"scaler{postfix_file}_fold_{current_split}"))
 
     # Convert dataset to tensor information for model.
-    x_train = dataset_train.tensor(hyper["model"]["config"]["inputs"])
-    x_test = dataset_test.tensor(hyper["model"]["config"]["inputs"])
+    x_train = dataset_train.tensor(hyper["model"]["config"]["inputs"], make_copy=False)
+    x_test = dataset_test.tensor(hyper["model"]["config"]["inputs"], make_copy=False)
 
     # Convert targets into tensors.
-    y_train = dataset_train.tensor(hyper["model"]["config"]["outputs"])
-    y_test = dataset_test.tensor(hyper["model"]["config"]["outputs"])
+    y_train = dataset_train.tensor(hyper["model"]["config"]["outputs"], make_copy=False)
+    y_test = dataset_test.tensor(hyper["model"]["config"]["outputs"], make_copy=False)
 
     # Compile model with optimizer and loss
     model.compile(**hyper.compile(
@@ -178,12 +225,19 @@ for current_split, (train_index, test_index) in enumerate(train_test_indices):
     print(" Compiled with jit: %s" % model._jit_compile)  # noqa
     print(" Model is built: %s" % all([layer.built for layer in model._flatten_layers()]))  # noqa
 
+    # Optionally write a profile trace of training steps and epochs for this fold.
+    profile_callbacks = []
+    if args["profile"] is not None:
+        profile_callbacks.append(ProfilingCallback(
+            file_path=os.path.join(filepath, f"profile{postfix_file}_fold_{current_split}.{args['profile']}"),
+            **count_graph_sizes(dataset_train, node_key=hyper["model"]["config"]["inputs"][0]["name"])))
+
     # Start and time training
     start = time.time()
     hist = model.fit(
         x_train, y_train,
         validation_data=(x_test, y_test),
-        **hyper.fit()
+        **hyper.fit(callbacks=profile_callbacks)
     )
     stop = time.time()
     print("Print Time for training: ", str(timedelta(seconds=stop - start)))
@@ -200,7 +254,7 @@ for current_split, (train_index, test_index) in enumerate(train_test_indices):
     plot_predict_true(np.array(predicted_y["energy"]), np.array(true_y["energy"]),
                       filepath=filepath, data_unit=label_units,
                       model_name=hyper.model_name, dataset_name=hyper.dataset_class, target_names=label_names,
-                      file_name=f"predict_energy{postfix_file}_fold_{splits_done}.png",
+                      file_name=f"predict_energy{postfix_file}_fold_{current_split}.png",
                       scaled_predictions=scaled_predictions)
 
     num_forces = [len(x) for x in dataset_test.get("force")]
@@ -208,7 +262,7 @@ for current_split, (train_index, test_index) in enumerate(train_test_indices):
                       np.concatenate([np.array(f)[:l] for f, l in zip(true_y["force"], num_forces)], axis=0),
                       filepath=filepath, data_unit=label_units,
                       model_name=hyper.model_name, dataset_name=hyper.dataset_class, target_names=label_names,
-                      file_name=f"predict_force{postfix_file}_fold_{splits_done}.png",
+                      file_name=f"predict_force{postfix_file}_fold_{current_split}.png",
                       scaled_predictions=scaled_predictions)
 
     # Save last keras-model to output-folder.
@@ -220,6 +274,10 @@ for current_split, (train_index, test_index) in enumerate(train_test_indices):
     # Get loss from history
     splits_done = splits_done + 1
 
+# Processes of parallel folds only train their split. Results of all splits are collected by the main process.
+if args["dataset_file"] is not None:
+    sys.exit(0)
+
 # Save original data indices of the splits.
 np.savez(os.path.join(filepath, f"{hyper.model_name}_test_indices_{postfix_file}.npz"), *test_indices_all)
 np.savez(os.path.join(filepath, f"{hyper.model_name}_train_indices_{postfix_file}.npz"), *train_indices_all)
@@ -1,4 +1,6 @@
 import os
+import sys
+import shutil
 import keras as ks
 import numpy as np
 import argparse
@@ -14,7 +16,12 @@ from kgcnn.data.transform.scaler.serial import deserialize as deserialize_scaler
 from kgcnn.utils.plots import plot_train_test_loss, plot_predict_true
 from kgcnn.models.serial import deserialize as deserialize_model
 from kgcnn.data.serial import deserialize as deserialize_dataset
+from kgcnn.data.base import MemoryGraphDataset
+from kgcnn.io.file import GraphListMemoryMapFile
+from kgcnn.training.folds import make_fold_command, run_folds_in_processes
 from kgcnn.training.hyper import HyperParameter
+from kgcnn.training.callbacks import ProfilingCallback
+from kgcnn.training.profiler import count_graph_sizes
 from kgcnn.utils.devices import check_device, set_cuda_device
 from kgcnn.data.utils import save_pickle_file
 
@@ -31,6 +38,14 @@ parser.add_argument("--make", required=False, help="Name of the class for model.
 parser.add_argument("--gpu", required=False, help="GPU index used for training.", default=None, nargs="+", type=int)
 parser.add_argument("--fold", required=False, help="Split or fold indices to run.", default=None, nargs="+", type=int)
 parser.add_argument("--seed", required=False, help="Set random seed.", default=42, type=int)
+parser.add_argument("--num_workers", required=False, help="Number of folds to train concurrently in processes.",
+                    default=1, type=int)
+parser.add_argument("--threads_per_worker", required=False, help="Number of threads for each process.",
+                    default=None, type=int)
+parser.add_argument("--dataset_file", required=False, help="Memory-mapped dataset of a run with parallel folds.",
+                    default=None)
+parser.add_argument("--profile", required=False, help="Write a profile trace of training in this format.",
+                    default=None, choices=["json", "csv"])
 args = vars(parser.parse_args())
 print("Input of argparse:", args)
 
@@ -50,32 +65,39 @@ hyper = HyperParameter(
     model_name=args["model"], model_class=args["make"], dataset_class=args["dataset"])
 hyper.verify()
 
-# Loading a specific per-defined dataset from a module in kgcnn.data.datasets.
-# Those sub-classed classes are named after the dataset like e.g. `ESOLDataset`
-dataset = deserialize_dataset(hyper["dataset"])
+if args["dataset_file"] is None:
+    # Loading a specific per-defined dataset from a module in kgcnn.data.datasets.
+    # Those sub-classed classes are named after the dataset like e.g. `ESOLDataset`
+    dataset = deserialize_dataset(hyper["dataset"])
 
-# Check if dataset has the required properties for model input. This includes a quick shape comparison.
-# The name of the keras `Input` layer of the model is directly connected to property of the dataset.
-# Example 'edge_indices' or 'node_attributes'. This couples the keras model to the dataset.
-dataset.assert_valid_model_input(hyper["model"]["config"]["inputs"])
+    # Check if dataset has the required properties for model input. This includes a quick shape comparison.
+    # The name of the keras `Input` layer of the model is directly connected to property of the dataset.
+    # Example 'edge_indices' or 'node_attributes'. This couples the keras model to the dataset.
+    dataset.assert_valid_model_input(hyper["model"]["config"]["inputs"], make_copy=False)
 
-# Filter the dataset for invalid graphs. At the moment invalid graphs are graphs which do not have the property set,
-# which is required by the model's input layers, or if a tensor-like property has zero length.
-dataset.clean(hyper["model"]["config"]["inputs"])
+    # Filter the dataset for invalid graphs. At the moment invalid graphs are graphs which do not have the property
+    # set, which is required by the model's input layers, or if a tensor-like property has zero length.
+    dataset.clean(hyper["model"]["config"]["inputs"])
+
+    # Always train on `graph_labels` .
+    # Just making sure that the target is of shape `(N, #labels)`. This means output embedding is on graph level.
+    label_names, label_units = dataset.set_multi_target_labels(
+        "graph_labels",
+        hyper["training"]["multi_target_indices"] if "multi_target_indices" in hyper["training"] else None,
+        data_unit=hyper["data"]["data_unit"] if "data_unit" in hyper["data"] else None
+    )
+else:
+    # Process of a parallel fold. The dataset has been loaded, cleaned and labels have been selected by the main
+    # process and is shared read-only via a memory-mapped file.
+    dataset_file = GraphListMemoryMapFile(args["dataset_file"])
+    dataset = dataset_file.read(MemoryGraphDataset(dataset_name=hyper.dataset_class))
+    label_names, label_units = dataset_file.metadata["label_names"], dataset_file.metadata["label_units"]
 data_length = len(dataset)  # Length of the cleaned dataset.
 
 # Make output directory. This can further be adapted in hyperparameter.
 filepath = hyper.results_file_path()
 postfix_file = hyper["info"]["postfix_file"]
 
-# Always train on `graph_labels` .
-# Just making sure that the target is of shape `(N, #labels)`. This means output embedding is on graph level.
-label_names, label_units = dataset.set_multi_target_labels(
-    "graph_labels",
-    hyper["training"]["multi_target_indices"] if "multi_target_indices" in hyper["training"] else None,
-    data_unit=hyper["data"]["data_unit"] if "data_unit" in hyper["data"] else None
-)
-
 # Iterate over the cross-validation splits.
 # Indices for train-test splits are stored in 'test_indices_list'.
 if "cross_validation" in hyper["training"]:
@@ -89,6 +111,25 @@ train_indices_all, test_indices_all = [], []
 
 # Run splits.
 execute_folds = args["fold"] if "execute_folds" not in hyper["training"] else hyper["training"]["execute_folds"]
+if args["dataset_file"] is not None:
+    execute_folds = args["fold"]
+
+# With multiple workers, each split is trained by this script in a separate process, which writes the same files
+# for its split as the sequential loop below. The dataset is shared with the processes via a memory-mapped file.
+run_folds_parallel = args["num_workers"] > 1 and args["dataset_file"] is None
+if run_folds_parallel:
+    dataset_file_path = os.path.join(filepath, f"dataset{postfix_file}_memmap")
+    GraphListMemoryMapFile(dataset_file_path).write(
+        dataset, metadata={"label_names": label_names, "label_units": label_units})
+    try:
+        run_folds_in_processes(
+            {i: make_fold_command(__file__, args, fold=[i], num_workers=1, gpu=None, dataset_file=dataset_file_path)
+             for i in range(len(train_test_indices)) if execute_folds is None or i in execute_folds},
+            num_workers=args["num_workers"], threads_per_worker=args["threads_per_worker"], gpu=args["gpu"],
+            log_file_path=os.path.join(filepath, f"log{postfix_file}_fold_(i).txt"))
+    finally:
+        shutil.rmtree(dataset_file_path, ignore_errors=True)
+
 model, current_split, scaled_predictions = None, None, False
 for current_split, (train_index, test_index) in enumerate(train_test_indices):
 
@@ -100,6 +141,8 @@ for current_split, (train_index, test_index) in enumerate(train_test_indices):
     if execute_folds is not None:
         if current_split not in execute_folds:
             continue
+    if run_folds_parallel:
+        continue
     print("Running training on split: '%s'." % current_split)
 
     dataset_train, dataset_test = dataset[train_index], dataset[test_index]
@@ -136,9 +179,9 @@ for current_split, (train_index, test_index) in enumerate(train_test_indices):
         scaler.save(os.path.join(filepath, f"scaler{postfix_file}_fold_{current_split}"))
 
     # Pick train/test data.
-    x_train = dataset_train.tensor(hyper["model"]["config"]["inputs"])
+    x_train = dataset_train.tensor(hyper["model"]["config"]["inputs"], make_copy=False)
     y_train = np.array(dataset_train.get("graph_labels"))
-    x_test = dataset_test.tensor(hyper["model"]["config"]["inputs"])
+    x_test = dataset_test.tensor(hyper["model"]["config"]["inputs"], make_copy=False)
     y_test = np.array(dataset_test.get("graph_labels"))
 
     # Compile model with optimizer and loss from hyperparameter.
@@ -158,12 +201,19 @@ for current_split, (train_index, test_index) in enumerate(train_test_indices):
         [layer.name for layer in model._flatten_layers() if not layer.built]
     ))
 
+    # Optionally write a profile trace of training steps and epochs for this fold.
+    profile_callbacks = []
+    if args["profile"] is not None:
+        profile_callbacks.append(ProfilingCallback(
+            file_path=os.path.join(filepath, f"profile{postfix_file}_fold_{current_split}.{args['profile']}"),
+            **count_graph_sizes(dataset_train, node_key=hyper["model"]["config"]["inputs"][0]["name"])))
+
     # Run keras model-fit and take time for training.
     start = time.time()
     hist = model.fit(
         x_train, y_train,
         validation_data=(x_test, y_test),
-        **hyper.fit()
+        **hyper.fit(callbacks=profile_callbacks)
     )
     stop = time.time()
     print("Print Time for training: '%s'." % str(timedelta(seconds=stop - start)))
@@ -192,6 +242,12 @@ for current_split, (train_index, test_index) in enumerate(train_test_indices):
     # Save last keras-model to output-folder.
     model.save_weights(os.path.join(filepath, f"model{postfix_file}_fold_{current_split}.weights.h5"))
 
+# Processes of parallel folds only train their split. Results of all splits are collected by the main process.
+if args["dataset_file"] is not None:
+    sys.exit(0)
+if run_folds_parallel:
+    model = deserialize_model(hyper["model"])  # Only for the model version in the score file.
+
 # Plot training- and test-loss vs epochs for all splits.
 history_list = load_history_list(os.path.join(filepath, f"history{postfix_file}_fold_(i).pickle"), current_split + 1)
 plot_train_test_loss(history_list, loss_name=None, val_loss_name=None,
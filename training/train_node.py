@@ -2,15 +2,25 @@ import keras as ks
 import numpy as np
 import argparse
 import os
+import sys
+import shutil
 import time
+from datetime import timedelta
 from sklearn.model_selection import KFold
-from kgcnn.training.history import save_history_score
+from kgcnn.training.history import save_history_score, load_history_list, load_time_list
 from keras import ops
 import kgcnn.training.scheduler
 from kgcnn.metrics.metrics import ScaledMeanAbsoluteError, ScaledRootMeanSquaredError
 from kgcnn.utils.plots import plot_train_test_loss, plot_predict_true
 from kgcnn.training.hyper import HyperParameter
+from kgcnn.training.callbacks import ProfilingCallback
+from kgcnn.training.profiler import count_graph_sizes
 from kgcnn.data.serial import deserialize as deserialize_dataset
+from kgcnn.data.base import MemoryGraphDataset
+from kgcnn.data.utils import save_pickle_file
+from kgcnn.io.file import GraphListMemoryMapFile
+from kgcnn.io.loader import tf_dataset_neighbour_sampler_generator
+from kgcnn.training.folds import make_fold_command, run_folds_in_processes
 from kgcnn.models.serial import deserialize as deserialize_model
 from kgcnn.utils.devices import check_device, set_cuda_device
 
@@ -25,7 +35,18 @@ parser.add_argument("--model", required=False, help="Graph model to train.", def
 parser.add_argument("--dataset", required=False, help="Name of the dataset.", default=None)
 parser.add_argument("--make", required=False, help="Name of the class for model.", default=None)
 parser.add_argument("--gpu", required=False, help="GPU index used for training.", default=None, nargs="+", type=int)
+parser.add_argument("--fold", required=False, help="Split or fold indices to run.", default=None, nargs="+", type=int)
 parser.add_argument("--seed", required=False, help="Set random seed.", default=43, type=int)
+parser.add_argument("--num_workers", required=False, help="Number of folds to train concurrently in processes.",
+                    default=1, type=int)
+parser.add_argument("--threads_per_worker", required=False, help="Number of threads for each process.",
+                    default=None, type=int)
+parser.add_argument("--dataset_file", required=False, help="Memory-mapped dataset of a run with parallel folds.",
+                    default=None)
+parser.add_argument("--fan_outs", required=False, help="Number of sampled neighbours per hop for mini-batch training.",
+                    default=None, nargs="+", type=int)
+parser.add_argument("--profile", required=False, help="Write a profile trace of training in this format.",
+                    default=None, choices=["json", "csv"])
 args = vars(parser.parse_args())
 print("Input of argparse:", args)
 
@@ -45,20 +66,38 @@ hyper = HyperParameter(
     model_name=args["model"], model_class=args["make"], dataset_class=args["dataset"])
 hyper.verify()
 
-# Loading a specific per-defined dataset from a module in kgcnn.data.datasets.
-# Those sub-classed classes are named after the dataset like e.g. `CoraLuDataset`
-dataset = deserialize_dataset(hyper["dataset"])
-
-# Check if dataset has the required properties for model input. This includes a quick shape comparison.
-# The name of the keras `Input` layer of the model is directly connected to property of the dataset.
-# Example 'edge_indices' or 'node_attributes'. This couples the keras model to the dataset.
-dataset.assert_valid_model_input(hyper["model"]["config"]["inputs"])
-
-# Filter the dataset for invalid graphs. At the moment invalid graphs are graphs which do not have the property set,
-# which is required by the model's input layers, or if a tensor-like property has zero length.
-dataset.clean(hyper["model"]["config"]["inputs"])
+# Optional mini-batch training on sampled k-hop subgraphs of the training nodes instead of the full graph, which is
+# set by 'neighbour_sampler' in the training hyperparameter, e.g. `{"fan_outs": [10, 10, 10], "batch_size": 512}` ,
+# or the fan-outs from command line. The number of nodes changes for each batch, so a static output shape is removed.
+sampler_kwargs = hyper["training"]["neighbour_sampler"] if "neighbour_sampler" in hyper["training"] else None
+if args["fan_outs"] is not None:
+    sampler_kwargs = dict(sampler_kwargs if sampler_kwargs is not None else {}, fan_outs=args["fan_outs"])
+if sampler_kwargs is not None and "cast_disjoint_kwargs" in hyper["model"]["config"]:
+    hyper = hyper.copy({"model.config.cast_disjoint_kwargs.static_batched_node_output_shape": None})
+
+if args["dataset_file"] is None:
+    # Loading a specific per-defined dataset from a module in kgcnn.data.datasets.
+    # Those sub-classed classes are named after the dataset like e.g. `CoraLuDataset`
+    dataset = deserialize_dataset(hyper["dataset"])
+
+    # Check if dataset has the required properties for model input. This includes a quick shape comparison.
+    # The name of the keras `Input` layer of the model is directly connected to property of the dataset.
+    # Example 'edge_indices' or 'node_attributes'. This couples the keras model to the dataset.
+    dataset.assert_valid_model_input(hyper["model"]["config"]["inputs"], make_copy=False)
+
+    # Filter the dataset for invalid graphs. At the moment invalid graphs are graphs which do not have the property
+    # set, which is required by the model's input layers, or if a tensor-like property has zero length.
+    dataset.clean(hyper["model"]["config"]["inputs"])
+else:
+    # Process of a parallel fold. The dataset has been loaded and cleaned by the main process and is shared
+    # read-only via a memory-mapped file.
+    dataset = GraphListMemoryMapFile(args["dataset_file"]).read(MemoryGraphDataset(dataset_name=hyper.dataset_class))
 data_length = len(dataset)  # Length of the cleaned dataset.
 
+# Make output directory. This can further be changed in hyperparameter.
+filepath = hyper.results_file_path()
+postfix_file = hyper["info"]["postfix_file"]
+
 # For Citation networks, node embedding tasks are assumed. Labels are taken as 'node_labels'.
 # For now, node embedding tasks are restricted to a single graph, e.g. a citation network. Batch-dimension is one.
 labels = dataset.obtain_property("node_labels")
@@ -67,7 +106,9 @@ labels = dataset.obtain_property("node_labels")
 # really needed for batch-dimension of one.
 # Which property of the dataset and whether the tensor will be ragged is retrieved from the kwargs of the
 # keras `Input` layers ('name' and 'ragged').
-x_train = dataset.tensor(hyper["model"]["config"]["inputs"])
+x_train = dataset.tensor(hyper["model"]["config"]["inputs"], make_copy=False)
+# Splits are made over nodes of the graph and not over graphs, so that arrays cached for the tensor are not used again.
+dataset.clear_tensor_cache()
 y_train = np.array(labels)
 
 # Cross-validation via random KFold split form `sklearn.model_selection`.
@@ -75,12 +116,44 @@ kf = KFold(**hyper["training"]["cross_validation"]["config"])
 
 # Iterate over the cross-validation splits.
 # Indices for train-test splits are stored in 'test_indices_list'.
-history_list, train_indices_all, test_indices_all, model, hist = [], [], [], None, None
-for i, (train_index, test_index) in enumerate(kf.split(X=np.arange(len(labels[0]))[:, None])):
+train_test_indices = [
+    (train_index, test_index) for train_index, test_index in kf.split(X=np.arange(len(labels[0]))[:, None])]
+train_indices_all, test_indices_all = [], []
+
+# Run splits.
+execute_folds = args["fold"] if "execute_folds" not in hyper["training"] else hyper["training"]["execute_folds"]
+if args["dataset_file"] is not None:
+    execute_folds = args["fold"]
+
+# With multiple workers, each split is trained by this script in a separate process, which writes the same files
+# for its split as the sequential loop below. The dataset is shared with the processes via a memory-mapped file.
+run_folds_parallel = args["num_workers"] > 1 and args["dataset_file"] is None
+if run_folds_parallel:
+    dataset_file_path = os.path.join(filepath, f"dataset{postfix_file}_memmap")
+    GraphListMemoryMapFile(dataset_file_path).write(dataset)
+    try:
+        run_folds_in_processes(
+            {i: make_fold_command(__file__, args, fold=[i], num_workers=1, gpu=None, dataset_file=dataset_file_path)
+             for i in range(len(train_test_indices)) if execute_folds is None or i in execute_folds},
+            num_workers=args["num_workers"], threads_per_worker=args["threads_per_worker"], gpu=args["gpu"],
+            log_file_path=os.path.join(filepath, f"log{postfix_file}_fold_(i).txt"))
+    finally:
+        shutil.rmtree(dataset_file_path, ignore_errors=True)
+
+model, current_split = None, None
+for current_split, (train_index, test_index) in enumerate(train_test_indices):
 
     test_indices_all.append(test_index)
     train_indices_all.append(train_index)
 
+    # Only do execute_splits out of the k-folds of cross-validation.
+    if execute_folds is not None:
+        if current_split not in execute_folds:
+            continue
+    if run_folds_parallel:
+        continue
+    print("Running training on split: '%s'." % current_split)
+
     # Make the model for current split using model kwargs from hyperparameter.
     # They are always updated on top of the models default kwargs.
     model = deserialize_model(hyper["model"])
@@ -107,35 +180,56 @@ for i, (train_index, test_index) in enumerate(kf.split(X=np.arange(len(labels[0]
     print(" Compiled with jit: %s" % model._jit_compile)  # noqa
     print(" Model is built: %s" % all([layer.built for layer in model._flatten_layers()]))  # noqa
 
+    # Optionally write a profile trace of training steps and epochs for this fold.
+    profile_callbacks = []
+    if args["profile"] is not None:
+        profile_callbacks.append(ProfilingCallback(
+            file_path=os.path.join(filepath, f"profile{postfix_file}_fold_{current_split}.{args['profile']}"),
+            **count_graph_sizes(dataset, node_key=hyper["model"]["config"]["inputs"][0]["name"])))
+
     # Run keras model-fit and take time for training.
     start = time.time()
-    hist = model.fit(
-        x_train, y_train,
-        validation_data=(x_train, y_train, val_mask),
-        sample_weight=train_mask,  # Hide validation data!
-        **hyper.fit(epochs=100, validation_freq=10)
-    )
+    if sampler_kwargs is None:
+        hist = model.fit(
+            x_train, y_train,
+            validation_data=(x_train, y_train, val_mask),
+            sample_weight=train_mask,  # Hide validation data!
+            **hyper.fit(epochs=100, validation_freq=10, callbacks=profile_callbacks)
+        )
+    else:
+        # Loss only for the seed nodes of each batch, which are taken from the training nodes.
+        # Validation is still run on the full graph.
+        train_loader = tf_dataset_neighbour_sampler_generator(
+            dataset[0], hyper["model"]["config"]["inputs"], seed_nodes=train_index, labels=y_train[0],
+            seed=args["seed"], **sampler_kwargs)
+        hyper_fit = hyper.fit(epochs=100, validation_freq=10, callbacks=profile_callbacks)
+        hyper_fit.pop("batch_size", None)
+        hist = model.fit(train_loader, validation_data=(x_train, y_train, val_mask), **hyper_fit)
     stop = time.time()
     print("Print Time for training: ", stop - start)
+    print("Print Time per epoch: ", (stop - start) / max(len(hist.epoch), 1))
 
-    # Get loss from history
-    history_list.append(hist)
+    # Save history for this fold.
+    save_pickle_file(hist.history, os.path.join(filepath, f"history{postfix_file}_fold_{current_split}.pickle"))
+    save_pickle_file(str(timedelta(seconds=stop - start)),
+                     os.path.join(filepath, f"time{postfix_file}_fold_{current_split}.pickle"))
 
-# Make output directory. This can further be changed in hyperparameter.
-filepath = hyper.results_file_path()
-postfix_file = hyper["info"]["postfix_file"]
+    # Save last keras-model to output-folder.
+    model.save(os.path.join(filepath, f"model{postfix_file}_fold_{current_split}.keras"))
+
+    # Save last keras-model to output-folder.
+    model.save_weights(os.path.join(filepath, f"model{postfix_file}_fold_{current_split}.weights.h5"))
+
+# Processes of parallel folds only train their split. Results of all splits are collected by the main process.
+if args["dataset_file"] is not None:
+    sys.exit(0)
 
 # Plot training- and test-loss vs epochs for all splits.
+history_list = load_history_list(os.path.join(filepath, f"history{postfix_file}_fold_(i).pickle"), current_split + 1)
 plot_train_test_loss(history_list, loss_name=None, val_loss_name=None,
                      model_name=hyper.model_name, data_unit="", dataset_name=hyper.dataset_class, filepath=filepath,
                      file_name=f"loss{postfix_file}.png")
 
-# Save last keras-model to output-folder.
-model.save(os.path.join(filepath, f"model{postfix_file}.keras"))
-
-# Save last keras-model to output-folder.
-model.save_weights(os.path.join(filepath, f"model{postfix_file}.weights.h5"))
-
 # Save original data indices of the splits.
 np.savez(os.path.join(filepath, f"{hyper.model_name}_test_indices_{postfix_file}.npz"), *test_indices_all)
 np.savez(os.path.join(filepath, f"{hyper.model_name}_train_indices_{postfix_file}.npz"), *train_indices_all)
@@ -145,7 +239,8 @@ hyper.save(os.path.join(filepath, f"{hyper.model_name}_hyper{postfix_file}.json"
 
 # Save score of fit result for as text file.
 data_unit = hyper["data"]["data_unit"] if "data_unit" in hyper["data"] else ""
+time_list = load_time_list(os.path.join(filepath, f"time{postfix_file}_fold_(i).pickle"), current_split + 1)
 save_history_score(history_list, loss_name=None, val_loss_name=None,
                    model_name=hyper.model_name, data_unit=data_unit, dataset_name=hyper.dataset_class,
-                   model_class=hyper.model_class, seed=args["seed"],
-                   filepath=filepath, file_name=f"score{postfix_file}.yaml")
\ No newline at end of file
+                   model_class=hyper.model_class, seed=args["seed"], execute_folds=execute_folds,
+                   filepath=filepath, file_name=f"score{postfix_file}.yaml", time_list=time_list)